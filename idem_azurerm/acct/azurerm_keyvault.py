@@ -5,6 +5,7 @@ Azure Key Vault Backend for Acct
 :depends:
     * `azure-identity <https://pypi.python.org/pypi/azure-identity>`_ == 1.3.0
     * `azure-keyvault-secrets <https://pypi.python.org/pypi/azure-keyvault-secrets>`_ == 4.1.0
+    * `cryptography <https://pypi.python.org/pypi/cryptography>`_ (only for ``cache_file``)
 
 :configuration: Get secrets from Azure Key Vault.
 
@@ -20,6 +21,9 @@ Azure Key Vault Backend for Acct
                 secret: "X2KRwdcdsQn9mwjdt0EbxsQR3w5TuBOR"
                 subscription_id: "bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb"
                 tenant: "cccccccc-cccc-cccc-cccc-cccccccccccc"
+                max_workers: 10
+                cache_file: "/var/cache/idem/azurerm_keyvault.fernet"
+                cache_ttl: 3600
 
     To use this backend, configure the backend YAML as shown above for the
     credentials which can be used to access the Key Vault URL provided. A
@@ -51,13 +55,32 @@ Azure Key Vault Backend for Acct
     will be converted to underscores. This is due to limitations in secret
     naming and the fact that Python parameters shouldn't have dashes.
 
+    Secrets which are disabled, expired or not yet valid are skipped without
+    fetching their values. The values of the matching secrets are fetched
+    concurrently by up to ``max_workers`` threads, which defaults to 10.
+
+    If ``cache_file`` is set, the unlocked secrets are kept in that file,
+    encrypted with the acct key, for ``cache_ttl`` seconds (default 3600).
+    While the cache is fresh, the secrets are still listed from the vault but
+    only the values of secrets whose version or update time has changed since
+    they were cached are fetched. The TTL is counted from when the cache was
+    first written and is not extended when changed secrets are written to it,
+    so every value is fetched again once it has passed. The cache is not used
+    when no acct key is available or the ``cryptography`` library is missing.
+
 """
 
 # Python libs
 from typing import Dict
+import concurrent.futures
+import datetime
+import json
 import logging
 import os
+import time
 
+# Local libs
+import idem_azurerm.auth as auth
 
 # Azure libs
 HAS_LIBS = False
@@ -68,19 +91,28 @@ try:
         HttpResponseError,
         ResourceExistsError,
     )
-    from azure.identity import (
-        DefaultAzureCredential,
-        KnownAuthorities,
-    )
     from azure.keyvault.secrets import SecretClient
+    import azure.identity  # pylint: disable=unused-import
 
     HAS_LIBS = True
 except ImportError:
     pass
 
+# Encryption of the secret cache, which is optional
+HAS_CRYPTOGRAPHY = False
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+
+    HAS_CRYPTOGRAPHY = True
+except ImportError:
+    pass
+
 
 log = logging.getLogger(__name__)
 
+# Credentials keyed by a digest of their authentication parameters and their authority
+CREDENTIALS = {}
+
 
 def __virtual__(hub):
     """
@@ -93,41 +125,10 @@ def _get_identity_credentials(**kwargs):
     """
     Acquire Azure RM Credentials from the identity provider
 
-    We basically set environment variables based upon incoming parameters and then pass off to
-    the DefaultAzureCredential object to correctly parse those environment variables. See the
-    `Microsoft Docs on EnvironmentCredential <https://aka.ms/azsdk-python-identity-default-cred-ref>`_
-    for more information.
+    The credential is built from the incoming parameters the same way as by ``get_identity_credentials`` of the
+    azurerm utilities, and reused for the same parameters.
     """
-    kwarg_map = {
-        "tenant": "AZURE_TENANT_ID",
-        "client_id": "AZURE_CLIENT_ID",
-        "secret": "AZURE_CLIENT_SECRET",
-        "client_certificate_path": "AZURE_CLIENT_CERTIFICATE_PATH",
-        "username": "AZURE_USERNAME",
-        "password": "AZURE_PASSWORD",
-    }
-
-    for kw in kwarg_map:
-        if kwargs.get(kw):
-            os.environ[kwarg_map[kw]] = kwargs[kw]
-
-    try:
-        if kwargs.get("cloud_environment") and kwargs.get(
-            "cloud_environment"
-        ).startswith("http"):
-            authority = kwargs["cloud_environment"]
-        else:
-            authority = getattr(
-                KnownAuthorities, kwargs.get("cloud_environment", "AZURE_PUBLIC_CLOUD")
-            )
-        log.debug("AUTHORITY: %s", authority)
-    except AttributeError as exc:
-        log.error('Unknown authority presented for "cloud_environment": %s', exc)
-        authority = KnownAuthorities.AZURE_PUBLIC_CLOUD
-
-    credential = DefaultAzureCredential(authority=authority)
-
-    return credential
+    return auth.identity_credential(CREDENTIALS, kwargs)
 
 
 def _get_secret_client(vault_url: str, **kwargs):
@@ -144,8 +145,80 @@ def _get_secret_client(vault_url: str, **kwargs):
     return secret_client
 
 
+def _is_active(secret, now) -> bool:
+    """
+    Return whether the value of a secret can be fetched, judging by its properties alone.
+    """
+    if secret.enabled is False:
+        log.debug("acct skipped disabled azurerm_keyvault secret: %s", secret.name)
+        return False
+    if secret.expires_on and secret.expires_on <= now:
+        log.debug("acct skipped expired azurerm_keyvault secret: %s", secret.name)
+        return False
+    if secret.not_before and secret.not_before > now:
+        log.debug(
+            "acct skipped azurerm_keyvault secret which is not yet valid: %s",
+            secret.name,
+        )
+        return False
+    return True
+
+
+def _cache_key(hub):
+    """
+    Return the acct key which the cache is encrypted with, if there is one.
+    """
+    try:
+        key = hub.OPT["acct"]["acct_key"]
+    except (AttributeError, KeyError, TypeError):
+        key = None
+    return key or os.environ.get("ACCT_FILE_KEY")
+
+
+def _read_cache(cache_file: str, key, vault_url: str, designator: str) -> Dict:
+    """
+    Return the cached secrets of a vault, or an empty cache if the file is missing, can't be decrypted or was written
+    for another vault.
+    """
+    try:
+        with open(cache_file, "rb") as cache_fh:
+            cache = json.loads(Fernet(key).decrypt(cache_fh.read()))
+    except FileNotFoundError:
+        return {}
+    except (InvalidToken, OSError, TypeError, ValueError) as exc:
+        log.debug("Unable to read the azurerm_keyvault cache %s: %s", cache_file, exc)
+        return {}
+
+    if cache.get("vault_url") != vault_url or cache.get("designator") != designator:
+        return {}
+    return cache
+
+
+def _write_cache(cache_file: str, key, cache: Dict):
+    """
+    Encrypt the cached secrets into a file which only the current user can read.
+    """
+    try:
+        data = Fernet(key).encrypt(json.dumps(cache).encode())
+        tmp_file = "{0}.{1}.tmp".format(cache_file, os.getpid())
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as cache_fh:
+            cache_fh.write(data)
+        os.replace(tmp_file, cache_file)
+    except (OSError, TypeError, ValueError) as exc:
+        log.warning(
+            "Unable to write the azurerm_keyvault cache %s: %s", cache_file, exc
+        )
+
+
 def unlock(
-    hub, vault_url: str, designator: str = "acct-provider-", **kwargs
+    hub,
+    vault_url: str,
+    designator: str = "acct-provider-",
+    max_workers: int = 10,
+    cache_file: str = None,
+    cache_ttl: int = 3600,
+    **kwargs,
 ) -> Dict[str, Dict[str, Dict[str, str]]]:
     """
     Get secrets from the Azure Key Vault.
@@ -155,12 +228,39 @@ def unlock(
     try:
         sconn = _get_secret_client(vault_url, **kwargs)
         secrets = sconn.list_properties_of_secrets()
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+        wanted = []
+        for secret in secrets:
+            if secret.name.startswith(designator) and _is_active(secret, now):
+                wanted.append(secret)
     except (HttpResponseError, ResourceExistsError, ResourceNotFoundError) as exc:
         log.error("Unable to unlock Azure Key Vault: %s", exc)
         return ret
 
-    for secret in secrets:
-        if secret.name.startswith(designator):
+    cache_key = None
+    if cache_file and not HAS_CRYPTOGRAPHY:
+        log.error(
+            "The cryptography library is required to cache azurerm_keyvault secrets in %s",
+            cache_file,
+        )
+    elif cache_file:
+        cache_key = _cache_key(hub)
+        if not cache_key:
+            log.debug("No acct key is available to encrypt the azurerm_keyvault cache")
+    cache = {}
+    if cache_key:
+        cache = _read_cache(cache_file, cache_key, vault_url, designator)
+        if time.time() - cache.get("created", 0) > float(cache_ttl):
+            cache = {}
+    cached = cache.get("secrets", {})
+    fresh = {}
+
+    fetches = {}
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(int(max_workers), 1), thread_name_prefix="azurerm-acct"
+    ) as executor:
+        for secret in wanted:
             try:
                 key = secret.name[len(designator) :]
 
@@ -194,10 +294,51 @@ def unlock(
                 if profile not in ret[provider]:
                     ret[provider][profile] = {}
 
-                sec = sconn.get_secret(name=secret.name)
-                ret[provider][profile][param] = sec.value
+                entry = {
+                    "version": secret.version,
+                    "updated_on": secret.updated_on.isoformat()
+                    if secret.updated_on
+                    else None,
+                }
+                previous = cached.get(secret.name, {})
+                if (
+                    "value" in previous
+                    and previous.get("version") == entry["version"]
+                    and previous.get("updated_on") == entry["updated_on"]
+                ):
+                    log.debug("acct reused cached azurerm_keyvault secret: %s", key)
+                    entry["value"] = previous["value"]
+                    ret[provider][profile][param] = entry["value"]
+                    fresh[secret.name] = entry
+                    continue
+
+                fetch = executor.submit(sconn.get_secret, name=secret.name)
+                fetches[fetch] = (provider, profile, param, secret.name, entry)
             except (AttributeError, IndexError, TypeError) as exc:
                 log.error("Unable to handle secret processing: %s", exc)
                 continue
 
+        for fetch in concurrent.futures.as_completed(fetches):
+            provider, profile, param, name, entry = fetches[fetch]
+            try:
+                entry["value"] = fetch.result().value
+            except (HttpResponseError, ResourceNotFoundError) as exc:
+                log.error("Unable to get secret %s from Azure Key Vault: %s", name, exc)
+                continue
+            ret[provider][profile][param] = entry["value"]
+            fresh[name] = entry
+
+    if cache_key and (fetches or set(fresh) != set(cached)):
+        _write_cache(
+            cache_file,
+            cache_key,
+            {
+                "vault_url": vault_url,
+                "designator": designator,
+                # a hard TTL, counted from the first write of the cache
+                "created": cache.get("created", time.time()),
+                "secrets": fresh,
+            },
+        )
+
     return ret
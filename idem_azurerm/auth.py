@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Azure Identity Credentials
+
+.. versionadded:: 2.4.0
+
+Builds the azure-identity credentials used by the data plane clients of the exec modules and by the Key Vault acct
+backend. This module is not loaded onto the hub and imports azure-identity only when a credential is built, so the
+acct backend can use it without loading the exec modules or the management SDK.
+
+:maintainer: <devops@eitr.tech>
+
+"""
+# Import Python libs
+import hashlib
+import logging
+
+log = logging.getLogger(__name__)
+
+# The public client ID of the Azure CLI, used for username and password authentication without a client_id
+AZURE_CLI_CLIENT_ID = "04b07795-8ddb-461a-bbee-02f9e1bf7b46"
+
+# Connection parameters which identify the principal a credential is issued to
+AUTH_KWARGS = [
+    "client_id",
+    "secret",
+    "tenant",
+    "username",
+    "password",
+    "client_certificate_path",
+]
+
+
+def auth_identity(kwargs):
+    """
+    Return a digest of the authentication parameters so that secrets are never used directly as cache keys.
+    """
+    digest = hashlib.sha256()
+    for key in AUTH_KWARGS:
+        digest.update("{0}={1};".format(key, kwargs.get(key) or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+def authority(kwargs):
+    """
+    Return the authority of the ``cloud_environment`` in the authentication parameters, which is either the URL of
+    the authority or the name of one of the azure-identity ``KnownAuthorities``.
+    """
+    from azure.identity import KnownAuthorities
+
+    try:
+        if kwargs.get("cloud_environment") and kwargs.get(
+            "cloud_environment"
+        ).startswith("http"):
+            ret = kwargs["cloud_environment"]
+        else:
+            ret = getattr(
+                KnownAuthorities, kwargs.get("cloud_environment", "AZURE_PUBLIC_CLOUD")
+            )
+        log.debug("AUTHORITY: %s", ret)
+    except AttributeError as exc:
+        log.error('Unknown authority presented for "cloud_environment": %s', exc)
+        ret = KnownAuthorities.AZURE_PUBLIC_CLOUD
+    return ret
+
+
+def build_credential(kwargs, authority):
+    """
+    Build the azure-identity credential for one set of authentication parameters. Service principals and users get
+    their own credential objects. Without either, the DefaultAzureCredential chain is used, which picks up the
+    environment, a managed identity or the Azure CLI.
+    """
+    from azure.identity import (
+        CertificateCredential,
+        ClientSecretCredential,
+        DefaultAzureCredential,
+        UsernamePasswordCredential,
+    )
+
+    if kwargs.get("client_id") and kwargs.get("secret") and kwargs.get("tenant"):
+        return ClientSecretCredential(
+            kwargs["tenant"], kwargs["client_id"], kwargs["secret"], authority=authority
+        )
+    if (
+        kwargs.get("client_id")
+        and kwargs.get("client_certificate_path")
+        and kwargs.get("tenant")
+    ):
+        return CertificateCredential(
+            kwargs["tenant"],
+            kwargs["client_id"],
+            kwargs["client_certificate_path"],
+            authority=authority,
+        )
+    if kwargs.get("username") and kwargs.get("password"):
+        return UsernamePasswordCredential(
+            kwargs.get("client_id") or AZURE_CLI_CLIENT_ID,
+            kwargs["username"],
+            kwargs["password"],
+            tenant=kwargs.get("tenant"),
+            authority=authority,
+        )
+    return DefaultAzureCredential(authority=authority)
+
+
+def identity_credential(credentials, kwargs):
+    """
+    Return the azure-identity credential for a set of authentication parameters from a dictionary of credentials,
+    building it if there is none for the identity and authority yet.
+
+    :param credentials: The credentials built so far, keyed by identity and authority. Missing credentials are added.
+
+    :param kwargs: The authentication parameters, such as those of an acct profile.
+
+    """
+    cred_authority = authority(kwargs)
+    cred_key = (auth_identity(kwargs), cred_authority)
+    credential = credentials.get(cred_key)
+    if credential is None:
+        credential = build_credential(kwargs, cred_authority)
+        credentials[cred_key] = credential
+
+    return credential
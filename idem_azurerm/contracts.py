@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+"""
+Azure Resource Manager (ARM) State Contracts
+
+.. versionadded:: 2.4.0
+
+The contracts shared by the azurerm state modules. Contracts only apply to the modules of their own sub, so the
+``contracts`` directory of each state sub imports them from here.
+
+"""
+
+
+async def pre(hub, ctx):
+    """
+    Prefetch the resources which the pending azurerm states of an idem run look up, once per run, before a state runs.
+    """
+    await hub.exec.azurerm.utils.prefetch_resources(ctx.get_argument("ctx"))
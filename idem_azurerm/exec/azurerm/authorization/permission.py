@@ -34,16 +34,16 @@ Azure Resource Manager (ARM) Authorization Permissions Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.authorization.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.authorization") is not None
 except ImportError:
     pass
 
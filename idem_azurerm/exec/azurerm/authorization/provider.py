@@ -34,16 +34,16 @@ Azure Resource Manager (ARM) Authorization Provider Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.authorization.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.authorization") is not None
 except ImportError:
     pass
 
@@ -72,7 +72,8 @@ async def operations_metadata_get(
     result = {}
     authconn = await hub.exec.azurerm.utils.get_client(ctx, "authorization", **kwargs)
     try:
-        data = authconn.provider_operations_metadata.get(
+        data = await hub.exec.azurerm.utils.sdk_call(
+            authconn.provider_operations_metadata.get,
             resource_provider_namespace=resource_provider_namespace,
             api_version=api_version,
             **kwargs,
@@ -88,7 +89,9 @@ async def operations_metadata_get(
     return result
 
 
-async def operations_metadata_list(hub, ctx, api_version="2015-07-01", **kwargs):
+async def operations_metadata_list(
+    hub, ctx, api_version="2015-07-01", stream=False, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
@@ -96,6 +99,9 @@ async def operations_metadata_list(hub, ctx, api_version="2015-07-01", **kwargs)
 
     :param api_version: The API version to use for the operation.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -107,13 +113,15 @@ async def operations_metadata_list(hub, ctx, api_version="2015-07-01", **kwargs)
     authconn = await hub.exec.azurerm.utils.get_client(ctx, "authorization", **kwargs)
 
     try:
-        providers = await hub.exec.azurerm.utils.paged_object_to_list(
+        providers = hub.exec.azurerm.utils.paged_object_iter(
             authconn.provider_operations_metadata.list(
                 api_version=api_version, **kwargs
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(providers)
 
-        for provider in providers:
+        async for provider in providers:
             result[provider["name"]] = provider
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error(
@@ -34,16 +34,16 @@ Azure Resource Manager (ARM) Authorization Roles Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.authorization.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.authorization") is not None
 except ImportError:
     pass
 
@@ -71,8 +71,11 @@ async def definitions_get(hub, ctx, role_id, scope, **kwargs):
     authconn = await hub.exec.azurerm.utils.get_client(ctx, "authorization", **kwargs)
 
     try:
-        defs = authconn.role_definitions.get(
-            scope=scope, role_definition_id=role_id, **kwargs
+        defs = await hub.exec.azurerm.utils.sdk_call(
+            authconn.role_definitions.get,
+            scope=scope,
+            role_definition_id=role_id,
+            **kwargs,
         )
 
         result = defs.as_dict()
@@ -107,7 +110,9 @@ async def definitions_get_by_id(hub, ctx, role_id, **kwargs):
     authconn = await hub.exec.azurerm.utils.get_client(ctx, "authorization", **kwargs)
 
     try:
-        defs = authconn.role_definitions.get_by_id(role_definition_id=role_id, **kwargs)
+        defs = await hub.exec.azurerm.utils.sdk_call(
+            authconn.role_definitions.get_by_id, role_definition_id=role_id, **kwargs
+        )
 
         result = defs.as_dict()
     except CloudError as exc:
@@ -175,8 +180,11 @@ async def assignments_get(hub, ctx, name, scope, **kwargs):
     authconn = await hub.exec.azurerm.utils.get_client(ctx, "authorization", **kwargs)
 
     try:
-        assigns = authconn.role_assignments.get(
-            role_assignment_name=name, scope=scope, **kwargs
+        assigns = await hub.exec.azurerm.utils.sdk_call(
+            authconn.role_assignments.get,
+            role_assignment_name=name,
+            scope=scope,
+            **kwargs,
         )
 
         result = assigns.as_dict()
@@ -210,8 +218,10 @@ async def assignments_get_by_id(hub, ctx, assignment_id, **kwargs):
     authconn = await hub.exec.azurerm.utils.get_client(ctx, "authorization", **kwargs)
 
     try:
-        assigns = authconn.role_assignments.get_by_id(
-            role_assignment_id=assignment_id, **kwargs
+        assigns = await hub.exec.azurerm.utils.sdk_call(
+            authconn.role_assignments.get_by_id,
+            role_assignment_id=assignment_id,
+            **kwargs,
         )
 
         result = assigns.as_dict()
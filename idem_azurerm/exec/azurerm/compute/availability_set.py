@@ -34,17 +34,17 @@ Azure Resource Manager (ARM) Compute Availability Set Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.compute.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
     from msrestazure.tools import is_valid_resource_id
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.compute") is not None
 except ImportError:
     pass
 
@@ -72,7 +72,7 @@ async def create_or_update(hub, ctx, name, resource_group, **kwargs):
 
     """
     if "location" not in kwargs:
-        rg_props = await hub.exec.azurerm.resource.group.get(
+        rg_props = await hub.exec.azurerm.resource.group.get_location(
             ctx, resource_group, **kwargs
         )
 
@@ -107,7 +107,8 @@ async def create_or_update(hub, ctx, name, resource_group, **kwargs):
         return result
 
     try:
-        av_set = compconn.availability_sets.create_or_update(
+        av_set = await hub.exec.azurerm.utils.sdk_call(
+            compconn.availability_sets.create_or_update,
             resource_group_name=resource_group,
             availability_set_name=name,
             parameters=setmodel,
@@ -146,8 +147,10 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     result = False
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
-        compconn.availability_sets.delete(
-            resource_group_name=resource_group, availability_set_name=name
+        await hub.exec.azurerm.utils.sdk_call(
+            compconn.availability_sets.delete,
+            resource_group_name=resource_group,
+            availability_set_name=name,
         )
         result = True
 
@@ -177,8 +180,10 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     """
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
-        av_set = compconn.availability_sets.get(
-            resource_group_name=resource_group, availability_set_name=name
+        av_set = await hub.exec.azurerm.utils.sdk_call(
+            compconn.availability_sets.get,
+            resource_group_name=resource_group,
+            availability_set_name=name,
         )
         result = av_set.as_dict()
 
@@ -189,7 +194,7 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def list_(hub, ctx, resource_group, **kwargs):
+async def list_(hub, ctx, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -198,6 +203,9 @@ async def list_(hub, ctx, resource_group, **kwargs):
     :param resource_group: The resource group name to list availability
         sets within.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -208,11 +216,13 @@ async def list_(hub, ctx, resource_group, **kwargs):
     result = {}
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
-        avail_sets = await hub.exec.azurerm.utils.paged_object_to_list(
+        avail_sets = hub.exec.azurerm.utils.paged_object_iter(
             compconn.availability_sets.list(resource_group_name=resource_group)
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(avail_sets)
 
-        for avail_set in avail_sets:
+        async for avail_set in avail_sets:
             result[avail_set["name"]] = avail_set
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("compute", str(exc), **kwargs)
@@ -221,7 +231,7 @@ async def list_(hub, ctx, resource_group, **kwargs):
     return result
 
 
-async def list_available_sizes(hub, ctx, name, resource_group, **kwargs):
+async def list_available_sizes(hub, ctx, name, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -234,6 +244,9 @@ async def list_available_sizes(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name to list available
         availability set sizes within.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -244,13 +257,15 @@ async def list_available_sizes(hub, ctx, name, resource_group, **kwargs):
     result = {}
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
-        sizes = await hub.exec.azurerm.utils.paged_object_to_list(
+        sizes = hub.exec.azurerm.utils.paged_object_iter(
             compconn.availability_sets.list_available_sizes(
                 resource_group_name=resource_group, availability_set_name=name
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(sizes)
 
-        for size in sizes:
+        async for size in sizes:
             result[size["name"]] = size
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("compute", str(exc), **kwargs)
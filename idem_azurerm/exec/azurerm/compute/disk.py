@@ -34,17 +34,17 @@ Azure Resource Manager (ARM) Compute Disk Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.compute.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
     from msrestazure.tools import is_valid_resource_id
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.compute") is not None
 except ImportError:
     pass
 
@@ -71,7 +71,9 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     result = False
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
-        compconn.disks.delete(resource_group_name=resource_group, disk_name=name)
+        await hub.exec.azurerm.utils.sdk_call(
+            compconn.disks.delete, resource_group_name=resource_group, disk_name=name
+        )
         result = True
 
     except CloudError as exc:
@@ -34,17 +34,17 @@ Azure Resource Manager (ARM) Compute Image Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.compute.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
     from msrestazure.tools import is_valid_resource_id
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.compute") is not None
 except ImportError:
     pass
 
@@ -61,11 +61,14 @@ async def create_or_update(
     os_disk=None,
     data_disks=None,
     zone_resilient=False,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or update an image.
 
     :param name: The image to create.
@@ -86,6 +89,9 @@ async def create_or_update(
     :param zone_resilient: Specifies whether an image is zone resilient or not. Zone resilient images
         can be created only in regions that provide Zone Redundant Storage (ZRS).
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -94,7 +100,7 @@ async def create_or_update(
 
     """
     if "location" not in kwargs:
-        rg_props = await hub.exec.azurerm.resource.group.get(
+        rg_props = await hub.exec.azurerm.resource.group.get_location(
             ctx, resource_group, **kwargs
         )
 
@@ -176,11 +182,15 @@ async def create_or_update(
         return result
 
     try:
-        image = compconn.images.create_or_update(
-            resource_group_name=resource_group, image_name=name, parameters=imagemodel
+        image = await hub.exec.azurerm.utils.begin_operation(
+            compconn.images.create_or_update,
+            resource_group_name=resource_group,
+            image_name=name,
+            parameters=imagemodel,
         )
-        image.wait()
-        image_result = image.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(image)
+        image_result = await hub.exec.azurerm.utils.wait_for_operation(image)
         result = image_result.as_dict()
 
     except CloudError as exc:
@@ -214,7 +224,9 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     result = False
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
-        compconn.images.delete(resource_group_name=resource_group, image_name=name)
+        await hub.exec.azurerm.utils.sdk_call(
+            compconn.images.delete, resource_group_name=resource_group, image_name=name
+        )
         result = True
 
     except CloudError as exc:
@@ -242,7 +254,9 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     """
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
-        image = compconn.images.get(resource_group_name=resource_group, image_name=name)
+        image = await hub.exec.azurerm.utils.sdk_call(
+            compconn.images.get, resource_group_name=resource_group, image_name=name
+        )
         result = image.as_dict()
 
     except CloudError as exc:
@@ -252,7 +266,9 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def images_list_by_resource_group(hub, ctx, resource_group, **kwargs):
+async def images_list_by_resource_group(
+    hub, ctx, resource_group, stream=False, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
@@ -260,6 +276,9 @@ async def images_list_by_resource_group(hub, ctx, resource_group, **kwargs):
 
     :param resource_group: The resource group name to list images within.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -270,11 +289,13 @@ async def images_list_by_resource_group(hub, ctx, resource_group, **kwargs):
     result = {}
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
-        images = await hub.exec.azurerm.utils.paged_object_to_list(
+        images = hub.exec.azurerm.utils.paged_object_iter(
             compconn.images.list_by_resource_group(resource_group_name=resource_group)
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(images)
 
-        for image in images:
+        async for image in images:
             result[image["name"]] = image
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("compute", str(exc), **kwargs)
@@ -283,12 +304,15 @@ async def images_list_by_resource_group(hub, ctx, resource_group, **kwargs):
     return result
 
 
-async def images_list(hub, ctx, **kwargs):
+async def images_list(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
     List all images in a subscription.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -299,11 +323,11 @@ async def images_list(hub, ctx, **kwargs):
     result = {}
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
-        images = await hub.exec.azurerm.utils.paged_object_to_list(
-            compconn.images.list()
-        )
+        images = hub.exec.azurerm.utils.paged_object_iter(compconn.images.list())
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(images)
 
-        for image in images:
+        async for image in images:
             result[image["name"]] = image
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("compute", str(exc), **kwargs)
@@ -35,18 +35,18 @@ Azure Resource Manager (ARM) Compute Virtual Machine Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 import os
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.compute.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
     from msrestazure.tools import is_valid_resource_id, parse_resource_id
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.compute") is not None
 except ImportError:
     pass
 
@@ -100,6 +100,7 @@ async def create_or_update(
     disk_enc_volume_type=None,
     disk_enc_kek_url=None,
     data_disks=None,
+    no_wait=False,
     **kwargs,
 ):
     """
@@ -107,6 +108,8 @@ async def create_or_update(
 
     .. versionchanged:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or update a virtual machine.
 
     :param name: The virtual machine to create.
@@ -321,6 +324,9 @@ async def create_or_update(
             be nested under an "id" key in a dictionary as expected by the SDK. If a dictionary is provided, the
             "storage_account_type" parameter can be passed (accepts (Standard|Premium)_LRS or (Standard|Ultra)SSD_LRS).
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -329,7 +335,7 @@ async def create_or_update(
 
     """
     if "location" not in kwargs:
-        rg_props = await hub.exec.azurerm.resource.group.get(
+        rg_props = await hub.exec.azurerm.resource.group.get_location(
             ctx, resource_group, **kwargs
         )
 
@@ -620,12 +626,16 @@ async def create_or_update(
         return result
 
     try:
-        vm = compconn.virtual_machines.create_or_update(
-            resource_group_name=resource_group, vm_name=name, parameters=vmmodel
+        vm = await hub.exec.azurerm.utils.begin_operation(
+            compconn.virtual_machines.create_or_update,
+            resource_group_name=resource_group,
+            vm_name=name,
+            parameters=vmmodel,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(vm)
 
-        vm.wait()
-        vm_result = vm.result()
+        vm_result = await hub.exec.azurerm.utils.wait_for_operation(vm)
         result = vm_result.as_dict()
 
         # Extract connection auth values for virtual machine extensions
@@ -776,17 +786,25 @@ async def delete(
     cleanup_disks=False,
     cleanup_data_disks=False,
     cleanup_interfaces=False,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Delete a virtual machine.
 
     :param name: The virtual machine to delete.
 
     :param resource_group: The resource group name assigned to the virtual machine.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. This is ignored if any of
+        the cleanup options are set, since the virtual machine has to be deleted before its disks and interfaces.
+        Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -802,11 +820,16 @@ async def delete(
     )
 
     try:
-        poller = compconn.virtual_machines.delete(
-            resource_group_name=resource_group, vm_name=name
+        poller = await hub.exec.azurerm.utils.begin_operation(
+            compconn.virtual_machines.delete,
+            resource_group_name=resource_group,
+            vm_name=name,
         )
 
-        poller.wait()
+        if no_wait and not (cleanup_disks or cleanup_data_disks or cleanup_interfaces):
+            return await hub.exec.azurerm.utils.operation_handle(poller)
+
+        await hub.exec.azurerm.utils.wait_for_operation(poller)
 
         if cleanup_disks:
             os_disk = parse_resource_id(
@@ -876,11 +899,14 @@ async def capture(
     resource_group,
     prefix="capture-",
     overwrite=False,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Captures the VM by copying virtual hard disks of the VM and outputs
     a template that can be used to create similar VMs.
 
@@ -895,6 +921,9 @@ async def capture(
 
     :param overwrite: (Default: False) Overwrite the destination disk in case of conflict.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -910,7 +939,8 @@ async def capture(
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
         # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.capture(
+        vm = await hub.exec.azurerm.utils.begin_operation(
+            compconn.virtual_machines.capture,
             resource_group_name=resource_group,
             vm_name=name,
             parameters=VirtualMachineCaptureParameters(
@@ -919,8 +949,9 @@ async def capture(
                 overwrite_vhds=overwrite,
             ),
         )
-        vm.wait()
-        vm_result = vm.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(vm)
+        vm_result = await hub.exec.azurerm.utils.wait_for_operation(vm)
         result = vm_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("compute", str(exc), **kwargs)
@@ -953,8 +984,11 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
         # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.get(
-            resource_group_name=resource_group, vm_name=name, expand=expand
+        vm = await hub.exec.azurerm.utils.sdk_call(
+            compconn.virtual_machines.get,
+            resource_group_name=resource_group,
+            vm_name=name,
+            expand=expand,
         )
         result = vm.as_dict()
     except CloudError as exc:
@@ -965,11 +999,13 @@ async def get(hub, ctx, name, resource_group, **kwargs):
 
 
 async def convert_to_managed_disks(
-    hub, ctx, name, resource_group, **kwargs
+    hub, ctx, name, resource_group, no_wait=False, **kwargs
 ):  # pylint: disable=invalid-name
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Converts virtual machine disks from blob-based to managed disks. Virtual
     machine must be stop-deallocated before invoking this operation.
 
@@ -978,6 +1014,9 @@ async def convert_to_managed_disks(
     :param resource_group: The resource group name assigned to the
         virtual machine.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -988,11 +1027,14 @@ async def convert_to_managed_disks(
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
         # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.convert_to_managed_disks(
-            resource_group_name=resource_group, vm_name=name
+        vm = await hub.exec.azurerm.utils.begin_operation(
+            compconn.virtual_machines.convert_to_managed_disks,
+            resource_group_name=resource_group,
+            vm_name=name,
         )
-        vm.wait()
-        vm_result = vm.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(vm)
+        vm_result = await hub.exec.azurerm.utils.wait_for_operation(vm)
         result = vm_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("compute", str(exc), **kwargs)
@@ -1001,10 +1043,12 @@ async def convert_to_managed_disks(
     return result
 
 
-async def deallocate(hub, ctx, name, resource_group, **kwargs):
+async def deallocate(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Power off a virtual machine and deallocate compute resources.
 
     :param name: The name of the virtual machine to deallocate.
@@ -1012,6 +1056,9 @@ async def deallocate(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         virtual machine.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -1023,10 +1070,14 @@ async def deallocate(hub, ctx, name, resource_group, **kwargs):
     result = False
     try:
         # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.deallocate(
-            resource_group_name=resource_group, vm_name=name
+        vm = await hub.exec.azurerm.utils.begin_operation(
+            compconn.virtual_machines.deallocate,
+            resource_group_name=resource_group,
+            vm_name=name,
         )
-        vm.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(vm)
+        await hub.exec.azurerm.utils.wait_for_operation(vm)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("compute", str(exc), **kwargs)
@@ -1056,8 +1107,10 @@ async def generalize(hub, ctx, name, resource_group, **kwargs):
     result = False
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
-        compconn.virtual_machines.generalize(
-            resource_group_name=resource_group, vm_name=name
+        await hub.exec.azurerm.utils.sdk_call(
+            compconn.virtual_machines.generalize,
+            resource_group_name=resource_group,
+            vm_name=name,
         )
         result = True
     except CloudError as exc:
@@ -1066,7 +1119,7 @@ async def generalize(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def list_(hub, ctx, resource_group, **kwargs):
+async def list_(hub, ctx, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -1075,6 +1128,9 @@ async def list_(hub, ctx, resource_group, **kwargs):
     :param resource_group: The resource group name to list virtual
         machines within.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -1085,10 +1141,12 @@ async def list_(hub, ctx, resource_group, **kwargs):
     result = {}
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
-        vms = await hub.exec.azurerm.utils.paged_object_to_list(
+        vms = hub.exec.azurerm.utils.paged_object_iter(
             compconn.virtual_machines.list(resource_group_name=resource_group)
         )
-        for vm in vms:  # pylint: disable=invalid-name
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(vms)
+        async for vm in vms:  # pylint: disable=invalid-name
             result[vm["name"]] = vm
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("compute", str(exc), **kwargs)
@@ -1097,12 +1155,15 @@ async def list_(hub, ctx, resource_group, **kwargs):
     return result
 
 
-async def list_all(hub, ctx, **kwargs):
+async def list_all(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
     List all virtual machines within a subscription.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -1113,10 +1174,12 @@ async def list_all(hub, ctx, **kwargs):
     result = {}
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
-        vms = await hub.exec.azurerm.utils.paged_object_to_list(
+        vms = hub.exec.azurerm.utils.paged_object_iter(
             compconn.virtual_machines.list_all()
         )
-        for vm in vms:  # pylint: disable=invalid-name
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(vms)
+        async for vm in vms:  # pylint: disable=invalid-name
             result[vm["name"]] = vm
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("compute", str(exc), **kwargs)
@@ -1126,7 +1189,7 @@ async def list_all(hub, ctx, **kwargs):
 
 
 async def list_available_sizes(
-    hub, ctx, name, resource_group, **kwargs
+    hub, ctx, name, resource_group, stream=False, **kwargs
 ):  # pylint: disable=invalid-name
     """
     .. versionadded:: 1.0.0
@@ -1139,6 +1202,9 @@ async def list_available_sizes(
     :param resource_group: The resource group name assigned to the
         virtual machine.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -1149,12 +1215,14 @@ async def list_available_sizes(
     result = {}
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
-        sizes = await hub.exec.azurerm.utils.paged_object_to_list(
+        sizes = hub.exec.azurerm.utils.paged_object_iter(
             compconn.virtual_machines.list_available_sizes(
                 resource_group_name=resource_group, vm_name=name
             )
         )
-        for size in sizes:
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(sizes)
+        async for size in sizes:
             result[size["name"]] = size
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("compute", str(exc), **kwargs)
@@ -1163,10 +1231,12 @@ async def list_available_sizes(
     return result
 
 
-async def power_off(hub, ctx, name, resource_group, **kwargs):
+async def power_off(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Power off (stop) a virtual machine.
 
     :param name: The name of the virtual machine to stop.
@@ -1174,6 +1244,9 @@ async def power_off(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         virtual machine.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -1184,11 +1257,14 @@ async def power_off(hub, ctx, name, resource_group, **kwargs):
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
         # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.power_off(
-            resource_group_name=resource_group, vm_name=name
+        vm = await hub.exec.azurerm.utils.begin_operation(
+            compconn.virtual_machines.power_off,
+            resource_group_name=resource_group,
+            vm_name=name,
         )
-        vm.wait()
-        vm_result = vm.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(vm)
+        vm_result = await hub.exec.azurerm.utils.wait_for_operation(vm)
         result = vm_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("compute", str(exc), **kwargs)
@@ -1197,10 +1273,12 @@ async def power_off(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def restart(hub, ctx, name, resource_group, **kwargs):
+async def restart(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Restart a virtual machine.
 
     :param name: The name of the virtual machine to restart.
@@ -1208,6 +1286,9 @@ async def restart(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         virtual machine.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -1218,11 +1299,14 @@ async def restart(hub, ctx, name, resource_group, **kwargs):
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
         # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.restart(
-            resource_group_name=resource_group, vm_name=name
+        vm = await hub.exec.azurerm.utils.begin_operation(
+            compconn.virtual_machines.restart,
+            resource_group_name=resource_group,
+            vm_name=name,
         )
-        vm.wait()
-        vm_result = vm.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(vm)
+        vm_result = await hub.exec.azurerm.utils.wait_for_operation(vm)
         result = vm_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("compute", str(exc), **kwargs)
@@ -1231,10 +1315,12 @@ async def restart(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def start(hub, ctx, name, resource_group, **kwargs):
+async def start(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Power on (start) a virtual machine.
 
     :param name: The name of the virtual machine to start.
@@ -1242,6 +1328,9 @@ async def start(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         virtual machine.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -1252,11 +1341,14 @@ async def start(hub, ctx, name, resource_group, **kwargs):
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
         # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.start(
-            resource_group_name=resource_group, vm_name=name
+        vm = await hub.exec.azurerm.utils.begin_operation(
+            compconn.virtual_machines.start,
+            resource_group_name=resource_group,
+            vm_name=name,
         )
-        vm.wait()
-        vm_result = vm.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(vm)
+        vm_result = await hub.exec.azurerm.utils.wait_for_operation(vm)
         result = vm_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("compute", str(exc), **kwargs)
@@ -1265,10 +1357,12 @@ async def start(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def redeploy(hub, ctx, name, resource_group, **kwargs):
+async def redeploy(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Redeploy a virtual machine.
 
     :param name: The name of the virtual machine to redeploy.
@@ -1276,6 +1370,9 @@ async def redeploy(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         virtual machine.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -1286,11 +1383,14 @@ async def redeploy(hub, ctx, name, resource_group, **kwargs):
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
     try:
         # pylint: disable=invalid-name
-        vm = compconn.virtual_machines.redeploy(
-            resource_group_name=resource_group, vm_name=name
+        vm = await hub.exec.azurerm.utils.begin_operation(
+            compconn.virtual_machines.redeploy,
+            resource_group_name=resource_group,
+            vm_name=name,
         )
-        vm.wait()
-        vm_result = vm.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(vm)
+        vm_result = await hub.exec.azurerm.utils.wait_for_operation(vm)
         result = vm_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("compute", str(exc), **kwargs)
@@ -33,15 +33,15 @@ Azure Resource Manager (ARM) Compute Virtual Machine Extension Operations Execut
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.compute.models  # pylint: disable=unused-import
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.compute") is not None
 except ImportError:
     pass
 
@@ -61,11 +61,14 @@ async def create_or_update(
     extension_type,
     version,
     settings,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     The operation to create or update the extension.
 
     :param name: The name of the virtual machine extension.
@@ -85,6 +88,9 @@ async def create_or_update(
     :param settings: A dictionary representing the public settings for the extension. This dictionary will be
         utilized as JSON by the SDK operation..
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -114,15 +120,17 @@ async def create_or_update(
         return result
 
     try:
-        extension = compconn.virtual_machine_extensions.create_or_update(
+        extension = await hub.exec.azurerm.utils.begin_operation(
+            compconn.virtual_machine_extensions.create_or_update,
             vm_extension_name=name,
             vm_name=vm_name,
             resource_group_name=resource_group,
             extension_parameters=paramsmodel,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(extension)
 
-        extension.wait()
-        result = extension.result().as_dict()
+        result = (await hub.exec.azurerm.utils.wait_for_operation(extension)).as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("compute", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -130,10 +138,12 @@ async def create_or_update(
     return result
 
 
-async def delete(hub, ctx, name, vm_name, resource_group, **kwargs):
+async def delete(hub, ctx, name, vm_name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     The operation to delete the extension.
 
     :param name: The name of the virtual machine extension.
@@ -142,6 +152,9 @@ async def delete(hub, ctx, name, vm_name, resource_group, **kwargs):
 
     :param resource_group: The name of the resource group.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -153,11 +166,16 @@ async def delete(hub, ctx, name, vm_name, resource_group, **kwargs):
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
 
     try:
-        extension = compconn.virtual_machine_extensions.delete(
-            vm_extension_name=name, vm_name=vm_name, resource_group_name=resource_group
+        extension = await hub.exec.azurerm.utils.begin_operation(
+            compconn.virtual_machine_extensions.delete,
+            vm_extension_name=name,
+            vm_name=vm_name,
+            resource_group_name=resource_group,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(extension)
 
-        extension.wait()
+        await hub.exec.azurerm.utils.wait_for_operation(extension)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("compute", str(exc), **kwargs)
@@ -189,8 +207,11 @@ async def get(hub, ctx, name, vm_name, resource_group, **kwargs):
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
 
     try:
-        extension = compconn.virtual_machine_extensions.get(
-            vm_extension_name=name, vm_name=vm_name, resource_group_name=resource_group
+        extension = await hub.exec.azurerm.utils.sdk_call(
+            compconn.virtual_machine_extensions.get,
+            vm_extension_name=name,
+            vm_name=vm_name,
+            resource_group_name=resource_group,
         )
 
         result = extension.as_dict()
@@ -222,8 +243,10 @@ async def list_(hub, ctx, vm_name, resource_group, **kwargs):
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
 
     try:
-        extensions = compconn.virtual_machine_extensions.list(
-            vm_name=vm_name, resource_group_name=resource_group
+        extensions = await hub.exec.azurerm.utils.sdk_call(
+            compconn.virtual_machine_extensions.list,
+            vm_name=vm_name,
+            resource_group_name=resource_group,
         )
 
         extensions_as_list = extensions.as_dict().get("value", {})
@@ -33,15 +33,15 @@ Azure Resource Manager (ARM) Compute Virtual Machine Extension Image Operations
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.compute.models  # pylint: disable=unused-import
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.compute") is not None
 except ImportError:
     pass
 
@@ -73,7 +73,8 @@ async def get(hub, ctx, location, publisher, extension_type, version, **kwargs):
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
 
     try:
-        image = compconn.virtual_machine_extension_images.get(
+        image = await hub.exec.azurerm.utils.sdk_call(
+            compconn.virtual_machine_extension_images.get,
             location=location,
             publisher_name=publisher,
             version=version,
@@ -110,8 +111,10 @@ async def list_types(hub, ctx, location, publisher, **kwargs):
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
 
     try:
-        images = compconn.virtual_machine_extension_images.list_types(
-            location=location, publisher_name=publisher,
+        images = await hub.exec.azurerm.utils.sdk_call(
+            compconn.virtual_machine_extension_images.list_types,
+            location=location,
+            publisher_name=publisher,
         )
 
         for image in images:
@@ -147,8 +150,11 @@ async def list_versions(hub, ctx, location, publisher, extension_type, **kwargs)
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
 
     try:
-        images = compconn.virtual_machine_extension_images.list_versions(
-            location=location, publisher_name=publisher, type=extension_type
+        images = await hub.exec.azurerm.utils.sdk_call(
+            compconn.virtual_machine_extension_images.list_versions,
+            location=location,
+            publisher_name=publisher,
+            type=extension_type,
         )
 
         for image in images:
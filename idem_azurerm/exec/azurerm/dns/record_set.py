@@ -34,16 +34,16 @@ Azure Resource Manager (ARM) DNS Record Set Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.dns.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.dns") is not None
 except ImportError:
     pass
 
@@ -89,7 +89,8 @@ async def create_or_update(
         return result
 
     try:
-        record_set = dnsconn.record_sets.create_or_update(
+        record_set = await hub.exec.azurerm.utils.sdk_call(
+            dnsconn.record_sets.create_or_update,
             relative_record_set_name=name,
             zone_name=zone_name,
             resource_group_name=resource_group,
@@ -136,7 +137,8 @@ async def delete(hub, ctx, name, zone_name, resource_group, record_type, **kwarg
     result = False
     dnsconn = await hub.exec.azurerm.utils.get_client(ctx, "dns", **kwargs)
     try:
-        record_set = dnsconn.record_sets.delete(
+        record_set = await hub.exec.azurerm.utils.sdk_call(
+            dnsconn.record_sets.delete,
             relative_record_set_name=name,
             zone_name=zone_name,
             resource_group_name=resource_group,
@@ -174,7 +176,8 @@ async def get(hub, ctx, name, zone_name, resource_group, record_type, **kwargs):
     """
     dnsconn = await hub.exec.azurerm.utils.get_client(ctx, "dns", **kwargs)
     try:
-        record_set = dnsconn.record_sets.get(
+        record_set = await hub.exec.azurerm.utils.sdk_call(
+            dnsconn.record_sets.get,
             relative_record_set_name=name,
             zone_name=zone_name,
             resource_group_name=resource_group,
@@ -197,6 +200,7 @@ async def list_by_type(
     record_type,
     top=None,
     recordsetnamesuffix=None,
+    stream=False,
     **kwargs,
 ):
     """
@@ -217,6 +221,9 @@ async def list_by_type(
     :param recordsetnamesuffix: The suffix label of the record set name that has
     to be used to filter the record set enumerations.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -227,7 +234,7 @@ async def list_by_type(
     result = {}
     dnsconn = await hub.exec.azurerm.utils.get_client(ctx, "dns", **kwargs)
     try:
-        record_sets = await hub.exec.azurerm.utils.paged_object_to_list(
+        record_sets = hub.exec.azurerm.utils.paged_object_iter(
             dnsconn.record_sets.list_by_type(
                 zone_name=zone_name,
                 resource_group_name=resource_group,
@@ -236,8 +243,10 @@ async def list_by_type(
                 recordsetnamesuffix=recordsetnamesuffix,
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(record_sets)
 
-        for record_set in record_sets:
+        async for record_set in record_sets:
             result[record_set["name"]] = record_set
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("dns", str(exc), **kwargs)
@@ -247,7 +256,14 @@ async def list_by_type(
 
 
 async def list_by_dns_zone(
-    hub, ctx, zone_name, resource_group, top=None, recordsetnamesuffix=None, **kwargs
+    hub,
+    ctx,
+    zone_name,
+    resource_group,
+    top=None,
+    recordsetnamesuffix=None,
+    stream=False,
+    **kwargs,
 ):
     """
     .. versionadded:: 1.0.0
@@ -264,6 +280,9 @@ async def list_by_dns_zone(
     :param recordsetnamesuffix: The suffix label of the record set name that has
     to be used to filter the record set enumerations.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -274,7 +293,7 @@ async def list_by_dns_zone(
     result = {}
     dnsconn = await hub.exec.azurerm.utils.get_client(ctx, "dns", **kwargs)
     try:
-        record_sets = await hub.exec.azurerm.utils.paged_object_to_list(
+        record_sets = hub.exec.azurerm.utils.paged_object_iter(
             dnsconn.record_sets.list_by_dns_zone(
                 zone_name=zone_name,
                 resource_group_name=resource_group,
@@ -282,8 +301,10 @@ async def list_by_dns_zone(
                 recordsetnamesuffix=recordsetnamesuffix,
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(record_sets)
 
-        for record_set in record_sets:
+        async for record_set in record_sets:
             result[record_set["name"]] = record_set
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("dns", str(exc), **kwargs)
@@ -34,16 +34,16 @@ Azure Resource Manager (ARM) DNS Zone Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.dns.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.dns") is not None
 except ImportError:
     pass
 
@@ -96,7 +96,8 @@ async def create_or_update(hub, ctx, name, resource_group, **kwargs):
         return result
 
     try:
-        zone = dnsconn.zones.create_or_update(
+        zone = await hub.exec.azurerm.utils.sdk_call(
+            dnsconn.zones.create_or_update,
             zone_name=name,
             resource_group_name=resource_group,
             parameters=zone_model,
@@ -115,16 +116,21 @@ async def create_or_update(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def delete(hub, ctx, name, resource_group, **kwargs):
+async def delete(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Delete a DNS zone within a resource group.
 
     :param name: The name of the DNS zone to delete.
 
     :param resource_group: The name of the resource group.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -135,12 +141,15 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     result = False
     dnsconn = await hub.exec.azurerm.utils.get_client(ctx, "dns", **kwargs)
     try:
-        zone = dnsconn.zones.delete(
+        zone = await hub.exec.azurerm.utils.begin_operation(
+            dnsconn.zones.delete,
             zone_name=name,
             resource_group_name=resource_group,
             if_match=kwargs.get("if_match"),
         )
-        zone.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(zone)
+        await hub.exec.azurerm.utils.wait_for_operation(zone)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("dns", str(exc), **kwargs)
@@ -168,7 +177,9 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     """
     dnsconn = await hub.exec.azurerm.utils.get_client(ctx, "dns", **kwargs)
     try:
-        zone = dnsconn.zones.get(zone_name=name, resource_group_name=resource_group)
+        zone = await hub.exec.azurerm.utils.sdk_call(
+            dnsconn.zones.get, zone_name=name, resource_group_name=resource_group
+        )
         result = zone.as_dict()
 
     except CloudError as exc:
@@ -178,7 +189,9 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def list_by_resource_group(hub, ctx, resource_group, top=None, **kwargs):
+async def list_by_resource_group(
+    hub, ctx, resource_group, top=None, stream=False, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
@@ -189,6 +202,9 @@ async def list_by_resource_group(hub, ctx, resource_group, top=None, **kwargs):
     :param top: The maximum number of DNS zones to return. If not specified,
     returns up to 100 zones.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -199,13 +215,15 @@ async def list_by_resource_group(hub, ctx, resource_group, top=None, **kwargs):
     result = {}
     dnsconn = await hub.exec.azurerm.utils.get_client(ctx, "dns", **kwargs)
     try:
-        zones = await hub.exec.azurerm.utils.paged_object_to_list(
+        zones = hub.exec.azurerm.utils.paged_object_iter(
             dnsconn.zones.list_by_resource_group(
                 resource_group_name=resource_group, top=top
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(zones)
 
-        for zone in zones:
+        async for zone in zones:
             result[zone["name"]] = zone
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("dns", str(exc), **kwargs)
@@ -214,7 +232,7 @@ async def list_by_resource_group(hub, ctx, resource_group, top=None, **kwargs):
     return result
 
 
-async def list_(hub, ctx, top=None, **kwargs):
+async def list_(hub, ctx, top=None, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -223,6 +241,9 @@ async def list_(hub, ctx, top=None, **kwargs):
     :param top: The maximum number of DNS zones to return. If not specified,
     returns up to 100 zones.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -233,11 +254,11 @@ async def list_(hub, ctx, top=None, **kwargs):
     result = {}
     dnsconn = await hub.exec.azurerm.utils.get_client(ctx, "dns", **kwargs)
     try:
-        zones = await hub.exec.azurerm.utils.paged_object_to_list(
-            dnsconn.zones.list(top=top)
-        )
+        zones = hub.exec.azurerm.utils.paged_object_iter(dnsconn.zones.list(top=top))
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(zones)
 
-        for zone in zones:
+        async for zone in zones:
             result[zone["name"]] = zone
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("dns", str(exc), **kwargs)
@@ -70,5 +70,6 @@ async def get(hub, ctx, **kwargs):
     graph_client = GraphRbacManagementClient(
         credentials=credentials, tenant_id=credentials._tenant
     )
+    await hub.exec.azurerm.utils.share_connection_pool(graph_client)
 
     return graph_client
@@ -84,7 +84,9 @@ async def list_(hub, ctx, sp_filter=None, **kwargs):
     )
 
     try:
-        spns = graphconn.service_principals.list(filter=sp_filter)
+        spns = await hub.exec.azurerm.utils.sdk_call(
+            list, graphconn.service_principals.list(filter=sp_filter)
+        )
         for spn in spns:
             result[spn.object_id] = spn.as_dict()
     except (AttributeError, GraphErrorException, HttpResponseError) as exc:
@@ -84,7 +84,9 @@ async def list_(hub, ctx, user_filter=None, **kwargs):
     )
 
     try:
-        users = graphconn.users.list(filter=user_filter)
+        users = await hub.exec.azurerm.utils.sdk_call(
+            list, graphconn.users.list(filter=user_filter)
+        )
         for user in users:
             result[user.object_id] = user.as_dict()
     except (AttributeError, GraphErrorException, HttpResponseError) as exc:
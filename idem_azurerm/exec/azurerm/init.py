@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Azure Resource Manager (ARM) Execution Module Initialization
+
+.. versionadded:: 2.4.0
+
+:maintainer: <devops@eitr.tech>
+:configuration: Process-wide tunables for the azurerm execution modules can be set with the environment variables
+    listed below. The values are read once when the hub loads the ``exec.azurerm`` subsystem and can also be changed
+    on the hub afterwards.
+
+    * ``AZURERM_CLIENT_POOL_SIZE``: The maximum number of management clients kept warm in the client pool
+      (default: ``64``).
+    * ``AZURERM_DATA_PLANE_POOL_SIZE``: The maximum number of data plane clients, such as Key Vault secret clients,
+      kept in the data plane client pool (default: ``32``).
+    * ``AZURERM_TOKEN_REFRESH_MARGIN``: The number of seconds before expiry at which a cached token is proactively
+      renewed (default: ``300``).
+    * ``AZURERM_THREAD_POOL_SIZE``: The number of worker threads used to run blocking Azure SDK calls off the event
+      loop, which bounds how many SDK calls can be waiting on the network at once (default: ``16``).
+    * ``AZURERM_CLOUD_METADATA_CACHE``: The path of a file used to cache clouds resolved from a metadata endpoint URL
+      passed as ``cloud_environment`` between runs (default: disabled).
+    * ``AZURERM_CLOUD_METADATA_TTL``: The number of seconds that clouds cached on disk remain valid
+      (default: ``86400``).
+    * ``AZURERM_RATELIMIT_LOW_WATERMARK``: The number of remaining subscription reads or writes reported by ARM below
+      which fewer SDK calls are run against the subscription at once (default: ``100``).
+    * ``AZURERM_HTTP_POOL_CONNECTIONS``: The number of hosts for which connections are kept in the shared HTTP
+      connection pools (default: ``10``).
+    * ``AZURERM_HTTP_POOL_MAXSIZE``: The maximum number of connections kept open to each host (default: ``32``).
+    * ``AZURERM_HTTP_KEEP_ALIVE``: Set to ``false`` to close connections after each request instead of reusing them
+      (default: ``true``).
+    * ``AZURERM_HTTP_CONNECT_TIMEOUT``: The number of seconds to wait for a connection to be established
+      (default: ``30``).
+    * ``AZURERM_HTTP_READ_TIMEOUT``: The number of seconds to wait for a response (default: ``100``).
+    * ``AZURERM_RESOURCE_CACHE_TTL``: The number of seconds for which resources fetched by ``get`` calls are served from
+      the resource cache of the run, along with the collections listed up front by test runs. Writes to a resource
+      evict it from the cache right away. Set to ``0`` to disable the cache (default: ``60``).
+    * ``AZURERM_NOT_FOUND_TTL``: The number of seconds for which ``get`` calls for a resource which was not found fail
+      without another request. Creating the resource ends this right away. Set to ``0`` to disable (default: ``15``).
+    * ``AZURERM_CALL_LOG_SIZE``: The number of most recent SDK calls whose individual records are kept along with the
+      aggregated call metrics (default: ``1000``).
+    * ``AZURERM_CALL_METRICS_FILE``: The path of a file to which the call metrics are written as JSON when the process
+      exits (default: disabled).
+
+"""
+# Python libs
+import atexit
+import collections
+import json
+import os
+
+
+def __init__(hub):
+    # Management clients keyed by (client_type, credential identity, subscription_id, cloud endpoint)
+    hub.exec.azurerm.CLIENT_POOL = collections.OrderedDict()
+    hub.exec.azurerm.CLIENT_POOL_SIZE = int(
+        os.environ.get("AZURERM_CLIENT_POOL_SIZE", 64)
+    )
+
+    # Credentials keyed by (credential identity, resource, authority) and the ADAL token cache they all share
+    hub.exec.azurerm.CREDENTIAL_CACHE = {}
+    hub.exec.azurerm.TOKEN_CACHE = None
+    hub.exec.azurerm.TOKEN_REFRESH_MARGIN = int(
+        os.environ.get("AZURERM_TOKEN_REFRESH_MARGIN", 300)
+    )
+
+    # azure-identity credentials for data plane clients keyed by (credential identity, authority)
+    hub.exec.azurerm.IDENTITY_CREDENTIALS = {}
+
+    # Data plane clients keyed by (client class, vault URL, credential identity, cloud environment)
+    hub.exec.azurerm.DATA_PLANE_CLIENTS = collections.OrderedDict()
+    hub.exec.azurerm.DATA_PLANE_POOL_SIZE = int(
+        os.environ.get("AZURERM_DATA_PLANE_POOL_SIZE", 32)
+    )
+
+    # Shared thread pool for blocking SDK calls, created on first use
+    hub.exec.azurerm.EXECUTOR = None
+    hub.exec.azurerm.THREAD_POOL_SIZE = int(
+        os.environ.get("AZURERM_THREAD_POOL_SIZE", 16)
+    )
+
+    # Clouds resolved from metadata endpoints, keyed by endpoint URL
+    hub.exec.azurerm.CLOUD_CACHE = {}
+    hub.exec.azurerm.CLOUD_METADATA_CACHE_FILE = os.environ.get(
+        "AZURERM_CLOUD_METADATA_CACHE"
+    )
+    hub.exec.azurerm.CLOUD_METADATA_TTL = int(
+        os.environ.get("AZURERM_CLOUD_METADATA_TTL", 86400)
+    )
+
+    # Model classes and attribute plans used by create_object_model, keyed by (module_name, object_name)
+    hub.exec.azurerm.MODEL_BUILDERS = {}
+
+    # Request quota and concurrency governors keyed by subscription ID
+    hub.exec.azurerm.RATE_GOVERNORS = {}
+    hub.exec.azurerm.RATELIMIT_LOW_WATERMARK = int(
+        os.environ.get("AZURERM_RATELIMIT_LOW_WATERMARK", 100)
+    )
+
+    # HTTP sessions shared by all clients, created on first use
+    hub.exec.azurerm.HTTP_SESSIONS = {}
+    hub.exec.azurerm.HTTP_POOL_CONNECTIONS = int(
+        os.environ.get("AZURERM_HTTP_POOL_CONNECTIONS", 10)
+    )
+    hub.exec.azurerm.HTTP_POOL_MAXSIZE = int(
+        os.environ.get("AZURERM_HTTP_POOL_MAXSIZE", 32)
+    )
+    hub.exec.azurerm.HTTP_KEEP_ALIVE = os.environ.get(
+        "AZURERM_HTTP_KEEP_ALIVE", "true"
+    ).lower() not in ("0", "false", "no")
+    hub.exec.azurerm.HTTP_CONNECT_TIMEOUT = float(
+        os.environ.get("AZURERM_HTTP_CONNECT_TIMEOUT", 30)
+    )
+    hub.exec.azurerm.HTTP_READ_TIMEOUT = float(
+        os.environ.get("AZURERM_HTTP_READ_TIMEOUT", 100)
+    )
+
+    # Resources fetched by get calls, keyed by (endpoint, lowercase resource ID)
+    hub.exec.azurerm.RESOURCE_CACHE = {}
+    hub.exec.azurerm.RESOURCE_CACHE_TTL = float(
+        os.environ.get("AZURERM_RESOURCE_CACHE_TTL", 60)
+    )
+
+    # Not found responses of get calls, keyed by (endpoint, lowercase resource ID)
+    hub.exec.azurerm.NOT_FOUND = {}
+    hub.exec.azurerm.NOT_FOUND_TTL = float(os.environ.get("AZURERM_NOT_FOUND_TTL", 15))
+
+    # Resource group locations keyed by (endpoint, lowercase resource group ID) and the listings which filled them,
+    # keyed by (endpoint, subscription ID)
+    hub.exec.azurerm.RESOURCE_GROUP_LOCATIONS = {}
+    hub.exec.azurerm.RESOURCE_GROUP_LISTINGS = {}
+
+    # Snapshots of listed collections keyed by (endpoint, lowercase collection ID), and the prefetches which listed
+    # them keyed by the name of the idem run
+    hub.exec.azurerm.RESOURCE_SNAPSHOTS = {}
+    hub.exec.azurerm.PREFETCHED_RUNS = {}
+
+    # Pollers of long-running operations which were not waited for, keyed by the operation ID of their handle
+    hub.exec.azurerm.OPERATIONS = {}
+
+    # Get calls in flight, keyed by (service client, operation, resource cache key, arguments)
+    hub.exec.azurerm.IN_FLIGHT = {}
+
+    # Metrics aggregated per SDK operation and a log of the most recent calls
+    hub.exec.azurerm.CALL_METRICS = {}
+    hub.exec.azurerm.CALL_LOG = collections.deque(
+        maxlen=int(os.environ.get("AZURERM_CALL_LOG_SIZE", 1000))
+    )
+    metrics_file = os.environ.get("AZURERM_CALL_METRICS_FILE")
+    if metrics_file:
+        atexit.register(_write_call_metrics, hub, metrics_file)
+
+
+def _write_call_metrics(hub, path):
+    with open(path, "w") as metrics_fh:
+        json.dump(
+            {
+                "operations": hub.exec.azurerm.CALL_METRICS,
+                "calls": list(hub.exec.azurerm.CALL_LOG),
+            },
+            metrics_fh,
+            indent=2,
+        )
@@ -64,13 +64,16 @@ async def get_key_client(hub, ctx, vault_url, **kwargs):
     """
     .. versionadded:: 2.0.0
 
-    Load the key client and return a KeyClient object.
+    .. versionchanged:: 2.4.0
+
+    Load the key client and return a KeyClient object. The client is reused by later calls for the same vault and
+    identity.
 
     :param vault_url: The URL of the vault that the client will access.
     """
-    credential = await hub.exec.azurerm.utils.get_identity_credentials(ctx, **kwargs)
-
-    key_client = KeyClient(vault_url=vault_url, credential=credential)
+    key_client = await hub.exec.azurerm.utils.get_data_plane_client(
+        ctx, KeyClient, vault_url, **kwargs
+    )
 
     return key_client
 
@@ -134,7 +137,7 @@ async def backup_key(hub, ctx, name, vault_url, **kwargs):
     kconn = await hub.exec.azurerm.keyvault.key.get_key_client(ctx, vault_url, **kwargs)
 
     try:
-        backup = kconn.backup_key(name=name,)
+        backup = await hub.exec.azurerm.utils.sdk_call(kconn.backup_key, name=name,)
 
         result = backup
     except (KeyVaultErrorException, ResourceNotFoundError) as exc:
@@ -166,9 +169,11 @@ async def begin_delete_key(hub, ctx, name, vault_url, **kwargs):
     kconn = await hub.exec.azurerm.keyvault.key.get_key_client(ctx, vault_url, **kwargs)
 
     try:
-        key = kconn.begin_delete_key(name=name,)
+        key = await hub.exec.azurerm.utils.begin_operation(
+            kconn.begin_delete_key, name=name,
+        )
 
-        result = _key_as_dict(key.result())
+        result = _key_as_dict(await hub.exec.azurerm.utils.wait_for_operation(key))
     except (KeyVaultErrorException, ResourceNotFoundError) as exc:
         result = {"error": str(exc)}
 
@@ -199,9 +204,11 @@ async def begin_recover_deleted_key(hub, ctx, name, vault_url, **kwargs):
     kconn = await hub.exec.azurerm.keyvault.key.get_key_client(ctx, vault_url, **kwargs)
 
     try:
-        key = kconn.begin_recover_deleted_key(name=name,)
+        key = await hub.exec.azurerm.utils.begin_operation(
+            kconn.begin_recover_deleted_key, name=name,
+        )
 
-        result = _key_as_dict(key.result())
+        result = _key_as_dict(await hub.exec.azurerm.utils.wait_for_operation(key))
     except (KeyVaultErrorException, HttpResponseError) as exc:
         result = {"error": str(exc)}
 
@@ -254,7 +261,8 @@ async def create_ec_key(
     kconn = await hub.exec.azurerm.keyvault.key.get_key_client(ctx, vault_url, **kwargs)
 
     try:
-        key = kconn.create_ec_key(
+        key = await hub.exec.azurerm.utils.sdk_call(
+            kconn.create_ec_key,
             name=name,
             key_operations=key_ops,
             enabled=enabled,
@@ -322,7 +330,8 @@ async def create_key(
         key_type = key_type.upper().replace("_", "-")
 
     try:
-        key = kconn.create_key(
+        key = await hub.exec.azurerm.utils.sdk_call(
+            kconn.create_key,
             name=name,
             key_type=key_type,
             enabled=enabled,
@@ -385,7 +394,8 @@ async def create_rsa_key(
     kconn = await hub.exec.azurerm.keyvault.key.get_key_client(ctx, vault_url, **kwargs)
 
     try:
-        key = kconn.create_rsa_key(
+        key = await hub.exec.azurerm.utils.sdk_call(
+            kconn.create_rsa_key,
             name=name,
             key_operations=key_ops,
             enabled=enabled,
@@ -422,7 +432,7 @@ async def get_deleted_key(hub, ctx, name, vault_url, **kwargs):
     kconn = await hub.exec.azurerm.keyvault.key.get_key_client(ctx, vault_url, **kwargs)
 
     try:
-        key = kconn.get_deleted_key(name=name,)
+        key = await hub.exec.azurerm.utils.sdk_call(kconn.get_deleted_key, name=name,)
 
         result = _key_as_dict(key)
     except (KeyVaultErrorException, ResourceNotFoundError) as exc:
@@ -455,7 +465,9 @@ async def get_key(hub, ctx, name, vault_url, version=None, **kwargs):
     kconn = await hub.exec.azurerm.keyvault.key.get_key_client(ctx, vault_url, **kwargs)
 
     try:
-        key = kconn.get_key(name=name, version=version,)
+        key = await hub.exec.azurerm.utils.sdk_call(
+            kconn.get_key, name=name, version=version,
+        )
 
         result = _key_as_dict(key)
     except (KeyVaultErrorException, ResourceNotFoundError) as exc:
@@ -538,7 +550,9 @@ async def import_key(hub, ctx, name, vault_url, **kwargs):
         return result
 
     try:
-        key = kconn.import_key(name=name, key=keymodel,)
+        key = await hub.exec.azurerm.utils.sdk_call(
+            kconn.import_key, name=name, key=keymodel,
+        )
 
         result = _key_as_dict(key)
     except (KeyVaultErrorException, ResourceNotFoundError) as exc:
@@ -566,7 +580,9 @@ async def list_(hub, ctx, vault_url, **kwargs):
     kconn = await hub.exec.azurerm.keyvault.key.get_key_client(ctx, vault_url, **kwargs)
 
     try:
-        keys = kconn.list_properties_of_keys()
+        keys = await hub.exec.azurerm.utils.sdk_call(
+            list, kconn.list_properties_of_keys()
+        )
 
         for key in keys:
             result[key.name] = _key_properties_as_dict(key)
@@ -597,7 +613,9 @@ async def list_properties_of_key_versions(hub, ctx, name, vault_url, **kwargs):
     kconn = await hub.exec.azurerm.keyvault.key.get_key_client(ctx, vault_url, **kwargs)
 
     try:
-        keys = kconn.list_properties_of_key_versions(name=name,)
+        keys = await hub.exec.azurerm.utils.sdk_call(
+            list, kconn.list_properties_of_key_versions(name=name,)
+        )
 
         for key in keys:
             result[key.name] = _key_properties_as_dict(key)
@@ -627,7 +645,7 @@ async def list_deleted_keys(hub, ctx, vault_url, **kwargs):
     kconn = await hub.exec.azurerm.keyvault.key.get_key_client(ctx, vault_url, **kwargs)
 
     try:
-        keys = kconn.list_deleted_keys()
+        keys = await hub.exec.azurerm.utils.sdk_call(list, kconn.list_deleted_keys())
 
         for key in keys:
             result[key.name] = _key_as_dict(key)
@@ -661,7 +679,7 @@ async def purge_deleted_key(hub, ctx, name, vault_url, **kwargs):
     kconn = await hub.exec.azurerm.keyvault.key.get_key_client(ctx, vault_url, **kwargs)
 
     try:
-        key = kconn.purge_deleted_key(name=name,)
+        key = await hub.exec.azurerm.utils.sdk_call(kconn.purge_deleted_key, name=name,)
 
         result = True
     except (KeyVaultErrorException, HttpResponseError) as exc:
@@ -693,7 +711,9 @@ async def restore_key_backup(hub, ctx, backup, vault_url, **kwargs):
     kconn = await hub.exec.azurerm.keyvault.key.get_key_client(ctx, vault_url, **kwargs)
 
     try:
-        key = kconn.restore_key_backup(backup=backup,)
+        key = await hub.exec.azurerm.utils.sdk_call(
+            kconn.restore_key_backup, backup=backup,
+        )
 
         result = _key_as_dict(key)
     except (KeyVaultErrorException, ResourceExistsError, SerializationError) as exc:
@@ -748,7 +768,8 @@ async def update_key_properties(
     kconn = await hub.exec.azurerm.keyvault.key.get_key_client(ctx, vault_url, **kwargs)
 
     try:
-        key = kconn.update_key_properties(
+        key = await hub.exec.azurerm.utils.sdk_call(
+            kconn.update_key_properties,
             name=name,
             version=version,
             enabled=enabled,
@@ -32,6 +32,7 @@ Azure Resource Manager (ARM) Key Vault Secret Execution Module
 
 """
 # Python libs
+import asyncio
 import datetime
 import logging
 
@@ -40,6 +41,7 @@ HAS_LIBS = False
 try:
     from azure.keyvault.secrets import SecretClient
     from azure.core.exceptions import (
+        AzureError,
         ResourceNotFoundError,
         HttpResponseError,
         ResourceExistsError,
@@ -65,14 +67,15 @@ async def get_secret_client(hub, ctx, vault_url, **kwargs):
     """
     .. versionadded:: 2.4.0
 
-    Load the secret client and return a SecretClient object.
+    Load the secret client and return a SecretClient object. Clients are pooled, so calls for the same vault and
+    identity share one client.
 
     :param vault_url: The URL of the vault that the client will access.
 
     """
-    credential = await hub.exec.azurerm.utils.get_identity_credentials(ctx, **kwargs)
-
-    secret_client = SecretClient(vault_url=vault_url, credential=credential)
+    secret_client = await hub.exec.azurerm.utils.get_data_plane_client(
+        ctx, SecretClient, vault_url, **kwargs
+    )
 
     return secret_client
 
@@ -151,7 +154,7 @@ async def backup_secret(hub, ctx, name, vault_url, **kwargs):
     )
 
     try:
-        result = sconn.backup_secret(name=name,)
+        result = await hub.exec.azurerm.utils.sdk_call(sconn.backup_secret, name=name,)
     except ResourceNotFoundError as exc:
         result = {"error": str(exc)}
 
@@ -185,10 +188,12 @@ async def delete_secret(hub, ctx, name, vault_url, wait=False, **kwargs):
     )
 
     try:
-        secret = sconn.begin_delete_secret(name=name,)
+        secret = await hub.exec.azurerm.utils.begin_operation(
+            sconn.begin_delete_secret, name=name,
+        )
 
         if wait:
-            secret.wait()
+            await hub.exec.azurerm.utils.wait_for_operation(secret)
 
         result = True
     except ResourceNotFoundError as exc:
@@ -227,10 +232,12 @@ async def recover_deleted_secret(hub, ctx, name, vault_url, wait=False, **kwargs
     )
 
     try:
-        secret = sconn.begin_recover_deleted_secret(name=name,)
+        secret = await hub.exec.azurerm.utils.begin_operation(
+            sconn.begin_recover_deleted_secret, name=name,
+        )
 
         if wait:
-            secret.wait()
+            await hub.exec.azurerm.utils.wait_for_operation(secret)
 
         result = True
     except HttpResponseError as exc:
@@ -262,7 +269,9 @@ async def get_deleted_secret(hub, ctx, name, vault_url, **kwargs):
     )
 
     try:
-        secret = sconn.get_deleted_secret(name=name,)
+        secret = await hub.exec.azurerm.utils.sdk_call(
+            sconn.get_deleted_secret, name=name,
+        )
 
         result = _secret_as_dict(secret)
     except ResourceNotFoundError as exc:
@@ -297,7 +306,9 @@ async def get_secret(hub, ctx, name, vault_url, version=None, **kwargs):
     )
 
     try:
-        secret = sconn.get_secret(name=name, version=version,)
+        secret = await hub.exec.azurerm.utils.sdk_call(
+            sconn.get_secret, name=name, version=version,
+        )
 
         result = _secret_as_dict(secret)
     except (HttpResponseError, ResourceNotFoundError) as exc:
@@ -306,6 +317,48 @@ async def get_secret(hub, ctx, name, vault_url, version=None, **kwargs):
     return result
 
 
+async def get_secrets(hub, ctx, names, vault_url, max_concurrency=10, **kwargs):
+    """
+    .. versionadded:: 2.4.0
+
+    Get the latest version of many secrets at once. Requires the secrets/get permission. The secrets are fetched
+    concurrently, and each secret which can't be fetched is reported with its own error.
+
+    :param names: A list of the names of the secrets to get.
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    :param max_concurrency: The maximum number of secrets fetched at the same time. Defaults to 10.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.keyvault.secret.get_secrets '["secret1", "secret2"]' https://myvault.vault.azure.net/
+
+    """
+    sconn = await hub.exec.azurerm.keyvault.secret.get_secret_client(
+        ctx, vault_url, **kwargs
+    )
+    limit = asyncio.Semaphore(max(int(max_concurrency), 1))
+
+    async def get(name):
+        async with limit:
+            try:
+                secret = await hub.exec.azurerm.utils.sdk_call(
+                    sconn.get_secret, name=name,
+                )
+                return _secret_as_dict(secret)
+            except AzureError as exc:
+                # any failure, including those of the connection, only affects its own secret
+                return {"error": str(exc)}
+
+    names = list(dict.fromkeys(names))
+    results = await asyncio.gather(*[get(name) for name in names])
+
+    return dict(zip(names, results))
+
+
 async def list_deleted_secrets(hub, ctx, vault_url, **kwargs):
     """
     .. versionadded:: 2.4.0
@@ -327,7 +380,9 @@ async def list_deleted_secrets(hub, ctx, vault_url, **kwargs):
     )
 
     try:
-        secrets = sconn.list_deleted_secrets()
+        secrets = await hub.exec.azurerm.utils.sdk_call(
+            list, sconn.list_deleted_secrets()
+        )
 
         for secret in secrets:
             result[secret.name] = _secret_as_dict(secret)
@@ -362,7 +417,9 @@ async def list_properties_of_secret_versions(hub, ctx, name, vault_url, **kwargs
     )
 
     try:
-        secrets = sconn.list_properties_of_secret_versions(name=name,)
+        secrets = await hub.exec.azurerm.utils.sdk_call(
+            list, sconn.list_properties_of_secret_versions(name=name,)
+        )
 
         for secret in secrets:
             result[secret.name] = _secret_properties_as_dict(secret)
@@ -395,7 +452,9 @@ async def list_properties_of_secrets(hub, ctx, vault_url, **kwargs):
     )
 
     try:
-        secrets = sconn.list_properties_of_secrets()
+        secrets = await hub.exec.azurerm.utils.sdk_call(
+            list, sconn.list_properties_of_secrets()
+        )
 
         for secret in secrets:
             result[secret.name] = _secret_properties_as_dict(secret)
@@ -434,7 +493,9 @@ async def purge_deleted_secret(hub, ctx, name, vault_url, **kwargs):
     )
 
     try:
-        secret = sconn.purge_deleted_secret(name=name,)
+        secret = await hub.exec.azurerm.utils.sdk_call(
+            sconn.purge_deleted_secret, name=name,
+        )
 
         result = True
     except HttpResponseError as exc:
@@ -468,7 +529,9 @@ async def restore_secret_backup(hub, ctx, backup, vault_url, **kwargs):
     )
 
     try:
-        secret = sconn.restore_secret_backup(backup=backup,)
+        secret = await hub.exec.azurerm.utils.sdk_call(
+            sconn.restore_secret_backup, backup=backup,
+        )
 
         result = _secret_as_dict(secret)
     except (ResourceExistsError, SerializationError) as exc:
@@ -497,7 +560,9 @@ async def set_secret(hub, ctx, name, value, vault_url, **kwargs):
     )
 
     try:
-        secret = sconn.set_secret(name=name, value=value)
+        secret = await hub.exec.azurerm.utils.sdk_call(
+            sconn.set_secret, name=name, value=value
+        )
 
         result = _secret_as_dict(secret)
     except (
@@ -511,6 +576,91 @@ async def set_secret(hub, ctx, name, value, vault_url, **kwargs):
     return result
 
 
+async def set_secrets(
+    hub,
+    ctx,
+    secrets,
+    vault_url,
+    content_type=None,
+    skip_unchanged=False,
+    max_concurrency=10,
+    **kwargs,
+):
+    """
+    .. versionadded:: 2.4.0
+
+    Set the values of many secrets at once. Requires secrets/set permission, and secrets/get permission as well if
+    unchanged secrets are skipped. The secrets are set concurrently. The result for each secret is the secret as
+    returned by ``set_secret`` along with whether it was ``changed``, or the error which kept it from being set.
+
+    :param secrets: A dictionary of secret names mapped to their values. A value can also be a dictionary with the
+        ``value`` and optional ``content_type`` of the secret.
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    :param content_type: An arbitrary string indicating the type of the secrets, used for any secret which doesn't
+        specify its own.
+
+    :param skip_unchanged: Get the current version of each secret first, and don't create a new version of a secret
+        when its value and content type already match. Defaults to False.
+
+    :param max_concurrency: The maximum number of secrets set at the same time. Defaults to 10.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.keyvault.secret.set_secrets '{"secret1": "value1", "secret2": "value2"}' https://myvault.vault.azure.net/
+
+    """
+    sconn = await hub.exec.azurerm.keyvault.secret.get_secret_client(
+        ctx, vault_url, **kwargs
+    )
+    limit = asyncio.Semaphore(max(int(max_concurrency), 1))
+
+    async def set_(name, value):
+        secret_type = content_type
+        if isinstance(value, dict):
+            if "value" not in value:
+                return {"error": 'The value of the secret must be given as "value".'}
+            secret_type = value.get("content_type", content_type)
+            value = value["value"]
+
+        async with limit:
+            if skip_unchanged:
+                try:
+                    current = await hub.exec.azurerm.utils.sdk_call(
+                        sconn.get_secret, name=name,
+                    )
+                    if (
+                        current.value == value
+                        and current.properties.content_type == secret_type
+                    ):
+                        result = _secret_as_dict(current)
+                        result["changed"] = False
+                        return result
+                except AzureError:
+                    # a secret which doesn't exist or can't be read is set all the same
+                    pass
+
+            try:
+                secret = await hub.exec.azurerm.utils.sdk_call(
+                    sconn.set_secret, name=name, value=value, content_type=secret_type
+                )
+            except (AzureError, SerializationError) as exc:
+                return {"error": str(exc)}
+
+        result = _secret_as_dict(secret)
+        result["changed"] = True
+        return result
+
+    results = await asyncio.gather(
+        *[set_(name, value) for name, value in secrets.items()]
+    )
+
+    return dict(zip(secrets, results))
+
+
 async def update_secret_properties(
     hub,
     ctx,
@@ -563,7 +713,8 @@ async def update_secret_properties(
     )
 
     try:
-        secret = sconn.update_secret_properties(
+        secret = await hub.exec.azurerm.utils.sdk_call(
+            sconn.update_secret_properties,
             name=name,
             version=version,
             content_type=content_type,
@@ -33,16 +33,16 @@ Azure Resource Manager (ARM) Key Vault Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.keyvault.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.keyvault") is not None
 except ImportError:
     pass
 
@@ -70,7 +70,9 @@ async def check_name_availability(hub, ctx, name, **kwargs):
     vconn = await hub.exec.azurerm.utils.get_client(ctx, "keyvault", **kwargs)
 
     try:
-        avail = vconn.vaults.check_name_availability(name=name,)
+        avail = await hub.exec.azurerm.utils.sdk_call(
+            vconn.vaults.check_name_availability, name=name,
+        )
 
         result = avail.as_dict()
     except CloudError as exc:
@@ -96,11 +98,14 @@ async def create_or_update(
     enabled_for_deployment=None,
     enabled_for_disk_encryption=None,
     enabled_for_template_deployment=None,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or update a key vault in the specified subscription.
 
     :param name: The vault name.
@@ -162,6 +167,9 @@ async def create_or_update(
     :param enabled_for_template_deployment: A boolean value specifying whether Azure Resource Manager is permitted
         to retrieve secrets from the key vault. Defaults to False.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -218,11 +226,16 @@ async def create_or_update(
     log.debug("Model for creation: %s", paramsmodel.as_dict())
 
     try:
-        vault = vconn.vaults.create_or_update(
-            vault_name=name, resource_group_name=resource_group, parameters=paramsmodel
+        vault = await hub.exec.azurerm.utils.begin_operation(
+            vconn.vaults.create_or_update,
+            vault_name=name,
+            resource_group_name=resource_group,
+            parameters=paramsmodel,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(vault)
 
-        result = vault.result().as_dict()
+        result = (await hub.exec.azurerm.utils.wait_for_operation(vault)).as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("keyvault", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -251,7 +264,9 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     vconn = await hub.exec.azurerm.utils.get_client(ctx, "keyvault", **kwargs)
 
     try:
-        vault = vconn.vaults.delete(vault_name=name, resource_group_name=resource_group)
+        vault = await hub.exec.azurerm.utils.sdk_call(
+            vconn.vaults.delete, vault_name=name, resource_group_name=resource_group
+        )
 
         result = True
     except CloudError as exc:
@@ -281,7 +296,9 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     vconn = await hub.exec.azurerm.utils.get_client(ctx, "keyvault", **kwargs)
 
     try:
-        vault = vconn.vaults.get(vault_name=name, resource_group_name=resource_group)
+        vault = await hub.exec.azurerm.utils.sdk_call(
+            vconn.vaults.get, vault_name=name, resource_group_name=resource_group
+        )
 
         result = vault.as_dict()
     except CloudError as exc:
@@ -312,7 +329,9 @@ async def get_deleted(hub, ctx, name, location, **kwargs):
     vconn = await hub.exec.azurerm.utils.get_client(ctx, "keyvault", **kwargs)
 
     try:
-        vault = vconn.vaults.get_deleted(vault_name=name, location=location)
+        vault = await hub.exec.azurerm.utils.sdk_call(
+            vconn.vaults.get_deleted, vault_name=name, location=location
+        )
 
         result = vault.as_dict()
     except CloudError as exc:
@@ -322,7 +341,7 @@ async def get_deleted(hub, ctx, name, location, **kwargs):
     return result
 
 
-async def list_(hub, ctx, top=None, **kwargs):
+async def list_(hub, ctx, top=None, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
@@ -330,6 +349,9 @@ async def list_(hub, ctx, top=None, **kwargs):
 
     :param top: Maximum number of results to return.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -341,11 +363,11 @@ async def list_(hub, ctx, top=None, **kwargs):
     vconn = await hub.exec.azurerm.utils.get_client(ctx, "keyvault", **kwargs)
 
     try:
-        vaults = await hub.exec.azurerm.utils.paged_object_to_list(
-            vconn.vaults.list(top=top)
-        )
+        vaults = hub.exec.azurerm.utils.paged_object_iter(vconn.vaults.list(top=top))
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(vaults)
 
-        for vault in vaults:
+        async for vault in vaults:
             result[vault["name"]] = vault
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("keyvault", str(exc), **kwargs)
@@ -354,7 +376,9 @@ async def list_(hub, ctx, top=None, **kwargs):
     return result
 
 
-async def list_by_resource_group(hub, ctx, resource_group, top=None, **kwargs):
+async def list_by_resource_group(
+    hub, ctx, resource_group, top=None, stream=False, **kwargs
+):
     """
     .. versionadded:: 2.0.0
 
@@ -365,6 +389,9 @@ async def list_by_resource_group(hub, ctx, resource_group, top=None, **kwargs):
 
     :param top: Maximum number of results to return.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -376,13 +403,15 @@ async def list_by_resource_group(hub, ctx, resource_group, top=None, **kwargs):
     vconn = await hub.exec.azurerm.utils.get_client(ctx, "keyvault", **kwargs)
 
     try:
-        vaults = await hub.exec.azurerm.utils.paged_object_to_list(
+        vaults = hub.exec.azurerm.utils.paged_object_iter(
             vconn.vaults.list_by_resource_group(
                 resource_group_name=resource_group, top=top
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(vaults)
 
-        for vault in vaults:
+        async for vault in vaults:
             result[vault["name"]] = vault
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("keyvault", str(exc), **kwargs)
@@ -391,7 +420,7 @@ async def list_by_resource_group(hub, ctx, resource_group, top=None, **kwargs):
     return result
 
 
-async def list_by_subscription(hub, ctx, top=None, **kwargs):
+async def list_by_subscription(hub, ctx, top=None, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
@@ -399,6 +428,9 @@ async def list_by_subscription(hub, ctx, top=None, **kwargs):
 
     :param top: Maximum number of results to return.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -410,11 +442,13 @@ async def list_by_subscription(hub, ctx, top=None, **kwargs):
     vconn = await hub.exec.azurerm.utils.get_client(ctx, "keyvault", **kwargs)
 
     try:
-        vaults = await hub.exec.azurerm.utils.paged_object_to_list(
+        vaults = hub.exec.azurerm.utils.paged_object_iter(
             vconn.vaults.list_by_subscription(top=top)
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(vaults)
 
-        for vault in vaults:
+        async for vault in vaults:
             result[vault["name"]] = vault
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("keyvault", str(exc), **kwargs)
@@ -423,12 +457,15 @@ async def list_by_subscription(hub, ctx, top=None, **kwargs):
     return result
 
 
-async def list_deleted(hub, ctx, **kwargs):
+async def list_deleted(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
     Gets information about the deleted vaults in a subscription.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -440,11 +477,11 @@ async def list_deleted(hub, ctx, **kwargs):
     vconn = await hub.exec.azurerm.utils.get_client(ctx, "keyvault", **kwargs)
 
     try:
-        vaults = await hub.exec.azurerm.utils.paged_object_to_list(
-            vconn.vaults.list_deleted()
-        )
+        vaults = hub.exec.azurerm.utils.paged_object_iter(vconn.vaults.list_deleted())
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(vaults)
 
-        for vault in vaults:
+        async for vault in vaults:
             result[vault["name"]] = vault
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("keyvault", str(exc), **kwargs)
@@ -474,7 +511,9 @@ async def purge_deleted(hub, ctx, name, location, **kwargs):
     vconn = await hub.exec.azurerm.utils.get_client(ctx, "keyvault", **kwargs)
 
     try:
-        vault = vconn.vaults.purge_deleted(vault_name=name, location=location)
+        vault = await hub.exec.azurerm.utils.sdk_call(
+            vconn.vaults.purge_deleted, vault_name=name, location=location
+        )
 
         result = True
     except CloudError as exc:
@@ -543,7 +582,8 @@ async def update_access_policy(
         return result
 
     try:
-        vault = vconn.vaults.update_access_policy(
+        vault = await hub.exec.azurerm.utils.sdk_call(
+            vconn.vaults.update_access_policy,
             vault_name=name,
             resource_group_name=resource_group,
             operation_kind=operation_kind,
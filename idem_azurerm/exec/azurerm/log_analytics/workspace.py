@@ -59,11 +59,14 @@ async def create_or_update(
     sku=None,
     retention=None,
     customer_id=None,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or update a workspace.
 
     :param name: The name of the workspace.
@@ -81,6 +84,9 @@ async def create_or_update(
     :param customer_id: The ID associated with the workspace. Setting this value at creation time allows the workspace
         being created to be linked to an existing workspace.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -112,13 +118,16 @@ async def create_or_update(
         return result
 
     try:
-        workspace = logconn.workspaces.create_or_update(
+        workspace = await hub.exec.azurerm.utils.begin_operation(
+            logconn.workspaces.create_or_update,
             workspace_name=name,
             resource_group_name=resource_group,
             parameters=spacemodel,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(workspace)
 
-        result = workspace.result().as_dict()
+        result = (await hub.exec.azurerm.utils.wait_for_operation(workspace)).as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("loganalytics", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -151,8 +160,10 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     logconn = await hub.exec.azurerm.utils.get_client(ctx, "loganalytics", **kwargs)
 
     try:
-        workspace = logconn.workspaces.delete(
-            workspace_name=name, resource_group_name=resource_group
+        workspace = await hub.exec.azurerm.utils.sdk_call(
+            logconn.workspaces.delete,
+            workspace_name=name,
+            resource_group_name=resource_group,
         )
 
         result = True
@@ -183,8 +194,10 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     logconn = await hub.exec.azurerm.utils.get_client(ctx, "loganalytics", **kwargs)
 
     try:
-        workspace = logconn.workspaces.get(
-            workspace_name=name, resource_group_name=resource_group
+        workspace = await hub.exec.azurerm.utils.sdk_call(
+            logconn.workspaces.get,
+            workspace_name=name,
+            resource_group_name=resource_group,
         )
 
         result = workspace.as_dict()
@@ -195,12 +208,15 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def list_(hub, ctx, **kwargs):
+async def list_(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
     Gets the workspaces in a subscription.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -212,11 +228,11 @@ async def list_(hub, ctx, **kwargs):
     logconn = await hub.exec.azurerm.utils.get_client(ctx, "loganalytics", **kwargs)
 
     try:
-        workspaces = await hub.exec.azurerm.utils.paged_object_to_list(
-            logconn.workspaces.list()
-        )
+        workspaces = hub.exec.azurerm.utils.paged_object_iter(logconn.workspaces.list())
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(workspaces)
 
-        for workspace in workspaces:
+        async for workspace in workspaces:
             result[workspace["name"]] = workspace
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("loganalytics", str(exc), **kwargs)
@@ -225,7 +241,7 @@ async def list_(hub, ctx, **kwargs):
     return result
 
 
-async def list_by_resource_group(hub, ctx, resource_group, **kwargs):
+async def list_by_resource_group(hub, ctx, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
@@ -233,6 +249,9 @@ async def list_by_resource_group(hub, ctx, resource_group, **kwargs):
 
     :param resource_group: The name of the resource group to get. The name is case insensitive.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -244,13 +263,15 @@ async def list_by_resource_group(hub, ctx, resource_group, **kwargs):
     logconn = await hub.exec.azurerm.utils.get_client(ctx, "loganalytics", **kwargs)
 
     try:
-        workspaces = await hub.exec.azurerm.utils.paged_object_to_list(
+        workspaces = hub.exec.azurerm.utils.paged_object_iter(
             logconn.workspaces.list_by_resource_group(
                 resource_group_name=resource_group
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(workspaces)
 
-        for workspace in workspaces:
+        async for workspace in workspaces:
             result[workspace["name"]] = workspace
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("loganalytics", str(exc), **kwargs)
@@ -280,8 +301,10 @@ async def list_intelligence_packs(hub, ctx, name, resource_group, **kwargs):
     logconn = await hub.exec.azurerm.utils.get_client(ctx, "loganalytics", **kwargs)
 
     try:
-        packs = logconn.workspaces.list_intelligence_packs(
-            workspace_name=name, resource_group_name=resource_group
+        packs = await hub.exec.azurerm.utils.sdk_call(
+            logconn.workspaces.list_intelligence_packs,
+            workspace_name=name,
+            resource_group_name=resource_group,
         )
 
         for pack in packs:
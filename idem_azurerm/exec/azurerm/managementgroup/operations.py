@@ -33,12 +33,12 @@ Azure Resource Manager (ARM) Management Group Operations Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.managementgroups.models  # pylint: disable=unused-import
     from azure.mgmt.managementgroups import ManagementGroupsAPI
     from azure.mgmt.managementgroups.models.error_response_py3 import (
         ErrorResponseException,
@@ -46,7 +46,7 @@ try:
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.managementgroups") is not None
 except ImportError:
     pass
 
@@ -71,10 +71,14 @@ async def get_api_client(hub, ctx, **kwargs):
     return client
 
 
-async def create_or_update(hub, ctx, name, display_name=None, parent=None, **kwargs):
+async def create_or_update(
+    hub, ctx, name, display_name=None, parent=None, no_wait=False, **kwargs
+):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or update a management group. If a management group is already created and a subsequent create request is
         issued with different properties, the management group properties will be updated.
 
@@ -86,6 +90,9 @@ async def create_or_update(hub, ctx, name, display_name=None, parent=None, **kwa
     :param parent: The fully qualified ID for the parent management group. For example,
         /providers/Microsoft.Management/managementGroups/0000000-0000-0000-0000-000000000000.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -127,11 +134,15 @@ async def create_or_update(hub, ctx, name, display_name=None, parent=None, **kwa
         return result
 
     try:
-        mgroup = manconn.management_groups.create_or_update(
-            group_id=name, create_management_group_request=group_request,
+        mgroup = await hub.exec.azurerm.utils.begin_operation(
+            manconn.management_groups.create_or_update,
+            group_id=name,
+            create_management_group_request=group_request,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(mgroup)
 
-        result = mgroup.result()
+        result = await hub.exec.azurerm.utils.wait_for_operation(mgroup)
     except ErrorResponseException as exc:
         result = {"error": str(exc)}
     except SerializationError as exc:
@@ -163,7 +174,9 @@ async def delete(hub, ctx, name, **kwargs):
     )
 
     try:
-        mgroup = manconn.management_groups.delete(group_id=name,)
+        mgroup = await hub.exec.azurerm.utils.sdk_call(
+            manconn.management_groups.delete, group_id=name,
+        )
 
         result = True
     except ErrorResponseException as exc:
@@ -199,8 +212,11 @@ async def get(hub, ctx, name, expand=None, recurse=None, **kwargs):
     )
 
     try:
-        mgroup = manconn.management_groups.get(
-            group_id=name, expand=expand, recurse=recurse,
+        mgroup = await hub.exec.azurerm.utils.sdk_call(
+            manconn.management_groups.get,
+            group_id=name,
+            expand=expand,
+            recurse=recurse,
         )
 
         result = mgroup.as_dict()
@@ -210,7 +226,7 @@ async def get(hub, ctx, name, expand=None, recurse=None, **kwargs):
     return result
 
 
-async def list_(hub, ctx, skip_token=None, **kwargs):
+async def list_(hub, ctx, skip_token=None, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
@@ -220,6 +236,9 @@ async def list_(hub, ctx, skip_token=None, **kwargs):
         If a previous response contains a nextLink element, the value of the nextLink element will include a token
         parameter that specifies a starting point to use for subsequent calls. Defaults to None.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -233,11 +252,13 @@ async def list_(hub, ctx, skip_token=None, **kwargs):
     )
 
     try:
-        mgroups = await hub.exec.azurerm.utils.paged_object_to_list(
+        mgroups = hub.exec.azurerm.utils.paged_object_iter(
             manconn.management_groups.list(skip_token=skip_token,)
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(mgroups)
 
-        for mgroup in mgroups:
+        async for mgroup in mgroups:
             result[mgroup["display_name"]] = mgroup
     except ErrorResponseException as exc:
         result = {"error": str(exc)}
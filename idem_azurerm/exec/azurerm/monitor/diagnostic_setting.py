@@ -34,17 +34,17 @@ Azure Resource Manager (ARM) Diagnostic Setting Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.monitor.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
     from azure.mgmt.monitor.models import ErrorResponseException
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.monitor") is not None
 except ImportError:
     pass
 
@@ -149,8 +149,11 @@ async def create_or_update(
         return result
 
     try:
-        diag = moniconn.diagnostic_settings.create_or_update(
-            name=name, resource_uri=resource_uri, parameters=diagmodel
+        diag = await hub.exec.azurerm.utils.sdk_call(
+            moniconn.diagnostic_settings.create_or_update,
+            name=name,
+            resource_uri=resource_uri,
+            parameters=diagmodel,
         )
 
         result = diag.as_dict()
@@ -181,8 +184,11 @@ async def delete(hub, ctx, name, resource_uri, **kwargs):
     result = False
     moniconn = await hub.exec.azurerm.utils.get_client(ctx, "monitor", **kwargs)
     try:
-        diag = moniconn.diagnostic_settings.delete(
-            name=name, resource_uri=resource_uri, **kwargs
+        diag = await hub.exec.azurerm.utils.sdk_call(
+            moniconn.diagnostic_settings.delete,
+            name=name,
+            resource_uri=resource_uri,
+            **kwargs,
         )
 
         result = True
@@ -214,8 +220,11 @@ async def get(hub, ctx, name, resource_uri, **kwargs):
     moniconn = await hub.exec.azurerm.utils.get_client(ctx, "monitor", **kwargs)
 
     try:
-        diag = moniconn.diagnostic_settings.get(
-            name=name, resource_uri=resource_uri, **kwargs
+        diag = await hub.exec.azurerm.utils.sdk_call(
+            moniconn.diagnostic_settings.get,
+            name=name,
+            resource_uri=resource_uri,
+            **kwargs,
         )
 
         result = diag.as_dict()
@@ -245,7 +254,9 @@ async def list_(hub, ctx, resource_uri, **kwargs):
     moniconn = await hub.exec.azurerm.utils.get_client(ctx, "monitor", **kwargs)
 
     try:
-        diag = moniconn.diagnostic_settings.list(resource_uri=resource_uri, **kwargs)
+        diag = await hub.exec.azurerm.utils.sdk_call(
+            moniconn.diagnostic_settings.list, resource_uri=resource_uri, **kwargs
+        )
 
         values = diag.as_dict().get("value", [])
         for value in values:
@@ -34,16 +34,16 @@ Azure (ARM) Monitor Log Profile Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.monitor.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.monitor") is not None
 except ImportError:
     pass
 
@@ -52,12 +52,15 @@ __func_alias__ = {"list_": "list"}
 log = logging.getLogger(__name__)
 
 
-async def list_(hub, ctx, **kwargs):
+async def list_(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
     List log profiles.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -68,11 +71,13 @@ async def list_(hub, ctx, **kwargs):
     result = {}
     moniconn = await hub.exec.azurerm.utils.get_client(ctx, "monitor", **kwargs)
     try:
-        profiles = await hub.exec.azurerm.utils.paged_object_to_list(
+        profiles = hub.exec.azurerm.utils.paged_object_iter(
             moniconn.log_profiles.list()
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(profiles)
 
-        for profile in profiles:
+        async for profile in profiles:
             result[profile["name"]] = profile
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("monitor", str(exc), **kwargs)
@@ -34,6 +34,7 @@ Azure Resource Manager (ARM) Network Load Balancer Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 try:
@@ -44,12 +45,11 @@ except ImportError:
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.network.models  # pylint: disable=unused-import
     from msrestazure.tools import is_valid_resource_id, parse_resource_id
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.network") is not None
 except ImportError:
     pass
 
@@ -58,12 +58,15 @@ __func_alias__ = {"list_": "list"}
 log = logging.getLogger(__name__)
 
 
-async def list_all(hub, ctx, **kwargs):
+async def list_all(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
     List all load balancers within a subscription.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -74,11 +77,13 @@ async def list_all(hub, ctx, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        load_balancers = await hub.exec.azurerm.utils.paged_object_to_list(
+        load_balancers = hub.exec.azurerm.utils.paged_object_iter(
             netconn.load_balancers.list_all()
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(load_balancers)
 
-        for load_balancer in load_balancers:
+        async for load_balancer in load_balancers:
             result[load_balancer["name"]] = load_balancer
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -87,7 +92,7 @@ async def list_all(hub, ctx, **kwargs):
     return result
 
 
-async def list_(hub, ctx, resource_group, **kwargs):
+async def list_(hub, ctx, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -96,6 +101,9 @@ async def list_(hub, ctx, resource_group, **kwargs):
     :param resource_group: The resource group name to list load balancers
         within.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -106,11 +114,13 @@ async def list_(hub, ctx, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        load_balancers = await hub.exec.azurerm.utils.paged_object_to_list(
+        load_balancers = hub.exec.azurerm.utils.paged_object_iter(
             netconn.load_balancers.list(resource_group_name=resource_group)
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(load_balancers)
 
-        for load_balancer in load_balancers:
+        async for load_balancer in load_balancers:
             result[load_balancer["name"]] = load_balancer
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -139,8 +149,10 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        load_balancer = netconn.load_balancers.get(
-            load_balancer_name=name, resource_group_name=resource_group
+        load_balancer = await hub.exec.azurerm.utils.sdk_call(
+            netconn.load_balancers.get,
+            load_balancer_name=name,
+            resource_group_name=resource_group,
         )
         result = load_balancer.as_dict()
     except CloudError as exc:
@@ -150,10 +162,12 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def create_or_update(hub, ctx, name, resource_group, **kwargs):
+async def create_or_update(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or update a load balancer within a specified resource group.
 
     :param name: The name of the load balancer to create.
@@ -161,6 +175,9 @@ async def create_or_update(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         load balancer.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -169,7 +186,7 @@ async def create_or_update(hub, ctx, name, resource_group, **kwargs):
 
     """
     if "location" not in kwargs:
-        rg_props = await hub.exec.azurerm.resource.group.get(
+        rg_props = await hub.exec.azurerm.resource.group.get_location(
             ctx, resource_group, **kwargs
         )
 
@@ -325,13 +342,15 @@ async def create_or_update(hub, ctx, name, resource_group, **kwargs):
         return result
 
     try:
-        load_balancer = netconn.load_balancers.create_or_update(
+        load_balancer = await hub.exec.azurerm.utils.begin_operation(
+            netconn.load_balancers.create_or_update,
             resource_group_name=resource_group,
             load_balancer_name=name,
             parameters=lbmodel,
         )
-        load_balancer.wait()
-        lb_result = load_balancer.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(load_balancer)
+        lb_result = await hub.exec.azurerm.utils.wait_for_operation(load_balancer)
         result = lb_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -344,10 +363,12 @@ async def create_or_update(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def delete(hub, ctx, name, resource_group, **kwargs):
+async def delete(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Delete a load balancer.
 
     :param name: The name of the load balancer to delete.
@@ -355,6 +376,9 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         load balancer.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -365,10 +389,14 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     result = False
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        load_balancer = netconn.load_balancers.delete(
-            load_balancer_name=name, resource_group_name=resource_group
+        load_balancer = await hub.exec.azurerm.utils.begin_operation(
+            netconn.load_balancers.delete,
+            load_balancer_name=name,
+            resource_group_name=resource_group,
         )
-        load_balancer.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(load_balancer)
+        await hub.exec.azurerm.utils.wait_for_operation(load_balancer)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -34,6 +34,7 @@ Azure Resource Manager (ARM) Local Network Gateway Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 try:
@@ -44,12 +45,11 @@ except ImportError:
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.network.models  # pylint: disable=unused-import
     from msrestazure.tools import is_valid_resource_id, parse_resource_id
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.network") is not None
 except ImportError:
     pass
 
@@ -59,11 +59,13 @@ log = logging.getLogger(__name__)
 
 
 async def create_or_update(
-    hub, ctx, name, resource_group, gateway_ip_address, **kwargs
+    hub, ctx, name, resource_group, gateway_ip_address, no_wait=False, **kwargs
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Creates or updates a local network gateway object in the specified resource group.
 
     :param name: The name of the local network gateway object to be created or updated.
@@ -72,6 +74,9 @@ async def create_or_update(
 
     :param gateway_ip_address: IP address of the local network gateway.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -80,7 +85,7 @@ async def create_or_update(
 
     """
     if "location" not in kwargs:
-        rg_props = await hub.exec.azurerm.resource.group.get(
+        rg_props = await hub.exec.azurerm.resource.group.get_location(
             ctx, resource_group, **kwargs
         )
 
@@ -107,13 +112,15 @@ async def create_or_update(
         return result
 
     try:
-        gateway = netconn.local_network_gateways.create_or_update(
+        gateway = await hub.exec.azurerm.utils.begin_operation(
+            netconn.local_network_gateways.create_or_update,
             local_network_gateway_name=name,
             resource_group_name=resource_group,
             parameters=gatewaymodel,
         )
-        gateway.wait()
-        gateway_result = gateway.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(gateway)
+        gateway_result = await hub.exec.azurerm.utils.wait_for_operation(gateway)
         result = gateway_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -145,8 +152,10 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        gateway = netconn.local_network_gateways.get(
-            resource_group_name=resource_group, local_network_gateway_name=name
+        gateway = await hub.exec.azurerm.utils.sdk_call(
+            netconn.local_network_gateways.get,
+            resource_group_name=resource_group,
+            local_network_gateway_name=name,
         )
 
         result = gateway.as_dict()
@@ -157,16 +166,21 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def delete(hub, ctx, name, resource_group, **kwargs):
+async def delete(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Deletes the specified local network gateway.
 
     :param name: The name of the local network gateway that will be deleted.
 
     :param resource_group: The name of the resource group.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -177,10 +191,14 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     result = False
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        gateway = netconn.local_network_gateways.delete(
-            resource_group_name=resource_group, local_network_gateway_name=name
+        gateway = await hub.exec.azurerm.utils.begin_operation(
+            netconn.local_network_gateways.delete,
+            resource_group_name=resource_group,
+            local_network_gateway_name=name,
         )
-        gateway.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(gateway)
+        await hub.exec.azurerm.utils.wait_for_operation(gateway)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -188,7 +206,7 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def list_(hub, ctx, resource_group, **kwargs):
+async def list_(hub, ctx, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -196,6 +214,9 @@ async def list_(hub, ctx, resource_group, **kwargs):
 
     :param resource_group: The name of the resource group.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -206,11 +227,13 @@ async def list_(hub, ctx, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        gateways = await hub.exec.azurerm.utils.paged_object_to_list(
+        gateways = hub.exec.azurerm.utils.paged_object_iter(
             netconn.local_network_gateways.list(resource_group_name=resource_group)
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(gateways)
 
-        for gateway in gateways:
+        async for gateway in gateways:
             result[gateway["name"]] = gateway
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -34,6 +34,7 @@ Azure Resource Manager (ARM) Network Interface Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 try:
@@ -44,12 +45,11 @@ except ImportError:
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.network.models  # pylint: disable=unused-import
     from msrestazure.tools import is_valid_resource_id, parse_resource_id
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.network") is not None
 except ImportError:
     pass
 
@@ -58,10 +58,12 @@ __func_alias__ = {"list_": "list"}
 log = logging.getLogger(__name__)
 
 
-async def delete(hub, ctx, name, resource_group, **kwargs):
+async def delete(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Delete a network interface.
 
     :param name: The name of the network interface to delete.
@@ -69,6 +71,9 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         network interface.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -80,10 +85,14 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
 
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        nic = netconn.network_interfaces.delete(
-            network_interface_name=name, resource_group_name=resource_group
+        nic = await hub.exec.azurerm.utils.begin_operation(
+            netconn.network_interfaces.delete,
+            network_interface_name=name,
+            resource_group_name=resource_group,
         )
-        nic.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(nic)
+        await hub.exec.azurerm.utils.wait_for_operation(nic)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -111,8 +120,10 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        nic = netconn.network_interfaces.get(
-            network_interface_name=name, resource_group_name=resource_group
+        nic = await hub.exec.azurerm.utils.sdk_call(
+            netconn.network_interfaces.get,
+            network_interface_name=name,
+            resource_group_name=resource_group,
         )
         result = nic.as_dict()
     except CloudError as exc:
@@ -123,11 +134,21 @@ async def get(hub, ctx, name, resource_group, **kwargs):
 
 
 async def create_or_update(
-    hub, ctx, name, ip_configurations, subnet, virtual_network, resource_group, **kwargs
+    hub,
+    ctx,
+    name,
+    ip_configurations,
+    subnet,
+    virtual_network,
+    resource_group,
+    no_wait=False,
+    **kwargs,
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or update a network interface within a specified resource group.
 
     :param name: The name of the network interface to create.
@@ -143,6 +164,9 @@ async def create_or_update(
     :param resource_group: The resource group name assigned to the
         virtual network.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -152,7 +176,7 @@ async def create_or_update(
 
     """
     if "location" not in kwargs:
-        rg_props = await hub.exec.azurerm.resource.group.get(
+        rg_props = await hub.exec.azurerm.resource.group.get_location(
             ctx, resource_group, **kwargs
         )
 
@@ -237,13 +261,15 @@ async def create_or_update(
         return result
 
     try:
-        interface = netconn.network_interfaces.create_or_update(
+        interface = await hub.exec.azurerm.utils.begin_operation(
+            netconn.network_interfaces.create_or_update,
             resource_group_name=resource_group,
             network_interface_name=name,
             parameters=nicmodel,
         )
-        interface.wait()
-        nic_result = interface.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(interface)
+        nic_result = await hub.exec.azurerm.utils.wait_for_operation(interface)
         result = nic_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -256,12 +282,15 @@ async def create_or_update(
     return result
 
 
-async def list_all(hub, ctx, **kwargs):
+async def list_all(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
     List all network interfaces within a subscription.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -272,11 +301,13 @@ async def list_all(hub, ctx, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        nics = await hub.exec.azurerm.utils.paged_object_to_list(
+        nics = hub.exec.azurerm.utils.paged_object_iter(
             netconn.network_interfaces.list_all()
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(nics)
 
-        for nic in nics:
+        async for nic in nics:
             result[nic["name"]] = nic
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -285,7 +316,7 @@ async def list_all(hub, ctx, **kwargs):
     return result
 
 
-async def list_(hub, ctx, resource_group, **kwargs):
+async def list_(hub, ctx, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -294,6 +325,9 @@ async def list_(hub, ctx, resource_group, **kwargs):
     :param resource_group: The resource group name to list network
         interfaces within.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -304,11 +338,13 @@ async def list_(hub, ctx, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        nics = await hub.exec.azurerm.utils.paged_object_to_list(
+        nics = hub.exec.azurerm.utils.paged_object_iter(
             netconn.network_interfaces.list(resource_group_name=resource_group)
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(nics)
 
-        for nic in nics:
+        async for nic in nics:
             result[nic["name"]] = nic
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -337,11 +373,12 @@ async def get_effective_route_table(hub, ctx, name, resource_group, **kwargs):
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        nic = netconn.network_interfaces.get_effective_route_table(
-            network_interface_name=name, resource_group_name=resource_group
+        nic = await hub.exec.azurerm.utils.begin_operation(
+            netconn.network_interfaces.get_effective_route_table,
+            network_interface_name=name,
+            resource_group_name=resource_group,
         )
-        nic.wait()
-        tables = nic.result()
+        tables = await hub.exec.azurerm.utils.wait_for_operation(nic)
         tables = tables.as_dict()
         result = tables["value"]
     except CloudError as exc:
@@ -373,11 +410,12 @@ async def list_effective_network_security_groups(
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        nic = netconn.network_interfaces.list_effective_network_security_groups(
-            network_interface_name=name, resource_group_name=resource_group
+        nic = await hub.exec.azurerm.utils.begin_operation(
+            netconn.network_interfaces.list_effective_network_security_groups,
+            network_interface_name=name,
+            resource_group_name=resource_group,
         )
-        nic.wait()
-        groups = nic.result()
+        groups = await hub.exec.azurerm.utils.wait_for_operation(nic)
         groups = groups.as_dict()
         result = groups["value"]
     except CloudError as exc:
@@ -388,7 +426,7 @@ async def list_effective_network_security_groups(
 
 
 async def list_virtual_machine_scale_set_vm_network_interfaces(
-    hub, ctx, scale_set, vm_index, resource_group, **kwargs
+    hub, ctx, scale_set, vm_index, resource_group, stream=False, **kwargs
 ):
     """
     .. versionadded:: 1.0.0
@@ -402,6 +440,9 @@ async def list_virtual_machine_scale_set_vm_network_interfaces(
     :param resource_group: The resource group name assigned to the
         scale set.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -412,15 +453,17 @@ async def list_virtual_machine_scale_set_vm_network_interfaces(
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        nics = await hub.exec.azurerm.utils.paged_object_to_list(
+        nics = hub.exec.azurerm.utils.paged_object_iter(
             netconn.network_interfaces.list_virtual_machine_scale_set_vm_network_interfaces(
                 virtual_machine_scale_set_name=scale_set,
                 virtualmachine_index=vm_index,
                 resource_group_name=resource_group,
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(nics)
 
-        for nic in nics:
+        async for nic in nics:
             result[nic["name"]] = nic
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -430,7 +473,7 @@ async def list_virtual_machine_scale_set_vm_network_interfaces(
 
 
 async def list_virtual_machine_scale_set_network_interfaces(
-    hub, ctx, scale_set, resource_group, **kwargs
+    hub, ctx, scale_set, resource_group, stream=False, **kwargs
 ):
     """
     .. versionadded:: 1.0.0
@@ -442,6 +485,9 @@ async def list_virtual_machine_scale_set_network_interfaces(
     :param resource_group: The resource group name assigned to the
         scale set.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -452,14 +498,16 @@ async def list_virtual_machine_scale_set_network_interfaces(
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        nics = await hub.exec.azurerm.utils.paged_object_to_list(
+        nics = hub.exec.azurerm.utils.paged_object_iter(
             netconn.network_interfaces.list_virtual_machine_scale_set_network_interfaces(
                 virtual_machine_scale_set_name=scale_set,
                 resource_group_name=resource_group,
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(nics)
 
-        for nic in nics:
+        async for nic in nics:
             result[nic["name"]] = nic
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -497,7 +545,8 @@ async def get_virtual_machine_scale_set_network_interface(
 
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        nic = netconn.network_interfaces.list_virtual_machine_scale_set_vm_network_interfaces(
+        nic = await hub.exec.azurerm.utils.sdk_call(
+            netconn.network_interfaces.list_virtual_machine_scale_set_vm_network_interfaces,
             network_interface_name=name,
             virtual_machine_scale_set_name=scale_set,
             virtualmachine_index=vm_index,
@@ -34,6 +34,7 @@ Azure Resource Manager (ARM) Network Security Group Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 try:
@@ -44,12 +45,11 @@ except ImportError:
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.network.models  # pylint: disable=unused-import
     from msrestazure.tools import is_valid_resource_id, parse_resource_id
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.network") is not None
 except ImportError:
     pass
 
@@ -163,7 +163,8 @@ async def security_rules_list(hub, ctx, security_group, resource_group, **kwargs
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        secrules = netconn.security_rules.list(
+        secrules = await hub.exec.azurerm.utils.sdk_call(
+            netconn.security_rules.list,
             network_security_group_name=security_group,
             resource_group_name=resource_group,
         )
@@ -193,11 +194,14 @@ async def security_rule_create_or_update(
     destination_address_prefixes=None,
     source_port_ranges=None,
     destination_port_ranges=None,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or update a security rule within a specified network security group.
 
     :param name: The name of the security rule to create.
@@ -254,6 +258,9 @@ async def security_rule_create_or_update(
     :param resource_group: The resource group name assigned to the
         network security group.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -311,14 +318,16 @@ async def security_rule_create_or_update(
         return result
 
     try:
-        secrule = netconn.security_rules.create_or_update(
+        secrule = await hub.exec.azurerm.utils.begin_operation(
+            netconn.security_rules.create_or_update,
             resource_group_name=resource_group,
             network_security_group_name=security_group,
             security_rule_name=name,
             security_rule_parameters=rulemodel,
         )
-        secrule.wait()
-        secrule_result = secrule.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(secrule)
+        secrule_result = await hub.exec.azurerm.utils.wait_for_operation(secrule)
         result = secrule_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -332,11 +341,13 @@ async def security_rule_create_or_update(
 
 
 async def security_rule_delete(
-    hub, ctx, security_rule, security_group, resource_group, **kwargs
+    hub, ctx, security_rule, security_group, resource_group, no_wait=False, **kwargs
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Delete a security rule within a specified security group.
 
     :param name: The name of the security rule to delete.
@@ -347,6 +358,9 @@ async def security_rule_delete(
     :param resource_group: The resource group name assigned to the
         network security group.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -357,12 +371,15 @@ async def security_rule_delete(
     result = False
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        secrule = netconn.security_rules.delete(
+        secrule = await hub.exec.azurerm.utils.begin_operation(
+            netconn.security_rules.delete,
             network_security_group_name=security_group,
             resource_group_name=resource_group,
             security_rule_name=security_rule,
         )
-        secrule.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(secrule)
+        await hub.exec.azurerm.utils.wait_for_operation(secrule)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -395,7 +412,8 @@ async def security_rule_get(
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        secrule = netconn.security_rules.get(
+        secrule = await hub.exec.azurerm.utils.sdk_call(
+            netconn.security_rules.get,
             network_security_group_name=security_group,
             resource_group_name=resource_group,
             security_rule_name=security_rule,
@@ -408,10 +426,12 @@ async def security_rule_get(
     return result
 
 
-async def create_or_update(hub, ctx, name, resource_group, **kwargs):
+async def create_or_update(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or update a network security group.
 
     :param name: The name of the network security group to create.
@@ -419,6 +439,9 @@ async def create_or_update(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         network security group.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -427,7 +450,7 @@ async def create_or_update(hub, ctx, name, resource_group, **kwargs):
 
     """
     if "location" not in kwargs:
-        rg_props = await hub.exec.azurerm.resource.group.get(
+        rg_props = await hub.exec.azurerm.resource.group.get_location(
             ctx, resource_group, **kwargs
         )
 
@@ -451,13 +474,15 @@ async def create_or_update(hub, ctx, name, resource_group, **kwargs):
         return result
 
     try:
-        secgroup = netconn.network_security_groups.create_or_update(
+        secgroup = await hub.exec.azurerm.utils.begin_operation(
+            netconn.network_security_groups.create_or_update,
             resource_group_name=resource_group,
             network_security_group_name=name,
             parameters=secgroupmodel,
         )
-        secgroup.wait()
-        secgroup_result = secgroup.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(secgroup)
+        secgroup_result = await hub.exec.azurerm.utils.wait_for_operation(secgroup)
         result = secgroup_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -470,10 +495,12 @@ async def create_or_update(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def delete(hub, ctx, name, resource_group, **kwargs):
+async def delete(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Delete a network security group within a resource group.
 
     :param name: The name of the network security group to delete.
@@ -481,6 +508,9 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         network security group.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -491,10 +521,14 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     result = False
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        secgroup = netconn.network_security_groups.delete(
-            resource_group_name=resource_group, network_security_group_name=name
+        secgroup = await hub.exec.azurerm.utils.begin_operation(
+            netconn.network_security_groups.delete,
+            resource_group_name=resource_group,
+            network_security_group_name=name,
         )
-        secgroup.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(secgroup)
+        await hub.exec.azurerm.utils.wait_for_operation(secgroup)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -522,8 +556,10 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        secgroup = netconn.network_security_groups.get(
-            resource_group_name=resource_group, network_security_group_name=name
+        secgroup = await hub.exec.azurerm.utils.sdk_call(
+            netconn.network_security_groups.get,
+            resource_group_name=resource_group,
+            network_security_group_name=name,
         )
         result = secgroup.as_dict()
     except CloudError as exc:
@@ -533,7 +569,7 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def list_(hub, ctx, resource_group, **kwargs):
+async def list_(hub, ctx, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -542,6 +578,9 @@ async def list_(hub, ctx, resource_group, **kwargs):
     :param resource_group: The resource group name to list network security \
         groups within.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -552,10 +591,12 @@ async def list_(hub, ctx, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        secgroups = await hub.exec.azurerm.utils.paged_object_to_list(
+        secgroups = hub.exec.azurerm.utils.paged_object_iter(
             netconn.network_security_groups.list(resource_group_name=resource_group)
         )
-        for secgroup in secgroups:
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(secgroups)
+        async for secgroup in secgroups:
             result[secgroup["name"]] = secgroup
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -564,12 +605,15 @@ async def list_(hub, ctx, resource_group, **kwargs):
     return result
 
 
-async def list_all(hub, ctx, **kwargs):
+async def list_all(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
     List all network security groups within a subscription.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -580,10 +624,12 @@ async def list_all(hub, ctx, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        secgroups = await hub.exec.azurerm.utils.paged_object_to_list(
+        secgroups = hub.exec.azurerm.utils.paged_object_iter(
             netconn.network_security_groups.list_all()
         )
-        for secgroup in secgroups:
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(secgroups)
+        async for secgroup in secgroups:
             result[secgroup["name"]] = secgroup
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
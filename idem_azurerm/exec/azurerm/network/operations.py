@@ -34,6 +34,7 @@ Azure Resource Manager (ARM) Network Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 try:
@@ -44,11 +45,10 @@ except ImportError:
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.network.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.network") is not None
 except ImportError:
     pass
 
@@ -74,8 +74,8 @@ async def check_dns_name_availability(hub, ctx, name, region, **kwargs):
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        check_dns_name = netconn.check_dns_name_availability(
-            location=region, domain_name_label=name
+        check_dns_name = await hub.exec.azurerm.utils.sdk_call(
+            netconn.check_dns_name_availability, location=region, domain_name_label=name
         )
         result = check_dns_name.as_dict()
     except CloudError as exc:
@@ -111,7 +111,8 @@ async def check_ip_address_availability(
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        check_ip = netconn.virtual_networks.check_ip_address_availability(
+        check_ip = await hub.exec.azurerm.utils.sdk_call(
+            netconn.virtual_networks.check_ip_address_availability,
             resource_group_name=resource_group,
             virtual_network_name=virtual_network,
             ip_address=ip_address,
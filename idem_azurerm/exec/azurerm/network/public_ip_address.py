@@ -34,6 +34,7 @@ Azure Resource Manager (ARM) Network Public IP Address Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 try:
@@ -44,12 +45,11 @@ except ImportError:
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.network.models  # pylint: disable=unused-import
     from msrestazure.tools import is_valid_resource_id, parse_resource_id
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.network") is not None
 except ImportError:
     pass
 
@@ -58,10 +58,12 @@ __func_alias__ = {"list_": "list"}
 log = logging.getLogger(__name__)
 
 
-async def delete(hub, ctx, name, resource_group, **kwargs):
+async def delete(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Delete a public IP address.
 
     :param name: The name of the public IP address to delete.
@@ -69,6 +71,9 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         public IP address.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -79,10 +84,14 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     result = False
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        pub_ip = netconn.public_ip_addresses.delete(
-            public_ip_address_name=name, resource_group_name=resource_group
+        pub_ip = await hub.exec.azurerm.utils.begin_operation(
+            netconn.public_ip_addresses.delete,
+            public_ip_address_name=name,
+            resource_group_name=resource_group,
         )
-        pub_ip.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(pub_ip)
+        await hub.exec.azurerm.utils.wait_for_operation(pub_ip)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -113,7 +122,8 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
 
     try:
-        pub_ip = netconn.public_ip_addresses.get(
+        pub_ip = await hub.exec.azurerm.utils.sdk_call(
+            netconn.public_ip_addresses.get,
             public_ip_address_name=name,
             resource_group_name=resource_group,
             expand=expand,
@@ -126,10 +136,12 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def create_or_update(hub, ctx, name, resource_group, **kwargs):
+async def create_or_update(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or update a public IP address within a specified resource group.
 
     :param name: The name of the public IP address to create.
@@ -137,6 +149,9 @@ async def create_or_update(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         public IP address.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -145,7 +160,7 @@ async def create_or_update(hub, ctx, name, resource_group, **kwargs):
 
     """
     if "location" not in kwargs:
-        rg_props = await hub.exec.azurerm.resource.group.get(
+        rg_props = await hub.exec.azurerm.resource.group.get_location(
             ctx, resource_group, **kwargs
         )
 
@@ -169,13 +184,15 @@ async def create_or_update(hub, ctx, name, resource_group, **kwargs):
         return result
 
     try:
-        ip = netconn.public_ip_addresses.create_or_update(
+        ip = await hub.exec.azurerm.utils.begin_operation(
+            netconn.public_ip_addresses.create_or_update,
             resource_group_name=resource_group,
             public_ip_address_name=name,
             parameters=pub_ip_model,
         )
-        ip.wait()
-        ip_result = ip.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(ip)
+        ip_result = await hub.exec.azurerm.utils.wait_for_operation(ip)
         result = ip_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -188,12 +205,15 @@ async def create_or_update(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def list_all(hub, ctx, **kwargs):
+async def list_all(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
     List all public IP addresses within a subscription.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -204,11 +224,13 @@ async def list_all(hub, ctx, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        pub_ips = await hub.exec.azurerm.utils.paged_object_to_list(
+        pub_ips = hub.exec.azurerm.utils.paged_object_iter(
             netconn.public_ip_addresses.list_all()
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(pub_ips)
 
-        for ip in pub_ips:
+        async for ip in pub_ips:
             result[ip["name"]] = ip
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -217,7 +239,7 @@ async def list_all(hub, ctx, **kwargs):
     return result
 
 
-async def list_(hub, ctx, resource_group, **kwargs):
+async def list_(hub, ctx, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -226,6 +248,9 @@ async def list_(hub, ctx, resource_group, **kwargs):
     :param resource_group: The resource group name to list public IP
         addresses within.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -236,11 +261,13 @@ async def list_(hub, ctx, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        pub_ips = await hub.exec.azurerm.utils.paged_object_to_list(
+        pub_ips = hub.exec.azurerm.utils.paged_object_iter(
             netconn.public_ip_addresses.list(resource_group_name=resource_group)
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(pub_ips)
 
-        for ip in pub_ips:
+        async for ip in pub_ips:
             result[ip["name"]] = ip
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -34,6 +34,7 @@ Azure Resource Manager (ARM) Network Route Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 try:
@@ -44,22 +45,25 @@ except ImportError:
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.network.models  # pylint: disable=unused-import
     from msrestazure.tools import is_valid_resource_id, parse_resource_id
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.network") is not None
 except ImportError:
     pass
 
 log = logging.getLogger(__name__)
 
 
-async def filter_rule_delete(hub, ctx, name, route_filter, resource_group, **kwargs):
+async def filter_rule_delete(
+    hub, ctx, name, route_filter, resource_group, no_wait=False, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Delete a route filter rule.
 
     :param name: The route filter rule to delete.
@@ -69,6 +73,9 @@ async def filter_rule_delete(hub, ctx, name, route_filter, resource_group, **kwa
     :param resource_group: The resource group name assigned to the
         route filter.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -79,12 +86,15 @@ async def filter_rule_delete(hub, ctx, name, route_filter, resource_group, **kwa
     result = False
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        rule = netconn.route_filter_rules.delete(
+        rule = await hub.exec.azurerm.utils.begin_operation(
+            netconn.route_filter_rules.delete,
             resource_group_name=resource_group,
             route_filter_name=route_filter,
             rule_name=name,
         )
-        rule.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(rule)
+        await hub.exec.azurerm.utils.wait_for_operation(rule)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -115,7 +125,8 @@ async def filter_rule_get(hub, ctx, name, route_filter, resource_group, **kwargs
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        rule = netconn.route_filter_rules.get(
+        rule = await hub.exec.azurerm.utils.sdk_call(
+            netconn.route_filter_rules.get,
             resource_group_name=resource_group,
             route_filter_name=route_filter,
             rule_name=name,
@@ -130,11 +141,21 @@ async def filter_rule_get(hub, ctx, name, route_filter, resource_group, **kwargs
 
 
 async def filter_rule_create_or_update(
-    hub, ctx, name, access, communities, route_filter, resource_group, **kwargs
+    hub,
+    ctx,
+    name,
+    access,
+    communities,
+    route_filter,
+    resource_group,
+    no_wait=False,
+    **kwargs,
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or update a rule within a specified route filter.
 
     :param name: The name of the rule to create.
@@ -148,6 +169,9 @@ async def filter_rule_create_or_update(
     :param resource_group: The resource group name assigned to the
         route filter.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -161,7 +185,7 @@ async def filter_rule_create_or_update(
         return {"error": "The communities parameter must be a list of strings!"}
 
     if "location" not in kwargs:
-        rg_props = await hub.exec.azurerm.resource.group.get(
+        rg_props = await hub.exec.azurerm.resource.group.get_location(
             ctx, resource_group, **kwargs
         )
 
@@ -189,14 +213,16 @@ async def filter_rule_create_or_update(
         return result
 
     try:
-        rule = netconn.route_filter_rules.create_or_update(
+        rule = await hub.exec.azurerm.utils.begin_operation(
+            netconn.route_filter_rules.create_or_update,
             resource_group_name=resource_group,
             route_filter_name=route_filter,
             rule_name=name,
             route_filter_rule_parameters=rule_model,
         )
-        rule.wait()
-        rule_result = rule.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(rule)
+        rule_result = await hub.exec.azurerm.utils.wait_for_operation(rule)
         result = rule_result.as_dict()
     except CloudError as exc:
         message = str(exc)
@@ -212,7 +238,9 @@ async def filter_rule_create_or_update(
     return result
 
 
-async def filter_rules_list(hub, ctx, route_filter, resource_group, **kwargs):
+async def filter_rules_list(
+    hub, ctx, route_filter, resource_group, stream=False, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
@@ -223,6 +251,9 @@ async def filter_rules_list(hub, ctx, route_filter, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         route filter.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -233,13 +264,15 @@ async def filter_rules_list(hub, ctx, route_filter, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        rules = await hub.exec.azurerm.utils.paged_object_to_list(
+        rules = hub.exec.azurerm.utils.paged_object_iter(
             netconn.route_filter_rules.list_by_route_filter(
                 resource_group_name=resource_group, route_filter_name=route_filter
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(rules)
 
-        for rule in rules:
+        async for rule in rules:
             result[rule["name"]] = rule
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -248,10 +281,12 @@ async def filter_rules_list(hub, ctx, route_filter, resource_group, **kwargs):
     return result
 
 
-async def filter_delete(hub, ctx, name, resource_group, **kwargs):
+async def filter_delete(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Delete a route filter.
 
     :param name: The name of the route filter to delete.
@@ -259,6 +294,9 @@ async def filter_delete(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         route filter.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -269,10 +307,14 @@ async def filter_delete(hub, ctx, name, resource_group, **kwargs):
     result = False
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        route_filter = netconn.route_filters.delete(
-            route_filter_name=name, resource_group_name=resource_group
+        route_filter = await hub.exec.azurerm.utils.begin_operation(
+            netconn.route_filters.delete,
+            route_filter_name=name,
+            resource_group_name=resource_group,
         )
-        route_filter.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(route_filter)
+        await hub.exec.azurerm.utils.wait_for_operation(route_filter)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -303,8 +345,11 @@ async def filter_get(hub, ctx, name, resource_group, **kwargs):
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
 
     try:
-        route_filter = netconn.route_filters.get(
-            route_filter_name=name, resource_group_name=resource_group, expand=expand
+        route_filter = await hub.exec.azurerm.utils.sdk_call(
+            netconn.route_filters.get,
+            route_filter_name=name,
+            resource_group_name=resource_group,
+            expand=expand,
         )
         result = route_filter.as_dict()
     except CloudError as exc:
@@ -314,10 +359,14 @@ async def filter_get(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def filter_create_or_update(hub, ctx, name, resource_group, **kwargs):
+async def filter_create_or_update(
+    hub, ctx, name, resource_group, no_wait=False, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or update a route filter within a specified resource group.
 
     :param name: The name of the route filter to create.
@@ -325,6 +374,9 @@ async def filter_create_or_update(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         route filter.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -333,7 +385,7 @@ async def filter_create_or_update(hub, ctx, name, resource_group, **kwargs):
 
     """
     if "location" not in kwargs:
-        rg_props = await hub.exec.azurerm.resource.group.get(
+        rg_props = await hub.exec.azurerm.resource.group.get_location(
             ctx, resource_group, **kwargs
         )
 
@@ -357,13 +409,15 @@ async def filter_create_or_update(hub, ctx, name, resource_group, **kwargs):
         return result
 
     try:
-        rt_filter = netconn.route_filters.create_or_update(
+        rt_filter = await hub.exec.azurerm.utils.begin_operation(
+            netconn.route_filters.create_or_update,
             resource_group_name=resource_group,
             route_filter_name=name,
             route_filter_parameters=rt_filter_model,
         )
-        rt_filter.wait()
-        rt_result = rt_filter.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(rt_filter)
+        rt_result = await hub.exec.azurerm.utils.wait_for_operation(rt_filter)
         result = rt_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -376,7 +430,7 @@ async def filter_create_or_update(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def filters_list(hub, ctx, resource_group, **kwargs):
+async def filters_list(hub, ctx, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -385,6 +439,9 @@ async def filters_list(hub, ctx, resource_group, **kwargs):
     :param resource_group: The resource group name to list route
         filters within.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -395,13 +452,15 @@ async def filters_list(hub, ctx, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        filters = await hub.exec.azurerm.utils.paged_object_to_list(
+        filters = hub.exec.azurerm.utils.paged_object_iter(
             netconn.route_filters.list_by_resource_group(
                 resource_group_name=resource_group
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(filters)
 
-        for route_filter in filters:
+        async for route_filter in filters:
             result[route_filter["name"]] = route_filter
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -410,12 +469,15 @@ async def filters_list(hub, ctx, resource_group, **kwargs):
     return result
 
 
-async def filters_list_all(hub, ctx, **kwargs):
+async def filters_list_all(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
     List all route filters within a subscription.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -426,11 +488,11 @@ async def filters_list_all(hub, ctx, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        filters = await hub.exec.azurerm.utils.paged_object_to_list(
-            netconn.route_filters.list()
-        )
+        filters = hub.exec.azurerm.utils.paged_object_iter(netconn.route_filters.list())
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(filters)
 
-        for route_filter in filters:
+        async for route_filter in filters:
             result[route_filter["name"]] = route_filter
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -439,10 +501,12 @@ async def filters_list_all(hub, ctx, **kwargs):
     return result
 
 
-async def delete(hub, ctx, name, route_table, resource_group, **kwargs):
+async def delete(hub, ctx, name, route_table, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Delete a route from a route table.
 
     :param name: The route to delete.
@@ -452,6 +516,9 @@ async def delete(hub, ctx, name, route_table, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         route table.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -462,12 +529,15 @@ async def delete(hub, ctx, name, route_table, resource_group, **kwargs):
     result = False
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        route = netconn.routes.delete(
+        route = await hub.exec.azurerm.utils.begin_operation(
+            netconn.routes.delete,
             resource_group_name=resource_group,
             route_table_name=route_table,
             route_name=name,
         )
-        route.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(route)
+        await hub.exec.azurerm.utils.wait_for_operation(route)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -498,7 +568,8 @@ async def get(hub, ctx, name, route_table, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        route = netconn.routes.get(
+        route = await hub.exec.azurerm.utils.sdk_call(
+            netconn.routes.get,
             resource_group_name=resource_group,
             route_table_name=route_table,
             route_name=name,
@@ -521,11 +592,14 @@ async def create_or_update(
     route_table,
     resource_group,
     next_hop_ip_address=None,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or update a route within a specified route table.
 
     :param name: The name of the route to create.
@@ -543,6 +617,9 @@ async def create_or_update(
     :param resource_group: The resource group name assigned to the
         route table.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -568,14 +645,16 @@ async def create_or_update(
         return result
 
     try:
-        route = netconn.routes.create_or_update(
+        route = await hub.exec.azurerm.utils.begin_operation(
+            netconn.routes.create_or_update,
             resource_group_name=resource_group,
             route_table_name=route_table,
             route_name=name,
             route_parameters=rt_model,
         )
-        route.wait()
-        rt_result = route.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(route)
+        rt_result = await hub.exec.azurerm.utils.wait_for_operation(route)
         result = rt_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -588,7 +667,7 @@ async def create_or_update(
     return result
 
 
-async def routes_list(hub, ctx, route_table, resource_group, **kwargs):
+async def routes_list(hub, ctx, route_table, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -599,6 +678,9 @@ async def routes_list(hub, ctx, route_table, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         route table.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -609,13 +691,15 @@ async def routes_list(hub, ctx, route_table, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        routes = await hub.exec.azurerm.utils.paged_object_to_list(
+        routes = hub.exec.azurerm.utils.paged_object_iter(
             netconn.routes.list(
                 resource_group_name=resource_group, route_table_name=route_table
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(routes)
 
-        for route in routes:
+        async for route in routes:
             result[route["name"]] = route
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -624,10 +708,12 @@ async def routes_list(hub, ctx, route_table, resource_group, **kwargs):
     return result
 
 
-async def table_delete(hub, ctx, name, resource_group, **kwargs):
+async def table_delete(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Delete a route table.
 
     :param name: The name of the route table to delete.
@@ -635,6 +721,9 @@ async def table_delete(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         route table.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -645,10 +734,14 @@ async def table_delete(hub, ctx, name, resource_group, **kwargs):
     result = False
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        table = netconn.route_tables.delete(
-            route_table_name=name, resource_group_name=resource_group
+        table = await hub.exec.azurerm.utils.begin_operation(
+            netconn.route_tables.delete,
+            route_table_name=name,
+            resource_group_name=resource_group,
         )
-        table.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(table)
+        await hub.exec.azurerm.utils.wait_for_operation(table)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -679,8 +772,11 @@ async def table_get(hub, ctx, name, resource_group, **kwargs):
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
 
     try:
-        table = netconn.route_tables.get(
-            route_table_name=name, resource_group_name=resource_group, expand=expand
+        table = await hub.exec.azurerm.utils.sdk_call(
+            netconn.route_tables.get,
+            route_table_name=name,
+            resource_group_name=resource_group,
+            expand=expand,
         )
         result = table.as_dict()
     except CloudError as exc:
@@ -690,10 +786,14 @@ async def table_get(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def table_create_or_update(hub, ctx, name, resource_group, **kwargs):
+async def table_create_or_update(
+    hub, ctx, name, resource_group, no_wait=False, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or update a route table within a specified resource group.
 
     :param name: The name of the route table to create.
@@ -701,6 +801,9 @@ async def table_create_or_update(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         route table.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -709,7 +812,7 @@ async def table_create_or_update(hub, ctx, name, resource_group, **kwargs):
 
     """
     if "location" not in kwargs:
-        rg_props = await hub.exec.azurerm.resource.group.get(
+        rg_props = await hub.exec.azurerm.resource.group.get_location(
             ctx, resource_group, **kwargs
         )
 
@@ -733,13 +836,15 @@ async def table_create_or_update(hub, ctx, name, resource_group, **kwargs):
         return result
 
     try:
-        table = netconn.route_tables.create_or_update(
+        table = await hub.exec.azurerm.utils.begin_operation(
+            netconn.route_tables.create_or_update,
             resource_group_name=resource_group,
             route_table_name=name,
             parameters=rt_tbl_model,
         )
-        table.wait()
-        tbl_result = table.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(table)
+        tbl_result = await hub.exec.azurerm.utils.wait_for_operation(table)
         result = tbl_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -752,7 +857,7 @@ async def table_create_or_update(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def tables_list(hub, ctx, resource_group, **kwargs):
+async def tables_list(hub, ctx, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -761,6 +866,9 @@ async def tables_list(hub, ctx, resource_group, **kwargs):
     :param resource_group: The resource group name to list route
         tables within.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -771,11 +879,13 @@ async def tables_list(hub, ctx, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        tables = await hub.exec.azurerm.utils.paged_object_to_list(
+        tables = hub.exec.azurerm.utils.paged_object_iter(
             netconn.route_tables.list(resource_group_name=resource_group)
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(tables)
 
-        for table in tables:
+        async for table in tables:
             result[table["name"]] = table
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -784,12 +894,15 @@ async def tables_list(hub, ctx, resource_group, **kwargs):
     return result
 
 
-async def tables_list_all(hub, ctx, **kwargs):
+async def tables_list_all(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
     List all route tables within a subscription.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -800,11 +913,13 @@ async def tables_list_all(hub, ctx, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        tables = await hub.exec.azurerm.utils.paged_object_to_list(
+        tables = hub.exec.azurerm.utils.paged_object_iter(
             netconn.route_tables.list_all()
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(tables)
 
-        for table in tables:
+        async for table in tables:
             result[table["name"]] = table
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
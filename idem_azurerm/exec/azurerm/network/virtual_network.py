@@ -34,6 +34,7 @@ Azure Resource Manager (ARM) Virtual Network Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 try:
@@ -44,12 +45,11 @@ except ImportError:
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.network.models  # pylint: disable=unused-import
     from msrestazure.tools import is_valid_resource_id, parse_resource_id
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.network") is not None
 except ImportError:
     pass
 
@@ -58,7 +58,9 @@ __func_alias__ = {"list_": "list"}
 log = logging.getLogger(__name__)
 
 
-async def subnets_list(hub, ctx, virtual_network, resource_group, **kwargs):
+async def subnets_list(
+    hub, ctx, virtual_network, resource_group, stream=False, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
@@ -69,6 +71,9 @@ async def subnets_list(hub, ctx, virtual_network, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         virtual network.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -79,13 +84,15 @@ async def subnets_list(hub, ctx, virtual_network, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        subnets = await hub.exec.azurerm.utils.paged_object_to_list(
+        subnets = hub.exec.azurerm.utils.paged_object_iter(
             netconn.subnets.list(
                 resource_group_name=resource_group, virtual_network_name=virtual_network
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(subnets)
 
-        for subnet in subnets:
+        async for subnet in subnets:
             result[subnet["name"]] = subnet
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -117,7 +124,8 @@ async def subnet_get(hub, ctx, name, virtual_network, resource_group, **kwargs):
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        subnet = netconn.subnets.get(
+        subnet = await hub.exec.azurerm.utils.sdk_call(
+            netconn.subnets.get,
             resource_group_name=resource_group,
             virtual_network_name=virtual_network,
             subnet_name=name,
@@ -132,11 +140,20 @@ async def subnet_get(hub, ctx, name, virtual_network, resource_group, **kwargs):
 
 
 async def subnet_create_or_update(
-    hub, ctx, name, address_prefix, virtual_network, resource_group, **kwargs
+    hub,
+    ctx,
+    name,
+    address_prefix,
+    virtual_network,
+    resource_group,
+    no_wait=False,
+    **kwargs,
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or update a subnet.
 
     :param name: The name assigned to the subnet being created or updated.
@@ -149,6 +166,9 @@ async def subnet_create_or_update(
     :param resource_group: The resource group name assigned to the
         virtual network.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -193,14 +213,16 @@ async def subnet_create_or_update(
         return result
 
     try:
-        subnet = netconn.subnets.create_or_update(
+        subnet = await hub.exec.azurerm.utils.begin_operation(
+            netconn.subnets.create_or_update,
             resource_group_name=resource_group,
             virtual_network_name=virtual_network,
             subnet_name=name,
             subnet_parameters=snetmodel,
         )
-        subnet.wait()
-        sn_result = subnet.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(subnet)
+        sn_result = await hub.exec.azurerm.utils.wait_for_operation(subnet)
         result = sn_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -213,10 +235,14 @@ async def subnet_create_or_update(
     return result
 
 
-async def subnet_delete(hub, ctx, name, virtual_network, resource_group, **kwargs):
+async def subnet_delete(
+    hub, ctx, name, virtual_network, resource_group, no_wait=False, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Delete a subnet.
 
     :param name: The name of the subnet to delete.
@@ -227,6 +253,9 @@ async def subnet_delete(hub, ctx, name, virtual_network, resource_group, **kwarg
     :param resource_group: The resource group name assigned to the
         virtual network.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -237,12 +266,15 @@ async def subnet_delete(hub, ctx, name, virtual_network, resource_group, **kwarg
     result = False
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        subnet = netconn.subnets.delete(
+        subnet = await hub.exec.azurerm.utils.begin_operation(
+            netconn.subnets.delete,
             resource_group_name=resource_group,
             virtual_network_name=virtual_network,
             subnet_name=name,
         )
-        subnet.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(subnet)
+        await hub.exec.azurerm.utils.wait_for_operation(subnet)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -250,12 +282,15 @@ async def subnet_delete(hub, ctx, name, virtual_network, resource_group, **kwarg
     return result
 
 
-async def list_all(hub, ctx, **kwargs):
+async def list_all(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
     List all virtual networks within a subscription.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -266,11 +301,13 @@ async def list_all(hub, ctx, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        vnets = await hub.exec.azurerm.utils.paged_object_to_list(
+        vnets = hub.exec.azurerm.utils.paged_object_iter(
             netconn.virtual_networks.list_all()
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(vnets)
 
-        for vnet in vnets:
+        async for vnet in vnets:
             result[vnet["name"]] = vnet
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -279,7 +316,7 @@ async def list_all(hub, ctx, **kwargs):
     return result
 
 
-async def list_(hub, ctx, resource_group, **kwargs):
+async def list_(hub, ctx, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -288,6 +325,9 @@ async def list_(hub, ctx, resource_group, **kwargs):
     :param resource_group: The resource group name to list virtual networks
         within.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -298,11 +338,13 @@ async def list_(hub, ctx, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        vnets = await hub.exec.azurerm.utils.paged_object_to_list(
+        vnets = hub.exec.azurerm.utils.paged_object_iter(
             netconn.virtual_networks.list(resource_group_name=resource_group)
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(vnets)
 
-        for vnet in vnets:
+        async for vnet in vnets:
             result[vnet["name"]] = vnet
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -311,10 +353,14 @@ async def list_(hub, ctx, resource_group, **kwargs):
     return result
 
 
-async def create_or_update(hub, ctx, name, address_prefixes, resource_group, **kwargs):
+async def create_or_update(
+    hub, ctx, name, address_prefixes, resource_group, no_wait=False, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or update a virtual network.
 
     :param name: The name assigned to the virtual network being
@@ -326,6 +372,9 @@ async def create_or_update(hub, ctx, name, address_prefixes, resource_group, **k
     :param resource_group: The resource group name assigned to the
         virtual network.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -335,7 +384,7 @@ async def create_or_update(hub, ctx, name, address_prefixes, resource_group, **k
 
     """
     if "location" not in kwargs:
-        rg_props = await hub.exec.azurerm.resource.group.get(
+        rg_props = await hub.exec.azurerm.resource.group.get_location(
             ctx, resource_group, **kwargs
         )
 
@@ -370,13 +419,15 @@ async def create_or_update(hub, ctx, name, address_prefixes, resource_group, **k
         return result
 
     try:
-        vnet = netconn.virtual_networks.create_or_update(
+        vnet = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_networks.create_or_update,
             virtual_network_name=name,
             resource_group_name=resource_group,
             parameters=vnetmodel,
         )
-        vnet.wait()
-        vnet_result = vnet.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(vnet)
+        vnet_result = await hub.exec.azurerm.utils.wait_for_operation(vnet)
         result = vnet_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -389,10 +440,12 @@ async def create_or_update(hub, ctx, name, address_prefixes, resource_group, **k
     return result
 
 
-async def delete(hub, ctx, name, resource_group, **kwargs):
+async def delete(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Delete a virtual network.
 
     :param name: The name of the virtual network to delete.
@@ -400,6 +453,9 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         virtual network
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -410,10 +466,14 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     result = False
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        vnet = netconn.virtual_networks.delete(
-            virtual_network_name=name, resource_group_name=resource_group
+        vnet = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_networks.delete,
+            virtual_network_name=name,
+            resource_group_name=resource_group,
         )
-        vnet.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(vnet)
+        await hub.exec.azurerm.utils.wait_for_operation(vnet)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -441,8 +501,10 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        vnet = netconn.virtual_networks.get(
-            virtual_network_name=name, resource_group_name=resource_group
+        vnet = await hub.exec.azurerm.utils.sdk_call(
+            netconn.virtual_networks.get,
+            virtual_network_name=name,
+            resource_group_name=resource_group,
         )
         result = vnet.as_dict()
     except CloudError as exc:
@@ -34,6 +34,7 @@ Azure Resource Manager (ARM) Virtual Network Gateway Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 try:
@@ -44,12 +45,11 @@ except ImportError:
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.network.models  # pylint: disable=unused-import
     from msrestazure.tools import is_valid_resource_id, parse_resource_id
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.network") is not None
 except ImportError:
     pass
 
@@ -59,11 +59,20 @@ log = logging.getLogger(__name__)
 
 
 async def connection_create_or_update(
-    hub, ctx, name, resource_group, virtual_network_gateway, connection_type, **kwargs
+    hub,
+    ctx,
+    name,
+    resource_group,
+    virtual_network_gateway,
+    connection_type,
+    no_wait=False,
+    **kwargs,
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Creates or updates a virtual network gateway connection in the specified resource group.
 
     :param name: The name of the virtual network gateway connection to create or update.
@@ -85,6 +94,9 @@ async def connection_create_or_update(
         passed as the peer kwarg.
     The second endpoint is immutable once set.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -94,7 +106,7 @@ async def connection_create_or_update(
 
     """
     if "location" not in kwargs:
-        rg_props = await hub.exec.azurerm.resource.group.get(
+        rg_props = await hub.exec.azurerm.resource.group.get_location(
             ctx, resource_group, **kwargs
         )
 
@@ -183,13 +195,15 @@ async def connection_create_or_update(
         return result
 
     try:
-        connection = netconn.virtual_network_gateway_connections.create_or_update(
+        connection = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_network_gateway_connections.create_or_update,
             resource_group_name=resource_group,
             virtual_network_gateway_connection_name=name,
             parameters=connectionmodel,
         )
-        connection.wait()
-        connection_result = connection.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(connection)
+        connection_result = await hub.exec.azurerm.utils.wait_for_operation(connection)
         result = connection_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -221,7 +235,8 @@ async def connection_get(hub, ctx, name, resource_group, **kwargs):
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        connection = netconn.virtual_network_gateway_connections.get(
+        connection = await hub.exec.azurerm.utils.sdk_call(
+            netconn.virtual_network_gateway_connections.get,
             resource_group_name=resource_group,
             virtual_network_gateway_connection_name=name,
         )
@@ -234,16 +249,21 @@ async def connection_get(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def connection_delete(hub, ctx, name, resource_group, **kwargs):
+async def connection_delete(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Deletes the specified virtual network gateway connection.
 
     :param name: The name of the virtual network gateway connection that will be deleted.
 
     :param resource_group: The name of the resource group.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -254,11 +274,14 @@ async def connection_delete(hub, ctx, name, resource_group, **kwargs):
     result = False
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        connection = netconn.virtual_network_gateway_connections.delete(
+        connection = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_network_gateway_connections.delete,
             resource_group_name=resource_group,
             virtual_network_gateway_connection_name=name,
         )
-        connection.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(connection)
+        await hub.exec.azurerm.utils.wait_for_operation(connection)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -266,10 +289,14 @@ async def connection_delete(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def connection_set_shared_key(hub, ctx, name, resource_group, value, **kwargs):
+async def connection_set_shared_key(
+    hub, ctx, name, resource_group, value, no_wait=False, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Sets the shared key for a virtual network gateway connection object.
 
     :param name: The virtual network gateway connection name.
@@ -278,6 +305,9 @@ async def connection_set_shared_key(hub, ctx, name, resource_group, value, **kwa
 
     :param value: The new virtual network connection shared key value.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -290,13 +320,16 @@ async def connection_set_shared_key(hub, ctx, name, resource_group, value, **kwa
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
 
     try:
-        key = netconn.virtual_network_gateway_connections.set_shared_key(
+        key = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_network_gateway_connections.set_shared_key,
             resource_group_name=resource_group,
             virtual_network_gateway_connection_name=name,
             value=value,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(key)
 
-        key.wait()
+        await hub.exec.azurerm.utils.wait_for_operation(key)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -325,7 +358,8 @@ async def connection_get_shared_key(hub, ctx, name, resource_group, **kwargs):
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        key = netconn.virtual_network_gateway_connections.get_shared_key(
+        key = await hub.exec.azurerm.utils.sdk_call(
+            netconn.virtual_network_gateway_connections.get_shared_key,
             resource_group_name=resource_group,
             virtual_network_gateway_connection_name=name,
         )
@@ -339,11 +373,13 @@ async def connection_get_shared_key(hub, ctx, name, resource_group, **kwargs):
 
 
 async def connection_reset_shared_key(
-    hub, ctx, name, resource_group, key_length=128, **kwargs
+    hub, ctx, name, resource_group, key_length=128, no_wait=False, **kwargs
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Resets the virtual network gateway connection shared key for passed virtual network
         gateway connection in the specified resource group through Network resource provider.
 
@@ -354,6 +390,9 @@ async def connection_reset_shared_key(
     :param key_length: The virtual network connection reset shared key length, should between 1 and 128.
         Defaults to 128.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -365,13 +404,16 @@ async def connection_reset_shared_key(
     result = False
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        rkey = netconn.virtual_network_gateway_connections.reset_shared_key(
+        rkey = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_network_gateway_connections.reset_shared_key,
             resource_group_name=resource_group,
             virtual_network_gateway_connection_name=name,
             key_length=key_length,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(rkey)
 
-        rkey.wait()
+        await hub.exec.azurerm.utils.wait_for_operation(rkey)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -380,7 +422,7 @@ async def connection_reset_shared_key(
     return result
 
 
-async def connections_list(hub, ctx, resource_group, **kwargs):
+async def connections_list(hub, ctx, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -388,6 +430,9 @@ async def connections_list(hub, ctx, resource_group, **kwargs):
 
     :param resource_group: The name of the resource group.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -398,13 +443,15 @@ async def connections_list(hub, ctx, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        connections = await hub.exec.azurerm.utils.paged_object_to_list(
+        connections = hub.exec.azurerm.utils.paged_object_iter(
             netconn.virtual_network_gateway_connections.list(
                 resource_group_name=resource_group
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(connections)
 
-        for connection in connections:
+        async for connection in connections:
             result[connection["name"]] = connection
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -413,7 +460,7 @@ async def connections_list(hub, ctx, resource_group, **kwargs):
     return result
 
 
-async def list_(hub, ctx, resource_group, **kwargs):
+async def list_(hub, ctx, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -421,6 +468,9 @@ async def list_(hub, ctx, resource_group, **kwargs):
 
     :param resource_group: The name of the resource group.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -431,11 +481,13 @@ async def list_(hub, ctx, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        gateways = await hub.exec.azurerm.utils.paged_object_to_list(
+        gateways = hub.exec.azurerm.utils.paged_object_iter(
             netconn.virtual_network_gateways.list(resource_group_name=resource_group)
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(gateways)
 
-        for gateway in gateways:
+        async for gateway in gateways:
             result[gateway["name"]] = gateway
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -445,11 +497,20 @@ async def list_(hub, ctx, resource_group, **kwargs):
 
 
 async def create_or_update(
-    hub, ctx, name, resource_group, virtual_network, ip_configurations, **kwargs
+    hub,
+    ctx,
+    name,
+    resource_group,
+    virtual_network,
+    ip_configurations,
+    no_wait=False,
+    **kwargs,
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Creates or updates a virtual network gateway in the specified resource group.
 
     :param name: The name of the virtual network gateway to be created or updated.
@@ -468,6 +529,9 @@ async def create_or_update(
         If the active_active keyword argument is disabled, only one IP configuration dictionary is permitted.
         If the active_active keyword argument is enabled, two IP configuration dictionaries are required.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -477,7 +541,7 @@ async def create_or_update(
 
     """
     if "location" not in kwargs:
-        rg_props = await hub.exec.azurerm.resource.group.get(
+        rg_props = await hub.exec.azurerm.resource.group.get_location(
             ctx, resource_group, **kwargs
         )
 
@@ -528,13 +592,15 @@ async def create_or_update(
         return result
 
     try:
-        gateway = netconn.virtual_network_gateways.create_or_update(
+        gateway = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_network_gateways.create_or_update,
             resource_group_name=resource_group,
             virtual_network_gateway_name=name,
             parameters=gatewaymodel,
         )
-        gateway.wait()
-        gateway_result = gateway.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(gateway)
+        gateway_result = await hub.exec.azurerm.utils.wait_for_operation(gateway)
         result = gateway_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -566,8 +632,10 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        gateway = netconn.virtual_network_gateways.get(
-            resource_group_name=resource_group, virtual_network_gateway_name=name
+        gateway = await hub.exec.azurerm.utils.sdk_call(
+            netconn.virtual_network_gateways.get,
+            resource_group_name=resource_group,
+            virtual_network_gateway_name=name,
         )
 
         result = gateway.as_dict()
@@ -578,16 +646,21 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def delete(hub, ctx, name, resource_group, **kwargs):
+async def delete(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Deletes the specified virtual network gateway.
 
     :param name: The name of the virtual network gateway that will be deleted.
 
     :param resource_group: The name of the resource group.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -598,10 +671,14 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     result = False
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        gateway = netconn.virtual_network_gateways.delete(
-            resource_group_name=resource_group, virtual_network_gateway_name=name
+        gateway = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_network_gateways.delete,
+            resource_group_name=resource_group,
+            virtual_network_gateway_name=name,
         )
-        gateway.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(gateway)
+        await hub.exec.azurerm.utils.wait_for_operation(gateway)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -609,7 +686,7 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def list_connections(hub, ctx, name, resource_group, **kwargs):
+async def list_connections(hub, ctx, name, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -619,6 +696,9 @@ async def list_connections(hub, ctx, name, resource_group, **kwargs):
 
     :param resource_group: The name of the resource group.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -629,12 +709,14 @@ async def list_connections(hub, ctx, name, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        connections = await hub.exec.azurerm.utils.paged_object_to_list(
+        connections = hub.exec.azurerm.utils.paged_object_iter(
             netconn.virtual_network_gateways.list_connections(
                 resource_group_name=resource_group, virtual_network_gateway_name=name
             )
         )
-        for connection in connections:
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(connections)
+        async for connection in connections:
             result[connection["name"]] = connection
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -643,10 +725,14 @@ async def list_connections(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def reset(hub, ctx, name, resource_group, gateway_vip=None, **kwargs):
+async def reset(
+    hub, ctx, name, resource_group, gateway_vip=None, no_wait=False, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Resets the virtual network gateway in the specified resource group.
 
     :param name: The name of the virtual network gateway to reset.
@@ -656,6 +742,9 @@ async def reset(hub, ctx, name, resource_group, gateway_vip=None, **kwargs):
     :param gateway_vip: Virtual network gateway vip address supplied to the begin
         reset of the active-active feature enabled gateway.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -666,12 +755,15 @@ async def reset(hub, ctx, name, resource_group, gateway_vip=None, **kwargs):
     result = False
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        reset = netconn.virtual_network_gateways.reset(
+        reset = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_network_gateways.reset,
             resource_group_name=resource_group,
             virtual_network_gateway_name=name,
             gateway_vip=gateway_vip,
         )
-        reset.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(reset)
+        await hub.exec.azurerm.utils.wait_for_operation(reset)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -680,16 +772,23 @@ async def reset(hub, ctx, name, resource_group, gateway_vip=None, **kwargs):
     return result
 
 
-async def reset_vpn_client_shared_key(hub, ctx, name, resource_group, **kwargs):
+async def reset_vpn_client_shared_key(
+    hub, ctx, name, resource_group, no_wait=False, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Resets the VPN client shared key of the virtual network gateway in the specified resource group.
 
     :param name: The name of the virtual network gateway.
 
     :param resource_group: The name of the resource group.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -700,11 +799,15 @@ async def reset_vpn_client_shared_key(hub, ctx, name, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        reset = netconn.virtual_network_gateways.reset_vpn_client_shared_key(
-            resource_group_name=resource_group, virtual_network_gateway_name=name
+        reset = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_network_gateways.reset_vpn_client_shared_key,
+            resource_group_name=resource_group,
+            virtual_network_gateway_name=name,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(reset)
 
-        reset_result = reset.result()
+        reset_result = await hub.exec.azurerm.utils.wait_for_operation(reset)
         result = reset_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -770,7 +873,8 @@ async def generatevpnclientpackage(
         return result
 
     try:
-        pkg = netconn.virtual_network_gateways.generatevpnclientpackage(
+        pkg = await hub.exec.azurerm.utils.sdk_call(
+            netconn.virtual_network_gateways.generatevpnclientpackage,
             resource_group_name=resource_group,
             virtual_network_gateway_name=name,
             parameters=pkgmodel,
@@ -846,7 +950,8 @@ async def generate_vpn_profile(
         return result
 
     try:
-        profile = netconn.virtual_network_gateways.generate_vpn_profile(
+        profile = await hub.exec.azurerm.utils.sdk_call(
+            netconn.virtual_network_gateways.generate_vpn_profile,
             resource_group_name=resource_group,
             virtual_network_gateway_name=name,
             parameters=profilemodel,
@@ -885,11 +990,13 @@ async def get_vpn_profile_package_url(hub, ctx, name, resource_group, **kwargs):
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        url = netconn.virtual_network_gateways.get_vpn_profile_package_url(
-            resource_group_name=resource_group, virtual_network_gateway_name=name
+        url = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_network_gateways.get_vpn_profile_package_url,
+            resource_group_name=resource_group,
+            virtual_network_gateway_name=name,
         )
 
-        result = url.result()
+        result = await hub.exec.azurerm.utils.wait_for_operation(url)
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -919,13 +1026,16 @@ async def get_bgp_peer_status(hub, ctx, name, resource_group, peer=None, **kwarg
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        peers = netconn.virtual_network_gateways.get_bgp_peer_status(
+        peers = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_network_gateways.get_bgp_peer_status,
             resource_group_name=resource_group,
             virtual_network_gateway_name=name,
             peer=peer,
         )
 
-        peers_result = peers.result().as_dict()
+        peers_result = (
+            await hub.exec.azurerm.utils.wait_for_operation(peers)
+        ).as_dict()
         for bgp_peer in peers_result["value"]:
             result["BGP peer"] = bgp_peer
     except CloudError as exc:
@@ -954,8 +1064,10 @@ async def supported_vpn_devices(hub, ctx, name, resource_group, **kwargs):
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        devices = netconn.virtual_network_gateways.supported_vpn_devices(
-            resource_group_name=resource_group, virtual_network_gateway_name=name
+        devices = await hub.exec.azurerm.utils.sdk_call(
+            netconn.virtual_network_gateways.supported_vpn_devices,
+            resource_group_name=resource_group,
+            virtual_network_gateway_name=name,
         )
 
         result = devices
@@ -986,11 +1098,15 @@ async def get_learned_routes(hub, ctx, name, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        routes = netconn.virtual_network_gateways.get_learned_routes(
-            resource_group_name=resource_group, virtual_network_gateway_name=name
+        routes = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_network_gateways.get_learned_routes,
+            resource_group_name=resource_group,
+            virtual_network_gateway_name=name,
         )
 
-        routes_result = routes.result().as_dict()
+        routes_result = (
+            await hub.exec.azurerm.utils.wait_for_operation(routes)
+        ).as_dict()
         for route in routes_result["value"]:
             result["route_list"] = route
     except CloudError as exc:
@@ -1021,13 +1137,16 @@ async def get_advertised_routes(hub, ctx, name, resource_group, peer, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        routes = netconn.virtual_network_gateways.get_advertised_routes(
+        routes = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_network_gateways.get_advertised_routes,
             resource_group_name=resource_group,
             virtual_network_gateway_name=name,
             peer=peer,
         )
 
-        routes_result = routes.result().as_dict()
+        routes_result = (
+            await hub.exec.azurerm.utils.wait_for_operation(routes)
+        ).as_dict()
         for route in routes_result["value"]:
             result["route_list"] = route
     except CloudError as exc:
@@ -1050,11 +1169,14 @@ async def set_vpnclient_ipsec_parameters(
     ike_integrity,
     dh_group,
     pfs_group,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Sets the vpnclient ipsec policy for P2S client of virtual network gateway in the
         specified resource group through Network resource provider.
 
@@ -1088,6 +1210,9 @@ async def set_vpnclient_ipsec_parameters(
     :param pfs_group: The Pfs Group used in IKE Phase 2 for new child SA. Possible values include:
         'None', 'PFS1', 'PFS2', 'PFS2048', 'ECP256', 'ECP384', 'PFS24', 'PFS14', 'PFSMM'
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -1118,14 +1243,17 @@ async def set_vpnclient_ipsec_parameters(
         return result
 
     try:
-        params = netconn.virtual_network_gateways.set_vpnclient_ipsec_parameters(
+        params = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_network_gateways.set_vpnclient_ipsec_parameters,
             resource_group_name=resource_group,
             virtual_network_gateway_name=name,
             vpnclient_ipsec_params=paramsmodel,
             **kwargs,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(params)
 
-        params_result = params.result()
+        params_result = await hub.exec.azurerm.utils.wait_for_operation(params)
         result = params_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -1153,11 +1281,13 @@ async def get_vpnclient_ipsec_parameters(hub, ctx, name, resource_group, **kwarg
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        policy = netconn.virtual_network_gateways.get_vpnclient_ipsec_parameters(
-            resource_group_name=resource_group, virtual_network_gateway_name=name
+        policy = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_network_gateways.get_vpnclient_ipsec_parameters,
+            resource_group_name=resource_group,
+            virtual_network_gateway_name=name,
         )
 
-        policy_result = policy.result()
+        policy_result = await hub.exec.azurerm.utils.wait_for_operation(policy)
         result = policy_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -1209,7 +1339,8 @@ async def vpn_device_configuration_script(
         return result
 
     try:
-        script = netconn.virtual_network_gateways.vpn_device_configuration_script(
+        script = await hub.exec.azurerm.utils.sdk_call(
+            netconn.virtual_network_gateways.vpn_device_configuration_script,
             resource_group_name=resource_group,
             virtual_network_gateway_connection_name=name,
             parameters=scriptmodel,
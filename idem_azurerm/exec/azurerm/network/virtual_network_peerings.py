@@ -34,6 +34,7 @@ Azure Resource Manager (ARM) Virtual Network Peering Execution Module
 
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 try:
@@ -44,12 +45,11 @@ except ImportError:
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.network.models  # pylint: disable=unused-import
     from msrestazure.tools import is_valid_resource_id, parse_resource_id
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.network") is not None
 except ImportError:
     pass
 
@@ -58,7 +58,7 @@ __func_alias__ = {"list_": "list"}
 log = logging.getLogger(__name__)
 
 
-async def list_(hub, ctx, virtual_network, resource_group, **kwargs):
+async def list_(hub, ctx, virtual_network, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -68,6 +68,9 @@ async def list_(hub, ctx, virtual_network, resource_group, **kwargs):
 
     :param resource_group: The resource group name for the virtual network.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -78,13 +81,15 @@ async def list_(hub, ctx, virtual_network, resource_group, **kwargs):
     result = {}
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        peerings = await hub.exec.azurerm.utils.paged_object_to_list(
+        peerings = hub.exec.azurerm.utils.paged_object_iter(
             netconn.virtual_network_peerings.list(
                 resource_group_name=resource_group, virtual_network_name=virtual_network
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(peerings)
 
-        for peering in peerings:
+        async for peering in peerings:
             result[peering["name"]] = peering
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -93,10 +98,14 @@ async def list_(hub, ctx, virtual_network, resource_group, **kwargs):
     return result
 
 
-async def delete(hub, ctx, name, virtual_network, resource_group, **kwargs):
+async def delete(
+    hub, ctx, name, virtual_network, resource_group, no_wait=False, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Delete a virtual network peering object.
 
     :param name: The name of the virtual network peering object to delete.
@@ -107,6 +116,9 @@ async def delete(hub, ctx, name, virtual_network, resource_group, **kwargs):
     :param resource_group: The resource group name assigned to the
         virtual network.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -117,12 +129,15 @@ async def delete(hub, ctx, name, virtual_network, resource_group, **kwargs):
     result = False
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        peering = netconn.virtual_network_peerings.delete(
+        peering = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_network_peerings.delete,
             resource_group_name=resource_group,
             virtual_network_name=virtual_network,
             virtual_network_peering_name=name,
         )
-        peering.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(peering)
+        await hub.exec.azurerm.utils.wait_for_operation(peering)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
@@ -153,7 +168,8 @@ async def get(hub, ctx, name, virtual_network, resource_group, **kwargs):
     """
     netconn = await hub.exec.azurerm.utils.get_client(ctx, "network", **kwargs)
     try:
-        peering = netconn.virtual_network_peerings.get(
+        peering = await hub.exec.azurerm.utils.sdk_call(
+            netconn.virtual_network_peerings.get,
             resource_group_name=resource_group,
             virtual_network_name=virtual_network,
             virtual_network_peering_name=name,
@@ -175,11 +191,14 @@ async def create_or_update(
     virtual_network,
     resource_group,
     remote_vnet_group=None,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or update a virtual network peering object.
 
     :param name: The name assigned to the peering object being created or updated.
@@ -195,6 +214,9 @@ async def create_or_update(
     :param resource_group: The resource group name assigned to the
         virtual network.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -229,14 +251,16 @@ async def create_or_update(
         return result
 
     try:
-        peering = netconn.virtual_network_peerings.create_or_update(
+        peering = await hub.exec.azurerm.utils.begin_operation(
+            netconn.virtual_network_peerings.create_or_update,
             resource_group_name=resource_group,
             virtual_network_name=virtual_network,
             virtual_network_peering_name=name,
             virtual_network_peering_parameters=peermodel,
         )
-        peering.wait()
-        peer_result = peering.result()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(peering)
+        peer_result = await hub.exec.azurerm.utils.wait_for_operation(peering)
         result = peer_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("network", str(exc), **kwargs)
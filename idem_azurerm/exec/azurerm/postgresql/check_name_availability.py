@@ -33,15 +33,15 @@ Azure Resource Manager (ARM) PostgreSQL Check Name Availability Operations Execu
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.rdbms.postgresql.models  # pylint: disable=unused-import
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.rdbms") is not None
 except ImportError:
     pass
 
@@ -69,8 +69,8 @@ async def execute(hub, ctx, name, resource_type=None, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        availability = postconn.check_name_availability.execute(
-            name=name, type=resource_type,
+        availability = await hub.exec.azurerm.utils.sdk_call(
+            postconn.check_name_availability.execute, name=name, type=resource_type,
         )
 
         result = availability.as_dict()
@@ -33,15 +33,15 @@ Azure Resource Manager (ARM) PostgreSQL Server Configuration Operations Executio
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.rdbms.postgresql.models  # pylint: disable=unused-import
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.rdbms") is not None
 except ImportError:
     pass
 
@@ -49,11 +49,13 @@ log = logging.getLogger(__name__)
 
 
 async def create_or_update(
-    hub, ctx, name, server_name, resource_group, value=None, **kwargs
+    hub, ctx, name, server_name, resource_group, value=None, no_wait=False, **kwargs
 ):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Updates the specified configuration setting for the given server. A list of configuration settings that can be
         updated for the given server can be found by using the list_by_server operation below. Additionally, all
         possible values for each individual configuration setting can be found using that module.
@@ -66,6 +68,9 @@ async def create_or_update(
 
     :param value: Value of the configuration. Defaults to None.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -77,15 +82,17 @@ async def create_or_update(
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        config = postconn.configurations.create_or_update(
+        config = await hub.exec.azurerm.utils.begin_operation(
+            postconn.configurations.create_or_update,
             configuration_name=name,
             server_name=server_name,
             resource_group_name=resource_group,
             value=value,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(config)
 
-        config.wait()
-        result = config.result().as_dict()
+        result = (await hub.exec.azurerm.utils.wait_for_operation(config)).as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -116,7 +123,8 @@ async def get(hub, ctx, name, server_name, resource_group, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        config = postconn.configurations.get(
+        config = await hub.exec.azurerm.utils.sdk_call(
+            postconn.configurations.get,
             configuration_name=name,
             server_name=server_name,
             resource_group_name=resource_group,
@@ -130,7 +138,7 @@ async def get(hub, ctx, name, server_name, resource_group, **kwargs):
     return result
 
 
-async def list_by_server(hub, ctx, server_name, resource_group, **kwargs):
+async def list_by_server(hub, ctx, server_name, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
@@ -140,6 +148,9 @@ async def list_by_server(hub, ctx, server_name, resource_group, **kwargs):
 
     :param resource_group: The name of the resource group. The name is case insensitive.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -151,13 +162,15 @@ async def list_by_server(hub, ctx, server_name, resource_group, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        configs = await hub.exec.azurerm.utils.paged_object_to_list(
+        configs = hub.exec.azurerm.utils.paged_object_iter(
             postconn.configurations.list_by_server(
                 server_name=server_name, resource_group_name=resource_group
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(configs)
 
-        for config in configs:
+        async for config in configs:
             result[config["name"]] = config
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
@@ -33,16 +33,16 @@ Azure Resource Manager (ARM) PostgreSQL Database Operations Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.rdbms.postgresql.models  # pylint: disable=unused-import
     from msrestazure.azure_exceptions import CloudError
     from msrest.exceptions import ValidationError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.rdbms") is not None
 except ImportError:
     pass
 
@@ -50,11 +50,21 @@ log = logging.getLogger(__name__)
 
 
 async def create_or_update(
-    hub, ctx, name, server_name, resource_group, charset=None, collation=None, **kwargs
+    hub,
+    ctx,
+    name,
+    server_name,
+    resource_group,
+    charset=None,
+    collation=None,
+    no_wait=False,
+    **kwargs,
 ):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Creates a new database or updates an existing database.
 
     :param name: The name of the database.
@@ -67,6 +77,9 @@ async def create_or_update(
 
     :param collation: The collation of the database. Defaults to None.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -78,16 +91,18 @@ async def create_or_update(
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        database = postconn.databases.create_or_update(
+        database = await hub.exec.azurerm.utils.begin_operation(
+            postconn.databases.create_or_update,
             database_name=name,
             server_name=server_name,
             resource_group_name=resource_group,
             charset=charset,
             collation=collation,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(database)
 
-        database.wait()
-        result = database.result().as_dict()
+        result = (await hub.exec.azurerm.utils.wait_for_operation(database)).as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -95,10 +110,12 @@ async def create_or_update(
     return result
 
 
-async def delete(hub, ctx, name, server_name, resource_group, **kwargs):
+async def delete(hub, ctx, name, server_name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Deletes a database.
 
     :param name: The name of the database.
@@ -107,6 +124,9 @@ async def delete(hub, ctx, name, server_name, resource_group, **kwargs):
 
     :param resource_group: The name of the resource group. The name is case insensitive.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -118,13 +138,16 @@ async def delete(hub, ctx, name, server_name, resource_group, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        database = postconn.databases.delete(
+        database = await hub.exec.azurerm.utils.begin_operation(
+            postconn.databases.delete,
             database_name=name,
             server_name=server_name,
             resource_group_name=resource_group,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(database)
 
-        database.wait()
+        await hub.exec.azurerm.utils.wait_for_operation(database)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
@@ -156,7 +179,8 @@ async def get(hub, ctx, name, server_name, resource_group, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        database = postconn.databases.get(
+        database = await hub.exec.azurerm.utils.sdk_call(
+            postconn.databases.get,
             database_name=name,
             server_name=server_name,
             resource_group_name=resource_group,
@@ -170,7 +194,7 @@ async def get(hub, ctx, name, server_name, resource_group, **kwargs):
     return result
 
 
-async def list_by_server(hub, ctx, server_name, resource_group, **kwargs):
+async def list_by_server(hub, ctx, server_name, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
@@ -180,6 +204,9 @@ async def list_by_server(hub, ctx, server_name, resource_group, **kwargs):
 
     :param resource_group: The name of the resource group. The name is case insensitive.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -191,13 +218,15 @@ async def list_by_server(hub, ctx, server_name, resource_group, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        databases = await hub.exec.azurerm.utils.paged_object_to_list(
+        databases = hub.exec.azurerm.utils.paged_object_iter(
             postconn.databases.list_by_server(
                 server_name=server_name, resource_group_name=resource_group
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(databases)
 
-        for database in databases:
+        async for database in databases:
             result[database["name"]] = database
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
@@ -33,16 +33,16 @@ Azure Resource Manager (ARM) PostgreSQL Server Firewall Rule Operations Executio
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.rdbms.postgresql.models  # pylint: disable=unused-import
     from msrestazure.azure_exceptions import CloudError
     from msrest.exceptions import ValidationError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.rdbms") is not None
 except ImportError:
     pass
 
@@ -57,11 +57,14 @@ async def create_or_update(
     resource_group,
     start_ip_address,
     end_ip_address,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Creates a new firewall rule or updates an existing firewall rule.
 
     :param name: The name of the server firewall rule.
@@ -74,6 +77,9 @@ async def create_or_update(
 
     :param end_ip_address: The end IP address of the server firewall rule. Must be IPv4 format.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -85,16 +91,18 @@ async def create_or_update(
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        rule = postconn.firewall_rules.create_or_update(
+        rule = await hub.exec.azurerm.utils.begin_operation(
+            postconn.firewall_rules.create_or_update,
             firewall_rule_name=name,
             server_name=server_name,
             resource_group_name=resource_group,
             start_ip_address=start_ip_address,
             end_ip_address=end_ip_address,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(rule)
 
-        rule.wait()
-        result = rule.result().as_dict()
+        result = (await hub.exec.azurerm.utils.wait_for_operation(rule)).as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -102,10 +110,12 @@ async def create_or_update(
     return result
 
 
-async def delete(hub, ctx, name, server_name, resource_group, **kwargs):
+async def delete(hub, ctx, name, server_name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Deletes a server firewall rule.
 
     :param name: The name of the server firewall rule.
@@ -114,6 +124,9 @@ async def delete(hub, ctx, name, server_name, resource_group, **kwargs):
 
     :param resource_group: The name of the resource group. The name is case insensitive.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -125,13 +138,16 @@ async def delete(hub, ctx, name, server_name, resource_group, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        server = postconn.firewall_rules.delete(
+        server = await hub.exec.azurerm.utils.begin_operation(
+            postconn.firewall_rules.delete,
             firewall_rule_name=name,
             server_name=server_name,
             resource_group_name=resource_group,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(server)
 
-        server.wait()
+        await hub.exec.azurerm.utils.wait_for_operation(server)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
@@ -163,7 +179,8 @@ async def get(hub, ctx, name, server_name, resource_group, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        rule = postconn.firewall_rules.get(
+        rule = await hub.exec.azurerm.utils.sdk_call(
+            postconn.firewall_rules.get,
             firewall_rule_name=name,
             server_name=server_name,
             resource_group_name=resource_group,
@@ -177,7 +194,7 @@ async def get(hub, ctx, name, server_name, resource_group, **kwargs):
     return result
 
 
-async def list_by_server(hub, ctx, server_name, resource_group, **kwargs):
+async def list_by_server(hub, ctx, server_name, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
@@ -187,6 +204,9 @@ async def list_by_server(hub, ctx, server_name, resource_group, **kwargs):
 
     :param resource_group: The name of the resource group. The name is case insensitive.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -198,13 +218,15 @@ async def list_by_server(hub, ctx, server_name, resource_group, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        rules = await hub.exec.azurerm.utils.paged_object_to_list(
+        rules = hub.exec.azurerm.utils.paged_object_iter(
             postconn.firewall_rules.list_by_server(
                 server_name=server_name, resource_group_name=resource_group
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(rules)
 
-        for rule in rules:
+        async for rule in rules:
             result[rule["name"]] = rule
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
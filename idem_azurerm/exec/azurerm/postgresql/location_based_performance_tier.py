@@ -33,15 +33,15 @@ Azure Resource Manager (ARM) PostgreSQL Location Based Performance Tier Operatio
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.rdbms.postgresql.models  # pylint: disable=unused-import
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.rdbms") is not None
 except ImportError:
     pass
 
@@ -50,7 +50,7 @@ __func_alias__ = {"list_": "list"}
 log = logging.getLogger(__name__)
 
 
-async def list_(hub, ctx, location, **kwargs):
+async def list_(hub, ctx, location, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
@@ -58,6 +58,9 @@ async def list_(hub, ctx, location, **kwargs):
 
     :param location: The name of the location.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -69,11 +72,13 @@ async def list_(hub, ctx, location, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        tiers = await hub.exec.azurerm.utils.paged_object_to_list(
+        tiers = hub.exec.azurerm.utils.paged_object_iter(
             postconn.location_based_performance_tier.list(location_name=location)
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(tiers)
 
-        for tier in tiers:
+        async for tier in tiers:
             result[tier["id"]] = tier
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
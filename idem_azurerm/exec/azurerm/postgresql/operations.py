@@ -33,15 +33,15 @@ Azure Resource Manager (ARM) PostgreSQL Operations Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.rdbms.postgresql.models  # pylint: disable=unused-import
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.rdbms") is not None
 except ImportError:
     pass
 
@@ -67,7 +67,7 @@ async def list_(hub, ctx, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        ops = postconn.operations.list()
+        ops = await hub.exec.azurerm.utils.sdk_call(postconn.operations.list)
 
         result = ops.as_dict()
     except CloudError as exc:
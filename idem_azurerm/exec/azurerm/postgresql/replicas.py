@@ -33,22 +33,22 @@ Azure Resource Manager (ARM) PostgreSQL Server Replicas Operations Execution Mod
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.rdbms.postgresql.models  # pylint: disable=unused-import
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.rdbms") is not None
 except ImportError:
     pass
 
 log = logging.getLogger(__name__)
 
 
-async def list_by_server(hub, ctx, server_name, resource_group, **kwargs):
+async def list_by_server(hub, ctx, server_name, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
@@ -58,6 +58,9 @@ async def list_by_server(hub, ctx, server_name, resource_group, **kwargs):
 
     :param resource_group: The name of the resource group. The name is case insensitive.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -69,13 +72,15 @@ async def list_by_server(hub, ctx, server_name, resource_group, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        reps = await hub.exec.azurerm.utils.paged_object_to_list(
+        reps = hub.exec.azurerm.utils.paged_object_iter(
             postconn.replicas.list_by_server(
                 server_name=server_name, resource_group_name=resource_group
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(reps)
 
-        for rep in reps:
+        async for rep in reps:
             result[rep["name"]] = rep
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
@@ -33,17 +33,17 @@ Azure Resource Manager (ARM) PostgreSQL Server Operations Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 import datetime
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.rdbms.postgresql.models  # pylint: disable=unused-import
     from msrestazure.azure_exceptions import CloudError
     from msrest.exceptions import ValidationError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.rdbms") is not None
 except ImportError:
     pass
 
@@ -66,11 +66,14 @@ async def create(
     login_password=None,
     create_mode="Default",
     tags=None,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Creates a new server, or will overwrite an existing server.
 
     :param name: The name of the server.
@@ -106,6 +109,9 @@ async def create(
 
     :param tags: Application-specific metadata in the form of key-value pairs.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -150,12 +156,16 @@ async def create(
         return result
 
     try:
-        server = postconn.servers.create(
-            server_name=name, resource_group_name=resource_group, parameters=servermodel
+        server = await hub.exec.azurerm.utils.begin_operation(
+            postconn.servers.create,
+            server_name=name,
+            resource_group_name=resource_group,
+            parameters=servermodel,
         )
 
-        server.wait()
-        result = server.result().as_dict()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(server)
+        result = (await hub.exec.azurerm.utils.wait_for_operation(server)).as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -165,16 +175,21 @@ async def create(
     return result
 
 
-async def delete(hub, ctx, name, resource_group, **kwargs):
+async def delete(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Deletes a server.
 
     :param name: The name of the server.
 
     :param resource_group: The name of the resource group. The name is case insensitive.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -186,11 +201,15 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        server = postconn.servers.delete(
-            server_name=name, resource_group_name=resource_group,
+        server = await hub.exec.azurerm.utils.begin_operation(
+            postconn.servers.delete,
+            server_name=name,
+            resource_group_name=resource_group,
         )
 
-        server.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(server)
+        await hub.exec.azurerm.utils.wait_for_operation(server)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
@@ -220,8 +239,8 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        server = postconn.servers.get(
-            server_name=name, resource_group_name=resource_group,
+        server = await hub.exec.azurerm.utils.sdk_call(
+            postconn.servers.get, server_name=name, resource_group_name=resource_group,
         )
 
         result = server.as_dict()
@@ -232,12 +251,15 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def list_(hub, ctx, **kwargs):
+async def list_(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
     List all the servers in a given subscription.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -249,11 +271,11 @@ async def list_(hub, ctx, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        servers = await hub.exec.azurerm.utils.paged_object_to_list(
-            postconn.servers.list()
-        )
+        servers = hub.exec.azurerm.utils.paged_object_iter(postconn.servers.list())
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(servers)
 
-        for server in servers:
+        async for server in servers:
             result[server["name"]] = server
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
@@ -262,7 +284,7 @@ async def list_(hub, ctx, **kwargs):
     return result
 
 
-async def list_by_resource_group(hub, ctx, resource_group, **kwargs):
+async def list_by_resource_group(hub, ctx, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
@@ -270,6 +292,9 @@ async def list_by_resource_group(hub, ctx, resource_group, **kwargs):
 
     :param resource_group: The name of the resource group. The name is case insensitive.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -281,11 +306,13 @@ async def list_by_resource_group(hub, ctx, resource_group, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        servers = await hub.exec.azurerm.utils.paged_object_to_list(
+        servers = hub.exec.azurerm.utils.paged_object_iter(
             postconn.servers.list_by_resource_group(resource_group_name=resource_group)
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(servers)
 
-        for server in servers:
+        async for server in servers:
             result[server["name"]] = server
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
@@ -294,16 +321,21 @@ async def list_by_resource_group(hub, ctx, resource_group, **kwargs):
     return result
 
 
-async def restart(hub, ctx, name, resource_group, **kwargs):
+async def restart(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Restarts a server.
 
     :param name: The name of the server.
 
     :param resource_group: The name of the resource group. The name is case insensitive.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -315,11 +347,15 @@ async def restart(hub, ctx, name, resource_group, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        server = postconn.servers.restart(
-            server_name=name, resource_group_name=resource_group,
+        server = await hub.exec.azurerm.utils.begin_operation(
+            postconn.servers.restart,
+            server_name=name,
+            resource_group_name=resource_group,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(server)
 
-        server.wait()
+        await hub.exec.azurerm.utils.wait_for_operation(server)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
@@ -339,11 +375,14 @@ async def update(
     storage_profile=None,
     login_password=None,
     tags=None,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Creates a new server, or will overwrite an existing server.
 
     :param name: The name of the server.
@@ -374,6 +413,9 @@ async def update(
 
     :param tags: Application-specific metadata in the form of key-value pairs.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -403,12 +445,16 @@ async def update(
         return result
 
     try:
-        server = postconn.servers.update(
-            server_name=name, resource_group_name=resource_group, parameters=paramsmodel
+        server = await hub.exec.azurerm.utils.begin_operation(
+            postconn.servers.update,
+            server_name=name,
+            resource_group_name=resource_group,
+            parameters=paramsmodel,
         )
 
-        server.wait()
-        result = server.result().as_dict()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(server)
+        result = (await hub.exec.azurerm.utils.wait_for_operation(server)).as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -33,15 +33,15 @@ Azure Resource Manager (ARM) PostgreSQL Server Security Alert Policy Operations
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.rdbms.postgresql.models  # pylint: disable=unused-import
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.rdbms") is not None
 except ImportError:
     pass
 
@@ -60,11 +60,14 @@ async def create_or_update(
     storage_endpoint=None,
     storage_account_access_key=None,
     retention_days=None,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Creates or updates a threat detection policy.
 
     :param server_name: The name of the server.
@@ -91,6 +94,9 @@ async def create_or_update(
 
     :param retention_days: Specifies the number of days to keep in the Threat Detection audit logs.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -120,14 +126,16 @@ async def create_or_update(
         return result
 
     try:
-        policy = postconn.server_security_alert_policies.create_or_update(
+        policy = await hub.exec.azurerm.utils.begin_operation(
+            postconn.server_security_alert_policies.create_or_update,
             server_name=server_name,
             resource_group_name=resource_group,
             parameters=paramsmodel,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(policy)
 
-        policy.wait()
-        result = policy.result().as_dict()
+        result = (await hub.exec.azurerm.utils.wait_for_operation(policy)).as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -156,8 +164,10 @@ async def get(hub, ctx, server_name, resource_group, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        policy = postconn.server_security_alert_policies.get(
-            server_name=server_name, resource_group_name=resource_group,
+        policy = await hub.exec.azurerm.utils.sdk_call(
+            postconn.server_security_alert_policies.get,
+            server_name=server_name,
+            resource_group_name=resource_group,
         )
 
         result = policy.as_dict()
@@ -33,15 +33,15 @@ Azure Resource Manager (ARM) PostgreSQL Virtual Network Rule Operations Executio
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.rdbms.postgresql.models  # pylint: disable=unused-import
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.rdbms") is not None
 except ImportError:
     pass
 
@@ -56,11 +56,14 @@ async def create_or_update(
     resource_group,
     subnet_id,
     ignore_missing_endpoint=None,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Creates or updates an existing virtual network rule.
 
     :param name: The name of the virtual network rule.
@@ -75,6 +78,9 @@ async def create_or_update(
     :param ignore_missing_endpoint: A boolean value representing whether the fire wall rule is created before the
         virtual network has vnet service endpoint enabled.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -86,16 +92,18 @@ async def create_or_update(
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        rule = postconn.virtual_network_rules.create_or_update(
+        rule = await hub.exec.azurerm.utils.begin_operation(
+            postconn.virtual_network_rules.create_or_update,
             virtual_network_rule_name=name,
             server_name=server_name,
             resource_group_name=resource_group,
             virtual_network_subnet_id=subnet_id,
             ignore_missing_vnet_service_endpoint=ignore_missing_endpoint,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(rule)
 
-        rule.wait()
-        result = rule.result().as_dict()
+        result = (await hub.exec.azurerm.utils.wait_for_operation(rule)).as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -103,10 +111,12 @@ async def create_or_update(
     return result
 
 
-async def delete(hub, ctx, name, server_name, resource_group, **kwargs):
+async def delete(hub, ctx, name, server_name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Deletes the virtual network rule with the given name.
 
     :param name: The name of the virtual network rule.
@@ -115,6 +125,9 @@ async def delete(hub, ctx, name, server_name, resource_group, **kwargs):
 
     :param resource_group: The name of the resource group. The name is case insensitive.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -126,13 +139,16 @@ async def delete(hub, ctx, name, server_name, resource_group, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        rule = postconn.virtual_network_rules.delete(
+        rule = await hub.exec.azurerm.utils.begin_operation(
+            postconn.virtual_network_rules.delete,
             virtual_network_rule_name=name,
             server_name=server_name,
             resource_group_name=resource_group,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(rule)
 
-        rule.wait()
+        await hub.exec.azurerm.utils.wait_for_operation(rule)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
@@ -164,7 +180,8 @@ async def get(hub, ctx, name, server_name, resource_group, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        rule = postconn.virtual_network_rules.get(
+        rule = await hub.exec.azurerm.utils.sdk_call(
+            postconn.virtual_network_rules.get,
             virtual_network_rule_name=name,
             server_name=server_name,
             resource_group_name=resource_group,
@@ -178,7 +195,7 @@ async def get(hub, ctx, name, server_name, resource_group, **kwargs):
     return result
 
 
-async def list_by_server(hub, ctx, server_name, resource_group, **kwargs):
+async def list_by_server(hub, ctx, server_name, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
@@ -188,6 +205,9 @@ async def list_by_server(hub, ctx, server_name, resource_group, **kwargs):
 
     :param resource_group: The name of the resource group. The name is case insensitive.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -199,13 +219,15 @@ async def list_by_server(hub, ctx, server_name, resource_group, **kwargs):
     postconn = await hub.exec.azurerm.utils.get_client(ctx, "postgresql", **kwargs)
 
     try:
-        rules = await hub.exec.azurerm.utils.paged_object_to_list(
+        rules = hub.exec.azurerm.utils.paged_object_iter(
             postconn.virtual_network_rules.list_by_server(
                 server_name=server_name, resource_group_name=resource_group
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(rules)
 
-        for rule in rules:
+        async for rule in rules:
             result[rule["name"]] = rule
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("postgresql", str(exc), **kwargs)
@@ -33,16 +33,16 @@ Azure Resource Manager (ARM) Redis Operations Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.network.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.network") is not None
 except ImportError:
     pass
 
@@ -70,8 +70,10 @@ async def check_name_availability(hub, ctx, name, **kwargs):
     redconn = await hub.exec.azurerm.utils.get_client(ctx, "redis", **kwargs)
 
     try:
-        avail = redconn.redis.check_name_availability(
-            name=name, type="Microsoft.Cache/redis",
+        avail = await hub.exec.azurerm.utils.sdk_call(
+            redconn.redis.check_name_availability,
+            name=name,
+            type="Microsoft.Cache/redis",
         )
 
         if avail is None:
@@ -98,11 +100,14 @@ async def create(
     subnet_id=None,
     static_ip=None,
     zones=None,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Create or replace (overwrite/recreate, with potential downtime) an existing Redis cache.
 
     :param name: The name of the Redis cache.
@@ -139,6 +144,9 @@ async def create(
 
     :param zones: A list of availability zones denoting where the resource needs to come from.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -171,11 +179,16 @@ async def create(
         return result
 
     try:
-        cache = redconn.redis.create(
-            name=name, resource_group_name=resource_group, parameters=paramsmodel
+        cache = await hub.exec.azurerm.utils.begin_operation(
+            redconn.redis.create,
+            name=name,
+            resource_group_name=resource_group,
+            parameters=paramsmodel,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(cache)
 
-        result = cache.result().as_dict()
+        result = (await hub.exec.azurerm.utils.wait_for_operation(cache)).as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("redis", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -208,7 +221,9 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     redconn = await hub.exec.azurerm.utils.get_client(ctx, "redis", **kwargs)
 
     try:
-        cache = redconn.redis.delete(name=name, resource_group_name=resource_group)
+        cache = await hub.exec.azurerm.utils.sdk_call(
+            redconn.redis.delete, name=name, resource_group_name=resource_group
+        )
 
         result = True
     except CloudError as exc:
@@ -218,11 +233,21 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
 
 
 async def export_data(
-    hub, ctx, name, resource_group, prefix, container, file_format=None, **kwargs
+    hub,
+    ctx,
+    name,
+    resource_group,
+    prefix,
+    container,
+    file_format=None,
+    no_wait=False,
+    **kwargs,
 ):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Export data from the redis cache to blobs in a container.
 
     :param name: The name of the Redis cache.
@@ -235,6 +260,9 @@ async def export_data(
 
     :param file_format: An optional file format.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -261,11 +289,16 @@ async def export_data(
         return result
 
     try:
-        cache = redconn.redis.export_data(
-            name=name, resource_group_name=resource_group, parameters=paramsmodel
+        cache = await hub.exec.azurerm.utils.begin_operation(
+            redconn.redis.export_data,
+            name=name,
+            resource_group_name=resource_group,
+            parameters=paramsmodel,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(cache)
 
-        result = cache.result().as_dict()
+        result = (await hub.exec.azurerm.utils.wait_for_operation(cache)).as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("redis", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -302,7 +335,8 @@ async def force_reboot(
     redconn = await hub.exec.azurerm.utils.get_client(ctx, "redis", **kwargs)
 
     try:
-        cache = redconn.redis.force_reboot(
+        cache = await hub.exec.azurerm.utils.sdk_call(
+            redconn.redis.force_reboot,
             name=name,
             resource_group_name=resource_group,
             reboot_type=reboot_type,
@@ -338,7 +372,9 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     redconn = await hub.exec.azurerm.utils.get_client(ctx, "redis", **kwargs)
 
     try:
-        cache = redconn.redis.get(name=name, resource_group_name=resource_group)
+        cache = await hub.exec.azurerm.utils.sdk_call(
+            redconn.redis.get, name=name, resource_group_name=resource_group
+        )
 
         result = cache.as_dict()
     except CloudError as exc:
@@ -349,11 +385,13 @@ async def get(hub, ctx, name, resource_group, **kwargs):
 
 
 async def import_data(
-    hub, ctx, name, resource_group, files, file_format=None, **kwargs
+    hub, ctx, name, resource_group, files, file_format=None, no_wait=False, **kwargs
 ):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Import data into Redis cache.
 
     :param name: The name of the Redis cache.
@@ -364,6 +402,9 @@ async def import_data(
 
     :param file_format: An optional file format.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -375,14 +416,17 @@ async def import_data(
     redconn = await hub.exec.azurerm.utils.get_client(ctx, "redis", **kwargs)
 
     try:
-        cache = redconn.redis.import_data(
+        cache = await hub.exec.azurerm.utils.begin_operation(
+            redconn.redis.import_data,
             name=name,
             resource_group_name=resource_group,
             files=files,
             format=file_format,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(cache)
 
-        result = cache.result().as_dict()
+        result = (await hub.exec.azurerm.utils.wait_for_operation(cache)).as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("redis", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -390,12 +434,15 @@ async def import_data(
     return result
 
 
-async def list_(hub, ctx, **kwargs):
+async def list_(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
     Gets all Redis caches in the specified subscription.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -407,9 +454,11 @@ async def list_(hub, ctx, **kwargs):
     redconn = await hub.exec.azurerm.utils.get_client(ctx, "redis", **kwargs)
 
     try:
-        caches = await hub.exec.azurerm.utils.paged_object_to_list(redconn.redis.list())
+        caches = hub.exec.azurerm.utils.paged_object_iter(redconn.redis.list())
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(caches)
 
-        for cache in caches:
+        async for cache in caches:
             result[cache["name"]] = cache
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("redis", str(exc), **kwargs)
@@ -418,7 +467,7 @@ async def list_(hub, ctx, **kwargs):
     return result
 
 
-async def list_by_resource_group(hub, ctx, resource_group, **kwargs):
+async def list_by_resource_group(hub, ctx, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
@@ -426,6 +475,9 @@ async def list_by_resource_group(hub, ctx, resource_group, **kwargs):
 
     :param resource_group: The name of the resource group.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -437,11 +489,13 @@ async def list_by_resource_group(hub, ctx, resource_group, **kwargs):
     redconn = await hub.exec.azurerm.utils.get_client(ctx, "redis", **kwargs)
 
     try:
-        caches = await hub.exec.azurerm.utils.paged_object_to_list(
+        caches = hub.exec.azurerm.utils.paged_object_iter(
             redconn.redis.list_by_resource_group(resource_group_name=resource_group,)
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(caches)
 
-        for cache in caches:
+        async for cache in caches:
             result[cache["name"]] = cache
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("redis", str(exc), **kwargs)
@@ -471,7 +525,9 @@ async def list_keys(hub, ctx, name, resource_group, **kwargs):
     redconn = await hub.exec.azurerm.utils.get_client(ctx, "redis", **kwargs)
 
     try:
-        keys = redconn.redis.list_keys(name=name, resource_group_name=resource_group)
+        keys = await hub.exec.azurerm.utils.sdk_call(
+            redconn.redis.list_keys, name=name, resource_group_name=resource_group
+        )
 
         result = keys.as_dict()
     except CloudError as exc:
@@ -504,8 +560,11 @@ async def list_upgrade_notifications(hub, ctx, name, resource_group, history, **
     redconn = await hub.exec.azurerm.utils.get_client(ctx, "redis", **kwargs)
 
     try:
-        notifications = redconn.redis.list_upgrade_notifications(
-            name=name, resource_group_name=resource_group, history=history
+        notifications = await hub.exec.azurerm.utils.sdk_call(
+            redconn.redis.list_upgrade_notifications,
+            name=name,
+            resource_group_name=resource_group,
+            history=history,
         )
 
         result = notifications.as_dict()
@@ -538,8 +597,12 @@ async def regenerate_key(hub, ctx, name, resource_group, key_type, **kwargs):
     redconn = await hub.exec.azurerm.utils.get_client(ctx, "redis", **kwargs)
 
     try:
-        keys = redconn.redis.regenerate_key(
-            resource_group_name=resource_group, name=name, key_type=key_type, **kwargs
+        keys = await hub.exec.azurerm.utils.sdk_call(
+            redconn.redis.regenerate_key,
+            resource_group_name=resource_group,
+            name=name,
+            key_type=key_type,
+            **kwargs,
         )
 
         result = keys.as_dict()
@@ -621,8 +684,11 @@ async def update(
         return result
 
     try:
-        cache = redconn.redis.update(
-            name=name, resource_group_name=resource_group, parameters=paramsmodel
+        cache = await hub.exec.azurerm.utils.sdk_call(
+            redconn.redis.update,
+            name=name,
+            resource_group_name=resource_group,
+            parameters=paramsmodel,
         )
 
         result = cache.as_dict()
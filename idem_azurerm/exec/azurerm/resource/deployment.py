@@ -35,16 +35,16 @@ Azure Resource Manager (ARM) Resource Deployment Execution Module
 # Python libs
 from __future__ import absolute_import
 from json import loads, dumps
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.resource.resources.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.resource") is not None
 except ImportError:
     pass
 
@@ -74,7 +74,8 @@ async def operation_get(hub, ctx, operation, deployment, resource_group, **kwarg
     """
     resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
     try:
-        operation = resconn.deployment_operations.get(
+        operation = await hub.exec.azurerm.utils.sdk_call(
+            resconn.deployment_operations.get,
             resource_group_name=resource_group,
             deployment_name=deployment,
             operation_id=operation,
@@ -88,7 +89,9 @@ async def operation_get(hub, ctx, operation, deployment, resource_group, **kwarg
     return result
 
 
-async def operations_list(hub, ctx, name, resource_group, result_limit=10, **kwargs):
+async def operations_list(
+    hub, ctx, name, resource_group, result_limit=10, stream=False, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
@@ -100,6 +103,9 @@ async def operations_list(hub, ctx, name, resource_group, result_limit=10, **kwa
 
     :param result_limit: (Default: 10) The limit on the list of deployment operations.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -110,15 +116,17 @@ async def operations_list(hub, ctx, name, resource_group, result_limit=10, **kwa
     result = {}
     resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
     try:
-        operations = await hub.exec.azurerm.utils.paged_object_to_list(
+        operations = hub.exec.azurerm.utils.paged_object_iter(
             resconn.deployment_operations.list(
                 resource_group_name=resource_group,
                 deployment_name=name,
                 top=result_limit,
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(operations)
 
-        for oper in operations:
+        async for oper in operations:
             result[oper["operation_id"]] = oper
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -127,16 +135,21 @@ async def operations_list(hub, ctx, name, resource_group, result_limit=10, **kwa
     return result
 
 
-async def delete(hub, ctx, name, resource_group, **kwargs):
+async def delete(hub, ctx, name, resource_group, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Delete a deployment.
 
     :param name: The name of the deployment to delete.
 
     :param resource_group: The resource group name assigned to the deployment.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -147,10 +160,14 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     result = False
     resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
     try:
-        deploy = resconn.deployments.delete(
-            deployment_name=name, resource_group_name=resource_group
+        deploy = await hub.exec.azurerm.utils.begin_operation(
+            resconn.deployments.delete,
+            deployment_name=name,
+            resource_group_name=resource_group,
         )
-        deploy.wait()
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(deploy)
+        await hub.exec.azurerm.utils.wait_for_operation(deploy)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -178,8 +195,10 @@ async def check_existence(hub, ctx, name, resource_group, **kwargs):
     result = False
     resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
     try:
-        result = resconn.deployments.check_existence(
-            deployment_name=name, resource_group_name=resource_group
+        result = await hub.exec.azurerm.utils.sdk_call(
+            resconn.deployments.check_existence,
+            deployment_name=name,
+            resource_group_name=resource_group,
         )
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -198,11 +217,14 @@ async def create_or_update(
     parameters_link=None,
     deploy_template=None,
     template_link=None,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Deploys resources to a resource group.
 
     :param name: The name of the deployment to create or update.
@@ -236,6 +258,9 @@ async def create_or_update(
     :param template_link: The URI of the template. Use either the template_link property or the
         deploy_template property, but not both.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -293,13 +318,15 @@ async def create_or_update(
         if "error" in validate:
             result = validate
         else:
-            deploy = resconn.deployments.create_or_update(
+            deploy = await hub.exec.azurerm.utils.begin_operation(
+                resconn.deployments.create_or_update,
                 deployment_name=name,
                 resource_group_name=resource_group,
                 properties=deploy_model,
             )
-            deploy.wait()
-            deploy_result = deploy.result()
+            if no_wait:
+                return await hub.exec.azurerm.utils.operation_handle(deploy)
+            deploy_result = await hub.exec.azurerm.utils.wait_for_operation(deploy)
             result = deploy_result.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -331,8 +358,10 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     """
     resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
     try:
-        deploy = resconn.deployments.get(
-            deployment_name=name, resource_group_name=resource_group
+        deploy = await hub.exec.azurerm.utils.sdk_call(
+            resconn.deployments.get,
+            deployment_name=name,
+            resource_group_name=resource_group,
         )
         result = deploy.as_dict()
     except CloudError as exc:
@@ -361,8 +390,10 @@ async def cancel(hub, ctx, name, resource_group, **kwargs):
     """
     resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
     try:
-        resconn.deployments.cancel(
-            deployment_name=name, resource_group_name=resource_group
+        await hub.exec.azurerm.utils.sdk_call(
+            resconn.deployments.cancel,
+            deployment_name=name,
+            resource_group_name=resource_group,
         )
         result = {"result": True}
     except CloudError as exc:
@@ -467,7 +498,8 @@ async def validate(
         if local_validation:
             raise local_validation[0]
 
-        deploy = resconn.deployments.validate(
+        deploy = await hub.exec.azurerm.utils.sdk_call(
+            resconn.deployments.validate,
             deployment_name=name,
             resource_group_name=resource_group,
             properties=deploy_model,
@@ -503,8 +535,10 @@ async def export_template(hub, ctx, name, resource_group, **kwargs):
     """
     resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
     try:
-        deploy = resconn.deployments.export_template(
-            deployment_name=name, resource_group_name=resource_group
+        deploy = await hub.exec.azurerm.utils.sdk_call(
+            resconn.deployments.export_template,
+            deployment_name=name,
+            resource_group_name=resource_group,
         )
         result = deploy.as_dict()
     except CloudError as exc:
@@ -514,12 +548,15 @@ async def export_template(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def list_(hub, ctx, resource_group, **kwargs):
+async def list_(hub, ctx, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
     List all deployments within a resource group.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -530,13 +567,15 @@ async def list_(hub, ctx, resource_group, **kwargs):
     result = {}
     resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
     try:
-        deployments = await hub.exec.azurerm.utils.paged_object_to_list(
+        deployments = hub.exec.azurerm.utils.paged_object_iter(
             resconn.deployments.list_by_resource_group(
                 resource_group_name=resource_group
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(deployments)
 
-        for deploy in deployments:
+        async for deploy in deployments:
             result[deploy["name"]] = deploy
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
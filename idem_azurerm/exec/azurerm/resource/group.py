@@ -35,16 +35,17 @@ Azure Resource Manager (ARM) Resource Group Execution Module
 # Python libs
 from __future__ import absolute_import
 from json import loads, dumps
+import asyncio
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.resource.resources.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.resource") is not None
 except ImportError:
     pass
 
@@ -53,12 +54,15 @@ __func_alias__ = {"list_": "list"}
 log = logging.getLogger(__name__)
 
 
-async def list_(hub, ctx, **kwargs):
+async def list_(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
     List all resource groups within a subscription.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -69,11 +73,13 @@ async def list_(hub, ctx, **kwargs):
     result = {}
     resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
     try:
-        groups = await hub.exec.azurerm.utils.paged_object_to_list(
+        groups = hub.exec.azurerm.utils.paged_object_iter(
             resconn.resource_groups.list()
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(groups)
 
-        for group in groups:
+        async for group in groups:
             result[group["name"]] = group
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -100,7 +106,9 @@ async def check_existence(hub, ctx, name, **kwargs):
     result = False
     resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
     try:
-        result = resconn.resource_groups.check_existence(name)
+        result = await hub.exec.azurerm.utils.sdk_call(
+            resconn.resource_groups.check_existence, name
+        )
 
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -126,7 +134,7 @@ async def get(hub, ctx, name, **kwargs):
     result = {}
     resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
     try:
-        group = resconn.resource_groups.get(name)
+        group = await hub.exec.azurerm.utils.sdk_call(resconn.resource_groups.get, name)
         result = group.as_dict()
 
     except CloudError as exc:
@@ -136,6 +144,68 @@ async def get(hub, ctx, name, **kwargs):
     return result
 
 
+async def _list_locations(hub, resconn):
+    """
+    Fill the resource group location cache with every resource group in the subscription of a client
+    """
+    endpoint = resconn.config.base_url
+    locations = hub.exec.azurerm.RESOURCE_GROUP_LOCATIONS
+    async for group in hub.exec.azurerm.utils.paged_object_iter(
+        resconn.resource_groups.list()
+    ):
+        locations[(endpoint, group["id"].lower())] = group["location"]
+
+
+async def get_location(hub, ctx, name, **kwargs):
+    """
+    .. versionadded:: 2.4.0
+
+    Get the location of a resource group. The locations of all resource groups in the subscription are fetched with a
+    single list call the first time a location is needed and are then served from a cache for the rest of the run,
+    since a resource group cannot be moved. Resource groups created after the list call are fetched individually.
+
+    :param name: The resource group name.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.resource.group.get_location testgroup
+
+    """
+    resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
+    endpoint = resconn.config.base_url
+    subscription_id = resconn.config.subscription_id
+    key = (
+        endpoint,
+        "/subscriptions/{0}/resourcegroups/{1}".format(subscription_id, name).lower(),
+    )
+    locations = hub.exec.azurerm.RESOURCE_GROUP_LOCATIONS
+
+    if key not in locations:
+        # Concurrent lookups in the same subscription share one list call
+        listings = hub.exec.azurerm.RESOURCE_GROUP_LISTINGS
+        listing_key = (endpoint, subscription_id.lower())
+        listing = listings.get(listing_key)
+        if listing is None or listing.get_loop() is not asyncio.get_event_loop():
+            listing = asyncio.ensure_future(_list_locations(hub, resconn))
+            listings[listing_key] = listing
+
+        try:
+            await asyncio.shield(listing)
+        except CloudError as exc:
+            # Without permission to list resource groups, fall back to getting the one needed
+            log.debug("Unable to list resource groups: %s", exc)
+
+    if key not in locations:
+        group = await hub.exec.azurerm.resource.group.get(ctx, name, **kwargs)
+        if "error" in group:
+            return group
+        locations[key] = group["location"]
+
+    return {"name": name, "location": locations[key]}
+
+
 async def create_or_update(hub, ctx, name, location, **kwargs):
     """
     .. versionadded:: 1.0.0
@@ -162,7 +232,9 @@ async def create_or_update(hub, ctx, name, location, **kwargs):
         "tags": kwargs.get("tags"),
     }
     try:
-        group = resconn.resource_groups.create_or_update(name, resource_group_params)
+        group = await hub.exec.azurerm.utils.sdk_call(
+            resconn.resource_groups.create_or_update, name, resource_group_params
+        )
         result = group.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -171,14 +243,19 @@ async def create_or_update(hub, ctx, name, location, **kwargs):
     return result
 
 
-async def delete(hub, ctx, name, **kwargs):
+async def delete(hub, ctx, name, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 2.4.0
+
     Delete a resource group from the subscription.
 
     :param name: The resource group name to delete.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -189,8 +266,12 @@ async def delete(hub, ctx, name, **kwargs):
     result = False
     resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
     try:
-        group = resconn.resource_groups.delete(name)
-        group.wait()
+        group = await hub.exec.azurerm.utils.begin_operation(
+            resconn.resource_groups.delete, name
+        )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(group)
+        await hub.exec.azurerm.utils.wait_for_operation(group)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -33,16 +33,16 @@ Azure Resource Manager (ARM) Management Lock Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.resource.resources.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.resource") is not None
 except ImportError:
     pass
 
@@ -105,8 +105,11 @@ async def create_or_update_at_resource_group_level(
         return result
 
     try:
-        lock = lckconn.management_locks.create_or_update_at_resource_group_level(
-            resource_group_name=resource_group, lock_name=name, parameters=lockmodel
+        lock = await hub.exec.azurerm.utils.sdk_call(
+            lckconn.management_locks.create_or_update_at_resource_group_level,
+            resource_group_name=resource_group,
+            lock_name=name,
+            parameters=lockmodel,
         )
 
         result = lock.as_dict()
@@ -143,8 +146,11 @@ async def delete_at_resource_group_level(hub, ctx, name, resource_group, **kwarg
     lckconn = await hub.exec.azurerm.utils.get_client(ctx, "managementlock", **kwargs)
 
     try:
-        lock = lckconn.management_locks.delete_at_resource_group_level(
-            resource_group_name=resource_group, lock_name=name, **kwargs
+        lock = await hub.exec.azurerm.utils.sdk_call(
+            lckconn.management_locks.delete_at_resource_group_level,
+            resource_group_name=resource_group,
+            lock_name=name,
+            **kwargs,
         )
 
         result = True
@@ -176,8 +182,11 @@ async def get_at_resource_group_level(hub, ctx, name, resource_group, **kwargs):
     lckconn = await hub.exec.azurerm.utils.get_client(ctx, "managementlock", **kwargs)
 
     try:
-        lock = lckconn.management_locks.get_at_resource_group_level(
-            resource_group_name=resource_group, lock_name=name, **kwargs
+        lock = await hub.exec.azurerm.utils.sdk_call(
+            lckconn.management_locks.get_at_resource_group_level,
+            resource_group_name=resource_group,
+            lock_name=name,
+            **kwargs,
         )
 
         result = lock.as_dict()
@@ -248,8 +257,11 @@ async def create_or_update_by_scope(
         return result
 
     try:
-        lock = lckconn.management_locks.create_or_update_by_scope(
-            scope=scope, lock_name=name, parameters=lockmodel
+        lock = await hub.exec.azurerm.utils.sdk_call(
+            lckconn.management_locks.create_or_update_by_scope,
+            scope=scope,
+            lock_name=name,
+            parameters=lockmodel,
         )
 
         result = lock.as_dict()
@@ -290,8 +302,11 @@ async def delete_by_scope(hub, ctx, name, scope, **kwargs):
     lckconn = await hub.exec.azurerm.utils.get_client(ctx, "managementlock", **kwargs)
 
     try:
-        lock = lckconn.management_locks.delete_by_scope(
-            scope=scope, lock_name=name, **kwargs
+        lock = await hub.exec.azurerm.utils.sdk_call(
+            lckconn.management_locks.delete_by_scope,
+            scope=scope,
+            lock_name=name,
+            **kwargs,
         )
 
         result = True
@@ -327,8 +342,8 @@ async def get_by_scope(hub, ctx, name, scope, **kwargs):
     lckconn = await hub.exec.azurerm.utils.get_client(ctx, "managementlock", **kwargs)
 
     try:
-        lock = lckconn.management_locks.get_by_scope(
-            scope=scope, lock_name=name, **kwargs
+        lock = await hub.exec.azurerm.utils.sdk_call(
+            lckconn.management_locks.get_by_scope, scope=scope, lock_name=name, **kwargs
         )
 
         result = lock.as_dict()
@@ -418,7 +433,8 @@ async def create_or_update_at_resource_level(
         parent_resource_path = ""
 
     try:
-        lock = lckconn.management_locks.create_or_update_at_resource_level(
+        lock = await hub.exec.azurerm.utils.sdk_call(
+            lckconn.management_locks.create_or_update_at_resource_level,
             resource_group_name=resource_group,
             lock_name=name,
             resource_name=resource,
@@ -485,7 +501,8 @@ async def delete_at_resource_level(
         parent_resource_path = ""
 
     try:
-        lock = lckconn.management_locks.delete_at_resource_level(
+        lock = await hub.exec.azurerm.utils.sdk_call(
+            lckconn.management_locks.delete_at_resource_level,
             lock_name=name,
             resource_group_name=resource_group,
             resource_name=resource,
@@ -546,7 +563,8 @@ async def get_at_resource_level(
         parent_resource_path = ""
 
     try:
-        lock = lckconn.management_locks.get_at_resource_level(
+        lock = await hub.exec.azurerm.utils.sdk_call(
+            lckconn.management_locks.get_at_resource_level,
             lock_name=name,
             resource_group_name=resource_group,
             resource_name=resource,
@@ -618,8 +636,10 @@ async def create_or_update_at_subscription_level(
         return result
 
     try:
-        lock = lckconn.management_locks.create_or_update_at_subscription_level(
-            lock_name=name, parameters=lockmodel
+        lock = await hub.exec.azurerm.utils.sdk_call(
+            lckconn.management_locks.create_or_update_at_subscription_level,
+            lock_name=name,
+            parameters=lockmodel,
         )
 
         result = lock.as_dict()
@@ -654,8 +674,10 @@ async def delete_at_subscription_level(hub, ctx, name, **kwargs):
     lckconn = await hub.exec.azurerm.utils.get_client(ctx, "managementlock", **kwargs)
 
     try:
-        lock = lckconn.management_locks.delete_at_subscription_level(
-            lock_name=name, **kwargs
+        lock = await hub.exec.azurerm.utils.sdk_call(
+            lckconn.management_locks.delete_at_subscription_level,
+            lock_name=name,
+            **kwargs,
         )
 
         result = True
@@ -685,8 +707,8 @@ async def get_at_subscription_level(hub, ctx, name, **kwargs):
     lckconn = await hub.exec.azurerm.utils.get_client(ctx, "managementlock", **kwargs)
 
     try:
-        lock = lckconn.management_locks.get_at_subscription_level(
-            lock_name=name, **kwargs
+        lock = await hub.exec.azurerm.utils.sdk_call(
+            lckconn.management_locks.get_at_subscription_level, lock_name=name, **kwargs
         )
 
         result = lock.as_dict()
@@ -38,17 +38,17 @@ Azure Resource Manager (ARM) Resource Policy Execution Module
 from __future__ import absolute_import
 from json import loads, dumps
 from uuid import UUID
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.resource.resources.models  # pylint: disable=unused-import
     from azure.mgmt.resource.policy.models import ErrorResponseException
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.resource") is not None
 except ImportError:
     pass
 
@@ -77,8 +77,8 @@ async def assignment_delete(hub, ctx, name, scope, **kwargs):
     polconn = await hub.exec.azurerm.utils.get_client(ctx, "policy", **kwargs)
     try:
         # pylint: disable=unused-variable
-        policy = polconn.policy_assignments.delete(
-            policy_assignment_name=name, scope=scope
+        policy = await hub.exec.azurerm.utils.sdk_call(
+            polconn.policy_assignments.delete, policy_assignment_name=name, scope=scope
         )
         result = True
     except (CloudError, ErrorResponseException) as exc:
@@ -134,8 +134,11 @@ async def assignment_create(hub, ctx, name, scope, definition_name, **kwargs):
             return result
 
         try:
-            policy = polconn.policy_assignments.create(
-                scope=scope, policy_assignment_name=name, parameters=policy_model
+            policy = await hub.exec.azurerm.utils.sdk_call(
+                polconn.policy_assignments.create,
+                scope=scope,
+                policy_assignment_name=name,
+                parameters=policy_model,
             )
             result = policy.as_dict()
         except (CloudError, ErrorResponseException) as exc:
@@ -177,8 +180,8 @@ async def assignment_get(hub, ctx, name, scope, **kwargs):
     """
     polconn = await hub.exec.azurerm.utils.get_client(ctx, "policy", **kwargs)
     try:
-        policy = polconn.policy_assignments.get(
-            policy_assignment_name=name, scope=scope
+        policy = await hub.exec.azurerm.utils.sdk_call(
+            polconn.policy_assignments.get, policy_assignment_name=name, scope=scope
         )
         result = policy.as_dict()
     except (CloudError, ErrorResponseException) as exc:
@@ -189,7 +192,7 @@ async def assignment_get(hub, ctx, name, scope, **kwargs):
 
 
 async def assignments_list_for_resource_group(
-    hub, ctx, resource_group, **kwargs
+    hub, ctx, resource_group, stream=False, **kwargs
 ):  # pylint: disable=invalid-name
     """
     .. versionadded:: 1.0.0
@@ -198,6 +201,9 @@ async def assignments_list_for_resource_group(
 
     :param resource_group: The resource group name to list policy assignments within.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -208,13 +214,15 @@ async def assignments_list_for_resource_group(
     result = {}
     polconn = await hub.exec.azurerm.utils.get_client(ctx, "policy", **kwargs)
     try:
-        policy_assign = await hub.exec.azurerm.utils.paged_object_to_list(
+        policy_assign = hub.exec.azurerm.utils.paged_object_iter(
             polconn.policy_assignments.list_for_resource_group(
                 resource_group_name=resource_group, filter=kwargs.get("filter")
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(policy_assign)
 
-        for assign in policy_assign:
+        async for assign in policy_assign:
             result[assign["name"]] = assign
     except (CloudError, ErrorResponseException) as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -223,12 +231,15 @@ async def assignments_list_for_resource_group(
     return result
 
 
-async def assignments_list(hub, ctx, **kwargs):
+async def assignments_list(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
     List all policy assignments for a subscription.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -239,11 +250,13 @@ async def assignments_list(hub, ctx, **kwargs):
     result = {}
     polconn = await hub.exec.azurerm.utils.get_client(ctx, "policy", **kwargs)
     try:
-        policy_assign = await hub.exec.azurerm.utils.paged_object_to_list(
+        policy_assign = hub.exec.azurerm.utils.paged_object_iter(
             polconn.policy_assignments.list()
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(policy_assign)
 
-        for assign in policy_assign:
+        async for assign in policy_assign:
             result[assign["name"]] = assign
     except (CloudError, ErrorResponseException) as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -295,8 +308,10 @@ async def definition_create_or_update(
         return result
 
     try:
-        policy = polconn.policy_definitions.create_or_update(
-            policy_definition_name=name, parameters=policy_model
+        policy = await hub.exec.azurerm.utils.sdk_call(
+            polconn.policy_definitions.create_or_update,
+            policy_definition_name=name,
+            parameters=policy_model,
         )
         result = policy.as_dict()
     except (CloudError, ErrorResponseException) as exc:
@@ -329,7 +344,9 @@ async def definition_delete(hub, ctx, name, **kwargs):
     polconn = await hub.exec.azurerm.utils.get_client(ctx, "policy", **kwargs)
     try:
         # pylint: disable=unused-variable
-        policy = polconn.policy_definitions.delete(policy_definition_name=name)
+        policy = await hub.exec.azurerm.utils.sdk_call(
+            polconn.policy_definitions.delete, policy_definition_name=name
+        )
         result = True
     except (CloudError, ErrorResponseException) as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -367,11 +384,13 @@ async def definition_get(hub, ctx, name, policy_type=None, **kwargs):
 
     try:
         if policy_type and policy_type.lower() == "builtin":
-            policy_def = polconn.policy_definitions.get_built_in(
-                policy_definition_name=name
+            policy_def = await hub.exec.azurerm.utils.sdk_call(
+                polconn.policy_definitions.get_built_in, policy_definition_name=name
             )
         else:
-            policy_def = polconn.policy_definitions.get(policy_definition_name=name)
+            policy_def = await hub.exec.azurerm.utils.sdk_call(
+                polconn.policy_definitions.get, policy_definition_name=name
+            )
         result = policy_def.as_dict()
     except (CloudError, ErrorResponseException) as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -380,7 +399,7 @@ async def definition_get(hub, ctx, name, policy_type=None, **kwargs):
     return result
 
 
-async def definitions_list(hub, ctx, hide_builtin=False, **kwargs):
+async def definitions_list(hub, ctx, hide_builtin=False, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -388,6 +407,9 @@ async def definitions_list(hub, ctx, hide_builtin=False, **kwargs):
 
     :param hide_builtin: Boolean which will filter out BuiltIn policy definitions from the result.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -398,11 +420,13 @@ async def definitions_list(hub, ctx, hide_builtin=False, **kwargs):
     result = {}
     polconn = await hub.exec.azurerm.utils.get_client(ctx, "policy", **kwargs)
     try:
-        policy_defs = await hub.exec.azurerm.utils.paged_object_to_list(
+        policy_defs = hub.exec.azurerm.utils.paged_object_iter(
             polconn.policy_definitions.list()
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(policy_defs)
 
-        for policy in policy_defs:
+        async for policy in policy_defs:
             if not (hide_builtin and policy["policy_type"] == "BuiltIn"):
                 result[policy["name"]] = policy
     except (CloudError, ErrorResponseException) as exc:
@@ -35,16 +35,16 @@ Azure Resource Manager (ARM) Resource Provider Execution Module
 # Python libs
 from __future__ import absolute_import
 from json import loads, dumps
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.resource.resources.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.resource") is not None
 except ImportError:
     pass
 
@@ -53,7 +53,7 @@ __func_alias__ = {"list_": "list"}
 log = logging.getLogger(__name__)
 
 
-async def list_(hub, ctx, top=None, expand=None, **kwargs):
+async def list_(hub, ctx, top=None, expand=None, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -64,6 +64,9 @@ async def list_(hub, ctx, top=None, expand=None, **kwargs):
     :param expand: The properties to include in the results. For example, use 'metadata' in the query string
         to retrieve resource provider metadata. To include property aliases in response, use 'resourceTypes/aliases'.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -78,11 +81,13 @@ async def list_(hub, ctx, top=None, expand=None, **kwargs):
         expand = "resourceTypes/aliases"
 
     try:
-        groups = await hub.exec.azurerm.utils.paged_object_to_list(
+        groups = hub.exec.azurerm.utils.paged_object_iter(
             resconn.providers.list(top=top, expand=expand)
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(groups)
 
-        for group in groups:
+        async for group in groups:
             result[group["namespace"]] = group
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
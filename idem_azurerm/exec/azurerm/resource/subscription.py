@@ -35,16 +35,16 @@ Azure Resource Manager (ARM) Resource Subscription Execution Module
 # Python libs
 from __future__ import absolute_import
 from json import loads, dumps
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.resource.resources.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.resource") is not None
 except ImportError:
     pass
 
@@ -53,7 +53,7 @@ __func_alias__ = {"list_": "list"}
 log = logging.getLogger(__name__)
 
 
-async def list_locations(hub, ctx, subscription_id=None, **kwargs):
+async def list_locations(hub, ctx, subscription_id=None, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
@@ -61,6 +61,9 @@ async def list_locations(hub, ctx, subscription_id=None, **kwargs):
 
     :param subscription_id: The ID of the subscription to query.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -77,13 +80,15 @@ async def list_locations(hub, ctx, subscription_id=None, **kwargs):
 
     subconn = await hub.exec.azurerm.utils.get_client(ctx, "subscription", **kwargs)
     try:
-        locations = await hub.exec.azurerm.utils.paged_object_to_list(
+        locations = hub.exec.azurerm.utils.paged_object_iter(
             subconn.subscriptions.list_locations(
                 subscription_id=kwargs["subscription_id"]
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(locations)
 
-        for loc in locations:
+        async for loc in locations:
             result[loc["name"]] = loc
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -116,8 +121,8 @@ async def get(hub, ctx, subscription_id=None, **kwargs):
 
     subconn = await hub.exec.azurerm.utils.get_client(ctx, "subscription", **kwargs)
     try:
-        subscription = subconn.subscriptions.get(
-            subscription_id=kwargs.get("subscription_id")
+        subscription = await hub.exec.azurerm.utils.sdk_call(
+            subconn.subscriptions.get, subscription_id=kwargs.get("subscription_id")
         )
 
         result = subscription.as_dict()
@@ -128,12 +133,15 @@ async def get(hub, ctx, subscription_id=None, **kwargs):
     return result
 
 
-async def list_(hub, ctx, **kwargs):
+async def list_(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
     List all subscriptions for a tenant.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -144,11 +152,11 @@ async def list_(hub, ctx, **kwargs):
     result = {}
     subconn = await hub.exec.azurerm.utils.get_client(ctx, "subscription", **kwargs)
     try:
-        subs = await hub.exec.azurerm.utils.paged_object_to_list(
-            subconn.subscriptions.list()
-        )
+        subs = hub.exec.azurerm.utils.paged_object_iter(subconn.subscriptions.list())
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(subs)
 
-        for sub in subs:
+        async for sub in subs:
             result[sub["subscription_id"]] = sub
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -35,16 +35,16 @@ Azure Resource Manager (ARM) Resource Tenant Execution Module
 # Python libs
 from __future__ import absolute_import
 from json import loads, dumps
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.resource.resources.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.resource") is not None
 except ImportError:
     pass
 
@@ -53,12 +53,15 @@ __func_alias__ = {"list_": "list"}
 log = logging.getLogger(__name__)
 
 
-async def list_(hub, ctx, **kwargs):
+async def list_(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
     List all tenants for your account.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -69,11 +72,11 @@ async def list_(hub, ctx, **kwargs):
     result = {}
     subconn = await hub.exec.azurerm.utils.get_client(ctx, "subscription", **kwargs)
     try:
-        tenants = await hub.exec.azurerm.utils.paged_object_to_list(
-            subconn.tenants.list()
-        )
+        tenants = hub.exec.azurerm.utils.paged_object_iter(subconn.tenants.list())
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(tenants)
 
-        for tenant in tenants:
+        async for tenant in tenants:
             result[tenant["tenant_id"]] = tenant
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -33,15 +33,15 @@ Azure Resource Manager (ARM) Storage Account Operations Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.storage  # pylint: disable=unused-import
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.storage") is not None
 except ImportError:
     pass
 
@@ -69,7 +69,9 @@ async def check_name_availability(hub, ctx, name, **kwargs):
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        status = storconn.storage_accounts.check_name_availability(name=name)
+        status = await hub.exec.azurerm.utils.sdk_call(
+            storconn.storage_accounts.check_name_availability, name=name
+        )
 
         result = status.as_dict()
     except CloudError as exc:
@@ -93,11 +95,14 @@ async def create(
     access_tier=None,
     https_traffic_only=False,
     is_hns_enabled=False,
+    no_wait=False,
     **kwargs,
 ):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 2.4.0
+
     Asynchronously creates a new storage account with the specified parameters. If an account is already created and a
         subsequent create request is issued with different properties, the account properties will be updated. If an
         account is already created and a subsequent create or update request is issued with the exact same set of
@@ -136,6 +141,9 @@ async def create(
 
     :param is_hns_enabled: Account HierarchicalNamespace enabled if set to True. The default value is False.
 
+    :param no_wait: Return a handle for the operation as soon as it has started instead of waiting for it to finish.
+        Pass the handle to ``azurerm.utils.wait_for_operations`` to wait for the operation. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -169,13 +177,16 @@ async def create(
         return result
 
     try:
-        account = storconn.storage_accounts.create(
+        account = await hub.exec.azurerm.utils.begin_operation(
+            storconn.storage_accounts.create,
             account_name=name,
             resource_group_name=resource_group,
             parameters=accountmodel,
         )
+        if no_wait:
+            return await hub.exec.azurerm.utils.operation_handle(account)
 
-        result = account.result().as_dict()
+        result = (await hub.exec.azurerm.utils.wait_for_operation(account)).as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("storage", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -208,8 +219,10 @@ async def delete(hub, ctx, name, resource_group, **kwargs):
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        account = storconn.storage_accounts.delete(
-            account_name=name, resource_group_name=resource_group
+        account = await hub.exec.azurerm.utils.sdk_call(
+            storconn.storage_accounts.delete,
+            account_name=name,
+            resource_group_name=resource_group,
         )
 
         result = True
@@ -240,8 +253,10 @@ async def get_properties(hub, ctx, name, resource_group, **kwargs):
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        props = storconn.storage_accounts.get_properties(
-            account_name=name, resource_group_name=resource_group
+        props = await hub.exec.azurerm.utils.sdk_call(
+            storconn.storage_accounts.get_properties,
+            account_name=name,
+            resource_group_name=resource_group,
         )
 
         result = props.as_dict()
@@ -252,13 +267,16 @@ async def get_properties(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def list_(hub, ctx, **kwargs):
+async def list_(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
     Lists all the storage accounts available under the subscription. Note that storage keys are not returned; use the
         ListKeys operation for this.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -270,11 +288,13 @@ async def list_(hub, ctx, **kwargs):
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        accounts = await hub.exec.azurerm.utils.paged_object_to_list(
+        accounts = hub.exec.azurerm.utils.paged_object_iter(
             storconn.storage_accounts.list()
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(accounts)
 
-        for account in accounts:
+        async for account in accounts:
             result[account["name"]] = account
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("storage", str(exc), **kwargs)
@@ -344,7 +364,8 @@ async def list_account_sas(
         return result
 
     try:
-        creds = storconn.storage_accounts.list_account_sas(
+        creds = await hub.exec.azurerm.utils.sdk_call(
+            storconn.storage_accounts.list_account_sas,
             account_name=name,
             resource_group_name=resource_group,
             parameters=accountmodel,
@@ -358,7 +379,7 @@ async def list_account_sas(
     return result
 
 
-async def list_by_resource_group(hub, ctx, resource_group, **kwargs):
+async def list_by_resource_group(hub, ctx, resource_group, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
@@ -367,6 +388,9 @@ async def list_by_resource_group(hub, ctx, resource_group, **kwargs):
 
     :param resource_group: The name of the resource group that the storage account belongs to.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -377,13 +401,15 @@ async def list_by_resource_group(hub, ctx, resource_group, **kwargs):
     result = {}
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
     try:
-        accounts = await hub.exec.azurerm.utils.paged_object_to_list(
+        accounts = hub.exec.azurerm.utils.paged_object_iter(
             storconn.storage_accounts.list_by_resource_group(
                 resource_group_name=resource_group
             )
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(accounts)
 
-        for account in accounts:
+        async for account in accounts:
             result[account["name"]] = account
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("storage", str(exc), **kwargs)
@@ -412,8 +438,10 @@ async def list_keys(hub, ctx, name, resource_group, **kwargs):
     result = {}
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
     try:
-        keys = storconn.storage_accounts.list_keys(
-            account_name=name, resource_group_name=resource_group
+        keys = await hub.exec.azurerm.utils.sdk_call(
+            storconn.storage_accounts.list_keys,
+            account_name=name,
+            resource_group_name=resource_group,
         )
 
         result = keys.as_dict()
@@ -478,7 +506,8 @@ async def list_service_sas(
         return result
 
     try:
-        creds = storconn.storage_accounts.list_service_sas(
+        creds = await hub.exec.azurerm.utils.sdk_call(
+            storconn.storage_accounts.list_service_sas,
             account_name=name,
             resource_group_name=resource_group,
             parameters=servicemodel,
@@ -514,7 +543,8 @@ async def regenerate_key(hub, ctx, name, resource_group, key_name, **kwargs):
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        keys = storconn.storage_accounts.regenerate_key(
+        keys = await hub.exec.azurerm.utils.sdk_call(
+            storconn.storage_accounts.regenerate_key,
             resource_group_name=resource_group,
             account_name=name,
             key_name=key_name,
@@ -33,15 +33,15 @@ Azure Resource Manager (ARM) Blob Container Operations Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.storage  # pylint: disable=unused-import
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.storage") is not None
 except ImportError:
     pass
 
@@ -78,7 +78,8 @@ async def clear_legal_hold(hub, ctx, name, account, resource_group, tags, **kwar
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        hold = storconn.blob_containers.clear_legal_hold(
+        hold = await hub.exec.azurerm.utils.sdk_call(
+            storconn.blob_containers.clear_legal_hold,
             container_name=name,
             resource_group_name=resource_group,
             account_name=account,
@@ -127,7 +128,8 @@ async def create(
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        container = storconn.blob_containers.create(
+        container = await hub.exec.azurerm.utils.sdk_call(
+            storconn.blob_containers.create,
             container_name=name,
             account_name=account,
             resource_group_name=resource_group,
@@ -191,7 +193,8 @@ async def create_or_update_immutability_policy(
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        policy = storconn.blob_containers.create_or_update_immutability_policy(
+        policy = await hub.exec.azurerm.utils.sdk_call(
+            storconn.blob_containers.create_or_update_immutability_policy,
             container_name=name,
             account_name=account,
             resource_group_name=resource_group,
@@ -238,7 +241,8 @@ async def delete(hub, ctx, name, account, resource_group, **kwargs):
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        container = storconn.blob_containers.delete(
+        container = await hub.exec.azurerm.utils.sdk_call(
+            storconn.blob_containers.delete,
             container_name=name,
             account_name=account,
             resource_group_name=resource_group,
@@ -285,7 +289,8 @@ async def delete_immutability_policy(
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        policy = storconn.blob_containers.delete_immutability_policy(
+        policy = await hub.exec.azurerm.utils.sdk_call(
+            storconn.blob_containers.delete_immutability_policy,
             container_name=name,
             account_name=account,
             resource_group_name=resource_group,
@@ -334,7 +339,8 @@ async def extend_immutability_policy(
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        policy = storconn.blob_containers.extend_immutability_policy(
+        policy = await hub.exec.azurerm.utils.sdk_call(
+            storconn.blob_containers.extend_immutability_policy,
             container_name=name,
             account_name=account,
             resource_group_name=resource_group,
@@ -377,7 +383,8 @@ async def get(hub, ctx, name, account, resource_group, **kwargs):
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        container = storconn.blob_containers.get(
+        container = await hub.exec.azurerm.utils.sdk_call(
+            storconn.blob_containers.get,
             container_name=name,
             account_name=account,
             resource_group_name=resource_group,
@@ -423,7 +430,8 @@ async def get_immutability_policy(
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        policy = storconn.blob_containers.get_immutability_policy(
+        policy = await hub.exec.azurerm.utils.sdk_call(
+            storconn.blob_containers.get_immutability_policy,
             container_name=name,
             account_name=account,
             resource_group_name=resource_group,
@@ -461,8 +469,10 @@ async def list_(hub, ctx, account, resource_group, **kwargs):
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        containers = storconn.blob_containers.list(
-            account_name=account, resource_group_name=resource_group
+        containers = await hub.exec.azurerm.utils.sdk_call(
+            storconn.blob_containers.list,
+            account_name=account,
+            resource_group_name=resource_group,
         )
 
         containers_list = containers.as_dict().get("value", [])
@@ -504,7 +514,8 @@ async def lock_immutability_policy(
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        policy = storconn.blob_containers.lock_immutability_policy(
+        policy = await hub.exec.azurerm.utils.sdk_call(
+            storconn.blob_containers.lock_immutability_policy,
             container_name=name,
             account_name=account,
             resource_group_name=resource_group,
@@ -548,7 +559,8 @@ async def set_legal_hold(hub, ctx, name, account, resource_group, tags, **kwargs
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        hold = storconn.blob_containers.set_legal_hold(
+        hold = await hub.exec.azurerm.utils.sdk_call(
+            storconn.blob_containers.set_legal_hold,
             container_name=name,
             resource_group_name=resource_group,
             account_name=account,
@@ -596,7 +608,8 @@ async def update(
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        container = storconn.blob_containers.update(
+        container = await hub.exec.azurerm.utils.begin_operation(
+            storconn.blob_containers.update,
             container_name=name,
             account_name=account,
             resource_group_name=resource_group,
@@ -605,7 +618,7 @@ async def update(
             **kwargs,
         )
 
-        result = container.result().as_dict()
+        result = (await hub.exec.azurerm.utils.wait_for_operation(container)).as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("storage", str(exc), **kwargs)
         result = {"error": str(exc)}
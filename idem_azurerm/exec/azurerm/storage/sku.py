@@ -33,15 +33,15 @@ Azure Resource Manager (ARM) SKU Operations Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.storage  # pylint: disable=unused-import
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.storage") is not None
 except ImportError:
     pass
 
@@ -50,12 +50,15 @@ __func_alias__ = {"list_": "list"}
 log = logging.getLogger(__name__)
 
 
-async def list_(hub, ctx, **kwargs):
+async def list_(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
     Lists the available SKUs supported by Microsoft.Storage for given subscription.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -67,9 +70,11 @@ async def list_(hub, ctx, **kwargs):
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        skus = await hub.exec.azurerm.utils.paged_object_to_list(storconn.skus.list())
+        skus = hub.exec.azurerm.utils.paged_object_iter(storconn.skus.list())
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(skus)
 
-        for sku in skus:
+        async for sku in skus:
             result[sku["name"]] = sku
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("storage", str(exc), **kwargs)
@@ -33,15 +33,15 @@ Azure Resource Manager (ARM) Usage Operations Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import importlib.util
 import logging
 
 # Azure libs
 HAS_LIBS = False
 try:
-    import azure.mgmt.storage  # pylint: disable=unused-import
     from msrestazure.azure_exceptions import CloudError
 
-    HAS_LIBS = True
+    HAS_LIBS = importlib.util.find_spec("azure.mgmt.storage") is not None
 except ImportError:
     pass
 
@@ -50,12 +50,15 @@ __func_alias__ = {"list_": "list"}
 log = logging.getLogger(__name__)
 
 
-async def list_(hub, ctx, **kwargs):
+async def list_(hub, ctx, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
     Gets the current usage count and the limit for the resources under the subscription.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -67,11 +70,11 @@ async def list_(hub, ctx, **kwargs):
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        usages = await hub.exec.azurerm.utils.paged_object_to_list(
-            storconn.usage.list()
-        )
+        usages = hub.exec.azurerm.utils.paged_object_iter(storconn.usage.list())
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(usages)
 
-        for usage in usages:
+        async for usage in usages:
             result[usage["name"]["value"]] = usage
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("storage", str(exc), **kwargs)
@@ -80,7 +83,7 @@ async def list_(hub, ctx, **kwargs):
     return result
 
 
-async def list_by_location(hub, ctx, location, **kwargs):
+async def list_by_location(hub, ctx, location, stream=False, **kwargs):
     """
     .. versionadded:: 2.0.0
 
@@ -88,6 +91,9 @@ async def list_by_location(hub, ctx, location, **kwargs):
 
     :param location: The location of the Azure Storage resource.
 
+    :param stream: If True, return an asynchronous generator which yields each item as a dictionary while the
+        results are paged through, instead of a dictionary of all items. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -99,11 +105,13 @@ async def list_by_location(hub, ctx, location, **kwargs):
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
     try:
-        usages = await hub.exec.azurerm.utils.paged_object_to_list(
+        usages = hub.exec.azurerm.utils.paged_object_iter(
             storconn.usage.list_by_location(location)
         )
+        if stream:
+            return await hub.exec.azurerm.utils.paged_object_stream(usages)
 
-        for usage in usages:
+        async for usage in usages:
             result[usage["name"]["value"]] = usage
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("storage", str(exc), **kwargs)
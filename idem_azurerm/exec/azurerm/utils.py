@@ -11,53 +11,411 @@ Azure Resource Manager (ARM) Utilities
 """
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
-from operator import itemgetter
+import asyncio
+import bisect
+import collections
+import concurrent.futures
+import copy
+import functools
 import importlib
+import importlib.util
+import inspect
+import json
 import logging
 import six
 import sys
 import os
+import random
+import re
+import threading
+import time
+import uuid
+
+# Import local libs
+import idem_azurerm.auth as auth
 
 # Import third party libs
 try:
-    from azure.common.credentials import (
-        UserPassCredentials,
-        ServicePrincipalCredentials,
-    )
     from msrestazure.azure_cloud import (
+        Cloud,
+        CloudEndpoints,
+        CloudSuffixes,
         MetadataEndpointError,
         get_cloud_from_metadata_endpoint,
     )
     from msrestazure.azure_exceptions import CloudError
+    from msrestazure.polling.arm_polling import (
+        ARMPolling,
+        BadResponse,
+        BadStatus,
+        OperationFailed,
+        failed,
+    )
+    from urllib3.util.retry import Retry
 
     HAS_AZURE = True
 except ImportError:
     HAS_AZURE = False
 
 try:
-    from azure.identity import (
-        DefaultAzureCredential,
-        KnownAuthorities,
-    )
-
-    HAS_AZURE_ID = True
+    HAS_AZURE_ID = importlib.util.find_spec("azure.identity") is not None
 except ImportError:
     HAS_AZURE_ID = False
 
 log = logging.getLogger(__name__)
 
+if HAS_AZURE:
+
+    class _EventLoopPolling(ARMPolling):
+        """
+        ARM polling method which leaves the polling loop to ``wait_for_operation`` on the event loop instead of
+        sleeping in a polling thread. Each step is a short blocking request which is run with ``sdk_call``.
+        """
+
+        def run(self):
+            # The poller thread has nothing to do, the event loop drives the operation
+            return
+
+        def retry_after(self):
+            """
+            Return the number of seconds to wait before the next status request. Retry-After headers given as an
+            HTTP date fall back to the polling interval.
+            """
+            if self._response is not None and self._response.headers.get("retry-after"):
+                try:
+                    return int(self._response.headers["retry-after"])
+                except ValueError:
+                    pass
+            return self._timeout
+
+        def _step(self, step):
+            try:
+                step()
+            except BadStatus:
+                self._operation.status = "Failed"
+                raise CloudError(self._response)
+            except BadResponse as err:
+                self._operation.status = "Failed"
+                raise CloudError(self._response, str(err))
+            except OperationFailed:
+                raise CloudError(self._response)
+
+        def poll(self):
+            """
+            Request the current status of the operation once.
+            """
+            self._step(self.update_status)
+
+        def complete(self):
+            """
+            Fail on an unsuccessful terminal status, or fetch the final resource if the operation requires it.
+            """
+            self._step(self._complete)
+
+        def _complete(self):
+            if failed(self._operation.status):
+                raise OperationFailed("Operation failed or cancelled")
+
+            if self._operation.should_do_final_get():
+                if self._operation.method == "POST" and self._operation.location_url:
+                    final_get_url = self._operation.location_url
+                else:
+                    final_get_url = self._operation.initial_response.request.url
+                self._response = self.request_status(final_get_url)
+                self._operation.parse_resource(self._response)
+
+    class _GovernedRetry(Retry):
+        """
+        Retry policy for the shared ARM connection pool. Throttled requests are always retried, backoff between
+        retries is jittered so that concurrent requests do not retry in lockstep, and every throttled or failed
+        response is reported to the rate governor of the subscription in the request URL.
+        """
+
+        def __init__(self, *args, governors=None, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.governors = governors if governors is not None else {}
+
+        @classmethod
+        def wrap(cls, policy, governors):
+            """
+            Return a copy of an existing retry policy which reports to the given governors.
+            """
+            retry = cls(governors=governors)
+            retry.__dict__.update(policy.__dict__)
+            retry.governors = governors
+            return retry
+
+        def new(self, **kwargs):
+            kwargs.setdefault("governors", self.governors)
+            return super().new(**kwargs)
+
+        def is_retry(self, method, status_code, has_retry_after=False):
+            if status_code == 429 and self.total:
+                return True
+            return super().is_retry(method, status_code, has_retry_after)
+
+        def get_backoff_time(self):
+            return random.uniform(0, super().get_backoff_time())
+
+        def increment(self, method=None, url=None, response=None, error=None, **kwargs):
+            match = SUBSCRIPTION_URL.search(url or "")
+            governor = self.governors.get(match.group(1)) if match else None
+            if governor is not None and response is not None:
+                if response.status == 429:
+                    governor.throttled(self.get_retry_after(response))
+                elif response.status >= 500:
+                    governor.server_error()
+            return super().increment(method, url, response, error, **kwargs)
+
+
+class _RateGovernor:
+    """
+    Tracks the ARM request quota of a subscription and adapts how many SDK calls against it may run at once. The limit
+    grows by one for every window of successful responses and halves whenever requests are throttled or the remaining
+    quota reported by ARM falls below the low watermark.
+    """
+
+    def __init__(self, max_concurrency, low_watermark):
+        self.lock = threading.Lock()
+        # calls waiting for a slot are woken through a condition of the event loop they wait on
+        self.loop = None
+        self.condition = None
+        self.max_concurrency = max(1, max_concurrency)
+        self.low_watermark = low_watermark
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.counters = {
+            "calls": 0,
+            "responses": 0,
+            "throttled": 0,
+            "server_errors": 0,
+            "wait_seconds": 0.0,
+        }
+        self.remaining = {"reads": None, "writes": None}
+        self.min_remaining = {"reads": None, "writes": None}
+
+    def _decrease(self):
+        self.limit = max(1.0, self.limit / 2)
+
+    def record_response(self, status_code, headers):
+        """
+        Record the remaining quota reported in the headers of a response received for the subscription.
+        """
+        with self.lock:
+            self.counters["responses"] += 1
+            low = False
+            for kind in ("reads", "writes"):
+                value = headers.get(
+                    "x-ms-ratelimit-remaining-subscription-{0}".format(kind)
+                )
+                try:
+                    value = int(value)
+                except (TypeError, ValueError):
+                    continue
+                self.remaining[kind] = value
+                if self.min_remaining[kind] is None or value < self.min_remaining[kind]:
+                    self.min_remaining[kind] = value
+                if value < self.low_watermark:
+                    low = True
+
+            grown = False
+            if low:
+                self._decrease()
+            elif status_code < 400:
+                limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+                grown = int(limit) > int(self.limit)
+                self.limit = limit
+
+        if grown:
+            self._wake()
+
+    def throttled(self, retry_after=None):
+        """
+        Record a throttled request. New calls are held back until the requested retry interval has passed.
+        """
+        with self.lock:
+            self.counters["throttled"] += 1
+            self._decrease()
+            if retry_after:
+                self.paused_until = max(
+                    self.paused_until, time.monotonic() + retry_after
+                )
+
+    def server_error(self):
+        """
+        Record a request which failed with a server error.
+        """
+        with self.lock:
+            self.counters["server_errors"] += 1
+
+    def _wake(self):
+        """
+        Wake the calls waiting for a slot. Responses are recorded in worker threads, so the waiters are notified through
+        the event loop they wait on.
+        """
+        loop, condition = self.loop, self.condition
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(
+                functools.partial(asyncio.ensure_future, _notify_all(condition))
+            )
+        except RuntimeError:
+            # the loop was closed in the meantime
+            pass
+
+    async def acquire(self):
+        """
+        Wait until another call may run against the subscription.
+        """
+        started = time.monotonic()
+        loop = asyncio.get_event_loop()
+        if self.loop is not loop:
+            self.loop = loop
+            self.condition = asyncio.Condition()
+        condition = self.condition
+
+        async with condition:
+            while True:
+                with self.lock:
+                    now = time.monotonic()
+                    if now >= self.paused_until and self.in_flight < int(self.limit):
+                        self.in_flight += 1
+                        self.counters["calls"] += 1
+                        self.counters["wait_seconds"] += now - started
+                        return
+                    # a pause ends on its own, while a full subscription waits for a call to be released
+                    timeout = (
+                        self.paused_until - now if now < self.paused_until else None
+                    )
+                try:
+                    await asyncio.wait_for(condition.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+    def release(self):
+        with self.lock:
+            self.in_flight -= 1
+        self._wake()
+
+    def stats(self):
+        with self.lock:
+            ret = dict(self.counters)
+            ret["concurrency"] = int(self.limit)
+            ret["in_flight"] = self.in_flight
+            for kind in ("reads", "writes"):
+                ret["remaining_{0}".format(kind)] = self.remaining[kind]
+                ret["min_remaining_{0}".format(kind)] = self.min_remaining[kind]
+        return ret
+
+
+async def _notify_all(condition):
+    async with condition:
+        condition.notify_all()
+
+
+# Matches the subscription ID in the path of an ARM request
+SUBSCRIPTION_URL = re.compile(r"/subscriptions/([^/?#]+)", re.IGNORECASE)
+
+
+def _merge_acct(ctx, kwargs):
+    """
+    Return a copy of the keyword arguments with any missing values filled in from acct.
+    """
+    merged = dict(kwargs)
+    if ctx["acct"]:
+        for key, val in ctx["acct"].items():
+            # explicit kwargs override acct
+            merged.setdefault(key, val)
+    return merged
+
+
+def _refresh_credentials(hub, credentials):
+    """
+    Acquire a new token for cached credentials which are about to expire, so that requests made with them never
+    have to wait on an expired token being renewed.
+    """
+    expires_on = (credentials.token or {}).get("expires_on")
+    try:
+        expires_in = float(expires_on) - time.time()
+    except (TypeError, ValueError):
+        return
+
+    if expires_in < hub.exec.azurerm.TOKEN_REFRESH_MARGIN:
+        log.debug("Refreshing Azure token expiring in %d seconds", expires_in)
+        credentials.set_token()
+
+
+def _cloud_from_metadata_endpoint(hub, endpoint):
+    """
+    Resolve a cloud environment from an ARM metadata endpoint. Resolved clouds are kept in memory for the life of the
+    process and, if a cache file is configured, on disk until their TTL expires.
+    """
+    if endpoint in hub.exec.azurerm.CLOUD_CACHE:
+        return hub.exec.azurerm.CLOUD_CACHE[endpoint]
+
+    cloud_env = None
+    disk_cache = {}
+    cache_file = hub.exec.azurerm.CLOUD_METADATA_CACHE_FILE
+
+    if cache_file:
+        try:
+            with open(cache_file, "r") as cache_fh:
+                disk_cache = json.load(cache_fh)
+            cached = disk_cache[endpoint]
+            if time.time() - cached["fetched"] < hub.exec.azurerm.CLOUD_METADATA_TTL:
+                cloud_env = Cloud(
+                    cached["name"],
+                    endpoints=CloudEndpoints(**cached["endpoints"]),
+                    suffixes=CloudSuffixes(**cached["suffixes"]),
+                )
+        except (IOError, ValueError, KeyError, TypeError, AttributeError):
+            log.debug("No usable cached cloud metadata for %s", endpoint)
+
+    if not cloud_env:
+        cloud_env = get_cloud_from_metadata_endpoint(endpoint)
+
+        if cache_file:
+            if not isinstance(disk_cache, dict):
+                disk_cache = {}
+            disk_cache[endpoint] = {
+                "fetched": time.time(),
+                "name": cloud_env.name,
+                "endpoints": vars(cloud_env.endpoints),
+                "suffixes": vars(cloud_env.suffixes),
+            }
+            try:
+                cache_dir = os.path.dirname(cache_file)
+                if cache_dir:
+                    os.makedirs(cache_dir, exist_ok=True)
+                tmp_file = "{0}.{1}".format(cache_file, os.getpid())
+                with open(tmp_file, "w") as cache_fh:
+                    json.dump(disk_cache, cache_fh)
+                os.replace(tmp_file, cache_file)
+            except (IOError, TypeError) as exc:
+                log.warning("Unable to write the cloud metadata cache: %s", exc)
+
+    hub.exec.azurerm.CLOUD_CACHE[endpoint] = cloud_env
+
+    return cloud_env
+
 
 async def determine_auth(hub, ctx, resource=None, **kwargs):
     """
     Acquire Azure RM Credentials (mgmt modules)
     """
+    # the credential libraries are imported on first use since they take a while to load
+    import adal
+    from azure.common.credentials import (
+        UserPassCredentials,
+        ServicePrincipalCredentials,
+    )
+
     service_principal_creds_kwargs = ["client_id", "secret", "tenant"]
     user_pass_creds_kwargs = ["username", "password"]
 
-    if ctx["acct"]:
-        for key, val in ctx["acct"].items():
-            # explicit kwargs override acct
-            kwargs.setdefault(key, val)
+    kwargs = _merge_acct(ctx, kwargs)
 
     cred_kwargs = {}
 
@@ -68,7 +426,9 @@ async def determine_auth(hub, ctx, resource=None, **kwargs):
         if kwargs.get("cloud_environment") and kwargs.get(
             "cloud_environment"
         ).startswith("http"):
-            cloud_env = get_cloud_from_metadata_endpoint(kwargs["cloud_environment"])
+            cloud_env = await hub.exec.azurerm.utils.sdk_call(
+                _cloud_from_metadata_endpoint, hub, kwargs["cloud_environment"]
+            )
         else:
             cloud_env_module = importlib.import_module("msrestazure.azure_cloud")
             cloud_env = getattr(
@@ -81,13 +441,35 @@ async def determine_auth(hub, ctx, resource=None, **kwargs):
             )
         )
 
-    if set(service_principal_creds_kwargs).issubset(kwargs):
+    cred_key = (
+        auth.auth_identity(kwargs),
+        resource,
+        cloud_env.endpoints.active_directory,
+    )
+    credentials = hub.exec.azurerm.CREDENTIAL_CACHE.get(cred_key)
+
+    # all credentials share one ADAL token cache, so a token is only acquired once per tenant and resource
+    if hub.exec.azurerm.TOKEN_CACHE is None:
+        hub.exec.azurerm.TOKEN_CACHE = adal.TokenCache()
+    cred_kwargs["cache"] = hub.exec.azurerm.TOKEN_CACHE
+
+    if credentials:
+        await _dispatch(
+            hub,
+            _refresh_credentials,
+            (hub, credentials),
+            {},
+            origin=type(credentials),
+            step="refresh",
+        )
+    elif set(service_principal_creds_kwargs).issubset(kwargs):
         if not (kwargs["client_id"] and kwargs["secret"] and kwargs["tenant"]):
             raise Exception(
                 "The client_id, secret, and tenant parameters must all be "
                 "populated if using service principals."
             )
-        credentials = ServicePrincipalCredentials(
+        credentials = await hub.exec.azurerm.utils.sdk_call(
+            ServicePrincipalCredentials,
             kwargs["client_id"],
             kwargs["secret"],
             tenant=kwargs["tenant"],
@@ -100,7 +482,8 @@ async def determine_auth(hub, ctx, resource=None, **kwargs):
                 "The username and password parameters must both be "
                 "populated if using username/password authentication."
             )
-        credentials = UserPassCredentials(
+        credentials = await hub.exec.azurerm.utils.sdk_call(
+            UserPassCredentials,
             kwargs["username"],
             kwargs["password"],
             cloud_environment=cloud_env,
@@ -119,6 +502,8 @@ async def determine_auth(hub, ctx, resource=None, **kwargs):
 
     subscription_id = str(kwargs["subscription_id"])
 
+    hub.exec.azurerm.CREDENTIAL_CACHE[cred_key] = credentials
+
     return credentials, subscription_id, cloud_env
 
 
@@ -169,6 +554,19 @@ async def get_client(hub, ctx, client_type, **kwargs):
     except ImportError:
         raise sys.exit("The azure {0} client is not available.".format(client_type))
 
+    auth_kwargs = _merge_acct(ctx, kwargs)
+    pool_key = (
+        client_type,
+        auth.auth_identity(auth_kwargs),
+        str(auth_kwargs.get("subscription_id")),
+        auth_kwargs.get("cloud_environment", "AZURE_PUBLIC_CLOUD"),
+    )
+
+    pool = hub.exec.azurerm.CLIENT_POOL
+    if pool_key in pool:
+        pool.move_to_end(pool_key)
+        return pool[pool_key]
+
     (
         credentials,
         subscription_id,
@@ -188,9 +586,210 @@ async def get_client(hub, ctx, client_type, **kwargs):
 
     client.config.add_user_agent("idem-azurerm/2.0.0")
 
+    # pooled clients hold on to their HTTP session between calls instead of closing it after each response
+    client.config.keep_alive = True
+
+    governor = _rate_governor(hub, subscription_id)
+    client.config.hooks.append(functools.partial(_rate_limit_hook, governor))
+    client.config.hooks.append(_call_record_hook)
+    await hub.exec.azurerm.utils.share_connection_pool(client)
+
+    pool[pool_key] = client
+    while len(pool) > hub.exec.azurerm.CLIENT_POOL_SIZE:
+        # another coroutine may still be using the evicted client, so it is left open and closed once unreferenced
+        pool.popitem(last=False)
+
+    return client
+
+
+# Sessions are created lazily from worker threads, so only one thread may build each of them
+_HTTP_SESSION_LOCK = threading.Lock()
+
+
+def _http_session(hub, name):
+    """
+    Return one of the process-wide HTTP sessions, creating it on first use. The "arm" session is shared by msrest
+    clients and retries like msrest does, with the retries reported to the rate governors. The "data" session is
+    shared by azure-core clients, which retry in their own pipeline.
+    """
+    session = hub.exec.azurerm.HTTP_SESSIONS.get(name)
+    if session is not None:
+        return session
+
+    with _HTTP_SESSION_LOCK:
+        session = hub.exec.azurerm.HTTP_SESSIONS.get(name)
+        if session is None:
+            session = _new_http_session(hub, name)
+            hub.exec.azurerm.HTTP_SESSIONS[name] = session
+    return session
+
+
+def _new_http_session(hub, name):
+    """
+    Build one of the shared HTTP sessions.
+    """
+    import requests
+    from msrest.universal_http.requests import ClientRetryPolicy, _patch_redirect
+
+    session = requests.Session()
+    if name == "arm":
+        # msrest clients strip the authorization header when redirected, which has to be patched into the session
+        _patch_redirect(session)
+        max_retries = _GovernedRetry.wrap(
+            ClientRetryPolicy().policy, hub.exec.azurerm.RATE_GOVERNORS
+        )
+    else:
+        max_retries = Retry(total=False, redirect=False, raise_on_status=False)
+
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=hub.exec.azurerm.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=hub.exec.azurerm.HTTP_POOL_MAXSIZE,
+        max_retries=max_retries,
+    )
+    for protocol in ("http://", "https://"):
+        session.mount(protocol, adapter)
+    if not hub.exec.azurerm.HTTP_KEEP_ALIVE:
+        session.headers["Connection"] = "close"
+
+    return session
+
+
+def _shared_session_callback(hub, session, global_config, local_config, **kwargs):
+    """
+    msrest session configuration callback which sends the request through the shared ARM session.
+    """
+    kwargs["session"] = _http_session(hub, "arm")
+    return kwargs
+
+
+async def share_connection_pool(hub, client):
+    """
+    .. versionadded:: 2.4.0
+
+    Configure an msrest based client, such as a management or Graph RBAC client, to send its requests through the
+    shared ARM connection pool instead of opening its own HTTP sessions.
+
+    :param client: The client object.
+
+    """
+    client.config.session_configuration_callback = functools.partial(
+        _shared_session_callback, hub
+    )
+    client.config.connection.timeout = (
+        hub.exec.azurerm.HTTP_CONNECT_TIMEOUT,
+        hub.exec.azurerm.HTTP_READ_TIMEOUT,
+    )
+    return client
+
+
+async def shared_transport(hub):
+    """
+    .. versionadded:: 2.4.0
+
+    Return an azure-core transport which sends requests through the shared data plane connection pool. Pass it as the
+    ``transport`` of azure-core clients, such as Key Vault secret or key clients.
+
+    """
+    from azure.core.pipeline.transport import RequestsTransport
+
+    return RequestsTransport(
+        session=_http_session(hub, "data"),
+        session_owner=False,
+        connection_timeout=hub.exec.azurerm.HTTP_CONNECT_TIMEOUT,
+        read_timeout=hub.exec.azurerm.HTTP_READ_TIMEOUT,
+    )
+
+
+async def get_data_plane_client(hub, ctx, client_class, vault_url, **kwargs):
+    """
+    .. versionadded:: 2.4.0
+
+    Return a data plane client of the given azure-core client class, such as a Key Vault ``SecretClient`` or
+    ``KeyClient``, for a vault. Clients are pooled per client class, vault URL and identity, so that they share a
+    credential and its tokens and send their requests through the shared data plane connection pool. The least
+    recently used clients are evicted once there are more than ``DATA_PLANE_POOL_SIZE``.
+
+    :param client_class: The azure-core client class to build.
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    """
+    auth_kwargs = _merge_acct(ctx, kwargs)
+    pool_key = (
+        "{0}.{1}".format(client_class.__module__, client_class.__qualname__),
+        vault_url.rstrip("/").lower(),
+        auth.auth_identity(auth_kwargs),
+        auth_kwargs.get("cloud_environment", "AZURE_PUBLIC_CLOUD"),
+    )
+
+    pool = hub.exec.azurerm.DATA_PLANE_CLIENTS
+    if pool_key in pool:
+        pool.move_to_end(pool_key)
+        return pool[pool_key]
+
+    credential = await hub.exec.azurerm.utils.get_identity_credentials(ctx, **kwargs)
+    transport = await hub.exec.azurerm.utils.shared_transport()
+    client = client_class(
+        vault_url=vault_url, credential=credential, transport=transport
+    )
+
+    pool[pool_key] = client
+    while len(pool) > hub.exec.azurerm.DATA_PLANE_POOL_SIZE:
+        # another coroutine may still be using the evicted client, so it is left open and closed once unreferenced
+        pool.popitem(last=False)
+
     return client
 
 
+async def invalidate_clients(hub, ctx, client_type=None, **kwargs):
+    """
+    .. versionadded:: 2.4.0
+
+    .. versionchanged:: 2.4.0
+
+    Remove management clients from the client pool so that they will be rebuilt on the next call to ``get_client``.
+    This should be used after credentials have been rotated or revoked. If authentication parameters are available
+    via acct or keyword arguments, only the clients built for that identity are removed. Otherwise, the whole pool
+    is emptied. Data plane clients from ``get_data_plane_client`` are removed as well unless a ``client_type`` is
+    given.
+
+    :param client_type: Only remove clients of this type, such as "compute" or "network".
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.utils.invalidate_clients client_type=network
+
+    """
+    auth_kwargs = _merge_acct(ctx, kwargs)
+    identity = None
+    if any(auth_kwargs.get(key) for key in auth.AUTH_KWARGS):
+        identity = auth.auth_identity(auth_kwargs)
+
+    pool = hub.exec.azurerm.CLIENT_POOL
+    removed = 0
+    for pool_key in list(pool):
+        if client_type and pool_key[0] != client_type:
+            continue
+        if identity and pool_key[1] != identity:
+            continue
+        pool.pop(pool_key).close()
+        removed += 1
+
+    if not client_type:
+        data_plane = hub.exec.azurerm.DATA_PLANE_CLIENTS
+        for pool_key in list(data_plane):
+            if identity and pool_key[2] != identity:
+                continue
+            client = data_plane.pop(pool_key)
+            if hasattr(client, "close"):
+                client.close()
+            removed += 1
+
+    return removed
+
+
 async def log_cloud_error(hub, client, message, **kwargs):
     """
     Log an Azure cloud error exception
@@ -207,175 +806,1338 @@ async def log_cloud_error(hub, client, message, **kwargs):
     return
 
 
-async def paged_object_to_list(hub, paged_object):
+# Call record of the SDK call running on the current worker thread
+_CALL_CONTEXT = threading.local()
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+
+
+def _call_record(func, origin=None, step=None):
     """
-    Extract all pages within a paged object as a list of dictionaries
+    Start the record of an SDK call, naming it after the client package and operations group of a bound operation.
+    Pages, polls and other steps of an operation are run through helper functions, so they name the operation they
+    belong to as their origin along with the step they take.
     """
-    paged_return = []
-    while True:
-        try:
-            page = next(paged_object)
-            paged_return.append(page.as_dict())
-        except CloudError:
-            raise
-        except StopIteration:
-            break
+    named = origin if origin is not None else func
+    owner = getattr(named, "__self__", None)
+    client = ""
+    operation = getattr(named, "__name__", type(named).__name__)
+    if owner is not None and not inspect.ismodule(owner):
+        module = type(owner).__module__.split(".")
+        if module[:2] == ["azure", "mgmt"] and len(module) > 2:
+            client = module[2]
+        elif module[0] == "azure" and len(module) > 1:
+            client = module[1]
+        group = type(owner).__name__
+        if group.endswith("Operations"):
+            group = re.sub(r"(?<!^)(?=[A-Z])", "_", group[: -len("Operations")])
+        operation = "{0}.{1}".format(group.lower(), operation)
+    elif inspect.isclass(named):
+        # credentials and other SDK objects which are built off the event loop
+        client = named.__module__.split(".")[0]
 
-    return paged_return
+    return {
+        "client": client,
+        "operation": operation,
+        "step": step,
+        "started": time.time(),
+        "seconds": None,
+        "status": None,
+        "request_ids": [],
+        "requests": 0,
+        "bytes": 0,
+        "error": None,
+    }
 
 
-async def create_object_model(hub, module_name, object_name, **kwargs):
+def _run_recorded(record, func, args, kwargs):
     """
-    Assemble an object from incoming parameters.
+    Run an SDK call on a worker thread, making its record available to the response hooks of that thread.
     """
-    object_kwargs = {}
-
+    _CALL_CONTEXT.record = record
     try:
-        model_module = importlib.import_module(
-            "azure.mgmt.{0}.models".format(module_name)
-        )
-        # pylint: disable=invalid-name
-        Model = getattr(model_module, object_name)
-    except ImportError:
-        raise sys.exit(
-            "The {0} model in the {1} Azure module is not available.".format(
-                object_name, module_name
-            )
-        )
+        return func(*args, **kwargs)
+    finally:
+        _CALL_CONTEXT.record = None
 
-    if "_attribute_map" in dir(Model):
-        for attr, items in Model._attribute_map.items():
-            param = kwargs.get(attr)
-            if param is not None:
-                if items["type"][0].isupper() and isinstance(param, dict):
-                    object_kwargs[attr] = await create_object_model(
-                        hub, module_name, items["type"], **param
-                    )
-                elif items["type"][0] == "{" and isinstance(param, dict):
-                    object_kwargs[attr] = param
-                elif items["type"][0] == "[" and isinstance(param, list):
-                    obj_list = []
-                    for list_item in param:
-                        if items["type"][1].isupper() and isinstance(list_item, dict):
-                            obj_list.append(
-                                await create_object_model(
-                                    hub,
-                                    module_name,
-                                    items["type"][
-                                        items["type"].index("[")
-                                        + 1 : items["type"].rindex("]")
-                                    ],
-                                    **list_item,
-                                )
-                            )
-                        elif items["type"][1] == "{" and isinstance(list_item, dict):
-                            obj_list.append(list_item)
-                        elif not items["type"][1].isupper() and items["type"][1] != "{":
-                            obj_list.append(list_item)
-                    object_kwargs[attr] = obj_list
-                else:
-                    object_kwargs[attr] = param
 
-    # wrap calls to this function to catch TypeError exceptions
-    return Model(**object_kwargs)
+def _call_record_hook(response, *args, **kwargs):
+    """
+    Response hook which adds the status, request ID and size of each response to the record of the running SDK call.
+    """
+    record = getattr(_CALL_CONTEXT, "record", None)
+    if record is None:
+        return
 
+    record["requests"] += 1
+    record["status"] = response.status_code
+    request_id = response.headers.get("x-ms-request-id")
+    if request_id:
+        record["request_ids"].append(request_id)
+    try:
+        record["bytes"] += int(response.headers.get("Content-Length"))
+    except (TypeError, ValueError):
+        if isinstance(getattr(response, "_content", None), bytes):
+            record["bytes"] += len(response._content)
 
-async def compare_list_of_dicts(hub, old, new, convert_id_to_name=None):
+
+def _record_call(hub, record):
     """
-    Compare lists of dictionaries representing Azure objects. Only keys found in the "new" dictionaries are compared to
-    the "old" dictionaries, since getting Azure objects from the API returns some read-only data which should not be
-    used in the comparison. A list of parameter names can be passed in order to compare a bare object name to a full
-    Azure ID path for brevity. If string types are found in values, comparison is case insensitive. Return comment
-    should be used to trigger exit from the calling function.
+    Add a finished SDK call to the call log and to the aggregated metrics of its operation.
     """
-    ret = {}
+    hub.exec.azurerm.CALL_LOG.append(record)
 
-    if not convert_id_to_name:
-        convert_id_to_name = []
+    key = ".".join(filter(None, [record["client"], record["operation"]]))
+    if record["step"]:
+        key = "{0}:{1}".format(key, record["step"])
+    metrics = hub.exec.azurerm.CALL_METRICS.get(key)
+    if metrics is None:
+        metrics = hub.exec.azurerm.CALL_METRICS[key] = {
+            "calls": 0,
+            "errors": 0,
+            "requests": 0,
+            "bytes": 0,
+            "seconds_total": 0.0,
+            "seconds_max": 0.0,
+            "latency": collections.OrderedDict(
+                [("<={0}".format(bound), 0) for bound in LATENCY_BUCKETS]
+                + [(">{0}".format(LATENCY_BUCKETS[-1]), 0)]
+            ),
+            "status": {},
+        }
 
-    if not isinstance(new, list):
-        ret["comment"] = "must be provided as a list of dictionaries!"
-        return ret
+    metrics["calls"] += 1
+    metrics["requests"] += record["requests"]
+    metrics["bytes"] += record["bytes"]
+    metrics["seconds_total"] += record["seconds"]
+    metrics["seconds_max"] = max(metrics["seconds_max"], record["seconds"])
+    if record["error"]:
+        metrics["errors"] += 1
+    if record["status"] is not None:
+        status = str(record["status"])
+        metrics["status"][status] = metrics["status"].get(status, 0) + 1
 
-    if len(new) != len(old):
-        ret["changes"] = {"old": old, "new": new}
-        return ret
+    bucket = bisect.bisect_left(LATENCY_BUCKETS, record["seconds"])
+    metrics["latency"][list(metrics["latency"])[bucket]] += 1
 
-    try:
-        local_configs, remote_configs = [
-            sorted(config, key=itemgetter("name")) for config in (new, old)
-        ]
-    except TypeError:
-        ret["comment"] = "configurations must be provided as a list of dictionaries!"
-        return ret
-    except KeyError:
-        ret["comment"] = 'configuration dictionaries must contain the "name" key!'
-        return ret
 
-    for idx, cfg in enumerate(local_configs):
-        for key, val in cfg.items():
-            local_val = val
-            if key in convert_id_to_name:
-                remote_val = (
-                    remote_configs[idx].get(key, {}).get("id", "").split("/")[-1]
-                )
-            else:
-                remote_val = remote_configs[idx].get(key)
-                if isinstance(local_val, six.string_types):
-                    local_val = local_val.lower()
-                if isinstance(remote_val, six.string_types):
-                    remote_val = remote_val.lower()
-            if local_val != remote_val:
-                ret["changes"] = {"old": remote_configs, "new": local_configs}
-                return ret
+async def call_metrics(hub, path=None):
+    """
+    .. versionadded:: 2.4.0
+
+    Return the metrics recorded for the SDK calls made during this run. The "operations" key contains the number of
+    calls, errors, HTTP requests, bytes returned, latency histogram and status codes of each SDK operation. The
+    "calls" key contains the most recent individual calls, including the request IDs returned by ARM.
+
+    :param path: The path of a file to which the metrics should also be written as JSON.
+
+    """
+    ret = {
+        "operations": hub.exec.azurerm.CALL_METRICS,
+        "calls": list(hub.exec.azurerm.CALL_LOG),
+    }
+
+    if path:
+        with open(path, "w") as metrics_fh:
+            json.dump(ret, metrics_fh, indent=2)
 
     return ret
 
 
-async def get_identity_credentials(hub, ctx, **kwargs):
+def _rate_governor(hub, subscription_id):
     """
-    Acquire Azure RM Credentials from the identity provider (not for mgmt)
+    Return the rate governor of a subscription, creating it on first use.
+    """
+    governors = hub.exec.azurerm.RATE_GOVERNORS
+    if subscription_id not in governors:
+        governors[subscription_id] = _RateGovernor(
+            hub.exec.azurerm.THREAD_POOL_SIZE, hub.exec.azurerm.RATELIMIT_LOW_WATERMARK
+        )
+    return governors[subscription_id]
 
-    This is accessible on the hub so clients out in the code can use it. Non-management clients
-    can't be consolidated neatly here.
 
-    We basically set environment variables based upon incoming parameters and then pass off to
-    the DefaultAzureCredential object to correctly parse those environment variables. See the
-    `Microsoft Docs on EnvironmentCredential <https://aka.ms/azsdk-python-identity-default-cred-ref>`_
-    for more information.
+def _rate_limit_hook(governor, response, *args, **kwargs):
     """
-    if ctx["acct"]:
-        for key, val in ctx["acct"].items():
-            # explicit kwargs override acct
-            kwargs.setdefault(key, val)
+    Response hook which reports the remaining request quota to the rate governor of the subscription.
+    """
+    governor.record_response(response.status_code, response.headers)
 
-    kwarg_map = {
-        "tenant": "AZURE_TENANT_ID",
-        "client_id": "AZURE_CLIENT_ID",
-        "secret": "AZURE_CLIENT_SECRET",
-        "client_certificate_path": "AZURE_CLIENT_CERTIFICATE_PATH",
-        "username": "AZURE_USERNAME",
-        "password": "AZURE_PASSWORD",
-    }
 
-    for kw in kwarg_map:
-        if kwargs.get(kw):
-            os.environ[kwarg_map[kw]] = kwargs[kw]
+def _call_governor(hub, func):
+    """
+    Find the rate governor of the subscription a bound SDK operation is made against, if any.
+    """
+    owner = getattr(func, "__self__", None)
+    config = getattr(owner, "config", None) or getattr(
+        getattr(owner, "_client", None), "config", None
+    )
+    if config is None:
+        return None
+    return hub.exec.azurerm.RATE_GOVERNORS.get(getattr(config, "subscription_id", None))
 
-    try:
-        if kwargs.get("cloud_environment") and kwargs.get(
-            "cloud_environment"
-        ).startswith("http"):
-            authority = kwargs["cloud_environment"]
+
+async def throttle_stats(hub):
+    """
+    .. versionadded:: 2.4.0
+
+    Return the request and throttling statistics of each subscription which has been called during this run, keyed
+    by subscription ID.
+
+    """
+    return {
+        str(subscription_id): governor.stats()
+        for subscription_id, governor in hub.exec.azurerm.RATE_GOVERNORS.items()
+    }
+
+
+# Path parameters in the URL templates of SDK operations
+URL_PARAMETER = re.compile(r"{(\w+)}")
+
+# SDK operations which only read resources, and do not evict them from the resource cache. Other operations, such as
+# export_data, may change the resources they are called on.
+READ_OPERATIONS = re.compile(
+    r"^(get|list)"
+    r"|^(check_existence|check_name_availability|check_dns_name_availability|check_ip_address_availability"
+    r"|export_template)$"
+)
+
+# SDK list operations returning every resource which the states of a module look up, keyed by the state module and the
+# prefix of its present and absent functions. Resource group scoped operations are called with the resource group of
+# the state.
+PREFETCH_OPERATIONS = {
+    ("azurerm.compute.availability_set", ""): ("compute", "availability_sets", "list"),
+    ("azurerm.compute.virtual_machine", ""): ("compute", "virtual_machines", "list"),
+    ("azurerm.dns.zone", ""): ("dns", "zones", "list_by_resource_group"),
+    ("azurerm.keyvault.vault", ""): ("keyvault", "vaults", "list_by_resource_group"),
+    ("azurerm.network.load_balancer", ""): ("network", "load_balancers", "list"),
+    ("azurerm.network.local_network_gateway", ""): (
+        "network",
+        "local_network_gateways",
+        "list",
+    ),
+    ("azurerm.network.network_interface", ""): (
+        "network",
+        "network_interfaces",
+        "list",
+    ),
+    ("azurerm.network.network_security_group", ""): (
+        "network",
+        "network_security_groups",
+        "list",
+    ),
+    ("azurerm.network.public_ip_address", ""): (
+        "network",
+        "public_ip_addresses",
+        "list",
+    ),
+    ("azurerm.network.route", "table"): ("network", "route_tables", "list"),
+    ("azurerm.network.virtual_network", ""): ("network", "virtual_networks", "list"),
+    ("azurerm.network.virtual_network_gateway", ""): (
+        "network",
+        "virtual_network_gateways",
+        "list",
+    ),
+    ("azurerm.resource.group", ""): ("resource", "resource_groups", "list"),
+}
+
+
+def _resource_key(func, args, kwargs):
+    """
+    Return the cache key of the resource a bound SDK operation acts on, which is the endpoint of the client and the
+    lowercase resource ID built from the operation's URL template, along with the remaining arguments of the call.
+    Returns None for callables which are not SDK operations or whose URL can not be built from the arguments.
+    """
+    owner = getattr(func, "__self__", None)
+    metadata = getattr(func, "metadata", None)
+    config = getattr(owner, "config", None)
+    if not isinstance(metadata, dict) or "url" not in metadata or config is None:
+        return None
+
+    if args:
+        try:
+            bound = inspect.signature(func).bind(*args, **kwargs)
+        except (TypeError, ValueError):
+            return None
+        kwargs = {}
+        for name, value in bound.arguments.items():
+            if bound.signature.parameters[name].kind == inspect.Parameter.VAR_KEYWORD:
+                kwargs.update(value)
+            else:
+                kwargs[name] = value
+
+    path_args = set()
+
+    def path_value(match):
+        name = match.group(1)
+        if name == "subscriptionId":
+            value = getattr(config, "subscription_id", None)
         else:
-            authority = getattr(
-                KnownAuthorities, kwargs.get("cloud_environment", "AZURE_PUBLIC_CLOUD")
+            arg = re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+            path_args.add(arg)
+            value = kwargs.get(arg)
+        if value is None:
+            raise KeyError(name)
+        return str(getattr(value, "value", value))
+
+    try:
+        resource_id = URL_PARAMETER.sub(path_value, metadata["url"])
+    except KeyError:
+        return None
+
+    variant = tuple(
+        sorted(
+            (key, repr(value)) for key, value in kwargs.items() if key not in path_args
+        )
+    )
+    return (getattr(config, "base_url", None), resource_id.lower()), variant
+
+
+def _cached_resource(hub, key, variant):
+    """
+    Return a copy of a resource from the resource cache, or None if it is not cached or has expired.
+    """
+    entry = hub.exec.azurerm.RESOURCE_CACHE.get(key, {}).get(variant)
+    if entry is None:
+        return None
+    expires, resource = entry
+    if expires < time.monotonic():
+        hub.exec.azurerm.RESOURCE_CACHE[key].pop(variant, None)
+        return None
+    return copy.deepcopy(resource)
+
+
+def _is_poller(result):
+    """
+    Return whether the result of an SDK call is the poller of a long-running operation, which can't be copied.
+    """
+    return callable(getattr(result, "result", None)) and hasattr(result, "done")
+
+
+def _cache_resource(hub, key, variant, resource):
+    ttl = hub.exec.azurerm.RESOURCE_CACHE_TTL
+    if ttl > 0 and resource is not None and not _is_poller(resource):
+        hub.exec.azurerm.RESOURCE_CACHE.setdefault(key, {})[variant] = (
+            time.monotonic() + ttl,
+            copy.deepcopy(resource),
+        )
+
+
+def _cached_not_found(hub, key):
+    """
+    Return a new error built from the response of a get call which did not find a resource, or None if no such
+    response is cached or it has expired.
+    """
+    entry = hub.exec.azurerm.NOT_FOUND.get(key)
+    if entry is None:
+        return None
+    expires, response = entry
+    if expires < time.monotonic():
+        hub.exec.azurerm.NOT_FOUND.pop(key, None)
+        return None
+    return CloudError(response)
+
+
+def _cache_not_found(hub, key, exc):
+    ttl = hub.exec.azurerm.NOT_FOUND_TTL
+    if ttl > 0:
+        hub.exec.azurerm.NOT_FOUND[key] = (time.monotonic() + ttl, exc.response)
+
+
+def _evict_resource(hub, key):
+    """
+    Evict a resource from the resource cache along with its child resources and, since their properties embed it,
+    the provider resources it is nested under.
+    """
+    endpoint, resource_id = key
+
+    scope, _, provider_path = resource_id.partition("/providers/")
+    segments = provider_path.split("/")
+    ancestors = {
+        (endpoint, "{0}/providers/{1}".format(scope, "/".join(segments[:length])))
+        for length in range(3, len(segments))
+    }
+
+    def evicted(cached):
+        return cached in ancestors or (
+            cached[0] == endpoint
+            and (cached[1] == resource_id or cached[1].startswith(resource_id + "/"))
+        )
+
+    cache = hub.exec.azurerm.RESOURCE_CACHE
+    for cached in [cached for cached in cache if evicted(cached)]:
+        cache.pop(cached, None)
+
+    not_found = hub.exec.azurerm.NOT_FOUND
+    for missing in [missing for missing in not_found if evicted(missing)]:
+        not_found.pop(missing, None)
+
+    # gets already in flight may return the resource as it was, so later gets do not join them
+    flights = hub.exec.azurerm.IN_FLIGHT
+    for flight_key in [flight_key for flight_key in flights if evicted(flight_key[2])]:
+        flights.pop(flight_key, None)
+
+    hub.exec.azurerm.RESOURCE_GROUP_LOCATIONS.pop(key, None)
+
+    snapshots = hub.exec.azurerm.RESOURCE_SNAPSHOTS
+    for collection in [
+        collection
+        for collection in snapshots
+        if collection[0] == endpoint
+        and (
+            resource_id.startswith(collection[1] + "/")
+            or collection[1].startswith(resource_id + "/")
+        )
+    ]:
+        snapshots.pop(collection, None)
+
+
+async def invalidate_resource_cache(hub, resource_id=None):
+    """
+    .. versionadded:: 2.4.0
+
+    Evict a resource, along with its child resources, from the resource cache which serves ``get`` calls for the
+    length of the run. All resources are evicted if no resource ID is given.
+
+    :param resource_id: The ID of the resource to evict.
+
+    """
+    if resource_id is None:
+        hub.exec.azurerm.RESOURCE_CACHE.clear()
+        hub.exec.azurerm.RESOURCE_GROUP_LOCATIONS.clear()
+        hub.exec.azurerm.RESOURCE_GROUP_LISTINGS.clear()
+        hub.exec.azurerm.RESOURCE_SNAPSHOTS.clear()
+        hub.exec.azurerm.IN_FLIGHT.clear()
+        hub.exec.azurerm.NOT_FOUND.clear()
+        return
+
+    endpoints = {key[0] for key in hub.exec.azurerm.RESOURCE_CACHE}
+    endpoints.update(key[0] for key in hub.exec.azurerm.RESOURCE_GROUP_LOCATIONS)
+    endpoints.update(key[0] for key in hub.exec.azurerm.RESOURCE_SNAPSHOTS)
+    endpoints.update(key[2][0] for key in hub.exec.azurerm.IN_FLIGHT)
+    endpoints.update(key[0] for key in hub.exec.azurerm.NOT_FOUND)
+    for endpoint in endpoints:
+        _evict_resource(hub, (endpoint, resource_id.lower()))
+
+
+async def _pending_collections(hub, ctx):
+    """
+    Return the collections to list for the azurerm states which have yet to run in the idem run of a context, as the
+    list operation, resource group, acct and connection parameters of each collection keyed by the collection and
+    identity. The acct of each state is gathered from its own acct profile, which defaults to the profile of the run.
+    """
+    try:
+        run = hub.idem.RUNS[ctx["run_name"]]
+    except (AttributeError, KeyError):
+        return {}
+
+    accts = {}
+    collections = {}
+    for chunk in run.get("low", []):
+        prefix, _, fun = chunk.get("fun", "").rpartition("_")
+        operation = PREFETCH_OPERATIONS.get((chunk.get("state"), prefix))
+        if operation is None or fun not in ("present", "absent"):
+            continue
+        if hub.idem.tools.gen_tag(chunk) in run.get("running", {}):
+            continue
+
+        resource_group = None
+        if operation[1] != "resource_groups":
+            resource_group = chunk.get("resource_group")
+            if not isinstance(resource_group, str):
+                continue
+
+        profile = chunk.get("acct_profile", run.get("acct_profile"))
+        if profile not in accts:
+            accts[profile] = await hub.acct.init.gather(
+                hub.states.azurerm.ACCT, profile
             )
-        log.debug("AUTHORITY: %s", authority)
-    except AttributeError as exc:
-        log.error('Unknown authority presented for "cloud_environment": %s', exc)
-        authority = KnownAuthorities.AZURE_PUBLIC_CLOUD
 
-    credential = DefaultAzureCredential(authority=authority)
+        auth_kwargs = chunk.get("connection_auth")
+        if not isinstance(auth_kwargs, dict):
+            auth_kwargs = {}
+        merged = _merge_acct({"acct": accts[profile]}, auth_kwargs)
+        collection = (
+            operation,
+            (resource_group or "").lower(),
+            auth.auth_identity(merged),
+            str(merged.get("subscription_id")),
+            merged.get("cloud_environment", "AZURE_PUBLIC_CLOUD"),
+        )
+        collections.setdefault(
+            collection, (operation, resource_group, accts[profile], auth_kwargs)
+        )
+
+    return collections
+
+
+async def _prefetch_collection(hub, operation, resource_group, acct, auth_kwargs):
+    """
+    List a collection of resources and keep a snapshot of it which serves the get calls for its resources.
+    """
+    client_type, operations, list_name = operation
+    client = await hub.exec.azurerm.utils.get_client(
+        {"acct": acct, "test": True}, client_type, **auth_kwargs
+    )
+    list_operation = getattr(getattr(client, operations), list_name)
+    args = (resource_group,) if resource_group else ()
+
+    resource = _resource_key(list_operation, args, {})
+    if resource is None:
+        return
+
+    resources = {}
+    try:
+        async for item in hub.exec.azurerm.utils.paged_object_iter(
+            list_operation(*args), as_dict=False
+        ):
+            if getattr(item, "id", None):
+                resources[item.id.lower()] = item
+    except CloudError as exc:
+        # none of the resources exist when their resource group does not
+        if exc.status_code != 404:
+            raise
+        resources = {}
+
+    hub.exec.azurerm.RESOURCE_SNAPSHOTS[resource[0]] = (
+        time.monotonic() + hub.exec.azurerm.RESOURCE_CACHE_TTL,
+        resources,
+    )
+
+
+async def _prefetch_collections(hub, collections):
+    """
+    List collections concurrently. A collection which can not be listed is left to the get calls of its states.
+    """
+    results = await asyncio.gather(
+        *[
+            _prefetch_collection(hub, *collection)
+            for collection in collections.values()
+        ],
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            log.debug("Unable to prefetch resources: %s", result)
+
+
+async def _prefetch_run(hub, ctx):
+    """
+    List the collections of the pending states of a run, each with the credentials of the acct profile of its states.
+    """
+    try:
+        collections = await _pending_collections(hub, ctx)
+    except Exception as exc:
+        # the states look up their own resources if the acct profiles of the run can not be gathered
+        log.debug("Unable to prefetch resources: %s", exc)
+        return
+    log.debug(
+        "Prefetching %d collections for run %s", len(collections), ctx["run_name"]
+    )
+    await _prefetch_collections(hub, collections)
+
+
+async def prefetch_resources(hub, ctx):
+    """
+    .. versionadded:: 2.4.0
+
+    List the resources which the pending azurerm states of an idem run look up, so that their ``get`` calls are served
+    from snapshots of the listed collections instead of each making its own request. The states are grouped by
+    resource type, resource group and connection parameters, and each group is listed with a single call using the
+    acct profile of its states. Resources missing from a snapshot are reported as not found. The snapshots are kept
+    for ``AZURERM_RESOURCE_CACHE_TTL`` seconds, and writes to a collection drop its snapshot.
+
+    Resources are only prefetched once per run, and only in test mode, which is when the states of a run look up their
+    resources without changing them. This is called by the contracts of the azurerm state modules before each state.
+
+    """
+    if not ctx.get("test") or not ctx.get("run_name"):
+        return
+    if hub.exec.azurerm.RESOURCE_CACHE_TTL <= 0:
+        return
+
+    prefetched = hub.exec.azurerm.PREFETCHED_RUNS
+    prefetch = prefetched.get(ctx["run_name"])
+    if prefetch is None:
+        prefetch = asyncio.ensure_future(_prefetch_run(hub, ctx))
+        prefetched[ctx["run_name"]] = prefetch
+
+    if not prefetch.done():
+        await asyncio.shield(prefetch)
+
+
+def _snapshot_resources(hub, key, variant):
+    """
+    Return the resources of the snapshot of the collection which a resource belongs to, or None if the collection was
+    not prefetched, its snapshot has expired or the call asks for more than a plain get returns.
+    """
+    if any(value != "None" for _, value in variant):
+        return None
+
+    endpoint, resource_id = key
+    collection = (endpoint, resource_id.rpartition("/")[0])
+    entry = hub.exec.azurerm.RESOURCE_SNAPSHOTS.get(collection)
+    if entry is None:
+        return None
+    expires, resources = entry
+    if expires < time.monotonic():
+        hub.exec.azurerm.RESOURCE_SNAPSHOTS.pop(collection, None)
+        return None
+    return resources
+
+
+def _not_found(resource_id):
+    """
+    Return the error ARM responds with for a resource which does not exist.
+    """
+    import requests
+
+    response = requests.Response()
+    response.status_code = 404
+    response.reason = "Not Found"
+    response.headers["Content-Type"] = "application/json"
+    response._content = json.dumps(
+        {
+            "error": {
+                "code": "ResourceNotFound",
+                "message": "The resource '{0}' was not found.".format(resource_id),
+            }
+        }
+    ).encode("utf-8")
+    return CloudError(response)
+
+
+async def sdk_call(hub, func, *args, **kwargs):
+    """
+    .. versionadded:: 2.4.0
+
+    Run a blocking Azure SDK call in the shared thread pool and wait for its result without blocking the event loop,
+    so that other states can make progress while this one waits on the network. Exceptions raised by the call are
+    raised to the caller unchanged. Operations of pooled clients first wait for the rate governor of their
+    subscription, which holds calls back while ARM is throttling the subscription.
+
+    Resources returned by plain ``get`` operations are kept in the resource cache of the run for
+    ``AZURERM_RESOURCE_CACHE_TTL`` seconds and served from it, while any other operation which is not a read evicts
+    the resource it acts on from the cache. Resources of collections listed by ``prefetch_resources`` are served from
+    the snapshots of those collections. Identical ``get`` calls made at the same time with the same client share a
+    single request, and every caller receives its own copy of the result. A resource which was not found is reported
+    as not found without another request for ``AZURERM_NOT_FOUND_TTL`` seconds, or until it is written.
+
+    :param func: The SDK callable, such as ``compconn.virtual_machines.get``.
+
+    The remaining positional and keyword arguments are passed to ``func``.
+
+    """
+    return await _sdk_call(hub, func, args, kwargs)
+
+
+async def _sdk_call(hub, func, args, kwargs, cache=True):
+    """
+    Run an SDK call, keeping the resource cache up to date. Only plain ``get`` operations are served from the cache
+    and share their requests, since other operations named ``get_*`` include POST long-running operations which
+    return pollers. Calls which start long-running operations are never served from the cache.
+    """
+    resource = _resource_key(func, args, kwargs)
+    if resource is None:
+        return await _dispatch(hub, func, args, kwargs)
+
+    key, variant = resource
+    operation = func.__name__
+    if not READ_OPERATIONS.match(operation):
+        # evicted again afterwards, in case a concurrent get cached the resource while it was being written
+        _evict_resource(hub, key)
+        try:
+            return await _dispatch(hub, func, args, kwargs)
+        finally:
+            _evict_resource(hub, key)
+
+    if not cache or operation != "get" or kwargs.get("raw"):
+        return await _dispatch(hub, func, args, kwargs)
+
+    resources = _snapshot_resources(hub, key, variant)
+    if resources is not None:
+        if key[1] not in resources:
+            raise _not_found(key[1])
+        return copy.deepcopy(resources[key[1]])
+
+    missing = _cached_not_found(hub, key)
+    if missing is not None:
+        raise missing
+
+    cached = _cached_resource(hub, key, variant)
+    if cached is not None:
+        return cached
+
+    # identical gets of the same client which are in flight at the same time share one request. Operations groups may
+    # be created on every access, so the client is told apart by the service client they share.
+    owner = func.__self__
+    flight_key = (id(getattr(owner, "_client", owner)), func.__qualname__, key, variant)
+    # the fetched resource is shared by every caller and the cache, so each of them gets a copy of its own
+    flight = hub.exec.azurerm.IN_FLIGHT.get(flight_key)
+    if flight is None:
+        flight = asyncio.ensure_future(
+            _fetch(hub, flight_key, func, args, kwargs, variant)
+        )
+        hub.exec.azurerm.IN_FLIGHT[flight_key] = flight
+    ret = await asyncio.shield(flight)
+    return ret if _is_poller(ret) else copy.deepcopy(ret)
+
+
+async def _fetch(hub, flight_key, func, args, kwargs, variant):
+    """
+    Get a resource for every caller waiting on it and keep it, or the error if it was not found, in the cache.
+    """
+    flights = hub.exec.azurerm.IN_FLIGHT
+    try:
+        ret = await _dispatch(hub, func, args, kwargs)
+        # the resource is not cached if it was evicted while it was being fetched
+        if flights.get(flight_key) is asyncio.current_task():
+            _cache_resource(hub, flight_key[2], variant, ret)
+        return ret
+    except CloudError as exc:
+        if exc.status_code == 404 and flights.get(flight_key) is asyncio.current_task():
+            _cache_not_found(hub, flight_key[2], exc)
+        raise
+    finally:
+        if flights.get(flight_key) is asyncio.current_task():
+            del flights[flight_key]
+
+
+async def _dispatch(hub, func, args, kwargs, origin=None, step=None):
+    """
+    Run a call in the shared thread pool, under the rate governor of its subscription and recording its metrics. A
+    step of an operation is governed and recorded under the operation it originates from.
+    """
+    if hub.exec.azurerm.EXECUTOR is None:
+        hub.exec.azurerm.EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+            max_workers=hub.exec.azurerm.THREAD_POOL_SIZE, thread_name_prefix="azurerm",
+        )
+
+    governor = _call_governor(hub, func if origin is None else origin)
+    if governor is not None:
+        await governor.acquire()
+
+    record = _call_record(func, origin, step)
+    started = time.monotonic()
+    try:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            hub.exec.azurerm.EXECUTOR,
+            functools.partial(_run_recorded, record, func, args, kwargs),
+        )
+    except Exception as exc:
+        record["error"] = type(exc).__name__
+        if record["status"] is None:
+            record["status"] = getattr(exc, "status_code", None)
+        raise
+    finally:
+        if governor is not None:
+            governor.release()
+        record["seconds"] = time.monotonic() - started
+        _record_call(hub, record)
+
+
+async def begin_operation(hub, func, *args, **kwargs):
+    """
+    .. versionadded:: 2.4.0
+
+    Start a long-running SDK operation and return its poller without waiting for the operation to finish. Operations
+    which accept a polling strategy are polled by ``wait_for_operation`` on the event loop rather than by a
+    dedicated polling thread.
+
+    :param func: The SDK callable which starts the operation, such as ``compconn.virtual_machines.create_or_update``.
+
+    The remaining positional and keyword arguments are passed to ``func``.
+
+    """
+    try:
+        accepts_polling = "polling" in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        accepts_polling = False
+
+    if accepts_polling and "polling" not in kwargs:
+        try:
+            delay = func.__self__.config.long_running_operation_timeout
+        except AttributeError:
+            delay = 30
+        kwargs["polling"] = _EventLoopPolling(delay)
+
+    poller = await _sdk_call(hub, func, args, kwargs, cache=False)
+    # the polls of the operation are recorded under the operation which started it
+    poller._azurerm_origin = func
+
+    # the resource changes until the operation is done, so it is evicted from the resource cache again afterwards
+    resource = _resource_key(func, args, kwargs)
+    if resource is not None:
+        try:
+            poller._azurerm_resource = resource[0]
+        except AttributeError:
+            pass
+
+    return poller
+
+
+async def wait_for_operation(hub, poller):
+    """
+    .. versionadded:: 2.4.0
+
+    Wait for a long-running operation started with ``begin_operation`` to finish and return its result. The status
+    of the operation is requested from its Azure-AsyncOperation or Location URL, sleeping on the event loop for as
+    long as the Retry-After header asks between requests, so many operations can be in flight at the same time.
+    Failed operations raise a CloudError just as the SDK poller would.
+
+    :param poller: The poller returned by ``begin_operation``.
+
+    """
+    method = getattr(poller, "_polling_method", None)
+    origin = getattr(poller, "_azurerm_origin", None)
+
+    if HAS_AZURE and isinstance(method, _EventLoopPolling):
+        while not method.finished():
+            await asyncio.sleep(method.retry_after())
+            await _dispatch(hub, method.poll, (), {}, origin, "poll")
+        # operations which were already terminal when they started still fail or need their final GET
+        await _dispatch(hub, method.complete, (), {}, origin, "complete")
+    else:
+        # pollers which do their own polling, such as the Key Vault data plane pollers
+        await _dispatch(hub, poller.wait, (), {}, origin, "wait")
+
+    resource = getattr(poller, "_azurerm_resource", None)
+    if isinstance(resource, tuple):
+        _evict_resource(hub, resource)
+
+    return poller.result()
+
+
+async def operation_handle(hub, poller):
+    """
+    .. versionadded:: 2.4.0
+
+    Return a handle for a long-running operation started with ``begin_operation``, without waiting for the operation
+    to finish. The handle is a dictionary which can be serialized, and is passed to ``wait_for_operations`` to wait
+    for the operation in this process or in any other one.
+
+    :param poller: The poller returned by ``begin_operation``.
+
+    """
+    handle = {"operation_id": uuid.uuid4().hex}
+
+    operation = getattr(getattr(poller, "_polling_method", None), "_operation", None)
+    if operation is None:
+        # pollers which do their own polling can only be waited for in this process
+        handle["status"] = "Succeeded" if poller.done() else "InProgress"
+    else:
+        initial_response = operation.initial_response
+        handle.update(
+            {
+                "method": operation.method,
+                "url": initial_response.request.url,
+                "status_code": initial_response.status_code,
+                "azure_async_operation": operation.async_url,
+                "location": operation.location_url,
+                "client_request_id": initial_response.request.headers.get(
+                    "x-ms-client-request-id"
+                ),
+                "status": operation.status,
+            }
+        )
+
+    hub.exec.azurerm.OPERATIONS[handle["operation_id"]] = poller
+    return handle
+
+
+def _json_resource(response):
+    """
+    Deserialize the resource in a response as it was returned by ARM.
+    """
+    return response.json() if response.content else None
+
+
+def _resume_operation(client, handle):
+    """
+    Return a poller which continues polling an operation from its handle, as if the operation had been started with
+    ``begin_operation`` by this process.
+    """
+    import requests
+    from msrest.polling import LROPoller
+
+    request = requests.Request(
+        handle["method"],
+        handle["url"],
+        headers={"x-ms-client-request-id": handle.get("client_request_id") or ""},
+    ).prepare()
+    response = requests.Response()
+    response.status_code = handle["status_code"]
+    response.url = handle["url"]
+    response.request = request
+    response._content = b""
+    if handle.get("azure_async_operation"):
+        response.headers["Azure-AsyncOperation"] = handle["azure_async_operation"]
+    if handle.get("location"):
+        response.headers["Location"] = handle["location"]
+    # the operation has been running since it was started, so its status is requested straight away
+    response.headers["Retry-After"] = "0"
+
+    polling = _EventLoopPolling(client.config.long_running_operation_timeout)
+    poller = LROPoller(client, response, _json_resource, polling)
+    poller._azurerm_resource = (
+        client.config.base_url,
+        requests.utils.urlparse(handle["url"]).path.lower(),
+    )
+    return poller
+
+
+async def wait_for_operations(hub, ctx, operations, timeout=None, **kwargs):
+    """
+    .. versionadded:: 2.4.0
+
+    Wait for many long-running operations at the same time. The operations are the handles returned by functions
+    called with ``no_wait=True``, and are polled concurrently until they have all finished or the timeout has passed.
+
+    A list with an updated copy of each handle is returned in the same order. The ``status`` of each handle is
+    ``Succeeded``, along with the resulting resource as ``result``, ``Failed``, along with the ``error``, or
+    ``InProgress`` if the operation was still running when the timeout passed. Handles which are still in progress can
+    be waited for again. Resources of operations started by another process are returned as ARM returned them.
+
+    :param operations: A list of operation handles.
+
+    :param timeout: The number of seconds to wait for all of the operations in total. Defaults to waiting until every
+        operation has finished.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.utils.wait_for_operations '[{"operation_id": "...", ...}]' timeout=3600
+
+    """
+    pollers = hub.exec.azurerm.OPERATIONS
+
+    async def wait(handle):
+        operation_id = handle.get("operation_id")
+        poller = pollers.get(operation_id)
+        if poller is None:
+            if "url" not in handle:
+                raise ValueError(
+                    "The operation {0} can not be resumed by this process.".format(
+                        operation_id
+                    )
+                )
+            client = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
+            poller = _resume_operation(client, handle)
+            pollers[operation_id] = poller
+
+        result = await hub.exec.azurerm.utils.wait_for_operation(poller)
+        pollers.pop(operation_id, None)
+        return result
+
+    tasks = [asyncio.ensure_future(wait(handle)) for handle in operations]
+    if tasks:
+        _, pending = await asyncio.wait(
+            tasks, timeout=float(timeout) if timeout is not None else None
+        )
+        # the pollers of unfinished operations are kept, so they carry on where they left off if waited for again
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    results = []
+    for handle, task in zip(operations, tasks):
+        ret = dict(handle)
+        if task.cancelled():
+            ret["status"] = "InProgress"
+        elif task.exception() is not None:
+            pollers.pop(handle.get("operation_id"), None)
+            ret["status"] = "Failed"
+            ret["error"] = str(task.exception())
+        else:
+            result = task.result()
+            ret["status"] = "Succeeded"
+            ret["result"] = result.as_dict() if hasattr(result, "as_dict") else result
+        results.append(ret)
+
+    return results
+
+
+def _paged_object_to_list(paged_object):
+    """
+    Drain a paged object into a list of dictionaries. Requesting the next page blocks on the network.
+    """
+    paged_return = []
+    while True:
+        try:
+            page = next(paged_object)
+            paged_return.append(page.as_dict())
+        except CloudError:
+            raise
+        except StopIteration:
+            break
+
+    return paged_return
+
+
+async def paged_object_to_list(hub, paged_object):
+    """
+    Extract all pages within a paged object as a list of dictionaries
+    """
+    return await _dispatch(
+        hub,
+        _paged_object_to_list,
+        (paged_object,),
+        {},
+        _paged_origin(paged_object),
+        "pages",
+    )
+
+
+def _paged_origin(paged_object):
+    """
+    Find the SDK operation which returned a paged object, from the "self" its page request function closes over.
+    """
+    get_next = getattr(paged_object, "_get_next", None)
+    if get_next is None:
+        # azure-core item paged objects are given the function as their first argument
+        get_next = next(iter(getattr(paged_object, "_args", ())), None)
+    try:
+        cell = get_next.__code__.co_freevars.index("self")
+        owner = get_next.__closure__[cell].cell_contents
+    except (AttributeError, TypeError, ValueError):
+        return None
+    name = get_next.__qualname__.split(".<locals>")[0].rsplit(".", 1)[-1]
+    return getattr(owner, name, None)
+
+
+def _pages(paged_object):
+    """
+    Generate the pages of a paged object. Each page is only requested once the previous one has been consumed.
+    """
+    if hasattr(paged_object, "advance_page"):
+        # msrest paged objects
+        while paged_object.next_link is not None:
+            yield paged_object.advance_page()
+    elif hasattr(paged_object, "by_page"):
+        # azure-core item paged objects
+        yield from paged_object.by_page()
+    else:
+        yield paged_object
+
+
+# Marker for a stream whose first page had no items
+_NO_ITEMS = object()
+
+
+def _next_page(pages):
+    """
+    Retrieve the next page from a page generator as a list, or None when there are no more pages.
+    """
+    try:
+        return list(next(pages))
+    except StopIteration:
+        return None
+
+
+async def paged_object_iter(hub, paged_object, max_items=None, as_dict=True):
+    """
+    .. versionadded:: 2.4.0
+
+    Iterate over the items within a paged object without retrieving every page up front. Pages are requested one at a
+    time as the items of the previous page are consumed, so breaking out of the loop early skips any remaining pages.
+
+    :param paged_object: The paged object returned by an SDK list operation.
+
+    :param max_items: The maximum number of items to yield. Defaults to all items.
+
+    :param as_dict: Convert each item to a dictionary as it is yielded. Defaults to True.
+
+    """
+    if max_items is not None and max_items <= 0:
+        return
+
+    pages = _pages(paged_object)
+    origin = _paged_origin(paged_object)
+    count = 0
+    while True:
+        page = await _dispatch(hub, _next_page, (pages,), {}, origin, "page")
+        if page is None:
+            return
+
+        for item in page:
+            yield item.as_dict() if as_dict else item
+            count += 1
+            if max_items is not None and count >= max_items:
+                return
+
+
+async def paged_object_stream(hub, items):
+    """
+    .. versionadded:: 2.4.0
+
+    Start streaming the items of ``paged_object_iter`` for a caller on the hub. The first page is requested before
+    this returns, so a CloudError for the list operation is raised inside the error handling of the calling function
+    rather than later on while the items are consumed.
+
+    The stream is an asynchronous generator, which is only of use to other coroutines. It can't be rendered as the
+    output of a CLI call.
+
+    :param items: The asynchronous iterator returned by ``paged_object_iter``.
+
+    """
+    try:
+        first = await items.__anext__()
+    except StopAsyncIteration:
+        first = _NO_ITEMS
+
+    async def stream():
+        if first is _NO_ITEMS:
+            return
+        yield first
+        async for item in items:
+            yield item
+
+    return stream()
+
+
+def _model_builder(hub, module_name, object_name):
+    """
+    Return the cached builder for a model, which is the model class along with a plan describing how each of its
+    attributes is assembled. The plan holds the builders of the nested models themselves, so resolving the models and
+    parsing their attribute types only happens the first time a model is built.
+    """
+    key = (module_name, object_name)
+    builder = hub.exec.azurerm.MODEL_BUILDERS.get(key)
+    if builder is not None:
+        return builder
+
+    try:
+        model_module = importlib.import_module(
+            "azure.mgmt.{0}.models".format(module_name)
+        )
+        # pylint: disable=invalid-name
+        Model = getattr(model_module, object_name)
+    except ImportError:
+        raise sys.exit(
+            "The {0} model in the {1} Azure module is not available.".format(
+                object_name, module_name
+            )
+        )
+
+    # the builder is cached before its plan is filled in, so that models which nest themselves share their builder
+    plan = []
+    builder = (Model, plan)
+    hub.exec.azurerm.MODEL_BUILDERS[key] = builder
+
+    if "_attribute_map" in dir(Model):
+        for attr, items in Model._attribute_map.items():
+            attr_type = items["type"]
+            if attr_type[0].isupper():
+                plan.append(
+                    (attr, "model", _model_builder(hub, module_name, attr_type))
+                )
+            elif attr_type[0] == "{":
+                plan.append((attr, "dict", None))
+            elif attr_type[0] == "[":
+                if attr_type[1].isupper():
+                    item_type = attr_type[
+                        attr_type.index("[") + 1 : attr_type.rindex("]")
+                    ]
+                    plan.append(
+                        (
+                            attr,
+                            "model_list",
+                            _model_builder(hub, module_name, item_type),
+                        )
+                    )
+                elif attr_type[1] == "{":
+                    plan.append((attr, "dict_list", None))
+                else:
+                    plan.append((attr, "list", None))
+            else:
+                plan.append((attr, "value", None))
+
+    return builder
+
+
+def _build_model(builder, params):
+    """
+    Assemble a model object from a dictionary of parameters using its builder.
+    """
+    # pylint: disable=invalid-name
+    Model, plan = builder
+    object_kwargs = {}
+
+    for attr, kind, nested_builder in plan:
+        param = params.get(attr)
+        if param is None:
+            continue
+        if kind == "model" and isinstance(param, dict):
+            object_kwargs[attr] = _build_model(nested_builder, param)
+        elif kind == "dict" and isinstance(param, dict):
+            object_kwargs[attr] = param
+        elif kind == "model_list" and isinstance(param, list):
+            object_kwargs[attr] = [
+                _build_model(nested_builder, list_item)
+                for list_item in param
+                if isinstance(list_item, dict)
+            ]
+        elif kind == "dict_list" and isinstance(param, list):
+            object_kwargs[attr] = [
+                list_item for list_item in param if isinstance(list_item, dict)
+            ]
+        elif kind == "list" and isinstance(param, list):
+            object_kwargs[attr] = list(param)
+        else:
+            object_kwargs[attr] = param
+
+    return Model(**object_kwargs)
+
+
+async def create_object_model(hub, module_name, object_name, **kwargs):
+    """
+    Assemble an object from incoming parameters.
+    """
+    # wrap calls to this function to catch TypeError exceptions
+    return _build_model(_model_builder(hub, module_name, object_name), kwargs)
+
+
+def _normalize(value):
+    """
+    Normalize a value for comparison. Strings are compared case insensitively.
+    """
+    if isinstance(value, six.string_types):
+        return value.lower()
+    return value
+
+
+def _index_by_name(configs):
+    """
+    Index a list of configuration dictionaries by their normalized names.
+    """
+    index = {}
+    for config in configs:
+        index[_normalize(config["name"])] = config
+    return index
+
+
+def _differ_by_position(old, new, convert_id_to_name):
+    """
+    Return whether two lists of configuration dictionaries differ when they are sorted by name and compared object by
+    object.
+    """
+    if len(new) != len(old):
+        return True
+
+    local_configs, remote_configs = [
+        sorted(config, key=lambda cfg: cfg["name"]) for config in (new, old)
+    ]
+    for cfg, remote_cfg in zip(local_configs, remote_configs):
+        for key, val in cfg.items():
+            if key in convert_id_to_name:
+                if val != (remote_cfg.get(key) or {}).get("id", "").split("/")[-1]:
+                    return True
+            elif _normalize(val) != _normalize(remote_cfg.get(key)):
+                return True
+    return False
+
+
+async def compare_list_of_dicts(hub, old, new, convert_id_to_name=None):
+    """
+    .. versionchanged:: 2.4.0
+
+    Compare lists of dictionaries representing Azure objects. Only keys found in the "new" dictionaries are compared to
+    the "old" dictionaries, since getting Azure objects from the API returns some read-only data which should not be
+    used in the comparison. A list of parameter names can be passed in order to compare a bare object name to a full
+    Azure ID path for brevity. If string types are found in values, comparison is case insensitive. Return comment
+    should be used to trigger exit from the calling function.
+
+    Objects are matched by name. If there are any differences, the "changes" dictionary of the return contains the
+    objects which were "added" or "removed" keyed by name, and the keys which "changed" within each existing object
+    along with their old and new values. Before 2.4.0, "changes" held the whole "old" and "new" lists instead, which
+    is still the case when names are repeated within either list.
+    """
+    ret = {}
+
+    if not convert_id_to_name:
+        convert_id_to_name = []
+
+    if not isinstance(new, list):
+        ret["comment"] = "must be provided as a list of dictionaries!"
+        return ret
+
+    try:
+        local_configs, remote_configs = [
+            _index_by_name(config) for config in (new, old)
+        ]
+    except (AttributeError, TypeError):
+        ret["comment"] = "configurations must be provided as a list of dictionaries!"
+        return ret
+    except KeyError:
+        ret["comment"] = 'configuration dictionaries must contain the "name" key!'
+        return ret
+
+    if len(local_configs) != len(new) or len(remote_configs) != len(old):
+        # objects can't be matched by name when names are repeated, so the lists are compared as a whole
+        if _differ_by_position(old, new, convert_id_to_name):
+            ret["changes"] = {"old": old, "new": new}
+        return ret
+
+    added = {}
+    changed = {}
+    for name, cfg in local_configs.items():
+        remote_cfg = remote_configs.get(name)
+        if remote_cfg is None:
+            added[cfg["name"]] = cfg
+            continue
+
+        # each value is normalized once, when its object is compared against the object of the same name
+        deltas = {}
+        for key, val in cfg.items():
+            if key in convert_id_to_name:
+                remote_val = (remote_cfg.get(key) or {}).get("id", "").split("/")[-1]
+                if val != remote_val:
+                    deltas[key] = {"old": remote_val, "new": val}
+            elif _normalize(val) != _normalize(remote_cfg.get(key)):
+                deltas[key] = {"old": remote_cfg.get(key), "new": val}
+        if deltas:
+            changed[cfg["name"]] = deltas
+
+    removed = {
+        cfg["name"]: cfg
+        for name, cfg in remote_configs.items()
+        if name not in local_configs
+    }
+
+    changes = {}
+    for change_type, items in (
+        ("added", added),
+        ("removed", removed),
+        ("changed", changed),
+    ):
+        if items:
+            changes[change_type] = items
+    if changes:
+        ret["changes"] = changes
+
+    return ret
+
+
+async def get_identity_credentials(hub, ctx, **kwargs):
+    """
+    .. versionchanged:: 2.4.0
+
+    Acquire Azure RM Credentials from the identity provider (not for mgmt)
+
+    This is accessible on the hub so clients out in the code can use it. Non-management clients
+    can't be consolidated neatly here.
+
+    A ClientSecretCredential, CertificateCredential or UsernamePasswordCredential is built from the
+    parameters of the profile, falling back to the DefaultAzureCredential chain when the profile has
+    none. See the `Microsoft Docs on azure-identity <https://aka.ms/azsdk-python-identity-default-cred-ref>`_
+    for more information. Credentials are kept for the life of the process per identity and authority,
+    so profiles for several tenants can be used at the same time.
+    """
+    if ctx["acct"]:
+        for key, val in ctx["acct"].items():
+            # explicit kwargs override acct
+            kwargs.setdefault(key, val)
 
-    return credential
+    return auth.identity_credential(hub.exec.azurerm.IDENTITY_CREDENTIALS, kwargs)
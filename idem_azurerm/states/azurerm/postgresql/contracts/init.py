@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""
+Azure Resource Manager (ARM) State Contracts
+
+.. versionadded:: 2.4.0
+
+"""
+# Import local libs
+from idem_azurerm.contracts import pre  # pylint: disable=unused-import
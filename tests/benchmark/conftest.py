@@ -0,0 +1,172 @@
+"""
+Benchmarks are measured with the ``benchmark`` fixture and checked against the baselines stored in baselines.json.
+A benchmark fails when it is slower or allocates more memory at its peak than its baseline by more than a threshold.
+Benchmarks are marked with the ``benchmark`` marker and only run when pytest is given the ``--benchmark`` option.
+
+Latencies are stored relative to the time this machine takes for a fixed calibration workload, so that baselines
+recorded on one machine can be checked on another. The thresholds and baselines are controlled with these environment
+variables:
+
+* ``AZURERM_BENCHMARK_TIME_THRESHOLD``: The fraction by which a benchmark may be slower than its baseline
+  (default: ``0.5``).
+* ``AZURERM_BENCHMARK_MEMORY_THRESHOLD``: The fraction by which the peak memory of a benchmark may exceed its baseline
+  (default: ``0.2``).
+* ``AZURERM_BENCHMARK_SAVE``: Set to ``true`` to store the results of the benchmarks run as their new baselines
+  instead of checking them.
+"""
+import asyncio
+import json
+import logging
+import os
+import pytest
+import time
+import tracemalloc
+
+log = logging.getLogger(__name__)
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+TIME_THRESHOLD = float(os.environ.get("AZURERM_BENCHMARK_TIME_THRESHOLD", 0.5))
+MEMORY_THRESHOLD = float(os.environ.get("AZURERM_BENCHMARK_MEMORY_THRESHOLD", 0.2))
+SAVE_BASELINES = os.environ.get("AZURERM_BENCHMARK_SAVE", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Peak memory differences below this many bytes are noise from the interpreter and the test harness
+MEMORY_SLACK = 256 * 1024
+
+
+def calibrate(rounds=5):
+    """
+    Return the fastest time this machine takes for a fixed, pure Python workload
+    """
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        table = {}
+        for idx in range(200000):
+            table[str(idx)] = sorted((idx % 7, idx % 13, idx % 17))
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+class Benchmark:
+    """
+    Measure a workload and check it against its baseline
+    """
+
+    def __init__(self, name, baselines, results, calibration):
+        self.name = name
+        self.baselines = baselines
+        self.results = results
+        self.calibration = calibration
+        self.loop = asyncio.new_event_loop()
+
+    def _run(self, func):
+        ret = func()
+        if asyncio.iscoroutine(ret):
+            ret = self.loop.run_until_complete(ret)
+        return ret
+
+    def __call__(self, func, rounds=5, warmup=1):
+        """
+        Run a workload, which may be a coroutine function, and return its result. The latency is the fastest of the
+        rounds and the peak memory is traced during one more round.
+        """
+        for _ in range(warmup):
+            self._run(func)
+
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            ret = self._run(func)
+            timings.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        try:
+            self._run(func)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        result = {
+            "seconds": min(timings),
+            "score": min(timings) / self.calibration,
+            "peak_kib": peak // 1024,
+        }
+        self.results[self.name] = result
+        log.info(
+            "%s: %.2fms, %d KiB peak",
+            self.name,
+            result["seconds"] * 1000,
+            result["peak_kib"],
+        )
+        self.check(result)
+        return ret
+
+    def check(self, result):
+        baseline = self.baselines.get(self.name)
+        if SAVE_BASELINES or baseline is None:
+            if baseline is None and not SAVE_BASELINES:
+                log.warning("%s has no baseline to compare against", self.name)
+            return
+
+        allowed = baseline["score"] * (1 + TIME_THRESHOLD)
+        assert (
+            result["score"] <= allowed
+        ), "{0} regressed: {1:.2f}ms is more than {2:.0%} slower than its baseline of {3:.2f}ms".format(
+            self.name,
+            result["seconds"] * 1000,
+            TIME_THRESHOLD,
+            baseline["score"] * self.calibration * 1000,
+        )
+
+        allowed = baseline["peak_kib"] * (1 + MEMORY_THRESHOLD) + MEMORY_SLACK // 1024
+        assert (
+            result["peak_kib"] <= allowed
+        ), "{0} regressed: a peak of {1} KiB is more than {2:.0%} above its baseline of {3} KiB".format(
+            self.name, result["peak_kib"], MEMORY_THRESHOLD, baseline["peak_kib"]
+        )
+
+    def close(self):
+        self.loop.close()
+
+
+@pytest.fixture(scope="session")
+def benchmark_baselines():
+    """
+    The stored baselines, which are rewritten at the end of the session if AZURERM_BENCHMARK_SAVE is set
+    """
+    try:
+        with open(BASELINE_FILE) as baseline_fh:
+            baselines = json.load(baseline_fh)
+    except IOError:
+        baselines = {}
+
+    results = {}
+    yield baselines.get("benchmarks", {}), results
+
+    if SAVE_BASELINES and results:
+        benchmarks = dict(baselines.get("benchmarks", {}))
+        benchmarks.update(results)
+        with open(BASELINE_FILE, "w") as baseline_fh:
+            json.dump({"benchmarks": benchmarks}, baseline_fh, indent=2, sort_keys=True)
+            baseline_fh.write("\n")
+
+
+@pytest.fixture(scope="session")
+def calibration():
+    yield calibrate()
+
+
+@pytest.fixture
+def benchmark(request, benchmark_baselines, calibration):
+    """
+    Measure a workload against the baseline stored under the name of the test
+    """
+    baselines, results = benchmark_baselines
+    bench = Benchmark(request.node.name, baselines, results, calibration)
+    yield bench
+    bench.close()
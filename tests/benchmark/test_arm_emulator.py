@@ -0,0 +1,90 @@
+import logging
+import pytest
+import time
+
+log = logging.getLogger(__name__)
+
+pytestmark = pytest.mark.benchmark
+
+RESOURCE_COUNT = 10000
+
+NSG_ID = "/subscriptions/{0}/resourceGroups/{1}/providers/Microsoft.Network/networkSecurityGroups/{2}"
+
+
+@pytest.mark.asyncio
+async def test_emulator_round_trip(azurerm_hub, arm_emulator, emulator_ctx):
+    """
+    Create, read and delete resources through the exec modules, including long running operations
+    """
+    hub = azurerm_hub
+    group = await hub.exec.azurerm.resource.group.create_or_update(
+        emulator_ctx, "rg-bench", "eastus"
+    )
+    assert group["properties"]["provisioning_state"] == "Succeeded"
+
+    nsg = await hub.exec.azurerm.network.network_security_group.create_or_update(
+        emulator_ctx,
+        "nsg-bench",
+        "rg-bench",
+        security_rules=[
+            {
+                "name": "ssh",
+                "priority": 100,
+                "protocol": "Tcp",
+                "access": "Allow",
+                "direction": "Inbound",
+                "source_address_prefix": "*",
+                "destination_address_prefix": "*",
+                "source_port_range": "*",
+                "destination_port_range": "22",
+            }
+        ],
+    )
+    assert nsg["provisioning_state"] == "Succeeded"
+    assert arm_emulator.stats["polls"]
+
+    rule = await hub.exec.azurerm.network.network_security_group.security_rule_get(
+        emulator_ctx, "ssh", "nsg-bench", "rg-bench"
+    )
+    assert rule["destination_port_range"] == "22"
+
+    assert await hub.exec.azurerm.resource.group.delete(emulator_ctx, "rg-bench")
+    assert not await hub.exec.azurerm.resource.group.check_existence(
+        emulator_ctx, "rg-bench"
+    )
+    assert not arm_emulator.resources()
+
+
+@pytest.mark.asyncio
+async def test_emulator_list_paged(azurerm_hub, arm_emulator, emulator_ctx):
+    """
+    List ten thousand resources, page by page, through a subscription quota which throttles part of the requests
+    """
+    subscription_id = emulator_ctx["acct"]["subscription_id"]
+    arm_emulator.add_resource_group(subscription_id, "rg-bench")
+    for idx in range(RESOURCE_COUNT):
+        arm_emulator.add_resource(
+            NSG_ID.format(subscription_id, "rg-bench", "nsg{0}".format(idx)),
+            {"location": "eastus"},
+        )
+    arm_emulator.page_size = 500
+    arm_emulator.quotas["reads"] = 2
+    arm_emulator.quota_window = 1
+
+    started = time.perf_counter()
+    ret = await azurerm_hub.exec.azurerm.network.network_security_group.list(
+        emulator_ctx, "rg-bench"
+    )
+    seconds = time.perf_counter() - started
+
+    log.info(
+        "listed %d network security groups in %.2fs with %d requests, %d throttled",
+        len(ret),
+        seconds,
+        arm_emulator.stats["requests"],
+        arm_emulator.stats["throttled"],
+    )
+    assert len(ret) == RESOURCE_COUNT
+    assert arm_emulator.stats["throttled"]
+    stats = await azurerm_hub.exec.azurerm.utils.throttle_stats()
+    assert stats[subscription_id]["throttled"]
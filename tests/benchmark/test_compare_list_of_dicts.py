@@ -0,0 +1,45 @@
+import copy
+import idem_azurerm.exec.azurerm.utils as utils
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+RULE_COUNT = 1000
+
+
+@pytest.fixture
+def security_rules():
+    yield [
+        {
+            "name": "rule{0}".format(idx),
+            "priority": 100 + idx,
+            "protocol": "Tcp",
+            "access": "Allow",
+            "direction": "Inbound",
+            "source_address_prefix": "*",
+            "destination_address_prefixes": ["10.0.0.0/24", "10.0.1.0/24"],
+            "destination_port_ranges": ["80", "443"],
+        }
+        for idx in range(RULE_COUNT)
+    ]
+
+
+def test_compare_list_of_dicts(azurerm_hub, security_rules, benchmark):
+    """
+    Diff a thousand security rules against a copy with a few rules added, removed and changed
+    """
+    new = copy.deepcopy(security_rules[5:])
+    for rule in new[::100]:
+        rule["access"] = "Deny"
+    new.extend(
+        dict(rule, name="added{0}".format(idx))
+        for idx, rule in enumerate(security_rules[:5])
+    )
+
+    ret = benchmark(
+        lambda: utils.compare_list_of_dicts(azurerm_hub, security_rules, new),
+        rounds=10,
+    )
+    assert len(ret["changes"]["added"]) == 5
+    assert len(ret["changes"]["removed"]) == 5
+    assert len(ret["changes"]["changed"]) == 10
@@ -0,0 +1,202 @@
+import asyncio
+import idem_azurerm.exec.azurerm.utils as utils
+import importlib
+import logging
+import pytest
+import timeit
+import types
+
+log = logging.getLogger(__name__)
+
+pytestmark = pytest.mark.benchmark
+
+RULE_COUNT = 300
+DISK_COUNT = 64
+ROUNDS = 20
+
+
+def reflective_create_object_model(module_name, object_name, **kwargs):
+    """
+    The model assembly used before builders were cached, which resolves the model and walks its attribute map on
+    every call. Kept as the baseline for this benchmark.
+    """
+    object_kwargs = {}
+    model_module = importlib.import_module("azure.mgmt.{0}.models".format(module_name))
+    Model = getattr(model_module, object_name)
+
+    if "_attribute_map" in dir(Model):
+        for attr, items in Model._attribute_map.items():
+            param = kwargs.get(attr)
+            if param is not None:
+                if items["type"][0].isupper() and isinstance(param, dict):
+                    object_kwargs[attr] = reflective_create_object_model(
+                        module_name, items["type"], **param
+                    )
+                elif items["type"][0] == "{" and isinstance(param, dict):
+                    object_kwargs[attr] = param
+                elif items["type"][0] == "[" and isinstance(param, list):
+                    obj_list = []
+                    for list_item in param:
+                        if items["type"][1].isupper() and isinstance(list_item, dict):
+                            obj_list.append(
+                                reflective_create_object_model(
+                                    module_name,
+                                    items["type"][
+                                        items["type"].index("[")
+                                        + 1 : items["type"].rindex("]")
+                                    ],
+                                    **list_item,
+                                )
+                            )
+                        elif items["type"][1] == "{" and isinstance(list_item, dict):
+                            obj_list.append(list_item)
+                        elif not items["type"][1].isupper() and items["type"][1] != "{":
+                            obj_list.append(list_item)
+                    object_kwargs[attr] = obj_list
+                else:
+                    object_kwargs[attr] = param
+
+    return Model(**object_kwargs)
+
+
+@pytest.fixture
+def model_hub():
+    hub = types.SimpleNamespace(
+        exec=types.SimpleNamespace(azurerm=types.SimpleNamespace(MODEL_BUILDERS={}))
+    )
+    yield hub
+
+
+@pytest.fixture
+def nsg_params():
+    yield {
+        "location": "eastus",
+        "tags": {"owner": "benchmark"},
+        "security_rules": [
+            {
+                "name": "rule{0}".format(idx),
+                "priority": 100 + idx,
+                "protocol": "Tcp",
+                "access": "Allow",
+                "direction": "Inbound",
+                "source_address_prefix": "*",
+                "destination_address_prefixes": ["10.0.0.0/24", "10.0.1.0/24"],
+                "destination_port_ranges": ["80", "443"],
+            }
+            for idx in range(RULE_COUNT)
+        ],
+    }
+
+
+@pytest.fixture
+def vm_params():
+    yield {
+        "location": "eastus",
+        "tags": {"owner": "benchmark"},
+        "hardware_profile": {"vm_size": "Standard_D64s_v3"},
+        "storage_profile": {
+            "image_reference": {
+                "publisher": "Canonical",
+                "offer": "UbuntuServer",
+                "sku": "18.04-LTS",
+                "version": "latest",
+            },
+            "os_disk": {
+                "create_option": "FromImage",
+                "disk_size_gb": 30,
+                "managed_disk": {"storage_account_type": "Premium_LRS"},
+            },
+            "data_disks": [
+                {
+                    "lun": lun,
+                    "create_option": "Empty",
+                    "disk_size_gb": 1024,
+                    "caching": "ReadOnly",
+                    "managed_disk": {"storage_account_type": "Premium_LRS"},
+                }
+                for lun in range(DISK_COUNT)
+            ],
+        },
+        "os_profile": {
+            "computer_name": "benchmark",
+            "admin_username": "idem",
+            "linux_configuration": {
+                "disable_password_authentication": True,
+                "ssh": {
+                    "public_keys": [
+                        {
+                            "path": "/home/idem/.ssh/authorized_keys",
+                            "key_data": "ssh-rsa AAAA{0}".format(idx),
+                        }
+                        for idx in range(8)
+                    ]
+                },
+            },
+        },
+        "network_profile": {
+            "network_interfaces": [
+                {"id": "/nic{0}".format(idx), "primary": idx == 0} for idx in range(8)
+            ]
+        },
+    }
+
+
+def test_create_object_model_builder_cache(model_hub, nsg_params):
+    """
+    Build a network security group with hundreds of rules from cached builders and by reflection on every call
+    """
+    loop = asyncio.new_event_loop()
+
+    def cached():
+        return loop.run_until_complete(
+            utils.create_object_model(
+                model_hub, "network", "NetworkSecurityGroup", **nsg_params
+            )
+        )
+
+    def reflective():
+        return reflective_create_object_model(
+            "network", "NetworkSecurityGroup", **nsg_params
+        )
+
+    try:
+        assert cached().serialize() == reflective().serialize()
+        baseline = min(timeit.repeat(reflective, number=1, repeat=ROUNDS))
+        optimized = min(timeit.repeat(cached, number=1, repeat=ROUNDS))
+    finally:
+        loop.close()
+
+    log.info(
+        "NetworkSecurityGroup with %d rules: %.2fms reflective, %.2fms cached (%.1fx)",
+        RULE_COUNT,
+        baseline * 1000,
+        optimized * 1000,
+        baseline / optimized,
+    )
+    assert optimized < baseline
+
+
+def test_create_object_model_nsg(model_hub, nsg_params, benchmark):
+    """
+    Build a network security group with hundreds of rules
+    """
+    model = benchmark(
+        lambda: utils.create_object_model(
+            model_hub, "network", "NetworkSecurityGroup", **nsg_params
+        ),
+        rounds=ROUNDS,
+    )
+    assert len(model.security_rules) == RULE_COUNT
+
+
+def test_create_object_model_vm(model_hub, vm_params, benchmark):
+    """
+    Build a virtual machine with the maximum number of data disks
+    """
+    model = benchmark(
+        lambda: utils.create_object_model(
+            model_hub, "compute", "VirtualMachine", **vm_params
+        ),
+        rounds=ROUNDS,
+    )
+    assert len(model.storage_profile.data_disks) == DISK_COUNT
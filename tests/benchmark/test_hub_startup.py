@@ -0,0 +1,97 @@
+import json
+import logging
+import os
+import pytest
+import subprocess
+import sys
+
+log = logging.getLogger(__name__)
+
+pytestmark = pytest.mark.benchmark
+
+ROUNDS = 3
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The SDK packages which every exec module used to import when the hub loaded them
+EAGER_IMPORTS = [
+    "adal",
+    "azure.common.credentials",
+    "azure.identity",
+    "azure.mgmt.authorization.models",
+    "azure.mgmt.compute.models",
+    "azure.mgmt.dns.models",
+    "azure.mgmt.keyvault.models",
+    "azure.mgmt.managementgroups.models",
+    "azure.mgmt.monitor.models",
+    "azure.mgmt.network.models",
+    "azure.mgmt.rdbms.postgresql.models",
+    "azure.mgmt.resource.resources.models",
+    "azure.mgmt.storage",
+]
+
+LOAD_HUB = """
+import importlib, json, sys, time
+
+started = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+
+import pop.hub
+
+hub = pop.hub.Hub()
+for dyne in ("exec", "states"):
+    hub.pop.sub.add(dyne_name=dyne)
+hub.pop.sub.load_subdirs(hub.exec, recurse=True)
+hub.pop.sub.load_subdirs(hub.states, recurse=True)
+for sub in (hub.exec.azurerm, hub.states.azurerm):
+    for name in list(sub._subs):
+        sub._subs[name]._load_all()
+
+print(
+    json.dumps(
+        {
+            "seconds": time.perf_counter() - started,
+            "modules": [name for name in sys.modules if name.startswith("azure")],
+        }
+    )
+)
+"""
+
+
+def load_hub(*eager_imports):
+    """
+    Load every azurerm exec and state module in a fresh interpreter, returning the fastest load time in seconds and
+    the Azure modules imported along the way
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [CODE_DIR, env.get("PYTHONPATH")]))
+    results = []
+    for _ in range(ROUNDS):
+        proc = subprocess.run(
+            [sys.executable, "-c", LOAD_HUB, *eager_imports],
+            check=True,
+            env=env,
+            stdout=subprocess.PIPE,
+        )
+        results.append(json.loads(proc.stdout.decode().splitlines()[-1]))
+    return min(ret["seconds"] for ret in results), results[0]["modules"]
+
+
+def test_hub_startup():
+    """
+    Load the hub with SDK packages imported on first use versus imported up front
+    """
+    eager, _ = load_hub(*EAGER_IMPORTS)
+    lazy, modules = load_hub()
+
+    log.info(
+        "hub load: %.3fs importing the SDK up front, %.3fs importing on first use (%d Azure modules)",
+        eager,
+        lazy,
+        len(modules),
+    )
+    assert "azure.mgmt.compute.models" not in modules
+    assert "azure.mgmt.network.models" not in modules
+    assert "adal" not in modules
+    assert lazy < eager
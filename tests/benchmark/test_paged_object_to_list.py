@@ -0,0 +1,49 @@
+import pytest
+
+from azure.mgmt.resource.resources import models
+
+pytestmark = pytest.mark.benchmark
+
+ITEM_COUNT = 10000
+PAGE_SIZE = 1000
+
+
+def resource_groups():
+    """
+    A paged list of resource groups, deserialized by the SDK from pages which are generated instead of requested
+    """
+
+    def get_page(next_link=None, raw=False):
+        start = int(next_link or 0)
+        page = {
+            "value": [
+                {
+                    "id": "/subscriptions/sub/resourceGroups/rg{0}".format(idx),
+                    "name": "rg{0}".format(idx),
+                    "location": "eastus",
+                    "tags": {"owner": "benchmark"},
+                    "properties": {"provisioningState": "Succeeded"},
+                }
+                for idx in range(start, min(start + PAGE_SIZE, ITEM_COUNT))
+            ]
+        }
+        if start + PAGE_SIZE < ITEM_COUNT:
+            page["nextLink"] = str(start + PAGE_SIZE)
+        return page
+
+    return models.ResourceGroupPaged(
+        get_page,
+        {name: obj for name, obj in vars(models).items() if isinstance(obj, type)},
+    )
+
+
+def test_paged_object_to_list(azurerm_hub, benchmark):
+    """
+    Drain ten thousand items from a paged object
+    """
+    ret = benchmark(
+        lambda: azurerm_hub.exec.azurerm.utils.paged_object_to_list(resource_groups()),
+        rounds=1,
+        warmup=0,
+    )
+    assert len(ret) == ITEM_COUNT
@@ -0,0 +1,103 @@
+import itertools
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+RULE_COUNT = 100
+
+
+@pytest.fixture
+def emulator_network(azurerm_hub, arm_emulator, emulator_ctx):
+    """
+    A resource group with a virtual network and subnet in the emulator
+    """
+    hub = azurerm_hub
+    subscription_id = emulator_ctx["acct"]["subscription_id"]
+    arm_emulator.add_resource_group(subscription_id, "rg-bench")
+    arm_emulator.add_resource(
+        "/subscriptions/{0}/resourceGroups/rg-bench/providers/Microsoft.Network/virtualNetworks/vnet".format(
+            subscription_id
+        ),
+        {
+            "location": "eastus",
+            "properties": {
+                "addressSpace": {"addressPrefixes": ["10.0.0.0/16"]},
+                "subnets": [
+                    {"name": "default", "properties": {"addressPrefix": "10.0.0.0/24"}}
+                ],
+            },
+        },
+    )
+    yield hub
+
+
+def test_network_security_group_present(
+    emulator_network, emulator_ctx, arm_emulator, benchmark
+):
+    """
+    Create a network security group with a hundred rules and ensure it is present again without changes
+    """
+    hub = emulator_network
+    names = ("nsg{0}".format(idx) for idx in itertools.count())
+    rules = [
+        {
+            "name": "rule{0}".format(idx),
+            "priority": 100 + idx,
+            "protocol": "Tcp",
+            "access": "Allow",
+            "direction": "Inbound",
+            "source_address_prefix": "*",
+            "destination_address_prefix": "*",
+            "source_port_range": "*",
+            "destination_port_range": str(1000 + idx),
+        }
+        for idx in range(RULE_COUNT)
+    ]
+
+    async def present():
+        name = next(names)
+        results = []
+        for _ in range(2):
+            results.append(
+                await hub.states.azurerm.network.network_security_group.present(
+                    emulator_ctx, name, "rg-bench", security_rules=rules
+                )
+            )
+        return results
+
+    created, unchanged = benchmark(present)
+    assert created["result"] and created["changes"]
+    assert unchanged["result"] and not unchanged["changes"]
+
+
+def test_virtual_machine_present(
+    emulator_network, emulator_ctx, arm_emulator, benchmark
+):
+    """
+    Create a virtual machine along with its network interface and ensure it is present again without changes
+    """
+    hub = emulator_network
+    names = ("vm{0}".format(idx) for idx in itertools.count())
+
+    async def present():
+        name = next(names)
+        results = []
+        for _ in range(2):
+            results.append(
+                await hub.states.azurerm.compute.virtual_machine.present(
+                    emulator_ctx,
+                    name,
+                    "rg-bench",
+                    "Standard_B1s",
+                    virtual_network="vnet",
+                    subnet="default",
+                    image="Canonical|UbuntuServer|18.04-LTS|latest",
+                    ssh_public_keys=["ssh-rsa AAAA"],
+                    disable_password_auth=True,
+                )
+            )
+        return results
+
+    created, unchanged = benchmark(present)
+    assert created["result"] and created["changes"]
+    assert unchanged["result"] and not unchanged["changes"]
@@ -14,8 +14,11 @@ sys.path.insert(0, CODE_DIR)
 sys.path.insert(0, TPATH_DIR)
 
 # Import 3rd-party libs
+import pop.hub
 import pytest
 
+from tests.emulator.arm import ArmEmulator
+
 
 log = logging.getLogger("pop.tests")
 
@@ -36,7 +39,29 @@ def pytest_runtest_teardown(item):
     log.debug("<<<<< END <<<<<<< {0}".format(item.name))
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="run the benchmarks, which are skipped by default",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Skip the benchmarks unless they were asked for
+    """
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --benchmark")
+    for item in items:
+        if item.get_closest_marker("benchmark"):
+            item.add_marker(skip)
+
+
 def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: mark test as a benchmark")
     config.addinivalue_line("markers", "first: mark test to run first")
     config.addinivalue_line("markers", "second: mark test to run second")
     config.addinivalue_line(
@@ -50,3 +75,34 @@ def os_sleep_secs():
     if "CI_RUN" in os.environ:
         return 1.75
     return 0.5
+
+
+@pytest.fixture(scope="session")
+def azurerm_hub():
+    """
+    A hub with every azurerm exec and state module loaded
+    """
+    hub = pop.hub.Hub()
+    for dyne in ("acct", "exec", "states"):
+        hub.pop.sub.add(dyne_name=dyne)
+    hub.pop.sub.load_subdirs(hub.exec, recurse=True)
+    hub.pop.sub.load_subdirs(hub.states, recurse=True)
+    yield hub
+
+
+@pytest.fixture
+def arm_emulator(azurerm_hub, monkeypatch):
+    """
+    A local ARM emulator which the clients trust, with the hub's client, cache and rate limiting state reset so that
+    every test starts cold
+    """
+    with ArmEmulator() as emulator:
+        monkeypatch.setenv("REQUESTS_CA_BUNDLE", emulator.ca_bundle)
+        for state in ("CLIENT_POOL", "RATE_GOVERNORS", "RESOURCE_CACHE", "NOT_FOUND"):
+            getattr(azurerm_hub.exec.azurerm, state).clear()
+        yield emulator
+
+
+@pytest.fixture
+def emulator_ctx(arm_emulator):
+    yield {"acct": arm_emulator.credentials(), "test": False}
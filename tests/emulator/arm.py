@@ -0,0 +1,1012 @@
+# -*- coding: utf-8 -*-
+"""
+A local stand-in for the parts of the Azure Resource Manager (ARM) REST API used by idem-azurerm, so that exec and
+state modules can be tested and load tested without a subscription.
+
+The emulator serves resource groups and any provider resource nested under them, which covers virtual machines,
+network interfaces, network security groups, virtual networks, key vaults, DNS zones and record sets, storage accounts
+and deployments. Collections are paged, long running operations are polled, ETags are honored and request latency and
+subscription quotas can be injected.
+
+It also serves the cloud metadata and an ADFS style token endpoint, so the azurerm modules can be pointed at it by
+passing its URL as ``cloud_environment``. ADAL only talks to HTTPS authorities, so the emulator serves HTTPS with a
+throwaway self-signed certificate and the clients have to trust it, e.g. with ``REQUESTS_CA_BUNDLE``:
+
+.. code-block:: python
+
+    with ArmEmulator(latency=0.05) as emulator:
+        os.environ["REQUESTS_CA_BUNDLE"] = emulator.ca_bundle
+        ctx = {"acct": emulator.credentials()}
+        await hub.exec.azurerm.resource.group.create(ctx, "rg1", "eastus")
+
+It can also be run on its own for manual load tests:
+
+.. code-block:: bash
+
+    python -m tests.emulator.arm --port 8443 --latency 0.05 --read-quota 12000
+
+"""
+# Python libs
+import argparse
+import collections
+import copy
+import datetime
+import functools
+import http.server
+import ipaddress
+import json
+import math
+import os
+import random
+import re
+import shutil
+import ssl
+import tempfile
+import threading
+import time
+import urllib.parse
+import uuid
+
+# The subscription providers under which long running operation status is served
+OPERATIONS_PROVIDER = "Microsoft.Emulator"
+
+# Resource types whose creation, deletion and actions are long running operations polled through the
+# Azure-AsyncOperation header, keyed by lowercase type prefix
+ASYNC_OPERATION_TYPES = (
+    "microsoft.network/",
+    "microsoft.compute/virtualmachines",
+    "microsoft.resources/deployments",
+)
+
+# Resource types under those above which are created and deleted synchronously
+SYNCHRONOUS_TYPES = ("microsoft.network/dnszones",)
+
+# Resource types whose creation is a long running operation polled through the Location header
+LOCATION_OPERATION_TYPES = ("microsoft.storage/storageaccounts",)
+
+# Collection names which list every child of a resource regardless of type, e.g. all record sets in a DNS zone
+ALL_CHILDREN = ("recordsets", "all")
+
+FILTER_TYPE = re.compile(r"resourceType eq '([^']+)'", re.IGNORECASE)
+
+
+class ArmError(Exception):
+    """
+    An error returned to the client in the ARM error format.
+    """
+
+    def __init__(self, status, code, message):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+def _is_type(resource_type, prefixes):
+    resource_type = resource_type.lower()
+    if any(resource_type.startswith(prefix) for prefix in SYNCHRONOUS_TYPES):
+        return False
+    return any(resource_type.startswith(prefix) for prefix in prefixes)
+
+
+def _make_certificate(directory):
+    """
+    Write a self-signed certificate for the loopback address and its key to the given directory.
+    """
+    from cryptography import x509
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+
+    key = rsa.generate_private_key(
+        public_exponent=65537, key_size=2048, backend=default_backend()
+    )
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.utcnow()
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=7))
+        .add_extension(
+            x509.SubjectAlternativeName(
+                [
+                    x509.DNSName("localhost"),
+                    x509.IPAddress(ipaddress.ip_address("127.0.0.1")),
+                ]
+            ),
+            critical=False,
+        )
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256(), default_backend())
+    )
+
+    cert_file = os.path.join(directory, "cert.pem")
+    key_file = os.path.join(directory, "key.pem")
+    with open(cert_file, "wb") as cert_fh:
+        cert_fh.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_file, "wb") as key_fh:
+        key_fh.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.TraditionalOpenSSL,
+                serialization.NoEncryption(),
+            )
+        )
+    return cert_file, key_file
+
+
+class _RequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Passes every request to the emulator and writes back its response.
+    """
+
+    protocol_version = "HTTP/1.1"
+    emulator = None
+
+    def _dispatch(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, headers, payload = self.emulator.handle(
+            self.command, self.path, self.headers, body
+        )
+        self.send_response(status)
+        headers.setdefault("x-ms-request-id", str(uuid.uuid4()))
+        if payload is not None:
+            headers["Content-Type"] = "application/json; charset=utf-8"
+        headers["Content-Length"] = str(len(payload or b""))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if payload and self.command != "HEAD":
+            self.wfile.write(payload)
+
+    do_GET = do_HEAD = do_PUT = do_PATCH = do_POST = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class ArmEmulator:
+    """
+    An in-memory ARM endpoint served over HTTPS on the loopback interface.
+
+    :param port: The port to listen on. Defaults to a free port.
+    :param page_size: The number of items returned per page of a collection.
+    :param latency: The number of seconds every request is delayed by.
+    :param jitter: The maximum number of seconds added at random to the latency of each request.
+    :param lro_polls: The number of times a long running operation reports being in progress before it completes.
+    :param read_quota: The number of reads allowed per subscription in each quota window. Reads beyond the quota are
+        throttled with a 429 response. Defaults to no quota.
+    :param write_quota: The number of writes allowed per subscription in each quota window.
+    :param quota_window: The number of seconds after which the quotas are replenished.
+    """
+
+    def __init__(
+        self,
+        port=0,
+        page_size=100,
+        latency=0.0,
+        jitter=0.0,
+        lro_polls=1,
+        read_quota=None,
+        write_quota=None,
+        quota_window=60.0,
+    ):
+        self.port = port
+        self.page_size = page_size
+        self.latency = latency
+        self.jitter = jitter
+        self.lro_polls = lro_polls
+        self.quotas = {"reads": read_quota, "writes": write_quota}
+        self.quota_window = quota_window
+        self.stats = collections.Counter()
+        self._lock = threading.RLock()
+        self._groups = collections.OrderedDict()
+        self._resources = collections.OrderedDict()
+        self._operations = {}
+        self._quota_usage = {}
+        self._server = None
+        self._thread = None
+        self._cert_dir = None
+
+    @property
+    def url(self):
+        return "https://127.0.0.1:{0}".format(self.port)
+
+    @property
+    def cloud_environment(self):
+        """
+        The value to pass as ``cloud_environment`` to target the emulator.
+        """
+        return self.url + "/"
+
+    @property
+    def ca_bundle(self):
+        """
+        The path of the certificate clients have to trust to connect to the emulator.
+        """
+        return os.path.join(self._cert_dir, "cert.pem")
+
+    def credentials(self, subscription_id="00000000-0000-0000-0000-000000000000"):
+        """
+        Return connection parameters for an acct profile which targets the emulator.
+        """
+        return {
+            "client_id": "00000000-0000-0000-0000-00000000000c",
+            "secret": "emulator",
+            "tenant": "adfs",
+            "subscription_id": subscription_id,
+            "cloud_environment": self.cloud_environment,
+        }
+
+    def start(self):
+        self._cert_dir = tempfile.mkdtemp(prefix="arm-emulator-")
+        cert_file, key_file = _make_certificate(self._cert_dir)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_file, key_file)
+
+        handler = type("ArmRequestHandler", (_RequestHandler,), {"emulator": self})
+        self._server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", self.port), handler
+        )
+        self._server.daemon_threads = True
+        self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._cert_dir:
+            shutil.rmtree(self._cert_dir, ignore_errors=True)
+            self._cert_dir = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def add_resource_group(self, subscription_id, name, location="eastus", tags=None):
+        """
+        Add a resource group directly to the emulator, without going through the REST API.
+        """
+        group_id = "/subscriptions/{0}/resourceGroups/{1}".format(subscription_id, name)
+        body = {
+            "id": group_id,
+            "name": name,
+            "type": "Microsoft.Resources/resourceGroups",
+            "location": location,
+            "tags": tags or {},
+            "properties": {"provisioningState": "Succeeded"},
+        }
+        with self._lock:
+            self._groups[group_id.lower()] = body
+        return body
+
+    def add_resource(self, resource_id, body=None):
+        """
+        Add a resource directly to the emulator, without going through the REST API. This is the quickest way to seed
+        the emulator with thousands of resources. The resource group has to exist already.
+        """
+        segments = [segment for segment in resource_id.split("/") if segment]
+        with self._lock:
+            return self._store(
+                segments[1], segments[3], segments[5], segments[6:], body or {}
+            )
+
+    def resources(self, resource_type=None):
+        """
+        Return the stored resources, optionally only those of the given type.
+        """
+        with self._lock:
+            return [
+                copy.deepcopy(body)
+                for body in self._resources.values()
+                if resource_type is None
+                or body["type"].lower() == resource_type.lower()
+            ]
+
+    def handle(self, method, path, headers, body):
+        """
+        Serve a single request, returning the response status, headers and JSON payload.
+        """
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+        url = urllib.parse.urlsplit(path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        segments = [urllib.parse.unquote(seg) for seg in url.path.split("/") if seg]
+        response_headers = {}
+
+        with self._lock:
+            self.stats["requests"] += 1
+            try:
+                if segments[:2] == ["metadata", "endpoints"]:
+                    return 200, response_headers, self._json(self._metadata())
+                if segments[-2:] == ["oauth2", "token"] and method == "POST":
+                    return 200, response_headers, self._json(self._token(body))
+                if not segments or segments[0].lower() != "subscriptions":
+                    raise ArmError(404, "NotFound", "Unknown path {0}".format(url.path))
+
+                self._charge_quota(segments[1], method, response_headers)
+                payload = json.loads(body.decode("utf-8")) if body else {}
+                status, result = self._route(
+                    method, segments, query, headers, payload, response_headers
+                )
+            except ArmError as exc:
+                status = exc.status
+                result = {"error": {"code": exc.code, "message": str(exc)}}
+                if status == 429:
+                    self.stats["throttled"] += 1
+
+            return status, response_headers, self._json(result)
+
+    @staticmethod
+    def _json(result):
+        if result is None:
+            return None
+        return json.dumps(result).encode("utf-8")
+
+    def _metadata(self):
+        return {
+            "galleryEndpoint": self.url + "/",
+            "graphEndpoint": self.url + "/",
+            "portalEndpoint": self.url + "/",
+            "authentication": {
+                "loginEndpoint": self.url + "/adfs",
+                "audiences": [self.url + "/"],
+            },
+        }
+
+    @staticmethod
+    def _token(body):
+        form = dict(urllib.parse.parse_qsl(body.decode("utf-8")))
+        return {
+            "token_type": "Bearer",
+            "access_token": "emulator-" + uuid.uuid4().hex,
+            "expires_in": "3600",
+            "expires_on": str(int(time.time()) + 3600),
+            "resource": form.get("resource", ""),
+        }
+
+    def _charge_quota(self, subscription_id, method, headers):
+        """
+        Count a request against the quota of the subscription, throttling it once the quota is used up.
+        """
+        kind = "reads" if method in ("GET", "HEAD") else "writes"
+        quota = self.quotas[kind]
+        self.stats[kind] += 1
+        if quota is None:
+            return
+
+        now = time.monotonic()
+        key = (subscription_id.lower(), kind)
+        used, reset_at = self._quota_usage.get(key, (0, now + self.quota_window))
+        if now >= reset_at:
+            used, reset_at = 0, now + self.quota_window
+
+        if used >= quota:
+            headers["Retry-After"] = str(max(1, math.ceil(reset_at - now)))
+            headers["x-ms-ratelimit-remaining-subscription-" + kind] = "0"
+            raise ArmError(
+                429,
+                "SubscriptionRequestsThrottled",
+                "Number of {0} requests for subscription '{1}' exceeded the limit of '{2}'.".format(
+                    kind[:-1], subscription_id, quota
+                ),
+            )
+
+        self._quota_usage[key] = (used + 1, reset_at)
+        headers["x-ms-ratelimit-remaining-subscription-" + kind] = str(quota - used - 1)
+
+    def _route(self, method, segments, query, headers, payload, response_headers):
+        subscription_id, rest = segments[1], segments[2:]
+        lowered = [segment.lower() for segment in rest]
+
+        if not rest:
+            return 200, self._subscription(subscription_id)
+
+        if lowered[:2] == ["providers", OPERATIONS_PROVIDER.lower()] and len(rest) == 4:
+            return self._poll(subscription_id, lowered[2], rest[3], response_headers)
+
+        if lowered[0] == "providers" and len(rest) == 3:
+            if method == "POST":
+                return 200, self._check_name(rest[1], rest[2], payload)
+            return (
+                200,
+                self._page(
+                    self._list_type(subscription_id, None, rest[1], rest[2]),
+                    segments,
+                    query,
+                ),
+            )
+
+        if lowered == ["resources"]:
+            return (
+                200,
+                self._page(
+                    self._list_resources(subscription_id, None, query), segments, query
+                ),
+            )
+
+        if lowered[0] != "resourcegroups":
+            raise ArmError(404, "NotFound", "Unknown path {0}".format("/".join(rest)))
+
+        if len(rest) == 1:
+            groups = [
+                body
+                for key, body in self._groups.items()
+                if key.startswith("/subscriptions/{0}/".format(subscription_id.lower()))
+            ]
+            return 200, self._page(groups, segments, query)
+
+        if len(rest) == 2:
+            return self._group(
+                method, subscription_id, rest[1], headers, payload, response_headers
+            )
+
+        group = rest[1]
+        if lowered[2:] == ["resources"]:
+            self._get_group(subscription_id, group)
+            return (
+                200,
+                self._page(
+                    self._list_resources(subscription_id, group, query), segments, query
+                ),
+            )
+
+        if lowered[2] != "providers" or len(rest) < 5:
+            raise ArmError(404, "NotFound", "Unknown path {0}".format("/".join(rest)))
+
+        namespace, tail = rest[3], rest[4:]
+        if len(tail) % 2:
+            if method == "POST" and len(tail) > 1:
+                return self._action(
+                    subscription_id,
+                    group,
+                    namespace,
+                    tail[:-1],
+                    tail[-1],
+                    payload,
+                    response_headers,
+                )
+            self._get_group(subscription_id, group)
+            return (
+                200,
+                self._page(
+                    self._list_children(subscription_id, group, namespace, tail),
+                    segments,
+                    query,
+                ),
+            )
+
+        return self._resource(
+            method,
+            subscription_id,
+            group,
+            namespace,
+            tail,
+            headers,
+            payload,
+            response_headers,
+        )
+
+    @staticmethod
+    def _subscription(subscription_id):
+        return {
+            "id": "/subscriptions/{0}".format(subscription_id),
+            "subscriptionId": subscription_id,
+            "displayName": "ARM emulator",
+            "state": "Enabled",
+        }
+
+    def _page(self, items, segments, query):
+        """
+        Return one page of a collection, with a link to the next page if there are more items.
+        """
+        start = int(query.get("$skiptoken") or 0)
+        page_size = min(int(query.get("$top") or self.page_size), self.page_size)
+        result = {"value": items[start : start + page_size]}
+        if start + page_size < len(items):
+            next_query = dict(query)
+            next_query["$skiptoken"] = start + page_size
+            result["nextLink"] = "{0}/{1}?{2}".format(
+                self.url,
+                "/".join(urllib.parse.quote(segment) for segment in segments),
+                urllib.parse.urlencode(next_query),
+            )
+        return result
+
+    def _etag(self):
+        return 'W/"{0}"'.format(uuid.uuid4())
+
+    @staticmethod
+    def _check_etag(existing, headers):
+        if_match = headers.get("If-Match")
+        if if_match and (
+            existing is None or (if_match != "*" and if_match != existing.get("etag"))
+        ):
+            raise ArmError(
+                412,
+                "PreconditionFailed",
+                "The ETag does not match the current resource.",
+            )
+        if headers.get("If-None-Match") == "*" and existing is not None:
+            raise ArmError(412, "PreconditionFailed", "The resource already exists.")
+
+    def _start_operation(self, subscription_id, finish, result=None):
+        operation_id = uuid.uuid4().hex
+        self._operations[operation_id] = {
+            "remaining": self.lro_polls,
+            "finish": finish,
+            "result": result,
+        }
+        return "{0}/subscriptions/{1}/providers/{2}/{{0}}/{3}".format(
+            self.url, subscription_id, OPERATIONS_PROVIDER, operation_id
+        )
+
+    def _poll(self, subscription_id, kind, operation_id, response_headers):
+        """
+        Report the status of a long running operation, completing it once it has been polled enough times.
+        """
+        self.stats["polls"] += 1
+        operation = self._operations.get(operation_id.lower())
+        if operation is None:
+            raise ArmError(
+                404, "NotFound", "Unknown operation {0}".format(operation_id)
+            )
+
+        response_headers["Retry-After"] = "0"
+        if operation["remaining"] > 0:
+            operation["remaining"] -= 1
+            if kind == "operations":
+                return 200, {"status": "InProgress"}
+            response_headers[
+                "Location"
+            ] = "{0}/subscriptions/{1}/providers/{2}/operationResults/{3}".format(
+                self.url, subscription_id, OPERATIONS_PROVIDER, operation_id
+            )
+            return 202, None
+
+        if operation["finish"]:
+            operation["result"] = operation["finish"]() or operation["result"]
+            operation["finish"] = None
+        if kind == "operations":
+            return 200, {"status": "Succeeded"}
+        if operation["result"] is None:
+            return 204, None
+        return 200, operation["result"]
+
+    def _get_group(self, subscription_id, name):
+        group = self._groups.get(
+            "/subscriptions/{0}/resourcegroups/{1}".format(
+                subscription_id, name
+            ).lower()
+        )
+        if group is None:
+            raise ArmError(
+                404,
+                "ResourceGroupNotFound",
+                "Resource group '{0}' could not be found.".format(name),
+            )
+        return group
+
+    def _group(self, method, subscription_id, name, headers, payload, response_headers):
+        key = "/subscriptions/{0}/resourcegroups/{1}".format(
+            subscription_id, name
+        ).lower()
+        existing = self._groups.get(key)
+
+        if method == "HEAD":
+            return (204 if existing else 404), None
+
+        if method == "GET":
+            return 200, self._get_group(subscription_id, name)
+
+        if method == "PUT":
+            body = self.add_resource_group(
+                subscription_id,
+                name,
+                payload.get("location", "eastus"),
+                payload.get("tags"),
+            )
+            if existing:
+                body["id"] = existing["id"]
+            return (200 if existing else 201), body
+
+        if method == "PATCH":
+            group = self._get_group(subscription_id, name)
+            if "tags" in payload:
+                group["tags"] = payload["tags"] or {}
+            return 200, group
+
+        if method == "DELETE":
+            self._get_group(subscription_id, name)
+
+            def finish():
+                self._groups.pop(key, None)
+                for resource in [
+                    res for res in self._resources if res.startswith(key + "/")
+                ]:
+                    del self._resources[resource]
+
+            response_headers["Location"] = self._start_operation(
+                subscription_id, finish
+            ).format("operationResults")
+            response_headers["Retry-After"] = "0"
+            return 202, None
+
+        raise ArmError(405, "MethodNotAllowed", "{0} is not supported".format(method))
+
+    @staticmethod
+    def _resource_id(subscription_id, group, namespace, tail):
+        return "/subscriptions/{0}/resourceGroups/{1}/providers/{2}/{3}".format(
+            subscription_id, group, namespace, "/".join(tail)
+        )
+
+    @staticmethod
+    def _resource_type(namespace, tail):
+        return "/".join([namespace] + list(tail[0::2]))
+
+    def _store(
+        self, subscription_id, group, namespace, tail, payload, state="Succeeded"
+    ):
+        """
+        Store a resource from a request body, along with the child resources listed in its properties.
+        """
+        resource_id = self._resource_id(subscription_id, group, namespace, tail)
+        resource_type = self._resource_type(namespace, tail)
+        body = copy.deepcopy(payload)
+        body.update(
+            {
+                "id": resource_id,
+                "name": tail[-1],
+                "type": resource_type,
+                "etag": self._etag(),
+            }
+        )
+        properties = body.setdefault("properties", {})
+        properties["provisioningState"] = state
+        if resource_type.lower() == "microsoft.compute/virtualmachines":
+            self._virtual_machine_defaults(tail[-1], properties)
+        self._resources[resource_id.lower()] = body
+
+        for prop, value in properties.items():
+            if not (
+                isinstance(value, list)
+                and value
+                and all(isinstance(item, dict) and item.get("name") for item in value)
+            ):
+                continue
+            prefix = "{0}/{1}/".format(resource_id, prop).lower()
+            for key in [key for key in self._resources if key.startswith(prefix)]:
+                del self._resources[key]
+            for item in value:
+                item["id"] = "{0}/{1}/{2}".format(resource_id, prop, item["name"])
+                item["etag"] = body["etag"]
+                item.setdefault("properties", {})["provisioningState"] = "Succeeded"
+                child = copy.deepcopy(item)
+                child["type"] = "{0}/{1}".format(resource_type, prop)
+                self._resources[item["id"].lower()] = child
+
+        if len(tail) > 2:
+            self._sync_parent(subscription_id, group, namespace, tail, body)
+
+        return body
+
+    @staticmethod
+    def _virtual_machine_defaults(name, properties):
+        """
+        Fill in the virtual machine properties which ARM derives from the image and the VM name.
+        """
+        properties.setdefault("vmId", str(uuid.uuid4()))
+        os_disk = properties.setdefault("storageProfile", {}).setdefault("osDisk", {})
+        os_disk.setdefault("osType", "Linux")
+        os_disk.setdefault("name", "{0}_OsDisk_1".format(name))
+
+    def _sync_parent(self, subscription_id, group, namespace, tail, child=None):
+        """
+        Keep the list of child resources in the properties of their parent in step with the child resources.
+        """
+        parent = self._resources.get(
+            self._resource_id(subscription_id, group, namespace, tail[:-2]).lower()
+        )
+        if parent is None:
+            return
+        properties = parent.setdefault("properties", {})
+        prop = next(
+            (key for key in properties if key.lower() == tail[-2].lower()), tail[-2]
+        )
+        items = [
+            item
+            for item in properties.get(prop) or []
+            if not (
+                isinstance(item, dict)
+                and item.get("name", "").lower() == tail[-1].lower()
+            )
+        ]
+        if child is not None:
+            item = copy.deepcopy(child)
+            item.pop("type", None)
+            items.append(item)
+        properties[prop] = items
+
+    def _get_resource(self, subscription_id, group, namespace, tail):
+        resource = self._resources.get(
+            self._resource_id(subscription_id, group, namespace, tail).lower()
+        )
+        if resource is None:
+            raise ArmError(
+                404,
+                "ResourceNotFound",
+                "The Resource '{0}' under resource group '{1}' was not found.".format(
+                    self._resource_type(namespace, tail) + "/" + tail[-1], group
+                ),
+            )
+        return resource
+
+    def _resource(
+        self,
+        method,
+        subscription_id,
+        group,
+        namespace,
+        tail,
+        headers,
+        payload,
+        response_headers,
+    ):
+        self._get_group(subscription_id, group)
+        key = self._resource_id(subscription_id, group, namespace, tail).lower()
+        resource_type = self._resource_type(namespace, tail)
+        existing = self._resources.get(key)
+
+        if method in ("GET", "HEAD"):
+            resource = self._get_resource(subscription_id, group, namespace, tail)
+            response_headers["ETag"] = resource["etag"]
+            return (200 if method == "GET" else 204), resource
+
+        if method == "PUT":
+            self._check_etag(existing, headers)
+            if len(tail) > 2:
+                self._get_resource(subscription_id, group, namespace, tail[:-2])
+            status = 200 if existing else 201
+
+            if self.lro_polls and _is_type(resource_type, LOCATION_OPERATION_TYPES):
+                body = self._store(
+                    subscription_id, group, namespace, tail, payload, "Creating"
+                )
+                response_headers["Location"] = self._start_operation(
+                    subscription_id, functools.partial(self._succeed, key)
+                ).format("operationResults")
+                response_headers["Retry-After"] = "0"
+                return 202, None
+
+            if self.lro_polls and _is_type(resource_type, ASYNC_OPERATION_TYPES):
+                body = self._store(
+                    subscription_id,
+                    group,
+                    namespace,
+                    tail,
+                    payload,
+                    "Updating" if existing else "Creating",
+                )
+                response_headers["Azure-AsyncOperation"] = self._start_operation(
+                    subscription_id, functools.partial(self._succeed, key)
+                ).format("operations")
+                response_headers["Retry-After"] = "0"
+            else:
+                body = self._store(subscription_id, group, namespace, tail, payload)
+
+            response_headers["ETag"] = body["etag"]
+            return status, body
+
+        if method == "PATCH":
+            resource = self._get_resource(subscription_id, group, namespace, tail)
+            self._check_etag(resource, headers)
+            if "tags" in payload:
+                resource["tags"] = payload["tags"] or {}
+            resource["properties"].update(payload.get("properties") or {})
+            resource["etag"] = self._etag()
+            response_headers["ETag"] = resource["etag"]
+            return 200, resource
+
+        if method == "DELETE":
+            if existing is None:
+                return 204, None
+            self._check_etag(existing, headers)
+
+            def finish():
+                for res in [
+                    res
+                    for res in self._resources
+                    if res == key or res.startswith(key + "/")
+                ]:
+                    del self._resources[res]
+                if len(tail) > 2:
+                    self._sync_parent(subscription_id, group, namespace, tail)
+
+            if self.lro_polls and _is_type(
+                resource_type, ASYNC_OPERATION_TYPES + LOCATION_OPERATION_TYPES
+            ):
+                response_headers["Location"] = self._start_operation(
+                    subscription_id, finish
+                ).format("operationResults")
+                response_headers["Retry-After"] = "0"
+                return 202, None
+
+            finish()
+            return 200, None
+
+        raise ArmError(405, "MethodNotAllowed", "{0} is not supported".format(method))
+
+    def _succeed(self, key):
+        resource = self._resources.get(key)
+        if resource is not None:
+            resource["properties"]["provisioningState"] = "Succeeded"
+        return resource
+
+    def _action(
+        self, subscription_id, group, namespace, tail, action, payload, response_headers
+    ):
+        """
+        Run a POST action, such as powering off a virtual machine or listing storage account keys, on a resource.
+        """
+        self._get_group(subscription_id, group)
+        action = action.lower()
+
+        if action == "validate":
+            return (
+                200,
+                {
+                    "properties": {
+                        "provisioningState": "Succeeded",
+                        "mode": (payload.get("properties") or {}).get("mode"),
+                    }
+                },
+            )
+
+        resource = self._get_resource(subscription_id, group, namespace, tail)
+
+        if action == "listkeys":
+            return (
+                200,
+                {
+                    "keys": [
+                        {
+                            "keyName": name,
+                            "value": uuid.uuid4().hex,
+                            "permissions": "FULL",
+                        }
+                        for name in ("key1", "key2")
+                    ]
+                },
+            )
+
+        if action == "exporttemplate":
+            return 200, {"template": resource["properties"].get("template", {})}
+
+        if action == "cancel":
+            return 204, None
+
+        # actions which read the effective configuration of a resource, such as its effective route table
+        result = {"value": []} if action.startswith("effective") else None
+
+        if self.lro_polls and _is_type(resource["type"], ASYNC_OPERATION_TYPES):
+            response_headers["Location"] = self._start_operation(
+                subscription_id, None, result
+            ).format("operationResults")
+            response_headers["Retry-After"] = "0"
+            return 202, None
+
+        return 200, result or {}
+
+    def _check_name(self, namespace, action, payload):
+        if action.lower() != "checknameavailability":
+            raise ArmError(404, "NotFound", "Unknown action {0}".format(action))
+        name = (payload.get("name") or "").lower()
+        resource_type = (payload.get("type") or namespace).lower()
+        taken = any(
+            body["name"].lower() == name
+            and body["type"].lower().startswith(resource_type)
+            for body in self._resources.values()
+        )
+        result = {"nameAvailable": not taken}
+        if taken:
+            result.update(
+                {
+                    "reason": "AlreadyExists",
+                    "message": "The name {0} is already in use.".format(name),
+                }
+            )
+        return result
+
+    def _list_type(self, subscription_id, group, namespace, resource_type):
+        resource_type = "{0}/{1}".format(namespace, resource_type).lower()
+        prefix = "/subscriptions/{0}/resourcegroups/{1}".format(
+            subscription_id, group or ""
+        ).lower()
+        return [
+            body
+            for key, body in self._resources.items()
+            if key.startswith(prefix) and body["type"].lower() == resource_type
+        ]
+
+    def _list_resources(self, subscription_id, group, query):
+        match = FILTER_TYPE.search(query.get("$filter", ""))
+        prefix = "/subscriptions/{0}/resourcegroups/{1}".format(
+            subscription_id, group or ""
+        ).lower()
+        return [
+            body
+            for key, body in self._resources.items()
+            if key.startswith(prefix)
+            and body["type"].count("/") == 1
+            and (not match or body["type"].lower() == match.group(1).lower())
+        ]
+
+    def _list_children(self, subscription_id, group, namespace, tail):
+        if len(tail) == 1:
+            return self._list_type(subscription_id, group, namespace, tail[0])
+
+        self._get_resource(subscription_id, group, namespace, tail[:-1])
+        prefix = (
+            self._resource_id(subscription_id, group, namespace, tail[:-1]).lower()
+            + "/"
+        )
+        if tail[-1].lower() in ALL_CHILDREN:
+            depth = 1
+        else:
+            prefix += tail[-1].lower() + "/"
+            depth = 0
+        return [
+            body
+            for key, body in self._resources.items()
+            if key.startswith(prefix) and key[len(prefix) :].count("/") == depth
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8443)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--lro-polls", type=int, default=1)
+    parser.add_argument("--read-quota", type=int)
+    parser.add_argument("--write-quota", type=int)
+    parser.add_argument("--quota-window", type=float, default=60.0)
+    args = parser.parse_args()
+
+    emulator = ArmEmulator(
+        port=args.port,
+        page_size=args.page_size,
+        latency=args.latency,
+        jitter=args.jitter,
+        lro_polls=args.lro_polls,
+        read_quota=args.read_quota,
+        write_quota=args.write_quota,
+        quota_window=args.quota_window,
+    )
+    with emulator:
+        print("cloud_environment: {0}".format(emulator.cloud_environment))
+        print("REQUESTS_CA_BUNDLE={0}".format(emulator.ca_bundle))
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
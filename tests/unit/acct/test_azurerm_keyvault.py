@@ -0,0 +1,182 @@
+import datetime
+import idem_azurerm.acct.azurerm_keyvault as azurerm_keyvault
+import mock
+import os
+import threading
+import time
+
+from azure.core.exceptions import ResourceNotFoundError
+from cryptography.fernet import Fernet
+
+
+class SecretProperties:
+    def __init__(
+        self, name, enabled=True, expires_on=None, not_before=None, version="1"
+    ):
+        self.name = name
+        self.enabled = enabled
+        self.expires_on = expires_on
+        self.not_before = not_before
+        self.version = version
+        self.updated_on = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class SecretClient:
+    """
+    A stand-in for the Key Vault secret client which records the secrets fetched and how many were fetched at once
+    """
+
+    def __init__(self, secrets):
+        self.secrets = secrets
+        self.fetched = []
+        self.active = 0
+        self.most_active = 0
+        self.lock = threading.Lock()
+
+    def list_properties_of_secrets(self):
+        return iter(self.secrets)
+
+    def get_secret(self, name):
+        with self.lock:
+            self.fetched.append(name)
+            self.active += 1
+            self.most_active = max(self.most_active, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        if name.endswith("missing"):
+            raise ResourceNotFoundError("gone")
+        version = next(secret.version for secret in self.secrets if secret.name == name)
+        return mock.MagicMock(value="value {0} of {1}".format(version, name))
+
+
+def test_unlock():
+    """
+    Matching secrets are fetched concurrently, skipping inactive secrets and those which fail to fetch
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    hour = datetime.timedelta(hours=1)
+    sconn = SecretClient(
+        [
+            SecretProperties("acct-provider-azurerm-default-client-id"),
+            SecretProperties("acct-provider-azurerm-default-secret"),
+            SecretProperties("acct-provider-azurerm-default-subscription-id"),
+            SecretProperties("acct-provider-azurerm-default-tenant"),
+            SecretProperties("acct-provider-azurerm-other-tenant"),
+            SecretProperties("acct-provider-azurerm-other-missing"),
+            SecretProperties("acct-provider-azurerm-other-secret", enabled=False),
+            SecretProperties("acct-provider-azurerm-other-password", expires_on=now),
+            SecretProperties(
+                "acct-provider-azurerm-other-username", not_before=now + hour
+            ),
+            SecretProperties(
+                "acct-provider-azurerm-other-client-id", expires_on=now + hour
+            ),
+            SecretProperties("acct-provider-malformed"),
+            SecretProperties("unrelated"),
+        ]
+    )
+
+    with mock.patch.object(
+        azurerm_keyvault, "_get_secret_client", return_value=sconn
+    ) as get_client:
+        ret = azurerm_keyvault.unlock(
+            None, "https://myvault.vault.azure.net", max_workers=4, tenant="t"
+        )
+
+    get_client.assert_called_once_with("https://myvault.vault.azure.net", tenant="t")
+    assert ret == {
+        "azurerm": {
+            "default": {
+                "client_id": "value 1 of acct-provider-azurerm-default-client-id",
+                "secret": "value 1 of acct-provider-azurerm-default-secret",
+                "subscription_id": "value 1 of acct-provider-azurerm-default-subscription-id",
+                "tenant": "value 1 of acct-provider-azurerm-default-tenant",
+            },
+            "other": {
+                "tenant": "value 1 of acct-provider-azurerm-other-tenant",
+                "client_id": "value 1 of acct-provider-azurerm-other-client-id",
+            },
+        }
+    }
+    assert len(sconn.fetched) == 7
+    assert 1 < sconn.most_active <= 4
+
+
+def test_unlock_cache(tmp_path, monkeypatch):
+    """
+    Cached secrets are decrypted with the acct key and only changed secrets are fetched again
+    """
+    monkeypatch.delenv("ACCT_FILE_KEY", raising=False)
+    hub = mock.MagicMock(OPT={"acct": {"acct_key": Fernet.generate_key().decode()}})
+    cache_file = str(tmp_path / "cache.fernet")
+    sconn = SecretClient(
+        [
+            SecretProperties("acct-provider-azurerm-default-client-id"),
+            SecretProperties("acct-provider-azurerm-default-secret"),
+        ]
+    )
+
+    def unlock(**kwargs):
+        sconn.fetched = []
+        with mock.patch.object(
+            azurerm_keyvault, "_get_secret_client", return_value=sconn
+        ):
+            return azurerm_keyvault.unlock(
+                hub, "https://myvault.vault.azure.net", cache_file=cache_file, **kwargs
+            )
+
+    expected = {
+        "azurerm": {
+            "default": {
+                "client_id": "value 1 of acct-provider-azurerm-default-client-id",
+                "secret": "value 1 of acct-provider-azurerm-default-secret",
+            }
+        }
+    }
+    assert unlock() == expected
+    assert len(sconn.fetched) == 2
+    with open(cache_file, "rb") as cache_fh:
+        assert b"value 1 of" not in cache_fh.read()
+
+    assert unlock() == expected
+    assert sconn.fetched == []
+
+    sconn.secrets[1].version = "2"
+    expected["azurerm"]["default"][
+        "secret"
+    ] = "value 2 of acct-provider-azurerm-default-secret"
+    assert unlock() == expected
+    assert sconn.fetched == ["acct-provider-azurerm-default-secret"]
+
+    assert unlock(cache_ttl=0) == expected
+    assert len(sconn.fetched) == 2
+
+    # a cache written with another key is ignored
+    hub.OPT["acct"]["acct_key"] = Fernet.generate_key().decode()
+    assert unlock() == expected
+    assert len(sconn.fetched) == 2
+
+    # without cryptography the secrets are unlocked without the cache
+    monkeypatch.setattr(azurerm_keyvault, "HAS_CRYPTOGRAPHY", False)
+    os.remove(cache_file)
+    assert unlock() == expected
+    assert len(sconn.fetched) == 2
+    assert not os.path.exists(cache_file)
+
+
+def test_get_identity_credentials(monkeypatch):
+    """
+    Credentials are built by the azurerm utilities and reused for the same parameters
+    """
+    monkeypatch.setattr(azurerm_keyvault, "CREDENTIALS", {})
+    principal = dict(tenant="t", client_id="c", secret="s")
+
+    credential = azurerm_keyvault._get_identity_credentials(**principal)
+    assert type(credential).__name__ == "ClientSecretCredential"
+    assert azurerm_keyvault._get_identity_credentials(**principal) is credential
+    assert (
+        azurerm_keyvault._get_identity_credentials(username="u", password="p")
+        is not credential
+    )
+    assert len(azurerm_keyvault.CREDENTIALS) == 2
@@ -0,0 +1,118 @@
+import asyncio
+import idem_azurerm.exec.azurerm.keyvault.secret as secret
+import mock
+import pytest
+
+from azure.core.exceptions import ResourceNotFoundError, ServiceRequestError
+from azure.keyvault.secrets import KeyVaultSecret, SecretProperties
+
+
+class SecretClient:
+    """
+    A stand-in for the Key Vault secret client which keeps its secrets in memory
+    """
+
+    def __init__(self):
+        self.secrets = {}
+        self.sets = []
+        self.active = 0
+        self.most_active = 0
+
+    def get_secret(self, name):
+        if name == "unreachable":
+            raise ServiceRequestError("connection refused")
+        if name not in self.secrets:
+            raise ResourceNotFoundError("secret {0} not found".format(name))
+        value, content_type = self.secrets[name]
+        return KeyVaultSecret(
+            SecretProperties(
+                attributes=None,
+                vault_id="https://myvault.vault.azure.net/secrets/" + name,
+                content_type=content_type,
+            ),
+            value,
+        )
+
+    def set_secret(self, name, value, content_type=None):
+        self.sets.append(name)
+        self.secrets[name] = (value, content_type)
+        return self.get_secret(name)
+
+
+@pytest.fixture
+def secret_hub():
+    hub = mock.MagicMock()
+    sconn = SecretClient()
+    hub.exec.azurerm.keyvault.secret.get_secret_client = mock.AsyncMock(
+        return_value=sconn
+    )
+
+    async def sdk_call(func, *args, **kwargs):
+        sconn.active += 1
+        sconn.most_active = max(sconn.most_active, sconn.active)
+        await asyncio.sleep(0.01)
+        sconn.active -= 1
+        return func(*args, **kwargs)
+
+    hub.exec.azurerm.utils.sdk_call = sdk_call
+    yield hub, sconn
+
+
+@pytest.mark.asyncio
+async def test_set_and_get_secrets(secret_hub):
+    """
+    Secrets are set and fetched concurrently with per-secret results, skipping writes of unchanged secrets
+    """
+    hub, sconn = secret_hub
+    vault = "https://myvault.vault.azure.net"
+
+    ret = await secret.set_secrets(
+        hub,
+        {},
+        {"one": "1", "two": {"value": "2", "content_type": "text/plain"}, "three": "3"},
+        vault,
+        content_type="password",
+        max_concurrency=2,
+    )
+    assert {name: item["value"] for name, item in ret.items()} == {
+        "one": "1",
+        "two": "2",
+        "three": "3",
+    }
+    assert all(item["changed"] for item in ret.values())
+    assert ret["two"]["properties"]["content_type"] == "text/plain"
+    assert sconn.secrets["one"] == ("1", "password")
+    assert sconn.most_active == 2
+
+    sconn.sets = []
+    ret = await secret.set_secrets(
+        hub,
+        {},
+        {"one": "1", "two": "2", "three": "changed"},
+        vault,
+        content_type="password",
+        skip_unchanged=True,
+    )
+    assert [ret[name]["changed"] for name in ("one", "two", "three")] == [
+        False,
+        True,
+        True,
+    ]
+    assert sorted(sconn.sets) == ["three", "two"]
+
+    ret = await secret.get_secrets(
+        hub, {}, ["one", "missing", "one", "unreachable"], vault
+    )
+    assert list(ret) == ["one", "missing", "unreachable"]
+    assert ret["one"]["value"] == "1"
+    assert "not found" in ret["missing"]["error"]
+    assert "connection refused" in ret["unreachable"]["error"]
+
+    # a secret given as a dictionary without a value is reported on its own
+    sconn.sets = []
+    ret = await secret.set_secrets(
+        hub, {}, {"four": {"content_type": "text/plain"}, "five": "5"}, vault
+    )
+    assert "value" in ret["four"]["error"]
+    assert ret["five"]["changed"]
+    assert sconn.sets == ["five"]
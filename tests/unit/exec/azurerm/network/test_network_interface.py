@@ -0,0 +1,42 @@
+import asyncio
+import pytest
+
+NIC_ID = "/subscriptions/{0}/resourceGroups/{1}/providers/Microsoft.Network/networkInterfaces/{2}"
+
+
+@pytest.mark.asyncio
+async def test_get_effective_route_table(azurerm_hub, arm_emulator, emulator_ctx):
+    """
+    Operations named get_* which start a long running operation return their poller, which is neither copied nor
+    cached, and concurrent calls each start their own operation
+    """
+    hub = azurerm_hub
+    subscription_id = emulator_ctx["acct"]["subscription_id"]
+    arm_emulator.add_resource_group(subscription_id, "rg-unit")
+    arm_emulator.add_resource(
+        NIC_ID.format(subscription_id, "rg-unit", "nic-unit"), {"location": "eastus"}
+    )
+
+    for _ in range(2):
+        ret = await hub.exec.azurerm.network.network_interface.get_effective_route_table(
+            emulator_ctx, "nic-unit", "rg-unit"
+        )
+        assert ret == []
+    assert arm_emulator.stats["polls"] == 4
+    assert not hub.exec.azurerm.RESOURCE_CACHE
+
+    netconn = await hub.exec.azurerm.utils.get_client(emulator_ctx, "network")
+    pollers = await asyncio.gather(
+        *[
+            hub.exec.azurerm.utils.sdk_call(
+                netconn.network_interfaces.get_effective_route_table,
+                network_interface_name="nic-unit",
+                resource_group_name="rg-unit",
+            )
+            for _ in range(2)
+        ]
+    )
+    assert pollers[0] is not pollers[1]
+    for poller in pollers:
+        assert (await hub.exec.azurerm.utils.wait_for_operation(poller)).value == []
+    assert not hub.exec.azurerm.RESOURCE_CACHE
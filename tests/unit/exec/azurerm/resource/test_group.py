@@ -1,4 +1,9 @@
+import asyncio
+import json
+import idem_azurerm.exec.azurerm.init as init
 import idem_azurerm.exec.azurerm.resource.group as group
+import idem_azurerm.exec.azurerm.utils as utils
+import mock
 import pytest
 
 
@@ -8,3 +13,82 @@ async def test_get(mock_hub):
     """
     # await group.get(mock_hub, "name")
     # mock_hub.exec.utils.azurerm.log_cloud_error.assert_called_once_with("resource")
+
+
+@pytest.mark.asyncio
+async def test_get_location():
+    """
+    Locations are listed once per subscription and served from the cache, with groups missing from the list fetched
+    """
+    hub = mock.MagicMock()
+    init.__init__(hub)
+    resconn = mock.MagicMock()
+    resconn.config.base_url = "https://management.azure.com"
+    resconn.config.subscription_id = "sub"
+    hub.exec.azurerm.utils.get_client = mock.AsyncMock(return_value=resconn)
+
+    async def paged_object_iter(paged):
+        await asyncio.sleep(0)
+        for name in ("rg1", "RG2"):
+            yield {
+                "id": "/subscriptions/sub/resourceGroups/" + name,
+                "location": "eastus",
+            }
+
+    hub.exec.azurerm.utils.paged_object_iter = mock.MagicMock(
+        side_effect=paged_object_iter
+    )
+    hub.exec.azurerm.resource.group.get = mock.AsyncMock(
+        return_value={"name": "rg3", "location": "westus"}
+    )
+
+    found = await asyncio.gather(
+        group.get_location(hub, {}, "rg1"), group.get_location(hub, {}, "rg2")
+    )
+    assert [ret["location"] for ret in found] == ["eastus", "eastus"]
+    assert hub.exec.azurerm.utils.paged_object_iter.call_count == 1
+
+    assert (await group.get_location(hub, {}, "rg3"))["location"] == "westus"
+    assert (await group.get_location(hub, {}, "rg3"))["location"] == "westus"
+    assert hub.exec.azurerm.resource.group.get.await_count == 1
+    assert hub.exec.azurerm.utils.paged_object_iter.call_count == 1
+
+    await utils.invalidate_resource_cache(hub, "/subscriptions/sub/resourceGroups/RG1")
+    assert (await group.get_location(hub, {}, "rg1"))["location"] == "westus"
+    assert hub.exec.azurerm.resource.group.get.await_count == 2
+
+    hub.exec.azurerm.resource.group.get.return_value = {"error": "not found"}
+    assert await group.get_location(hub, {}, "missing") == {"error": "not found"}
+
+
+@pytest.mark.asyncio
+async def test_delete_no_wait(azurerm_hub, arm_emulator, emulator_ctx):
+    """
+    Deleting without waiting returns a serializable handle, which is resumed by another process or by this one
+    """
+    hub = azurerm_hub
+    arm_emulator.lro_polls = 3
+    for name in ("rg1", "rg2"):
+        await hub.exec.azurerm.resource.group.create_or_update(
+            emulator_ctx, name, "eastus"
+        )
+    nsg = await hub.exec.azurerm.network.network_security_group.create_or_update(
+        emulator_ctx, "nsg1", "rg2", no_wait=True
+    )
+    handles = [
+        await hub.exec.azurerm.resource.group.delete(emulator_ctx, "rg1", no_wait=True),
+        nsg,
+    ]
+    assert [handle["status"] for handle in handles] == ["InProgress", "InProgress"]
+
+    # the first operation is resumed from its serialized handle, as if it had been started by another process
+    handles = json.loads(json.dumps(handles))
+    hub.exec.azurerm.OPERATIONS.pop(handles[0]["operation_id"])
+    ret = await hub.exec.azurerm.utils.wait_for_operations(emulator_ctx, handles)
+
+    assert [handle["status"] for handle in ret] == ["Succeeded", "Succeeded"]
+    assert ret[1]["result"]["provisioning_state"] == "Succeeded"
+    assert not hub.exec.azurerm.OPERATIONS
+    assert not await hub.exec.azurerm.resource.group.check_existence(
+        emulator_ctx, "rg1"
+    )
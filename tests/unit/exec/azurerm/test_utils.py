@@ -0,0 +1,859 @@
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import idem_azurerm.exec.azurerm.init as init
+import idem_azurerm.exec.azurerm.utils as utils
+import mock
+import os
+import pytest
+import threading
+import time
+
+
+@pytest.fixture
+def utils_hub(monkeypatch):
+    """
+    A bare hub carrying the azurerm utilities state from the subsystem's __init__ and the utilities these tests call
+    through the hub
+    """
+    for name in list(os.environ):
+        if name.startswith("AZURERM_"):
+            monkeypatch.delenv(name)
+
+    hub = mock.MagicMock()
+    init.__init__(hub)
+    # small pools and logs so that the tests can fill them
+    hub.exec.azurerm.CLIENT_POOL_SIZE = 2
+    hub.exec.azurerm.DATA_PLANE_POOL_SIZE = 2
+    hub.exec.azurerm.THREAD_POOL_SIZE = 4
+    hub.exec.azurerm.CALL_LOG = collections.deque(maxlen=10)
+
+    for name in (
+        "sdk_call",
+        "wait_for_operation",
+        "share_connection_pool",
+        "get_identity_credentials",
+        "shared_transport",
+    ):
+        setattr(
+            hub.exec.azurerm.utils, name, functools.partial(getattr(utils, name), hub)
+        )
+    cloud_env = mock.MagicMock()
+    cloud_env.endpoints.resource_manager = "https://management.azure.com/"
+    hub.exec.azurerm.utils.determine_auth = mock.AsyncMock(
+        return_value=(mock.MagicMock(), "sub", cloud_env)
+    )
+    yield hub
+
+
+@pytest.fixture
+def ctx():
+    yield {
+        "acct": {
+            "client_id": "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa",
+            "secret": "X2KRwdcdsQn9mwjdt0EbxsQR3w5TuBOR",
+            "subscription_id": "bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb",
+            "tenant": "cccccccc-cccc-cccc-cccc-cccccccccccc",
+        }
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_client_pool(utils_hub, ctx):
+    """
+    Clients are reused per identity and evicted least recently used first
+    """
+    resconn = await utils.get_client(utils_hub, ctx, "resource")
+    assert await utils.get_client(utils_hub, ctx, "resource") is resconn
+    assert utils_hub.exec.azurerm.utils.determine_auth.await_count == 1
+
+    other = await utils.get_client(utils_hub, ctx, "resource", secret="rotated")
+    assert other is not resconn
+
+    await utils.get_client(utils_hub, ctx, "network")
+    assert len(utils_hub.exec.azurerm.CLIENT_POOL) == 2
+    assert resconn not in utils_hub.exec.azurerm.CLIENT_POOL.values()
+
+
+@pytest.mark.asyncio
+async def test_invalidate_clients(utils_hub, ctx):
+    await utils.get_client(utils_hub, ctx, "resource")
+    await utils.get_client(utils_hub, ctx, "network")
+
+    assert await utils.invalidate_clients(utils_hub, ctx, client_type="network") == 1
+    assert await utils.invalidate_clients(utils_hub, {"acct": {}}) == 1
+    assert not utils_hub.exec.azurerm.CLIENT_POOL
+
+
+@pytest.mark.asyncio
+async def test_data_plane_client_pool(utils_hub, ctx):
+    """
+    Data plane clients are reused per vault and identity and evicted least recently used first
+    """
+    from azure.keyvault.keys import KeyClient
+    from azure.keyvault.secrets import SecretClient
+
+    vault = "https://myvault.vault.azure.net"
+    secrets = await utils.get_data_plane_client(utils_hub, ctx, SecretClient, vault)
+    assert (
+        await utils.get_data_plane_client(utils_hub, ctx, SecretClient, vault + "/")
+        is secrets
+    )
+    keys = await utils.get_data_plane_client(utils_hub, ctx, KeyClient, vault)
+    assert keys is not secrets
+    assert len(utils_hub.exec.azurerm.IDENTITY_CREDENTIALS) == 1
+
+    secrets.close = mock.MagicMock()
+    await utils.get_data_plane_client(utils_hub, ctx, SecretClient, vault, secret="new")
+    assert len(utils_hub.exec.azurerm.DATA_PLANE_CLIENTS) == 2
+    assert secrets not in utils_hub.exec.azurerm.DATA_PLANE_CLIENTS.values()
+    # evicted clients may still be in use elsewhere
+    secrets.close.assert_not_called()
+
+    assert await utils.invalidate_clients(utils_hub, ctx) == 1
+    assert await utils.invalidate_clients(utils_hub, {"acct": {}}) == 1
+    assert not utils_hub.exec.azurerm.DATA_PLANE_CLIENTS
+
+
+@pytest.mark.asyncio
+async def test_determine_auth_credential_cache(utils_hub, ctx):
+    """
+    Credentials are built once per identity and refreshed shortly before their token expires
+    """
+    with mock.patch("azure.common.credentials.ServicePrincipalCredentials") as spc:
+        spc.return_value.token = {"expires_on": time.time() + 3600}
+        creds, _, _ = await utils.determine_auth(utils_hub, ctx)
+        assert (await utils.determine_auth(utils_hub, ctx))[0] is creds
+        assert spc.call_count == 1
+        creds.set_token.assert_not_called()
+
+        creds.token = {"expires_on": time.time() + 60}
+        await utils.determine_auth(utils_hub, ctx)
+        creds.set_token.assert_called_once()
+
+        await utils.determine_auth(utils_hub, ctx, secret="rotated")
+        assert spc.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_identity_credentials(utils_hub, ctx, monkeypatch):
+    """
+    Each profile gets its own credential, reused across calls, and the environment is left alone
+    """
+    monkeypatch.delenv("AZURE_TENANT_ID", raising=False)
+    user_ctx = {"acct": {"username": "user@example.com", "password": "hunter2"}}
+
+    first = await utils.get_identity_credentials(utils_hub, ctx)
+    other = await utils.get_identity_credentials(utils_hub, ctx, tenant="other")
+    user = await utils.get_identity_credentials(utils_hub, user_ctx)
+
+    assert type(first).__name__ == "ClientSecretCredential"
+    assert type(user).__name__ == "UsernamePasswordCredential"
+    assert first is not other
+    assert await utils.get_identity_credentials(utils_hub, ctx) is first
+    assert len(utils_hub.exec.azurerm.IDENTITY_CREDENTIALS) == 3
+    assert "AZURE_TENANT_ID" not in os.environ
+
+
+def test_cloud_metadata_cache(utils_hub, tmp_path):
+    """
+    Clouds resolved from a metadata endpoint are only fetched once, even across processes
+    """
+    endpoint = "https://management.local.azurestack.external"
+    utils_hub.exec.azurerm.CLOUD_METADATA_CACHE_FILE = str(tmp_path / "clouds.json")
+
+    with mock.patch.object(
+        utils,
+        "get_cloud_from_metadata_endpoint",
+        return_value=utils.Cloud(
+            "AzureStack", endpoints=utils.CloudEndpoints(resource_manager=endpoint),
+        ),
+    ) as fetch:
+        cloud_env = utils._cloud_from_metadata_endpoint(utils_hub, endpoint)
+        assert utils._cloud_from_metadata_endpoint(utils_hub, endpoint) is cloud_env
+
+        utils_hub.exec.azurerm.CLOUD_CACHE.clear()
+        cached = utils._cloud_from_metadata_endpoint(utils_hub, endpoint)
+        assert cached.endpoints.resource_manager == endpoint
+        assert fetch.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_sdk_call(utils_hub):
+    """
+    SDK calls run on the shared worker threads instead of the event loop thread
+    """
+    thread_name = await utils.sdk_call(
+        utils_hub, lambda: threading.current_thread().name
+    )
+    assert thread_name.startswith("azurerm")
+    assert thread_name != threading.current_thread().name
+
+    with pytest.raises(ZeroDivisionError):
+        await utils.sdk_call(utils_hub, divmod, 1, 0)
+
+
+VNET_ID = "/subscriptions/{0}/resourceGroups/rg/providers/Microsoft.Network/virtualNetworks/vnet"
+
+SUBNET = dict(resource_group_name="rg", virtual_network_name="vnet", subnet_name="sn")
+
+
+@pytest.fixture
+def emulator_vnet(azurerm_hub, arm_emulator, emulator_ctx):
+    """
+    A hub whose emulator holds a virtual network with a subnet
+    """
+    subscription_id = emulator_ctx["acct"]["subscription_id"]
+    arm_emulator.add_resource_group(subscription_id, "rg")
+    arm_emulator.add_resource(VNET_ID.format(subscription_id), {"location": "eastus"})
+    arm_emulator.add_resource(
+        VNET_ID.format(subscription_id) + "/subnets/sn",
+        {"properties": {"addressPrefix": "10.0.0.0/24"}},
+    )
+    yield azurerm_hub
+
+
+@pytest.mark.asyncio
+async def test_resource_cache(emulator_vnet, arm_emulator, emulator_ctx, monkeypatch):
+    """
+    Resources are served from the cache until they are written or their entry expires
+    """
+    hub = emulator_vnet
+    sdk_call = hub.exec.azurerm.utils.sdk_call
+    netconn = await hub.exec.azurerm.utils.get_client(emulator_ctx, "network")
+    reads = arm_emulator.stats["reads"]
+
+    first = await sdk_call(netconn.subnets.get, **SUBNET)
+    second = await sdk_call(netconn.subnets.get, **SUBNET)
+    assert first.as_dict() == second.as_dict()
+    assert second is not first
+    assert arm_emulator.stats["reads"] == reads + 1
+    assert (
+        netconn.config.base_url,
+        VNET_ID.format(netconn.config.subscription_id).lower() + "/subnets/sn",
+    ) in hub.exec.azurerm.RESOURCE_CACHE
+
+    await sdk_call(netconn.subnets.get, expand="x", **SUBNET)
+    assert arm_emulator.stats["reads"] == reads + 2
+
+    poller = await sdk_call(
+        netconn.subnets.create_or_update, subnet_parameters=first, **SUBNET
+    )
+    await hub.exec.azurerm.utils.wait_for_operation(poller)
+    reads = arm_emulator.stats["reads"]
+    await sdk_call(netconn.subnets.get, **SUBNET)
+    assert arm_emulator.stats["reads"] == reads + 1
+
+    await hub.exec.azurerm.utils.invalidate_resource_cache(
+        VNET_ID.format(netconn.config.subscription_id)
+    )
+    await sdk_call(netconn.subnets.get, **SUBNET)
+    assert arm_emulator.stats["reads"] == reads + 2
+
+    monkeypatch.setattr(hub.exec.azurerm, "RESOURCE_CACHE_TTL", 0)
+    await hub.exec.azurerm.utils.invalidate_resource_cache()
+    await sdk_call(netconn.subnets.get, **SUBNET)
+    await sdk_call(netconn.subnets.get, **SUBNET)
+    assert arm_emulator.stats["reads"] == reads + 4
+
+    # only operations known to leave resources alone are reads
+    assert utils.READ_OPERATIONS.match("list_by_resource_group")
+    assert utils.READ_OPERATIONS.match("check_name_availability")
+    assert not utils.READ_OPERATIONS.match("export_data")
+
+
+@pytest.mark.asyncio
+async def test_not_found_cache(emulator_vnet, arm_emulator, emulator_ctx, monkeypatch):
+    """
+    Resources which were not found are reported as not found without another request until they are created
+    """
+    hub = emulator_vnet
+    sdk_call = hub.exec.azurerm.utils.sdk_call
+    monkeypatch.setattr(hub.exec.azurerm, "RESOURCE_CACHE_TTL", 0)
+    netconn = await hub.exec.azurerm.utils.get_client(emulator_ctx, "network")
+    missing = dict(SUBNET, subnet_name="missing")
+    reads = arm_emulator.stats["reads"]
+
+    for expand in (None, None, "x"):
+        with pytest.raises(utils.CloudError) as exc:
+            await sdk_call(netconn.subnets.get, expand=expand, **missing)
+        assert exc.value.status_code == 404
+    assert arm_emulator.stats["reads"] == reads + 1
+
+    subnet = await sdk_call(netconn.subnets.get, **SUBNET)
+    poller = await sdk_call(
+        netconn.subnets.create_or_update, subnet_parameters=subnet, **missing
+    )
+    await hub.exec.azurerm.utils.wait_for_operation(poller)
+    assert (await sdk_call(netconn.subnets.get, **missing)).name == "missing"
+
+    monkeypatch.setattr(hub.exec.azurerm, "NOT_FOUND_TTL", 0)
+    reads = arm_emulator.stats["reads"]
+    for _ in range(2):
+        with pytest.raises(utils.CloudError):
+            await sdk_call(netconn.subnets.get, **dict(SUBNET, subnet_name="other"))
+    assert arm_emulator.stats["reads"] == reads + 2
+
+
+@pytest.mark.asyncio
+async def test_coalesced_gets(emulator_vnet, arm_emulator, emulator_ctx, monkeypatch):
+    """
+    Identical gets in flight at the same time share one request, while gets of other resources do not
+    """
+    hub = emulator_vnet
+    sdk_call = hub.exec.azurerm.utils.sdk_call
+    monkeypatch.setattr(hub.exec.azurerm, "RESOURCE_CACHE_TTL", 0)
+    netconn = await hub.exec.azurerm.utils.get_client(emulator_ctx, "network")
+    arm_emulator.latency = 0.05
+    reads = arm_emulator.stats["reads"]
+
+    results = await asyncio.gather(
+        *[sdk_call(netconn.subnets.get, **SUBNET) for _ in range(5)],
+        sdk_call(netconn.virtual_networks.get, "rg", "vnet"),
+    )
+    assert arm_emulator.stats["reads"] == reads + 2
+    assert results[0].as_dict() == results[4].as_dict()
+    assert results[0] is not results[4]
+    assert not hub.exec.azurerm.IN_FLIGHT
+
+    await sdk_call(netconn.subnets.get, **SUBNET)
+    assert arm_emulator.stats["reads"] == reads + 3
+
+    monkeypatch.setattr(hub.exec.azurerm, "RESOURCE_CACHE_TTL", 60)
+    stale = asyncio.ensure_future(sdk_call(netconn.subnets.get, **SUBNET))
+    await asyncio.sleep(0)
+    await hub.exec.azurerm.utils.invalidate_resource_cache(
+        VNET_ID.format(netconn.config.subscription_id)
+    )
+    await asyncio.gather(stale, sdk_call(netconn.subnets.get, **SUBNET))
+    assert arm_emulator.stats["reads"] == reads + 5
+    await sdk_call(netconn.subnets.get, **SUBNET)
+    assert arm_emulator.stats["reads"] == reads + 5
+
+    # the first caller gets a copy as well, so changing it leaves the other callers and the cache alone
+    await hub.exec.azurerm.utils.invalidate_resource_cache()
+
+    async def change():
+        ret = await sdk_call(netconn.subnets.get, **SUBNET)
+        ret.name = "changed"
+        return ret
+
+    first, second = await asyncio.gather(
+        change(), sdk_call(netconn.subnets.get, **SUBNET)
+    )
+    assert first.name == "changed"
+    assert second.name == "sn"
+    assert (await sdk_call(netconn.subnets.get, **SUBNET)).name == "sn"
+    assert arm_emulator.stats["reads"] == reads + 6
+
+
+@pytest.mark.asyncio
+async def test_prefetch_resources(utils_hub, emulator_vnet, arm_emulator, emulator_ctx):
+    """
+    In test runs, the collections of pending states are listed once and their get calls served from the snapshots
+    """
+    subscription_id = emulator_ctx["acct"]["subscription_id"]
+    nsg_id = VNET_ID.replace("virtualNetworks/vnet", "networkSecurityGroups/{1}")
+    arm_emulator.add_resource(
+        nsg_id.format(subscription_id, "nsg1"), {"location": "eastus"}
+    )
+
+    async def get_client(ctx, client_type, **kwargs):
+        return await emulator_vnet.exec.azurerm.utils.get_client(
+            ctx, client_type, **kwargs
+        )
+
+    utils_hub.exec.azurerm.utils.get_client = mock.AsyncMock(side_effect=get_client)
+    utils_hub.exec.azurerm.utils.paged_object_iter = functools.partial(
+        utils.paged_object_iter, utils_hub
+    )
+    utils_hub.idem.tools.gen_tag = lambda chunk: chunk["name"]
+    state = "azurerm.network.network_security_group"
+    utils_hub.idem.RUNS = {
+        "run": {
+            "low": [
+                {
+                    "state": state,
+                    "fun": "present",
+                    "name": "nsg1",
+                    "resource_group": "rg",
+                },
+                {
+                    "state": state,
+                    "fun": "present",
+                    "name": "nsg2",
+                    "resource_group": "RG",
+                },
+                {
+                    "state": state,
+                    "fun": "security_rule_present",
+                    "name": "rule",
+                    "resource_group": "rg",
+                },
+                {
+                    "state": state,
+                    "fun": "present",
+                    "name": "nsg3",
+                    "resource_group": "done",
+                },
+                {
+                    "state": state,
+                    "fun": "present",
+                    "name": "nsg4",
+                    "resource_group": "rg",
+                    "acct_profile": "other",
+                },
+            ],
+            "running": {"nsg3": {}},
+            "acct_profile": "default",
+        }
+    }
+    profiles = {
+        "default": emulator_ctx["acct"],
+        "other": dict(emulator_ctx["acct"], secret="other"),
+    }
+    utils_hub.acct.init.gather = mock.AsyncMock(
+        side_effect=lambda subs, profile: profiles[profile]
+    )
+    netconn = await emulator_vnet.exec.azurerm.utils.get_client(emulator_ctx, "network")
+    nsgs = netconn.network_security_groups
+    reads = arm_emulator.stats["reads"]
+
+    ctx = {"acct": emulator_ctx["acct"], "run_name": "run"}
+    await utils.prefetch_resources(utils_hub, ctx)
+    assert arm_emulator.stats["reads"] == reads
+
+    ctx["test"] = True
+    await utils.prefetch_resources(utils_hub, ctx)
+    await utils.prefetch_resources(utils_hub, ctx)
+    # each collection is listed with the acct profile of its states
+    assert arm_emulator.stats["reads"] == reads + 2
+    assert sorted(
+        call.args[0]["acct"]["secret"]
+        for call in utils_hub.exec.azurerm.utils.get_client.await_args_list
+    ) == sorted(profile["secret"] for profile in profiles.values())
+
+    nsg = await utils.sdk_call(utils_hub, nsgs.get, "rg", "nsg1")
+    assert nsg.id == nsg_id.format(subscription_id, "nsg1")
+    with pytest.raises(utils.CloudError) as exc:
+        await utils.sdk_call(utils_hub, nsgs.get, "rg", "nsg2")
+    assert exc.value.status_code == 404
+    assert arm_emulator.stats["reads"] == reads + 2
+
+    await utils.invalidate_resource_cache(
+        utils_hub, nsg_id.format(subscription_id, "nsg2")
+    )
+    with pytest.raises(utils.CloudError):
+        await utils.sdk_call(utils_hub, nsgs.get, "rg", "nsg2")
+    assert arm_emulator.stats["reads"] == reads + 3
+
+
+@pytest.mark.asyncio
+async def test_wait_for_operation(utils_hub):
+    """
+    Long-running operations are polled on the event loop, honoring Retry-After
+    """
+    method = utils._EventLoopPolling(30)
+    method._operation = mock.MagicMock(status="InProgress")
+    method._operation.should_do_final_get.return_value = False
+    method._response = mock.MagicMock(headers={"retry-after": "7"})
+    statuses = iter(["InProgress", "Succeeded"])
+
+    def update_status():
+        method._operation.status = next(statuses)
+
+    method.update_status = update_status
+    poller = mock.MagicMock(_polling_method=method)
+
+    with mock.patch("asyncio.sleep", new=mock.AsyncMock()) as sleep:
+        result = await utils.wait_for_operation(utils_hub, poller)
+
+    assert sleep.await_args_list == [mock.call(7), mock.call(7)]
+    assert result is poller.result.return_value
+
+    method._response.headers["retry-after"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert method.retry_after() == 30
+
+    # an operation which failed as it started is never polled but still raises
+    failed = utils._EventLoopPolling(30)
+    failed._operation = mock.MagicMock(status="Failed")
+    failed._response = utils._not_found("/subscriptions/sub/resourceGroups/rg").response
+    with pytest.raises(utils.CloudError):
+        await utils.wait_for_operation(
+            utils_hub, mock.MagicMock(_polling_method=failed)
+        )
+
+
+@pytest.mark.asyncio
+async def test_wait_for_operations(utils_hub, ctx):
+    """
+    Operations started without waiting are waited for together, and unfinished ones can be waited for again
+    """
+    release = threading.Event()
+    done = mock.MagicMock(_polling_method=None)
+    done.done.return_value = True
+    done.result.return_value.as_dict.return_value = {"name": "done"}
+    failed = mock.MagicMock(_polling_method=None)
+    failed.done.return_value = False
+    failed.wait.side_effect = Exception("operation failed")
+    slow = mock.MagicMock(_polling_method=None)
+    slow.done.return_value = False
+    slow.wait.side_effect = lambda: release.wait(5)
+    slow.result.return_value = None
+
+    handles = [
+        await utils.operation_handle(utils_hub, poller)
+        for poller in (done, failed, slow)
+    ]
+    assert [handle["status"] for handle in handles] == [
+        "Succeeded",
+        "InProgress",
+        "InProgress",
+    ]
+    assert len(utils_hub.exec.azurerm.OPERATIONS) == 3
+
+    rets = await utils.wait_for_operations(
+        utils_hub, ctx, handles + [{"operation_id": "unknown"}], timeout=0.2
+    )
+    assert [ret["status"] for ret in rets] == [
+        "Succeeded",
+        "Failed",
+        "InProgress",
+        "Failed",
+    ]
+    assert rets[0]["result"] == {"name": "done"}
+    assert rets[1]["error"] == "operation failed"
+    assert "can not be resumed" in rets[3]["error"]
+    assert list(utils_hub.exec.azurerm.OPERATIONS) == [handles[2]["operation_id"]]
+
+    release.set()
+    rets = await utils.wait_for_operations(utils_hub, ctx, [handles[2]])
+    assert rets[0]["status"] == "Succeeded"
+    assert rets[0]["operation_id"] == handles[2]["operation_id"]
+    assert not utils_hub.exec.azurerm.OPERATIONS
+
+
+@pytest.mark.asyncio
+async def test_paged_object_iter(utils_hub):
+    """
+    Paged results are yielded lazily and only the pages that are needed are requested
+    """
+
+    class Paged:
+        def __init__(self, pages):
+            self.pages = pages
+            self.fetched = 0
+            self.next_link = ""
+
+        def advance_page(self):
+            page = self.pages[self.fetched]
+            self.fetched += 1
+            self.next_link = None if self.fetched == len(self.pages) else "next"
+            return [mock.MagicMock(**{"as_dict.return_value": item}) for item in page]
+
+    paged = Paged([[{"name": "a"}, {"name": "b"}], [{"name": "c"}], [{"name": "d"}]])
+    items = [
+        item async for item in utils.paged_object_iter(utils_hub, paged, max_items=3)
+    ]
+    assert items == [{"name": "a"}, {"name": "b"}, {"name": "c"}]
+    assert paged.fetched == 2
+
+    paged = Paged([[{"name": "a"}, {"name": "b"}], [{"name": "c"}]])
+    async for item in utils.paged_object_iter(utils_hub, paged):
+        break
+    assert paged.fetched == 1
+
+    paged = Paged([[{"name": "a"}], [{"name": "b"}]])
+    assert len([item async for item in utils.paged_object_iter(utils_hub, paged)]) == 2
+
+    # streams request their first page up front, so errors reach the caller right away
+    paged = Paged([[{"name": "a"}], [{"name": "b"}]])
+    stream = await utils.paged_object_stream(
+        utils_hub, utils.paged_object_iter(utils_hub, paged)
+    )
+    assert paged.fetched == 1
+    assert [item async for item in stream] == [{"name": "a"}, {"name": "b"}]
+
+    stream = await utils.paged_object_stream(
+        utils_hub, utils.paged_object_iter(utils_hub, Paged([[]]))
+    )
+    assert [item async for item in stream] == []
+
+    missing = Paged([])
+    missing.advance_page = mock.MagicMock(side_effect=utils._not_found("/rg"))
+    with pytest.raises(utils.CloudError):
+        await utils.paged_object_stream(
+            utils_hub, utils.paged_object_iter(utils_hub, missing)
+        )
+
+
+@pytest.mark.asyncio
+async def test_create_object_model(utils_hub):
+    """
+    Nested models are assembled from their cached builders
+    """
+    rules = [
+        {
+            "name": "rule{0}".format(idx),
+            "priority": 100 + idx,
+            "protocol": "Tcp",
+            "access": "Allow",
+            "direction": "Inbound",
+        }
+        for idx in range(3)
+    ]
+    for _ in range(2):
+        model = await utils.create_object_model(
+            utils_hub,
+            "network",
+            "NetworkSecurityGroup",
+            location="eastus",
+            tags={"owner": "test"},
+            security_rules=rules + ["ignored"],
+            subnets=[{"id": "/subnets/one"}],
+            default_security_rules=None,
+        )
+        assert model.location == "eastus"
+        assert model.tags == {"owner": "test"}
+        assert [rule.priority for rule in model.security_rules] == [100, 101, 102]
+        assert model.default_security_rules is None
+
+    # the plans hold the builders of the nested models, including models which nest themselves
+    builders = utils_hub.exec.azurerm.MODEL_BUILDERS
+    _, plan = builders[("network", "NetworkSecurityGroup")]
+    nested = {attr: nested_builder for attr, _, nested_builder in plan}
+    assert nested["security_rules"] is builders[("network", "SecurityRule")]
+    assert nested["subnets"] is builders[("network", "Subnet")]
+    _, plan = builders[("network", "Subnet")]
+    nested = {attr: nested_builder for attr, _, nested_builder in plan}
+    assert (
+        nested["network_security_group"]
+        is builders[("network", "NetworkSecurityGroup")]
+    )
+
+
+@pytest.mark.asyncio
+async def test_compare_list_of_dicts(utils_hub):
+    """
+    Objects are matched by name and only the differences are reported
+    """
+    old = [
+        {"name": "Keep", "priority": 100, "protocol": "TCP", "etag": "ignored"},
+        {"name": "change", "priority": 200, "subnet": {"id": "/subnets/one"}},
+        {"name": "remove", "priority": 300},
+    ]
+    new = [
+        {"name": "add", "priority": 400},
+        {"name": "change", "priority": 250, "subnet": "two"},
+        {"name": "keep", "priority": 100, "protocol": "tcp"},
+    ]
+
+    assert await utils.compare_list_of_dicts(utils_hub, old, new[1:], ["subnet"]) == {
+        "changes": {
+            "removed": {"remove": old[2]},
+            "changed": {
+                "change": {
+                    "priority": {"old": 200, "new": 250},
+                    "subnet": {"old": "one", "new": "two"},
+                }
+            },
+        }
+    }
+    ret = await utils.compare_list_of_dicts(utils_hub, old, new, ["subnet"])
+    assert ret["changes"]["added"] == {"add": new[0]}
+    assert await utils.compare_list_of_dicts(utils_hub, old[:1], new[2:]) == {}
+
+    # strings are normalized once each, and only when their objects are compared
+    class Value(str):
+        lowered = 0
+
+        def lower(self):
+            Value.lowered += 1
+            return super().lower()
+
+    await utils.compare_list_of_dicts(
+        utils_hub,
+        [{"name": "a", "protocol": Value("TCP")}],
+        [{"name": "a", "protocol": Value("tcp")}, {"name": "b"}],
+    )
+    assert Value.lowered == 2
+
+    assert "comment" in await utils.compare_list_of_dicts(utils_hub, old, {})
+    assert "comment" in await utils.compare_list_of_dicts(utils_hub, old, [{}])
+
+    # lists with repeated names are compared as a whole
+    assert await utils.compare_list_of_dicts(utils_hub, old + old, old + old) == {}
+    assert await utils.compare_list_of_dicts(utils_hub, old, new + new) == {
+        "changes": {"old": old, "new": new + new}
+    }
+
+
+def resource_group_pages(self):
+    """
+    A paged object with one empty page, returned by the list operation of the resource group operations given
+    """
+
+    def internal_paging(next_link=None):
+        return self
+
+    internal_paging.__qualname__ = (
+        "ResourceGroupsOperations.list.<locals>.internal_paging"
+    )
+    paged = mock.MagicMock(next_link="", _get_next=internal_paging)
+    paged.advance_page.side_effect = lambda: setattr(paged, "next_link", None) or []
+    return paged
+
+
+@pytest.mark.asyncio
+async def test_rate_governor(utils_hub, ctx):
+    """
+    Concurrency backs off when ARM reports throttling or low quota and recovers with successful responses
+    """
+    resconn = await utils.get_client(utils_hub, ctx, "resource")
+    governor = utils_hub.exec.azurerm.RATE_GOVERNORS["sub"]
+    retry = utils._http_session(utils_hub, "arm").get_adapter("https://").max_retries
+    assert retry.new(total=1).governors is utils_hub.exec.azurerm.RATE_GOVERNORS
+    assert retry.is_retry("POST", 429)
+
+    (rate_limit_hook,) = [
+        hook
+        for hook in resconn.config.hooks
+        if getattr(hook, "func", None) is utils._rate_limit_hook
+    ]
+    rate_limit_hook(
+        mock.MagicMock(
+            status_code=200,
+            headers={"x-ms-ratelimit-remaining-subscription-reads": "50"},
+        )
+    )
+    assert governor.limit == 2
+    retry.increment(
+        "GET",
+        "/subscriptions/sub/resourcegroups?api-version=2019-10-01",
+        mock.MagicMock(status=429, headers={}),
+    )
+    assert governor.limit == 1
+    governor.record_response(200, {})
+    assert governor.limit == 2
+
+    operation = mock.MagicMock(return_value="done")
+    operation.__self__ = resconn.resource_groups
+    assert await utils.sdk_call(utils_hub, operation) == "done"
+
+    stats = await utils.throttle_stats(utils_hub)
+    assert stats["sub"]["calls"] == 1
+    assert stats["sub"]["throttled"] == 1
+    assert stats["sub"]["min_remaining_reads"] == 50
+    assert stats["sub"]["in_flight"] == 0
+
+    # waiting calls are woken as soon as a slot is released, never exceeding the limit
+    running = []
+    peak = []
+
+    def slow():
+        running.append(1)
+        peak.append(len(running))
+        time.sleep(0.05)
+        running.pop()
+
+    operation = mock.MagicMock(side_effect=slow)
+    operation.__self__ = resconn.resource_groups
+    await asyncio.gather(*[utils.sdk_call(utils_hub, operation) for _ in range(5)])
+    assert max(peak) == 2
+    assert governor.in_flight == 0
+
+    # a call waiting on a throttled subscription is woken when the limit grows again
+    governor.throttled()
+    await governor.acquire()
+    waiter = asyncio.ensure_future(governor.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    await asyncio.get_event_loop().run_in_executor(
+        None, governor.record_response, 200, {}
+    )
+    await asyncio.wait_for(waiter, 1)
+    governor.release()
+    governor.release()
+
+    # pages of a paged object are governed by the subscription of the operation which returned it
+    calls = governor.stats()["calls"]
+    paged = resource_group_pages(resconn.resource_groups)
+    assert [item async for item in utils.paged_object_iter(utils_hub, paged)] == []
+    assert governor.stats()["calls"] == calls + 2
+
+
+@pytest.mark.asyncio
+async def test_call_metrics(utils_hub, ctx, tmp_path):
+    """
+    Every SDK call is recorded along with the responses received while it ran
+    """
+    resconn = await utils.get_client(utils_hub, ctx, "resource")
+    assert utils._call_record_hook in resconn.config.hooks
+
+    def get(name):
+        utils._call_record_hook(
+            mock.MagicMock(
+                status_code=200,
+                headers={"x-ms-request-id": "req-1", "Content-Length": "42"},
+            )
+        )
+        return name
+
+    operation = mock.MagicMock(side_effect=get, __name__="get")
+    operation.__self__ = resconn.resource_groups
+    await utils.sdk_call(utils_hub, operation, "group")
+
+    with pytest.raises(ZeroDivisionError):
+        await utils.sdk_call(utils_hub, divmod, 1, 0)
+
+    # pages are recorded under the operation which returned the paged object
+    paged = resource_group_pages(resconn.resource_groups)
+    assert [item async for item in utils.paged_object_iter(utils_hub, paged)] == []
+
+    metrics = await utils.call_metrics(utils_hub, path=str(tmp_path / "calls.json"))
+    assert metrics["operations"]["resource.resource_groups.list:page"]["calls"] == 2
+    assert not any("_next_page" in operation for operation in metrics["operations"])
+    assert metrics["calls"][0]["request_ids"] == ["req-1"]
+    get_metrics = metrics["operations"]["resource.resource_groups.get"]
+    assert get_metrics["calls"] == 1
+    assert get_metrics["bytes"] == 42
+    assert get_metrics["status"] == {"200": 1}
+    assert get_metrics["latency"]["<=0.05"] == 1
+    assert metrics["operations"]["divmod"]["errors"] == 1
+    assert (tmp_path / "calls.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_shared_connection_pool(utils_hub, ctx):
+    """
+    Management and data plane clients send their requests through the shared HTTP sessions
+    """
+    resconn = await utils.get_client(utils_hub, ctx, "resource")
+    netconn = await utils.get_client(utils_hub, ctx, "network")
+    sessions = [
+        conn.config.session_configuration_callback(
+            mock.MagicMock(), conn.config, {}, timeout=1
+        )["session"]
+        for conn in (resconn, netconn)
+    ]
+    assert sessions[0] is sessions[1] is utils_hub.exec.azurerm.HTTP_SESSIONS["arm"]
+    assert resconn.config.connection.timeout == (30, 100)
+    assert sessions[0].get_adapter("https://")._pool_maxsize == 32
+
+    transport = await utils.shared_transport(utils_hub)
+    assert transport.session is utils_hub.exec.azurerm.HTTP_SESSIONS["data"]
+    assert not transport._session_owner
+    assert not transport.session.get_adapter("https://").max_retries.total
+
+    # sessions requested from many worker threads at once are only built once
+    utils_hub.exec.azurerm.HTTP_SESSIONS.clear()
+    barrier = threading.Barrier(8)
+
+    def session():
+        barrier.wait()
+        return utils._http_session(utils_hub, "arm")
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        built = list(executor.map(lambda _: session(), range(8)))
+    assert all(ret is built[0] for ret in built)
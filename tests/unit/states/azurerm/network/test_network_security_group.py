@@ -0,0 +1,62 @@
+import pytest
+
+
+def rule(name, priority, port):
+    return {
+        "name": name,
+        "priority": priority,
+        "protocol": "Tcp",
+        "access": "Allow",
+        "direction": "Inbound",
+        "source_address_prefix": "*",
+        "destination_address_prefix": "*",
+        "source_port_range": "*",
+        "destination_port_range": port,
+    }
+
+
+@pytest.mark.asyncio
+async def test_present_rule_changes(azurerm_hub, arm_emulator, emulator_ctx):
+    """
+    The changes to the security rules of a network security group are reported per rule, even when rule names are
+    repeated
+    """
+    hub = azurerm_hub
+    subscription_id = emulator_ctx["acct"]["subscription_id"]
+    arm_emulator.add_resource_group(subscription_id, "rg-unit")
+    rules = [rule("ssh", 100, "22"), rule("http", 110, "80")]
+    ret = await hub.states.azurerm.network.network_security_group.present(
+        emulator_ctx, "nsg-unit", "rg-unit", security_rules=rules
+    )
+    assert ret["result"] is True
+
+    test_ctx = dict(emulator_ctx, test=True)
+    ret = await hub.states.azurerm.network.network_security_group.present(
+        test_ctx,
+        "nsg-unit",
+        "rg-unit",
+        security_rules=[rule("ssh", 100, "2222"), rule("https", 120, "443")],
+    )
+    assert ret["result"] is None
+    changes = ret["changes"]["security_rules"]
+    assert sorted(changes) == ["added", "changed", "removed"]
+    assert changes["added"] == {"https": rule("https", 120, "443")}
+    assert list(changes["removed"]) == ["http"]
+    assert changes["removed"]["http"]["destination_port_range"] == "80"
+    assert changes["changed"] == {
+        "ssh": {"destination_port_range": {"old": "22", "new": "2222"}}
+    }
+
+    ret = await hub.states.azurerm.network.network_security_group.present(
+        test_ctx, "nsg-unit", "rg-unit", security_rules=rules
+    )
+    assert ret["result"] is True
+    assert not ret["changes"]
+
+    # rules with repeated names are compared as whole lists, as they were before
+    ret = await hub.states.azurerm.network.network_security_group.present(
+        test_ctx, "nsg-unit", "rg-unit", security_rules=rules + rules[:1]
+    )
+    assert ret["result"] is None
+    assert ret["changes"]["security_rules"]["new"] == rules + rules[:1]
+    assert len(ret["changes"]["security_rules"]["old"]) == 2
@@ -0,0 +1,36 @@
+import idem_azurerm.contracts as contracts
+import mock
+import os
+import pop.contract
+import pop.hub
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_prefetch_contract():
+    """
+    Every azurerm state prefetches the resources of its run before it runs
+    """
+    hub = pop.hub.Hub()
+    hub.pop.sub.add(dyne_name="states")
+    hub.pop.sub.load_subdirs(hub.states, recurse=True)
+
+    states_dir = os.path.dirname(hub.states.azurerm.init.__file__)
+    for name in os.listdir(states_dir):
+        if os.path.isdir(os.path.join(states_dir, name)) and name != "__pycache__":
+            sub = getattr(hub.states.azurerm, name)
+            assert sub._contracts.init.pre.func is contracts.pre
+
+    present = hub.states.azurerm.resource.group.present
+    (pre,) = present.contract_functions["pre"]
+
+    ctx = {"run_name": "run", "test": True, "acct": {}}
+    mock_hub = mock.MagicMock()
+    mock_hub.exec.azurerm.utils.prefetch_resources = mock.AsyncMock()
+    await pre.func(
+        mock_hub,
+        pop.contract.ContractedContext(
+            present.func, (hub, ctx, "rg", "eastus"), {}, present.signature
+        ),
+    )
+    mock_hub.exec.azurerm.utils.prefetch_resources.assert_awaited_once_with(ctx)
@@ -0,0 +1,37 @@
+import idem_azurerm.auth as auth
+import subprocess
+import sys
+
+
+def test_identity_credential(monkeypatch):
+    """
+    Credentials are built per identity and authority and reused, and azure-identity is only imported to build them
+    """
+    credentials = {}
+    principal = dict(tenant="t", client_id="c", secret="X2KRwdcdsQn9mwjdt0Ebx")
+
+    credential = auth.identity_credential(credentials, principal)
+    assert type(credential).__name__ == "ClientSecretCredential"
+    assert auth.identity_credential(credentials, dict(principal)) is credential
+    assert (
+        auth.identity_credential(
+            credentials, dict(principal, cloud_environment="https://login.example.com")
+        )
+        is not credential
+    )
+    user = auth.identity_credential(credentials, dict(username="u", password="p"))
+    assert type(user).__name__ == "UsernamePasswordCredential"
+    assert len(credentials) == 3
+    assert principal["secret"] not in str(list(credentials))
+
+
+def test_no_sdk_imports():
+    """
+    Importing the module loads neither the SDK nor the exec modules
+    """
+    code = (
+        "import sys, idem_azurerm.auth; "
+        "print([mod for mod in sys.modules if mod.startswith(('azure', 'msrest', 'idem_azurerm.exec'))])"
+    )
+
+    assert subprocess.check_output([sys.executable, "-c", code]).strip() == b"[]"